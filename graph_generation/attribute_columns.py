@@ -0,0 +1,264 @@
+"""
+This module implements typed columns of node attributes, generated in bulk with NumPy.
+
+Columns store values as NumPy arrays and convert them to Python values only when they are read:
+    CategoricalColumn - uint8 codes of categories (ex. environments, criticalities), categories are kept once.
+    DurationColumn - int32 durations in seconds (ex. SLOs, data integrity times), read as integer seconds.
+                     format() returns human-readable strings like 5d / 25h, formatted with NumPy.
+    IdStringColumn - virtual strings derived from node ids (names, descriptions, regex groupings). Only the ids are
+                     stored, as a range for consecutive ids, and strings are built when they are read or written.
+
+Columns behave like read-only lists: they have a length, can be indexed and iterated, and tolist() converts a whole
+column at once, which is much faster than reading values one by one.
+"""
+
+import numpy as np
+
+# Time units of duration strings with their length in seconds, from the largest.
+TIME_UNITS = (("d", 86400), ("h", 3600), ("m", 60), ("s", 1))
+
+# Ranges of random durations of every time unit, both ends included. Used if a config has no range in seconds.
+TIME_RANGES = {
+    "d": (1, 30),
+    "h": (1, 120),
+    "m": (1, 720),
+    "s": (1, 360)
+}
+
+# Maximal number of categories of a column with uint8 codes.
+MAX_CATEGORIES = 256
+
+# Kinds of strings derived from node ids, every string is <prefix><number><suffix>.
+ID_STRING_KINDS = ("name", "description", "regex")
+
+
+def get_id_string_affixes(kind, node_type):
+    """Returns prefix and suffix of id-derived strings of a kind, ex. name of a dataset is dataset.<number>."""
+    if kind == "name":
+        return f"{node_type}.", ""
+    if kind == "description":
+        return f"{node_type.capitalize()} number ", "."
+    if kind == "regex":
+        return f"{node_type}.", ".*"
+    raise ValueError(f"Unknown id string kind {kind}, should be one of {', '.join(ID_STRING_KINDS)}.")
+
+
+def format_id_string(kind, node_type, number):
+    """Returns id-derived string of a node, ex. format_id_string("description", "dataset", 5) -> Dataset number 5."""
+    prefix, suffix = get_id_string_affixes(kind, node_type)
+    return f"{prefix}{number}{suffix}"
+
+
+def format_duration(seconds):
+    """Formats duration in seconds with the largest time unit that divides it, ex. 90000 -> 25h, 86400 -> 1d."""
+    for unit, unit_seconds in TIME_UNITS:
+        if seconds % unit_seconds == 0:
+            return f"{seconds // unit_seconds}{unit}"
+
+
+def format_durations(seconds):
+    """
+    Formats an array of durations in seconds like format_duration(), with NumPy string operations.
+
+    Returns:
+        Array of strings.
+    """
+    seconds = np.asarray(seconds, dtype=np.int64)
+    units = np.array([unit for unit, _ in TIME_UNITS])
+    unit_seconds = np.array([length for _, length in TIME_UNITS], dtype=np.int64)
+    # Index of the largest unit that divides every duration, 0 is divided by days.
+    unit_codes = np.argmax(seconds[:, None] % unit_seconds[None, :] == 0, axis=1)
+    return np.char.add((seconds // unit_seconds[unit_codes]).astype(str), units[unit_codes])
+
+
+def parse_duration(duration):
+    """Parses duration string like 5d / 25h / 121m / 46s to seconds.
+
+    Raises:
+        ValueError: Duration doesn't end with a time unit.
+    """
+    unit_seconds = dict(TIME_UNITS)
+    if not duration or duration[-1] not in unit_seconds:
+        raise ValueError(f"Duration {duration!r} should end with one of {', '.join(unit_seconds)}.")
+    return int(duration[:-1]) * unit_seconds[duration[-1]]
+
+
+def draw_durations(n, rng, seconds_range=None):
+    """
+    Draws n durations with a numpy.random.Generator. If seconds_range is given, durations are drawn uniformly from it.
+    Otherwise a time unit is picked uniformly from TIME_RANGES, and then a number of units from its range.
+
+    Args:
+        n: Integer, number of durations.
+        rng: numpy.random.Generator.
+        seconds_range: Pair of the shortest and the longest duration in seconds, both included.
+
+    Returns:
+        DurationColumn of n durations.
+    """
+    if seconds_range is not None:
+        low, high = seconds_range
+        # One uniform number per value, so values drawn in chunks are the same as values drawn at once.
+        values = low + np.minimum((rng.random(n) * (high - low + 1)).astype(np.int64), high - low)
+        return DurationColumn(values)
+
+    units = tuple(TIME_RANGES)
+    lows = np.array([TIME_RANGES[unit][0] for unit in units], dtype=np.int64)
+    highs = np.array([TIME_RANGES[unit][1] for unit in units], dtype=np.int64)
+    unit_seconds = np.array([dict(TIME_UNITS)[unit] for unit in units], dtype=np.int64)
+
+    # Two uniform numbers per value, so values drawn in chunks are the same as values drawn at once.
+    uniform = rng.random((n, 2))
+    unit_codes = np.minimum((uniform[:, 0] * len(units)).astype(np.int64), len(units) - 1)
+    spans = highs[unit_codes] - lows[unit_codes] + 1
+    values = lows[unit_codes] + np.minimum((uniform[:, 1] * spans).astype(np.int64), spans - 1)
+    return DurationColumn((values * unit_seconds[unit_codes]).astype(np.int32))
+
+
+class CategoricalColumn:
+    """
+    A column of categorical values stored as uint8 codes.
+
+    ...
+
+    Attributes:
+        codes: uint8 array, index of the category of every value.
+        categories: Tuple of categories.
+
+    Methods:
+        tolist()
+            Returns list of category values.
+    """
+    def __init__(self, codes, categories):
+        if len(categories) > MAX_CATEGORIES:
+            raise ValueError(f"Categorical column can't have more than {MAX_CATEGORIES} categories.")
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.categories = tuple(categories)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CategoricalColumn(self.codes[index], self.categories)
+        return self.categories[self.codes[index]]
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, CategoricalColumn):
+            return NotImplemented
+        return self.categories == other.categories and np.array_equal(self.codes, other.codes)
+
+    def __repr__(self):
+        return f"CategoricalColumn({self.tolist()!r})"
+
+    def tolist(self):
+        categories = np.empty(len(self.categories), dtype=object)
+        categories[:] = self.categories
+        return categories[self.codes].tolist()
+
+
+class DurationColumn:
+    """
+    A column of durations stored as int32 seconds.
+
+    ...
+
+    Attributes:
+        seconds: int32 array of durations in seconds.
+
+    Methods:
+        tolist()
+            Returns list of durations in seconds.
+        format()
+            Returns list of duration strings, ex. 5d, 25h, 121m, 46s.
+    """
+    def __init__(self, seconds):
+        self.seconds = np.asarray(seconds, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.seconds)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return DurationColumn(self.seconds[index])
+        return int(self.seconds[index])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, DurationColumn):
+            return NotImplemented
+        return np.array_equal(self.seconds, other.seconds)
+
+    def __repr__(self):
+        return f"DurationColumn({self.format()!r})"
+
+    def tolist(self):
+        return self.seconds.tolist()
+
+    def format(self):
+        return format_durations(self.seconds).tolist()
+
+
+class IdStringColumn:
+    """
+    A virtual column of strings derived from node numbers, ex. dataset.0, dataset.1, ...
+
+    ...
+
+    Attributes:
+        kind: String, one of ID_STRING_KINDS.
+        node_type: String, type of the nodes, ex. dataset.
+        numbers: Range or integer array of node numbers used in the strings.
+        prefix, suffix: Strings around the number of every value.
+
+    Methods:
+        tolist()
+            Returns list of strings.
+    """
+    def __init__(self, kind, node_type, numbers):
+        self.kind = kind
+        self.node_type = node_type
+        self.numbers = numbers if isinstance(numbers, range) else np.asarray(numbers, dtype=np.int64)
+        self.prefix, self.suffix = get_id_string_affixes(kind, node_type)
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return IdStringColumn(self.kind, self.node_type, self.numbers[index])
+        return f"{self.prefix}{self.numbers[index]}{self.suffix}"
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if not isinstance(other, IdStringColumn):
+            return NotImplemented
+        return (self.prefix, self.suffix) == (other.prefix, other.suffix) and \
+            np.array_equal(np.asarray(self.numbers), np.asarray(other.numbers))
+
+    def __repr__(self):
+        return f"IdStringColumn({self.kind!r}, {self.node_type!r}, {self.numbers!r})"
+
+    def tolist(self):
+        prefix, suffix = self.prefix, self.suffix
+        numbers = self.numbers if isinstance(self.numbers, range) else self.numbers.tolist()
+        return [f"{prefix}{number}{suffix}" for number in numbers]
+
+
+def to_list(values):
+    """Converts a column, an array, a range or a list of values to a list."""
+    if hasattr(values, "tolist"):
+        return values.tolist()
+    return values if isinstance(values, list) else list(values)
+
+
+def materialize(attributes):
+    """Converts columns of an attribute dictionary to lists, when a chunk of nodes is written to a graph."""
+    return {name: values.tolist() if hasattr(values, "tolist") else values for name, values in attributes.items()}
@@ -9,10 +9,68 @@ Method generate() will create all the necessary attributes for the graph:
     Dataset: slo, environment, description, name, regex grouping.
     Data integrity: reconstruction time, volatility, regeneration time, restoration time.
     Dataset processing: impact, freshness.
+
+Methods get_<node type>_attributes() return attributes of one chunk of nodes, so a graph can be generated in chunks.
+Every random attribute uses its own stream spawned from the stream of its block, and chunks continue these streams.
+Chunks of a node type have to be requested in the order nodes are generated.
+
+Random attributes are generated with one of two backends:
+    numpy - values of a chunk are drawn at once with NumPy and returned as typed columns (see attribute_columns.py):
+            uint8 category codes and int32 durations in seconds.
+    python - values are drawn one by one with random.Random and returned as lists.
+Durations (SLOs and data integrity times) are integer seconds with both backends. They are drawn uniformly from
+the ranges in seconds of the config if it has them, otherwise from TIME_RANGES.
+Both backends use the same streams, but draw different values from them.
+Names, descriptions and regex groupings only depend on node type and id. They are returned as virtual IdStringColumn
+columns, that keep node ids and build strings when graph builders read them, so no lists of strings are kept.
 """
 
 import random
 
+import numpy as np
+
+from attribute_columns import TIME_RANGES, IdStringColumn, draw_durations, format_id_string, parse_duration
+from random_streams import as_seed_sequence, child_sequence, python_random
+from samplers import AliasSampler
+
+# Attribute blocks that need random values. Index of a block is the key of its random stream.
+RANDOM_BLOCKS = ("dataset", "system", "processing", "data_integrity")
+
+# Random attributes of every block. Index of an attribute is the key of its random stream in the block stream.
+RANDOM_ATTRIBUTES = {
+    "dataset": ("dataset_slos", "dataset_environments"),
+    "system": ("system_criticalities", "system_environments"),
+    "processing": ("dataset_impacts", "dataset_freshness"),
+    "data_integrity": ("data_restoration_time", "data_regeneration_time", "data_reconstruction_time",
+                       "data_volatility")
+}
+
+BACKENDS = ("numpy", "python")
+
+# Attributes drawn from probability maps, with the params attribute and the map attribute of every map.
+SAMPLED_ATTRIBUTES = {
+    "dataset_environments": ("dataset_params", "dataset_env_count_map"),
+    "system_criticalities": ("system_params", "system_criticality_proba_map"),
+    "system_environments": ("system_params", "system_env_count_map"),
+    "dataset_impacts": ("processing_params", "dataset_impact_proba_map"),
+    "dataset_freshness": ("processing_params", "dataset_criticality_proba_map"),
+    "data_volatility": ("data_integrity_params", "data_volatility_proba_map")
+}
+
+
+def compile_samplers(**params):
+    """
+    Compiles an AliasSampler for every map of SAMPLED_ATTRIBUTES.
+
+    Args:
+        params: dataset_params, system_params, processing_params and data_integrity_params.
+
+    Returns:
+        Dictionary that maps attribute name to its AliasSampler.
+    """
+    return {attribute: AliasSampler(getattr(params[params_name], map_name))
+            for attribute, (params_name, map_name) in SAMPLED_ATTRIBUTES.items()}
+
 
 class AttributeGenerator:
     """
@@ -25,6 +83,11 @@ class AttributeGenerator:
         data_integrity_params: Instance of DataIntegrityParams.
         processing_params: Instance of ProcessingParams.
         connection_params: Instance of ConnectionParams.
+        seed_sequence: numpy SeedSequence, attribute block random streams are spawned from it.
+        id_offsets: Dictionary that maps node type to the first id - 1 of generated nodes, used for node names in
+                    graph shards. Nodes ids start from 1 for missing types.
+        backend: String, numpy or python, the way random attributes are drawn.
+        samplers: Dictionary that maps attribute name to the AliasSampler of its probability map.
 
         dataset_attributes: Dictionary with keys as attribute type, and value lists of generated attributes.
         system_attributes: Dictionary with keys as attribute type, and value lists of generated attributes.
@@ -35,7 +98,7 @@ class AttributeGenerator:
         _generate_time()
             Generates time strings from given range in seconds.
         _generate_from_proba()
-            Generates value from given probability map.
+            Generates values from given probability map, compiled into an AliasSampler.
         _generate_dataset_attributes()
             Generates all necessary dataset attributes.
         _generate_system_attributes()
@@ -44,17 +107,39 @@ class AttributeGenerator:
             Generates all dataset processing attributes.
         _generate_data_integrity_attributes()
             Generates all data integrity attributes.
+        get_dataset_attributes(dataset_ids), get_system_attributes(system_ids), ...
+            Return attributes of a chunk of nodes as a dictionary of lists.
+        reset_streams()
+            Restarts random streams, so the next chunks start from the first values again.
         generate()
             Generates all the needed attributes for data dependency mapping graph.
     """
     def __init__(self, collection_params, dataset_params, system_params, data_integrity_params, processing_params,
-                 connection_params):
+                 connection_params, seed=None, id_offsets=None, backend="numpy", samplers=None):
+        """
+        Args:
+            seed: Integer or SeedSequence, attribute streams are spawned from it.
+            id_offsets: Dictionary that maps node type to the first id - 1 of generated nodes.
+            backend: String, numpy or python.
+            samplers: Dictionary of samplers from compile_samplers(), to share them between generators of the same
+                      config. They are compiled from the params if None.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown attribute backend {backend}, should be one of {', '.join(BACKENDS)}.")
         self.collection_params = collection_params
         self.dataset_params = dataset_params
         self.system_params = system_params
         self.data_integrity_params = data_integrity_params
         self.processing_params = processing_params
         self.connection_params = connection_params
+        self.seed_sequence = as_seed_sequence(seed)
+        self.id_offsets = id_offsets if id_offsets is not None else {}
+        self.backend = backend
+        if samplers is None:
+            samplers = compile_samplers(dataset_params=dataset_params, system_params=system_params,
+                                        processing_params=processing_params,
+                                        data_integrity_params=data_integrity_params)
+        self.samplers = samplers
 
         self.collection_attributes = {}
         self.dataset_collection_attributes = {}
@@ -63,124 +148,193 @@ class AttributeGenerator:
         self.system_attributes = {}
         self.dataset_processing_attributes = {}
         self.data_integrity_attributes = {}
+        self._rngs = {}
+
+    def reset_streams(self):
+        """Restarts random streams of all attribute blocks."""
+        self._rngs = {}
+
+    def _get_rngs(self, block):
+        """
+        Returns numpy.random.Generator (or random.Random for python backend) for every random attribute of a block.
+        Every attribute has its own stream spawned from the block stream, so generated values don't depend on how
+        nodes are split into chunks.
+        """
+        if block not in self._rngs:
+            block_sequence = child_sequence(self.seed_sequence, RANDOM_BLOCKS.index(block))
+            create_rng = np.random.default_rng if self.backend == "numpy" else python_random
+            self._rngs[block] = {attribute: create_rng(child_sequence(block_sequence, i))
+                                 for i, attribute in enumerate(RANDOM_ATTRIBUTES[block])}
+        return self._rngs[block]
 
     @staticmethod
-    def _generate_time(n=1):
+    def _generate_time(n=1, rng=None):
         """Generates n random time strings in format 1d / 25h / 121m / 46s"""
+        rng = rng if rng is not None else random
         generated_time = []
-        time_ranges = {
-            "d": (1, 30),
-            "h": (1, 120),
-            "m": (1, 720),
-            "s": (1, 360)
-        }
         for i in range(n):
-            time_metric = random.choice(list(time_ranges.keys()))
-            time_value = random.randint(time_ranges[time_metric][0], time_ranges[time_metric][1])
+            time_metric = rng.choice(list(TIME_RANGES.keys()))
+            time_value = rng.randint(TIME_RANGES[time_metric][0], TIME_RANGES[time_metric][1])
             generated_time.append(f"{time_value}{time_metric}")
         return generated_time
 
     @staticmethod
-    def _generate_from_proba(proba_map, n=1):
-        """Generates n random values with replacement from map using their probability."""
-        population = list(proba_map.keys())
-        probability = list(proba_map.values())
+    def _generate_from_proba(sampler, n=1, rng=None):
+        """
+        Generates n random values with replacement from a probability map compiled into an AliasSampler.
+
+        Raises:
+            ValueError: Values are drawn from an empty map.
+        """
+        rng = rng if rng is not None else random
+        if n > 0 and not len(sampler):
+            raise ValueError("Can't draw values from an empty map.")
+        return rng.choices(sampler.values, cum_weights=sampler.cum_weights, k=n)
 
-        # Normalise probability
-        probability = [i / sum(probability) for i in probability]
-        return random.choices(population, probability, k=n)
+    def _draw_time(self, n, rng, seconds_range=None):
+        """Draws n random durations in seconds with the backend of the generator, from seconds_range if given."""
+        if self.backend == "numpy":
+            return draw_durations(n, rng, seconds_range)
+        if seconds_range is not None:
+            return [rng.randint(*seconds_range) for _ in range(n)]
+        return [parse_duration(duration) for duration in self._generate_time(n=n, rng=rng)]
+
+    def _draw_from_proba(self, attribute, n, rng):
+        """Draws n random values of an attribute from its probability map with the backend of the generator."""
+        sampler = self.samplers[attribute]
+        if self.backend == "numpy":
+            return sampler.sample(n, rng)
+        return self._generate_from_proba(sampler, n=n, rng=rng)
 
     @staticmethod
     def _generate_description(node_type, node_id):
         """Generates random description for a node (ex. Dataset number 1.)."""
-        return f"{node_type.capitalize()} number {node_id}."
+        return format_id_string("description", node_type, node_id)
 
     @staticmethod
     def _generate_regex(node_type, node_id):
         """Generates random regex grouping."""
-        return f"{node_type}.{node_id}.*"
+        return format_id_string("regex", node_type, node_id)
 
     @staticmethod
     def _generate_name(node_type, node_id):
         """Generates random node name."""
-        return f"{node_type}.{node_id}"
+        return format_id_string("name", node_type, node_id)
+
+    @staticmethod
+    def _get_numbers(node_ids):
+        """Returns numbers used in names of nodes with the given ids, they start from 0."""
+        if isinstance(node_ids, range):
+            return range(node_ids.start - 1, node_ids.stop - 1, node_ids.step)
+        return np.asarray(node_ids, dtype=np.int64) - 1
+
+    def _get_ids(self, node_type, count):
+        """Returns ids of generated nodes of a type. They start after the id offset of the type."""
+        offset = self.id_offsets.get(node_type, 0)
+        return range(offset + 1, offset + count + 1)
+
+    def get_collection_attributes(self, collection_ids):
+        """Returns names of collections with the given ids."""
+        return {"names": IdStringColumn("name", "collection", self._get_numbers(collection_ids))}
+
+    def get_dataset_collection_attributes(self, dataset_collection_ids):
+        """Returns names of dataset collections with the given ids."""
+        return {"names": IdStringColumn("name", "dataset collection", self._get_numbers(dataset_collection_ids))}
+
+    def get_system_collection_attributes(self, system_collection_ids):
+        """Returns names of system collections with the given ids."""
+        return {"names": IdStringColumn("name", "system collection", self._get_numbers(system_collection_ids))}
+
+    def get_dataset_attributes(self, dataset_ids):
+        """Returns slo, environments, regex groupings, names and descriptions of datasets with the given ids."""
+        rngs = self._get_rngs("dataset")
+        numbers = self._get_numbers(dataset_ids)
+        return {
+            "descriptions": IdStringColumn("description", "dataset", numbers),
+            "names": IdStringColumn("name", "dataset", numbers),
+            "regex_groupings": IdStringColumn("regex", "dataset", numbers),
+            "dataset_slos": self._draw_time(len(dataset_ids), rngs["dataset_slos"],
+                                            self.dataset_params.dataset_slo_range),
+            # View counts as probability of being picked
+            "dataset_environments": self._draw_from_proba("dataset_environments", len(dataset_ids),
+                                                          rngs["dataset_environments"])
+        }
+
+    def get_system_attributes(self, system_ids):
+        """Returns criticality, environments, regex groupings, names and descriptions of systems with the given ids."""
+        rngs = self._get_rngs("system")
+        numbers = self._get_numbers(system_ids)
+        return {
+            "regex_groupings": IdStringColumn("regex", "system", numbers),
+            "names": IdStringColumn("name", "system", numbers),
+            "descriptions": IdStringColumn("description", "system", numbers),
+            "system_criticalities": self._draw_from_proba("system_criticalities", len(system_ids),
+                                                          rngs["system_criticalities"]),
+            # View counts as probability of being picked
+            "system_environments": self._draw_from_proba("system_environments", len(system_ids),
+                                                         rngs["system_environments"])
+        }
+
+    def get_processing_attributes(self, processing_count):
+        """Returns dataset impacts and dataset freshness of the next processing_count processings."""
+        rngs = self._get_rngs("processing")
+        return {
+            "dataset_impacts": self._draw_from_proba("dataset_impacts", processing_count, rngs["dataset_impacts"]),
+            "dataset_freshness": self._draw_from_proba("dataset_freshness", processing_count,
+                                                       rngs["dataset_freshness"])
+        }
+
+    def get_data_integrity_attributes(self, data_integrity_count):
+        """Returns restoration, regeneration, reconstruction times and volatility of the next data integrities."""
+        rngs = self._get_rngs("data_integrity")
+        return {
+            "data_restoration_time": self._draw_time(data_integrity_count, rngs["data_restoration_time"],
+                                                     self.data_integrity_params.data_restoration_range_seconds),
+            "data_regeneration_time": self._draw_time(data_integrity_count, rngs["data_regeneration_time"],
+                                                      self.data_integrity_params.data_regeneration_range_seconds),
+            "data_reconstruction_time": self._draw_time(data_integrity_count, rngs["data_reconstruction_time"],
+                                                        self.data_integrity_params.data_reconstruction_range_seconds),
+            "data_volatility": self._draw_from_proba("data_volatility", data_integrity_count,
+                                                     rngs["data_volatility"])
+        }
 
     def _generate_collection_attributes(self):
         """Generates name for collections."""
-        collection_names = [self._generate_name("collection", i) for i in range(self.collection_params.collection_count)]
-        self.collection_attributes["names"] = collection_names
+        self.collection_attributes = self.get_collection_attributes(
+            range(1, self.collection_params.collection_count + 1))
 
     def _generate_dataset_collection_attributes(self):
         """Generates name for dataset collections."""
-        dataset_collection_names = [self._generate_name("dataset collection", i)
-                                    for i in range(self.collection_params.dataset_collection_count)]
-        self.dataset_collection_attributes["names"] = dataset_collection_names
+        self.dataset_collection_attributes = self.get_dataset_collection_attributes(
+            range(1, self.collection_params.dataset_collection_count + 1))
 
     def _generate_system_collection_attributes(self):
         """Generates name for system collections."""
-        system_collection_names = [self._generate_name("system collection", i)
-                                   for i in range(self.collection_params.system_collection_count)]
-        self.system_collection_attributes["names"] = system_collection_names
+        self.system_collection_attributes = self.get_system_collection_attributes(
+            range(1, self.collection_params.system_collection_count + 1))
 
     def _generate_dataset_attributes(self):
         """Generates slo, environments, regex groupings and names for datasets."""
-        dataset_descriptions = [self._generate_description("dataset", i) for i in range(self.dataset_params.dataset_count)]
-        dataset_regexs = [self._generate_regex("dataset", i) for i in range(self.dataset_params.dataset_count)]
-        dataset_names = [self._generate_name("dataset", i) for i in range(self.dataset_params.dataset_count)]
-
-        dataset_slos = self._generate_time(n=self.dataset_params.dataset_count)
-        # View counts as probability of being picked
-        dataset_environments = self._generate_from_proba(self.dataset_params.dataset_env_count_map,
-                                                         n=self.dataset_params.dataset_count)
-
-        self.dataset_attributes["descriptions"] = dataset_descriptions
-        self.dataset_attributes["names"] = dataset_names
-        self.dataset_attributes["regex_groupings"] = dataset_regexs
-        self.dataset_attributes["dataset_slos"] = dataset_slos
-        self.dataset_attributes["dataset_environments"] = dataset_environments
+        self.dataset_attributes = self.get_dataset_attributes(
+            self._get_ids("dataset", self.dataset_params.dataset_count))
 
     def _generate_system_attributes(self):
         """Generates system criticality, system environments, regex groupings, names and descriptions for systems."""
-        system_descriptions = [self._generate_description("system", i) for i in range(self.system_params.system_count)]
-        system_regexs = [self._generate_regex("system", i) for i in range(self.system_params.system_count)]
-        system_names = [self._generate_name("system", i) for i in range(self.system_params.system_count)]
-
-        system_criticalities = self._generate_from_proba(self.system_params.system_criticality_proba_map,
-                                                         n=self.system_params.system_count)
-        # View counts as probability of being picked
-        system_environments = self._generate_from_proba(self.system_params.system_env_count_map,
-                                                        n=self.system_params.system_count)
-
-        self.system_attributes["regex_groupings"] = system_regexs
-        self.system_attributes["names"] = system_names
-        self.system_attributes["descriptions"] = system_descriptions
-        self.system_attributes["system_criticalities"] = system_criticalities
-        self.system_attributes["system_environments"] = system_environments
+        self.system_attributes = self.get_system_attributes(self._get_ids("system", self.system_params.system_count))
 
     def _generate_processing_attributes(self):
         """Generates dataset impacts and dataset freshness."""
-        dataset_impacts = self._generate_from_proba(self.processing_params.dataset_impact_proba_map,
-                                                    n=self.connection_params.dataset_system_connection_count)
-        dataset_freshness = self._generate_from_proba(self.processing_params.dataset_criticality_proba_map,
-                                                      n=self.connection_params.dataset_system_connection_count)
-
-        self.dataset_processing_attributes["dataset_impacts"] = dataset_impacts
-        self.dataset_processing_attributes["dataset_freshness"] = dataset_freshness
+        self.dataset_processing_attributes = self.get_processing_attributes(
+            self.connection_params.dataset_system_connection_count)
 
     def _generate_data_integrity_attributes(self):
         """Generates restoration, regeneration, reconstruction times and volatility for each dataset collection."""
-        data_restoration_time = self._generate_time(n=self.collection_params.dataset_collection_count)
-        data_regeneration_time = self._generate_time(n=self.collection_params.dataset_collection_count)
-        data_reconstruction_time = self._generate_time(n=self.collection_params.dataset_collection_count)
-        data_volatility = self._generate_from_proba(self.data_integrity_params.data_volatility_proba_map,
-                                                    n=self.collection_params.dataset_collection_count)
-        self.data_integrity_attributes["data_restoration_time"] = data_restoration_time
-        self.data_integrity_attributes["data_regeneration_time"] = data_regeneration_time
-        self.data_integrity_attributes["data_reconstruction_time"] = data_reconstruction_time
-        self.data_integrity_attributes["data_volatility"] = data_volatility
+        self.data_integrity_attributes = self.get_data_integrity_attributes(
+            self.collection_params.dataset_collection_count)
 
     def generate(self):
         """Generates all needed attributes."""
+        self.reset_streams()
         self._generate_collection_attributes()
         self._generate_dataset_collection_attributes()
         self._generate_system_collection_attributes()
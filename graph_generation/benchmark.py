@@ -0,0 +1,276 @@
+"""
+This module benchmarks graph generation stages on configs scaled from a config file, and compares the results with a
+stored baseline to catch performance regressions.
+
+Every benchmark case runs in a fresh process, with a fixed seed, and is measured with a StageReport:
+    proto - ConnectionGenerator (connections.<relation>), AttributeGenerator (attributes.<node type>), ProtoGraph
+            build (nodes.<node type>) and save (serialization).
+    networkx - the same stages with NxGraph.
+    proto_read - ProtoGraph.read_from_file of the proto graph (read).
+    networkx_read - NxGraph.read_from_file of the GraphML graph (read).
+    proto_to_nx - conversion of the proto graph to NxGraph (nodes.<node type>) and save (serialization).
+
+Benchmarks are named <case>/<stage>, ex. proto/connections.dataset_read_conn_systems. The minimal wall and CPU time
+of repeat runs and the maximal peak RSS are kept for every scale. A benchmark regresses if:
+    its time or peak RSS at some scale is more than tolerance times higher than in the baseline, and the
+    difference is above min_seconds / min_bytes, so timer noise of fast stages is ignored;
+    its time grows faster than scale^max_exponent between the smallest and the largest scale at which it takes at
+    least min_seconds, ex. a stage that became quadratic in the number of nodes. This needs no baseline.
+
+Baselines depend on the machine, save a new baseline with --save_baseline after changing the machine, scales or
+seed. The script exits with status 1 if a benchmark regresses.
+
+Usage:
+    python3 graph_generation/benchmark.py \
+         --config_file "graph_generation/configs/config_15_09_20.yaml" \
+         --scales 0.02 0.1 0.3 \
+         --seed 42 \
+         --repeat 3 \
+         --output_file "benchmark_results.json" \
+         --baseline_file "graph_generation/benchmarks/baseline.json"
+
+    Parameters info:
+        scales are scale factors of node counts and count maps of the config (see generate_from_config.py).
+        cases are benchmark cases run at every scale, all cases if not specified.
+        repeat is the number of runs of every case, 1 if not specified.
+        output_file saves the results as JSON.
+        baseline_file is compared with the results, save_baseline saves the results to it instead.
+        tolerance is the allowed relative increase of time and memory, 0.5 (50%) if not specified.
+        max_exponent is the allowed growth of time with scale, 1.5 if not specified.
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import platform
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from generate_from_config import generate_and_save_graph, scale_config
+from nx_graph import NxGraph
+from progress import LOG_LEVELS, configure_logging
+from proto_graph import ProtoGraph
+from proto_to_nx import convert_proto_to_nx_graph
+from random_streams import RandomStreams
+from stage_report import StageReport
+
+# Benchmark cases in the order they run, read and conversion cases use the graphs saved by the generation cases.
+BENCHMARK_CASES = ("proto", "networkx", "proto_read", "networkx_read", "proto_to_nx")
+
+# Files the graphs of a scale are saved to, in its benchmark directory.
+GRAPH_FILES = {"proto": "graph.bin", "networkx": "graph.graphml", "proto_to_nx": "converted.graphml"}
+
+# Cases that need the graph of another case.
+REQUIRED_CASES = {"proto_read": "proto", "networkx_read": "networkx", "proto_to_nx": "proto"}
+
+DEFAULT_SCALES = (0.02, 0.1, 0.3)
+DEFAULT_TOLERANCE = 0.5
+DEFAULT_MAX_EXPONENT = 1.5
+
+# Differences smaller than these are timer and allocator noise.
+MIN_SECONDS = 0.05
+MIN_BYTES = 32 * 1024 * 1024
+
+
+def get_scaled_config(config, scale, seed):
+    """Scales config the same way generate_from_config.py does, with a stream of the seed."""
+    if scale == 1:
+        return config
+    return scale_config(config, scale, RandomStreams(seed).generator("scale"))
+
+
+def run_case(case, config, directory, seed):
+    """
+    Runs a benchmark case and saves its graph to the directory.
+
+    Returns:
+        List of stage dictionaries of StageReport.to_dict().
+    """
+    report = StageReport()
+    if case in ("proto", "networkx"):
+        generate_and_save_graph(config, case, os.path.join(directory, GRAPH_FILES[case]), seed=seed, overwrite=True,
+                                report=report)
+    elif case in ("proto_read", "networkx_read"):
+        graph = ProtoGraph() if case == "proto_read" else NxGraph()
+        with report.stage("read"):
+            graph.read_from_file(os.path.join(directory, GRAPH_FILES[REQUIRED_CASES[case]]))
+    elif case == "proto_to_nx":
+        proto_graph = ProtoGraph()
+        proto_graph.read_from_file(os.path.join(directory, GRAPH_FILES["proto"]))
+        convert_proto_to_nx_graph(proto_graph, NxGraph(), os.path.join(directory, GRAPH_FILES[case]), True,
+                                  report=report)
+    else:
+        raise ValueError(f"Unknown benchmark case {case}, should be one of {', '.join(BENCHMARK_CASES)}.")
+    return report.to_dict()["stages"]
+
+
+def get_machine():
+    """Returns a description of the machine, saved with results because baselines depend on it."""
+    return {"platform": platform.platform(), "python": platform.python_version(), "cpu_count": os.cpu_count()}
+
+
+def run_benchmarks(config, scales=DEFAULT_SCALES, cases=BENCHMARK_CASES, seed=42, repeat=1):
+    """
+    Runs benchmark cases on config scaled by every scale, every run in a fresh process.
+
+    Returns:
+        Dictionary of results with benchmarks <case>/<stage> -> scale -> measurements.
+    """
+    for case in cases:
+        if case not in BENCHMARK_CASES:
+            raise ValueError(f"Unknown benchmark case {case}, should be one of {', '.join(BENCHMARK_CASES)}.")
+        if case in REQUIRED_CASES and REQUIRED_CASES[case] not in cases:
+            raise ValueError(f"Benchmark case {case} needs case {REQUIRED_CASES[case]}.")
+    cases = [case for case in BENCHMARK_CASES if case in cases]
+
+    benchmarks = {}
+    for scale in scales:
+        scaled_config = get_scaled_config(config, scale, seed)
+        with tempfile.TemporaryDirectory() as directory:
+            for case in cases:
+                for _ in range(repeat):
+                    # A fresh process, so peak RSS and caches don't depend on the cases run before.
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        stages = executor.submit(run_case, case, scaled_config, directory, seed).result()
+                    for stage in stages:
+                        measurements = benchmarks.setdefault(f"{case}/{stage['name']}", {}).setdefault(
+                            str(scale), {"wall_seconds": math.inf, "cpu_seconds": math.inf, "peak_rss_bytes": None})
+                        measurements["wall_seconds"] = min(measurements["wall_seconds"], stage["wall_seconds"])
+                        measurements["cpu_seconds"] = min(measurements["cpu_seconds"], stage["cpu_seconds"])
+                        peaks = [peak for peak in (measurements["peak_rss_bytes"], stage["peak_rss_bytes"])
+                                 if peak is not None]
+                        measurements["peak_rss_bytes"] = max(peaks) if peaks else None
+                logging.info(f"Benchmarked case {case} at scale {scale}.")
+    return {"seed": seed, "scales": list(scales), "repeat": repeat, "machine": get_machine(),
+            "benchmarks": benchmarks}
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE, min_seconds=MIN_SECONDS, min_bytes=MIN_BYTES):
+    """
+    Compares time and peak RSS of every benchmark and scale with the baseline.
+
+    Returns:
+        List of regression messages.
+    """
+    regressions = []
+    for name, scales in results["benchmarks"].items():
+        for scale, measurements in scales.items():
+            base = baseline["benchmarks"].get(name, {}).get(scale)
+            if base is None:
+                continue
+            for key, min_difference in [("wall_seconds", min_seconds), ("peak_rss_bytes", min_bytes)]:
+                value, base_value = measurements.get(key), base.get(key)
+                if value is None or base_value is None:
+                    continue
+                if value > base_value * (1 + tolerance) and value - base_value > min_difference:
+                    regressions.append(f"{name} at scale {scale}: {key} {value} is {value / max(base_value, 1e-9):.2f} "
+                                       f"times the baseline {base_value}.")
+    return regressions
+
+
+def check_scaling(results, max_exponent=DEFAULT_MAX_EXPONENT, min_seconds=MIN_SECONDS):
+    """
+    Checks that time of every benchmark grows at most as scale^max_exponent, between the smallest and the largest
+    scale at which it takes at least min_seconds.
+
+    Returns:
+        List of regression messages.
+    """
+    regressions = []
+    for name, scales in results["benchmarks"].items():
+        measured = sorted((float(scale), measurements["wall_seconds"]) for scale, measurements in scales.items()
+                          if measurements["wall_seconds"] >= min_seconds)
+        if len(measured) < 2:
+            continue
+        (small_scale, small_seconds), (large_scale, large_seconds) = measured[0], measured[-1]
+        exponent = math.log(large_seconds / small_seconds) / math.log(large_scale / small_scale)
+        if exponent > max_exponent:
+            regressions.append(f"{name}: time grows as scale^{exponent:.2f} from scale {small_scale} "
+                               f"({small_seconds} s) to {large_scale} ({large_seconds} s).")
+    return regressions
+
+
+def format_results(results):
+    """Returns a table of wall seconds of every benchmark at every scale."""
+    scales = [str(scale) for scale in results["scales"]]
+    width = max([len(name) for name in results["benchmarks"]] + [len("benchmark")])
+    lines = [f"{'benchmark':<{width}} " + " ".join(f"{scale:>10}" for scale in scales)]
+    for name, measurements in results["benchmarks"].items():
+        seconds = (measurements.get(scale, {}).get("wall_seconds") for scale in scales)
+        lines.append(f"{name:<{width}} " + " ".join(f"{value:>10.3f}" if value is not None else f"{'-':>10}"
+                                                    for value in seconds))
+    return "\n".join(lines)
+
+
+def parse_args():
+    """Parses input arguments."""
+    parser = argparse.ArgumentParser(description='Benchmark graph generation stages at several config scales.')
+    parser.add_argument('-c', '--config_file', help='Path to yaml config file the benchmark configs are scaled from.',
+                        required=True)
+    parser.add_argument('--scales', help='Scale factors of the config.', type=float, nargs='+',
+                        default=list(DEFAULT_SCALES))
+    parser.add_argument('--cases', help='Benchmark cases to run.', nargs='+', choices=BENCHMARK_CASES,
+                        default=list(BENCHMARK_CASES))
+    parser.add_argument('-s', '--seed', help='Random seed of the benchmark graphs.', type=int, default=42)
+    parser.add_argument('--repeat', help='Number of runs of every case, the fastest is kept.', type=int, default=1)
+    parser.add_argument('-f', '--output_file', help='Path to JSON results.', default=None)
+    parser.add_argument('-b', '--baseline_file', help='Path to JSON baseline to compare the results with.',
+                        default=None)
+    parser.add_argument('--save_baseline', help='Save the results to --baseline_file instead of comparing.',
+                        type=bool, default=False)
+    parser.add_argument('--tolerance', help='Allowed relative increase of time and memory.', type=float,
+                        default=DEFAULT_TOLERANCE)
+    parser.add_argument('--max_exponent', help='Allowed growth of time with scale.', type=float,
+                        default=DEFAULT_MAX_EXPONENT)
+    parser.add_argument('--log_level', '--log-level', help='Logging level.', default="INFO",
+                        choices=LOG_LEVELS, type=str.upper)
+    args = parser.parse_args()
+    if any(scale <= 0 for scale in args.scales):
+        parser.error("--scales should be positive numbers.")
+    if args.repeat < 1:
+        parser.error("--repeat should be a positive integer.")
+    if args.save_baseline and args.baseline_file is None:
+        parser.error("--baseline_file is required with --save_baseline.")
+    for case, required_case in REQUIRED_CASES.items():
+        if case in args.cases and required_case not in args.cases:
+            parser.error(f"Benchmark case {case} needs case {required_case}.")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    configure_logging(args.log_level)
+    with open(args.config_file, 'r') as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+
+    results = run_benchmarks(config, scales=args.scales, cases=args.cases, seed=args.seed, repeat=args.repeat)
+    logging.info(f"Benchmark results, wall seconds:\n{format_results(results)}")
+    if args.output_file is not None:
+        with open(args.output_file, "w") as f:
+            json.dump(results, f, indent=2)
+        logging.info(f"Benchmark results saved to {args.output_file}.")
+
+    regressions = check_scaling(results, max_exponent=args.max_exponent)
+    if args.save_baseline:
+        with open(args.baseline_file, "w") as f:
+            json.dump(results, f, indent=2)
+        logging.info(f"Baseline saved to {args.baseline_file}.")
+    elif args.baseline_file is not None:
+        with open(args.baseline_file) as f:
+            baseline = json.load(f)
+        if baseline["machine"] != results["machine"]:
+            logging.warning(f"Baseline was saved on another machine ({baseline['machine']}), times may differ.")
+        if (baseline["seed"], baseline["scales"]) != (results["seed"], results["scales"]):
+            logging.warning("Baseline was saved with another seed or scales, only common scales are compared.")
+        regressions += compare_results(results, baseline, tolerance=args.tolerance)
+
+    for regression in regressions:
+        logging.error(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    logging.info("No performance regressions.")
@@ -0,0 +1,243 @@
+"""
+This module compares graph backends (see graph_backends.py) on one generated proto graph.
+
+For every backend, the graph is built from the proto graph and saved in one fresh process, then loaded and queried in
+another, so the memory of a loaded graph doesn't include the memory of the build. Measured:
+    build_seconds, build_peak_rss_bytes - time and peak RSS of building the graph of the backend.
+    save_seconds, size_bytes - time of saving the graph and size of the saved file (or directory).
+    load_seconds, loaded_rss_bytes - time of loading the graph and RSS it takes when loaded.
+    query_microseconds - mean latency of every traversal query of QUERIES, on the same sample of nodes.
+    query_results - total number of nodes found by every query, the same for all backends if they hold the same graph.
+
+Queries (edges go in the direction of containment and data flow):
+    node_lookup - attributes of a dataset.
+    readers - systems that read a dataset.
+    writers - systems that write a dataset.
+    downstream - datasets written by the systems that read a dataset.
+    lineage - datasets downstream of a dataset, up to LINEAGE_DEPTH generations.
+    collection_datasets - datasets of a collection.
+
+Backends that need packages which are not installed are skipped.
+
+Usage:
+    python3 graph_generation/compare_backends.py \
+         --proto_file "graph.bin" \
+         --backends proto networkx igraph neo4j_csv \
+         --sample_size 1000 \
+         --seed 0 \
+         --output_dir "backends" \
+         --output_file "backends.json"
+
+    Parameters info:
+        proto_file is a graph generated by generate_from_config.py with graph_type proto.
+        backends are compared backends, all backends of graph_backends.BACKENDS if not specified.
+        sample_size is the number of datasets (and at most of collections) queried, 1000 if not specified.
+        output_dir keeps the saved graphs of all backends, they are saved to a temporary directory if not specified.
+        output_file saves the results as JSON.
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from graph_backends import BACKENDS, get_node_type
+from progress import LOG_LEVELS, configure_logging
+from proto_graph import ProtoGraph
+from stage_report import StageReport, get_rss
+
+# Number of dataset generations of the lineage query.
+LINEAGE_DEPTH = 3
+
+
+def get_readers(view, dataset):
+    """Returns systems that read a dataset, dataset -> processing -> system."""
+    return [system for processing in view.get_successors(dataset) for system in view.get_successors(processing)]
+
+
+def get_writers(view, dataset):
+    """Returns systems that write a dataset, system -> processing -> dataset."""
+    return [system for processing in view.get_predecessors(dataset) if get_node_type(processing) == "processing"
+            for system in view.get_predecessors(processing)]
+
+
+def get_downstream(view, dataset):
+    """Returns datasets written by the systems that read a dataset."""
+    return [written for system in get_readers(view, dataset) for processing in view.get_successors(system)
+            if get_node_type(processing) == "processing" for written in view.get_successors(processing)]
+
+
+def get_lineage(view, dataset, depth=LINEAGE_DEPTH):
+    """Returns datasets downstream of a dataset, up to depth generations."""
+    found, frontier = set(), [dataset]
+    for _ in range(depth):
+        frontier = [written for current in frontier for written in set(get_downstream(view, current))
+                    if written not in found]
+        found.update(frontier)
+    return found
+
+
+def get_collection_datasets(view, collection):
+    """Returns datasets of a collection, collection -> dataset collection -> dataset."""
+    return [dataset for dataset_collection in view.get_successors(collection)
+            if get_node_type(dataset_collection) == "dataset_collection"
+            for dataset in view.get_successors(dataset_collection) if get_node_type(dataset) == "dataset"]
+
+
+# Query name -> (kind of queried nodes, function of a view and a node that returns found nodes).
+QUERIES = {
+    "node_lookup": ("datasets", lambda view, dataset: [view.get_node(dataset)]),
+    "readers": ("datasets", get_readers),
+    "writers": ("datasets", get_writers),
+    "downstream": ("datasets", get_downstream),
+    "lineage": ("datasets", get_lineage),
+    "collection_datasets": ("collections", get_collection_datasets)
+}
+
+
+def get_query_nodes(proto_graph, sample_size, seed):
+    """Returns the same random sample of dataset and collection keys for all backends."""
+    rng = np.random.default_rng(seed)
+    nodes = {}
+    for kind, field, id_field in [("datasets", "datasets", "dataset_id"),
+                                  ("collections", "collections", "collection_id")]:
+        ids = [getattr(message, id_field) for message in getattr(proto_graph.graph, field)]
+        sample = rng.choice(len(ids), size=min(sample_size, len(ids)), replace=False)
+        nodes[kind] = [f"{kind[:-1]}_{ids[index]}" for index in sample]
+    return nodes
+
+
+def build_and_save(backend_name, proto_file, filename):
+    """Builds the graph of a backend from a proto file and saves it. Returns the measurements."""
+    proto_graph = ProtoGraph()
+    proto_graph.read_from_file(proto_file)
+    backend = BACKENDS[backend_name]()
+    report = StageReport()
+    with report.stage("build"):
+        graph = backend.build(proto_graph)
+    with report.stage("save"):
+        backend.save(graph, filename)
+    return {"build_seconds": report.stages["build"]["wall_seconds"],
+            "build_peak_rss_bytes": report.stages["build"]["peak_rss_bytes"],
+            "save_seconds": report.stages["save"]["wall_seconds"],
+            "size_bytes": backend.get_size(filename)}
+
+
+def load_and_query(backend_name, filename, query_nodes):
+    """Loads the graph of a backend and runs all queries on the query nodes. Returns the measurements."""
+    backend = BACKENDS[backend_name]()
+    rss = get_rss()
+    start = time.perf_counter()
+    view = backend.load(filename)
+    results = {"load_seconds": time.perf_counter() - start,
+               "loaded_rss_bytes": get_rss() - rss if rss is not None else None,
+               "query_microseconds": {},
+               "query_results": {}}
+    for name, (kind, query) in QUERIES.items():
+        nodes = query_nodes[kind]
+        start = time.perf_counter()
+        found = sum(len(query(view, node)) for node in nodes)
+        results["query_microseconds"][name] = (time.perf_counter() - start) / max(len(nodes), 1) * 10 ** 6
+        results["query_results"][name] = found
+    return results
+
+
+def compare_backends(proto_file, output_dir, backend_names=None, sample_size=1000, seed=0):
+    """
+    Builds, saves, loads and queries the graph of a proto file with every backend, every step in a fresh process.
+
+    Returns:
+        Dictionary of backend name -> measurements.
+    """
+    backend_names = backend_names if backend_names is not None else list(BACKENDS)
+    for backend_name in backend_names:
+        if backend_name not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend_name}, should be one of {', '.join(BACKENDS)}.")
+    proto_graph = ProtoGraph()
+    proto_graph.read_from_file(proto_file)
+    query_nodes = get_query_nodes(proto_graph, sample_size, seed)
+    del proto_graph
+
+    results = {}
+    for backend_name in backend_names:
+        backend = BACKENDS[backend_name]
+        if not backend.is_available():
+            logging.warning(f"Backend {backend_name} is not available, its package is not installed.")
+            continue
+        filename = os.path.join(output_dir, f"graph{backend.extension}")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[backend_name] = executor.submit(build_and_save, backend_name, proto_file, filename).result()
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            results[backend_name].update(executor.submit(load_and_query, backend_name, filename, query_nodes).result())
+        logging.info(f"Compared backend {backend_name}.")
+
+    found = {json.dumps(measurements["query_results"], sort_keys=True) for measurements in results.values()}
+    if len(found) > 1:
+        logging.warning("Backends found different nodes with the same queries, their graphs are not the same.")
+    return results
+
+
+def format_table(results):
+    """Returns a comparison table of backends, one row per backend."""
+    columns = [("backend", None), ("build s", "build_seconds"), ("build MB", "build_peak_rss_bytes"),
+               ("save s", "save_seconds"), ("size MB", "size_bytes"), ("load s", "load_seconds"),
+               ("loaded MB", "loaded_rss_bytes")] + [(f"{name} us", name) for name in QUERIES]
+    rows = []
+    for backend_name, measurements in results.items():
+        row = [backend_name]
+        for _, key in columns[1:]:
+            value = measurements.get(key, measurements["query_microseconds"].get(key))
+            if value is None:
+                row.append("-")
+            elif key.endswith("_bytes"):
+                row.append(f"{value / 2 ** 20:.1f}")
+            elif key.endswith("_seconds"):
+                row.append(f"{value:.3f}")
+            else:
+                row.append(f"{value:.1f}")
+        rows.append(row)
+    widths = [max(len(str(row[i])) for row in rows + [[title for title, _ in columns]])
+              for i in range(len(columns))]
+    lines = [" ".join(f"{title:>{width}}" for (title, _), width in zip(columns, widths))]
+    lines += [" ".join(f"{value:>{width}}" for value, width in zip(row, widths)) for row in rows]
+    return "\n".join(lines)
+
+
+def parse_args():
+    """Parses input arguments."""
+    parser = argparse.ArgumentParser(description='Compare graph backends on a generated proto graph.')
+    parser.add_argument('-p', '--proto_file', help='Path to an input proto binary.', required=True)
+    parser.add_argument('-b', '--backends', help='Compared backends.', nargs='+', choices=list(BACKENDS),
+                        default=list(BACKENDS))
+    parser.add_argument('--sample_size', help='Number of queried datasets.', type=int, default=1000)
+    parser.add_argument('-s', '--seed', help='Random seed of the queried sample.', type=int, default=0)
+    parser.add_argument('-d', '--output_dir', help='Directory of the saved graphs of the backends.', default=None)
+    parser.add_argument('-f', '--output_file', help='Path to JSON results.', default=None)
+    parser.add_argument('--log_level', '--log-level', help='Logging level.', default="INFO",
+                        choices=LOG_LEVELS, type=str.upper)
+    args = parser.parse_args()
+    if args.sample_size < 1:
+        parser.error("--sample_size should be a positive integer.")
+    return args
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    configure_logging(args.log_level)
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+        results = compare_backends(args.proto_file, args.output_dir, args.backends, args.sample_size, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            results = compare_backends(args.proto_file, directory, args.backends, args.sample_size, args.seed)
+
+    logging.info(f"Backend comparison:\n{format_table(results)}")
+    if args.output_file is not None:
+        with open(args.output_file, "w") as f:
+            json.dump(results, f, indent=2)
+        logging.info(f"Backend comparison saved to {args.output_file}.")
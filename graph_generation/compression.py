@@ -0,0 +1,80 @@
+"""
+This module implements transparent streaming compression of graph files, chosen by the file extension:
+    .gz - gzip, with the gzip module.
+    .zst - zstd, with the optional zstandard package. Compression runs in COMPRESSION_THREADS threads.
+Files with other extensions are read and written uncompressed.
+
+open_file() returns a file object that compresses what is written to it and decompresses what is read from it,
+chunk by chunk, so a graph is never held in memory both compressed and uncompressed. Compressed files can only be
+read sequentially, so they can't be memory-mapped.
+
+Usage:
+    with open_file("graph.bin.zst", "wb") as f:
+        f.write(data)
+    with open_file("graph.graphml.gz", "r") as f:
+        text = f.read()
+"""
+
+import gzip
+import io
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compressions of file extensions.
+COMPRESSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd"
+}
+
+# Compression levels, zstd level 3 is its default and gzip level 6 is the default of the gzip command.
+COMPRESSION_LEVELS = {
+    "gzip": 6,
+    "zstd": 3
+}
+
+# Number of zstd compression threads, -1 uses one thread per CPU.
+COMPRESSION_THREADS = -1
+
+
+def get_compression(filename):
+    """Returns compression of a file from its extension, or None for uncompressed files."""
+    return COMPRESSIONS.get(os.path.splitext(filename)[1].lower())
+
+
+def split_compression(filename):
+    """Splits a file name into the name without its compression extension and the compression extension, or ''."""
+    root, extension = os.path.splitext(filename)
+    return (root, extension) if extension.lower() in COMPRESSIONS else (filename, "")
+
+
+def open_file(filename, mode="rb", threads=COMPRESSION_THREADS):
+    """
+    Opens a file, compressed or decompressed on the fly if its extension is one of COMPRESSIONS.
+    Mode is one of rb, wb, r, w, text modes use utf-8.
+
+    Raises:
+        ValueError: Incorrect mode or zstandard package is not installed for a .zst file.
+    """
+    if mode not in ("rb", "wb", "r", "w"):
+        raise ValueError(f"Incorrect mode {mode}, should be one of rb, wb, r, w.")
+    binary_mode = mode[0] + "b"
+    compression = get_compression(filename)
+    if compression is None:
+        return open(filename, mode) if mode.endswith("b") else open(filename, mode, encoding="utf-8")
+
+    if compression == "gzip":
+        f = gzip.open(filename, binary_mode, compresslevel=COMPRESSION_LEVELS["gzip"])
+    else:
+        if zstandard is None:
+            raise ValueError(f"zstandard package is required to open {filename}, install it or use .gz files.")
+        raw = open(filename, binary_mode)
+        if binary_mode == "wb":
+            compressor = zstandard.ZstdCompressor(level=COMPRESSION_LEVELS["zstd"], threads=threads)
+            f = compressor.stream_writer(raw, closefd=True)
+        else:
+            f = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return f if mode.endswith("b") else io.TextIOWrapper(f, encoding="utf-8")
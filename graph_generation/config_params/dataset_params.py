@@ -1,4 +1,5 @@
 class DatasetParams:
-    def __init__(self, dataset_count, dataset_env_count_map):
+    def __init__(self, dataset_count, dataset_env_count_map, dataset_slo_range=None):
         self.dataset_count = dataset_count
         self.dataset_env_count_map = dataset_env_count_map
+        self.dataset_slo_range = dataset_slo_range
@@ -8,11 +8,61 @@ Method generate() will create all the necessary connections for the graph:
     system collection <-> collection
     dataset read <-> system input
     dataset write <-> system output
+
+All connections are kept in a ConnectionStore, one CSR relation per connection type (see RELATIONS).
+Relations are independent, so with workers > 1 they are generated in a process pool. Every relation uses its own
+random stream spawned from the generator seed, so the output doesn't depend on the number of workers.
+
+Connections are generated by one of two engines:
+    vectorized - NumPy implementation. One-to-many connections are returned as CSR (offsets, members) arrays.
+                 Many-to-many connections use a configuration model: both degree sequences are expanded into stub
+                 arrays, which are permuted and paired in bulk. Duplicate pairs are repaired in vectorized rounds.
+    reference - the original pure Python implementation, kept to compare output distributions.
+
+Method iter_chunks() yields connections in chunks of NumPy arrays. With one worker relations are generated lazily
+one at a time, so only the relation being consumed is kept in memory.
+
+Function iter_connections() iterates (group id, element id) pairs of connections in any of these formats.
 """
 
-from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 import random
 
+import numpy as np
+
+from connection_store import ConnectionStore, Relation
+from random_streams import as_seed_sequence, child_sequence, python_random
+from stage_report import StageReport, call_measured
+
+ENGINES = ("vectorized", "reference")
+
+# Names of relations in ConnectionGenerator.connections. Relation maps the first id to the second ids.
+RELATIONS = (
+    "dataset_collections_conn_collection",  # collection id -> dataset collection ids
+    "system_collections_conn_collection",  # collection id -> system collection ids
+    "datasets_conn_collection",  # dataset collection id -> dataset ids
+    "systems_conn_collection",  # system collection id -> system ids
+    "dataset_read_conn_systems",  # dataset read id -> system ids this dataset inputs to
+    "dataset_write_conn_systems"  # dataset write id -> system ids this dataset outputs from
+)
+
+
+def iter_connections(connections):
+    """Iterates (group id, element id) pairs of connections.
+
+    Args:
+        connections: Dictionary that maps group id to element ids, or a CSR (offsets, members) tuple, where elements
+                     of group with id i + 1 are members[offsets[i]:offsets[i + 1]].
+    """
+    if isinstance(connections, dict):
+        for group_id in connections:
+            for element_id in connections[group_id]:
+                yield group_id, element_id
+    else:
+        offsets, members = connections
+        group_ids = np.repeat(np.arange(1, len(offsets), dtype=np.int64), np.diff(offsets))
+        yield from zip(group_ids.tolist(), members.tolist())
+
 
 class ConnectionGenerator:
     """
@@ -37,20 +87,25 @@ class ConnectionGenerator:
                                  dataset writes.
         system_output_count_map: Dictionary int:int that maps number of dataset writes by system output to count of
                                  system outputs.
-        dataset_collections_conn_collection: Dictionary int:[int] that maps collection id to dataset collection ids.
-        system_collections_conn_collection: Dictionary int:[int] that maps collection id to system collection ids.
-        datasets_conn_collection: Dictionary int:[int] that maps dataset collection id to dataset ids.
-        systems_conn_collection: Dictionary int:[int] that maps system collection id to system ids.
-        dataset_read_conn_systems: Dictionary int:[int] that maps dataset read id to system ids this dataset inputs to.
-        dataset_write_conn_systems: Dictionary int:[int] that maps dataset write id to system ids this dataset outputs from.
+        connections: ConnectionStore with a relation for each name in RELATIONS.
+        workers: Integer, number of processes used to generate relations.
+        seed_sequence: numpy SeedSequence, relation random streams are spawned from it.
+        engine: String, one of ENGINES. Engine used for many-to-many connections.
+        report: StageReport, generation of every relation is measured as stage connections.<relation name>.
 
     Methods:
         get_one_to_many_connections()
             Creates connections between an element and a group. Each element belongs to one group exactly.
 
+        get_one_to_many_offsets()
+            Vectorized get_one_to_many_connections(), that returns connections as CSR (offsets, members) arrays.
+
         get_many_to_many_connections()
             Creates connections between two groups with many to many relationship.
 
+        match_stubs()
+            Pairs element stubs of two degree sequences at random and repairs duplicate pairs.
+
         _dataset_to_dataset_collection()
             Generates dataset - dataset collection connections.
 
@@ -65,15 +120,35 @@ class ConnectionGenerator:
 
         generate()
             Generates all the needed connections for data dependency mapping graph.
+
+        iter_chunks(chunk_size=None)
+            Yields (relation name, source ids, target ids) chunks of all connections in RELATIONS order.
     """
-    def __init__(self, dataset_params, system_params, dataset_to_system_params, collection_params):
+    def __init__(self, dataset_params, system_params, dataset_to_system_params, collection_params,
+                 engine="vectorized", workers=1, seed=None, report=None):
         """
         Args:
              dataset_params: DatasetParams object.
              system_params: SystemParams object.
              dataset_to_system_params: DatasetToSystemParams object.
              collection_params: CollectionParams object.
+             engine: String, one of ENGINES. Engine used for many-to-many connections.
+             workers: Integer, number of processes used to generate relations.
+             seed: Integer seed or numpy SeedSequence of the relation random streams, or None for fresh entropy.
+             report: StageReport to add relation stages to, a new one if None.
+
+        Raises:
+            ValueError: Unknown connection engine or incorrect number of workers.
         """
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown connection engine {engine}. Use one of {ENGINES}.")
+        if workers < 1:
+            raise ValueError("Number of workers should be at least 1.")
+        self.engine = engine
+        self.workers = workers
+        self.seed_sequence = as_seed_sequence(seed)
+        self.report = report if report is not None else StageReport()
+
         self.dataset_count = dataset_params.dataset_count
         self.dataset_count_map = collection_params.dataset_count_map
         self.dataset_collection_count = collection_params.dataset_collection_count
@@ -93,20 +168,16 @@ class ConnectionGenerator:
         self.dataset_write_count_map = dataset_to_system_params.dataset_write_count_map
         self.system_output_count_map = dataset_to_system_params.system_output_count_map
 
-        self.dataset_collections_conn_collection = {}
-        self.system_collections_conn_collection = {}
-        self.datasets_conn_collection = {}
-        self.systems_conn_collection = {}
-        self.dataset_read_conn_systems = {}
-        self.dataset_write_conn_systems = {}
+        self.connections = ConnectionStore()
 
     @staticmethod
-    def get_one_to_many_connections(element_count, element_count_map):
+    def get_one_to_many_connections(element_count, element_count_map, rng=None):
         """Generate group id for each element, based on number of element in group distribution.
 
         Args:
             element_count: Total number of elements.
             element_count_map: Dictionary int:int that maps element count in a group to number of groups with that count.
+            rng: random.Random used for sampling. Global random module if None.
 
         Returns:
             Dictionary int:[int] that maps group id to a list of element ids.
@@ -119,8 +190,9 @@ class ConnectionGenerator:
         elements_per_group = [i for i in element_count_map for _ in range(element_count_map[i])]
 
         # Randomise element ids and group ids.
-        random.shuffle(element_values)
-        random.shuffle(elements_per_group)
+        rng = rng if rng is not None else random
+        rng.shuffle(element_values)
+        rng.shuffle(elements_per_group)
 
         # Split element ids into chunks to get connections for each group.
         group_to_elements = {}
@@ -137,7 +209,96 @@ class ConnectionGenerator:
         return group_to_elements
 
     @staticmethod
-    def get_many_to_many_connections(element_1_count, element_2_count, element_1_count_map, element_2_count_map):
+    def get_one_to_many_offsets(element_count, element_count_map, rng=None):
+        """Generates group for each element as get_one_to_many_connections() does, but with NumPy arrays.
+        Group sizes are expanded with np.repeat, and a permutation of element ids is split by np.cumsum offsets.
+
+        Args:
+            element_count: Total number of elements.
+            element_count_map: Dictionary int:int that maps element count in a group to number of groups with that count.
+            rng: numpy.random.Generator used for sampling. New unseeded generator if None.
+
+        Returns:
+            Tuple (offsets, members) of int64 arrays. Elements of group with id i + 1 are
+            members[offsets[i]:offsets[i + 1]]. Offsets are [0] and members are empty if there are no groups.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        # Without groups there is no last group to assign the rest of elements to.
+        if sum(element_count_map.values()) == 0:
+            return np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Get number of elements for each group id from their count, randomise element ids and group ids.
+        group_sizes = np.repeat(np.fromiter(element_count_map.keys(), dtype=np.int64),
+                                np.fromiter(element_count_map.values(), dtype=np.int64))
+        group_sizes = rng.permutation(group_sizes)
+        members = rng.permutation(np.arange(1, element_count + 1, dtype=np.int64))
+
+        # Split element ids into chunks to get connections for each group.
+        offsets = np.zeros(len(group_sizes) + 1, dtype=np.int64)
+        np.cumsum(group_sizes, out=offsets[1:])
+        np.minimum(offsets, element_count, out=offsets)
+
+        # In case we don't have a full config - assign rest of elements to a last group.
+        offsets[-1] = element_count
+        return offsets, members
+
+    @staticmethod
+    def _get_group_sizes(element_count_map):
+        """Expands count map into an array of group sizes in map order. Groups without elements are skipped."""
+        sizes = np.fromiter((i for i in element_count_map if i > 0), dtype=np.int64)
+        counts = np.fromiter((element_count_map[i] for i in element_count_map if i > 0), dtype=np.int64)
+        return np.repeat(sizes, counts)
+
+    @staticmethod
+    def match_stubs(element_1_degrees, element_2_degrees, rng=None, max_repair_rounds=100):
+        """Pairs element stubs at random (configuration model) and repairs duplicate pairs in vectorized rounds.
+
+        Element with id i + 1 has element_*_degrees[i] stubs. If one side has more stubs than the other, a random
+        subset of its stubs is used. Each repair round shuffles element 2 stubs of all duplicate pairs together with
+        the same number of random pairs, which keeps the degrees unchanged. Duplicates left after the last round
+        are dropped.
+
+        Args:
+            element_1_degrees: Integer array of connection counts of elements of type 1.
+            element_2_degrees: Integer array of connection counts of elements of type 2.
+            rng: numpy.random.Generator used for sampling. New unseeded generator if None.
+            max_repair_rounds: Maximum number of duplicate repair rounds.
+
+        Returns:
+            Tuple of two int64 arrays with element 1 ids and element 2 ids, one entry per connection.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        element_1_degrees = np.asarray(element_1_degrees, dtype=np.int64)
+        element_2_degrees = np.asarray(element_2_degrees, dtype=np.int64)
+
+        # Expand degree sequences into stubs and pair random permutations of them.
+        stubs_1 = np.repeat(np.arange(1, len(element_1_degrees) + 1, dtype=np.int64), element_1_degrees)
+        stubs_2 = np.repeat(np.arange(1, len(element_2_degrees) + 1, dtype=np.int64), element_2_degrees)
+        stub_count = min(len(stubs_1), len(stubs_2))
+        stubs_1 = rng.permutation(stubs_1)[:stub_count]
+        stubs_2 = rng.permutation(stubs_2)[:stub_count]
+
+        key_width = len(element_2_degrees) + 1
+        is_first = np.ones(stub_count, dtype=bool)
+        for repair_round in range(max_repair_rounds + 1):
+            # Find pairs that already appeared earlier in the arrays.
+            _, first_index = np.unique(stubs_1 * key_width + stubs_2, return_index=True)
+            is_first[:] = False
+            is_first[first_index] = True
+            duplicates = np.flatnonzero(~is_first)
+            if len(duplicates) == 0 or repair_round == max_repair_rounds:
+                break
+
+            # Reshuffle element 2 stubs of duplicates together with random pairs.
+            partners = rng.choice(stub_count, size=min(len(duplicates), stub_count), replace=False)
+            positions = np.union1d(duplicates, partners)
+            stubs_2[positions] = rng.permutation(stubs_2[positions])
+
+        return stubs_1[is_first], stubs_2[is_first]
+
+    @staticmethod
+    def get_many_to_many_connections(element_1_count, element_2_count, element_1_count_map, element_2_count_map,
+                                     engine="vectorized", rng=None):
         """Generates random connections between elements of type 1 and type 2 that have many-to-many relationship.
         Generation is based on element count maps. The output distribution is expected to be exact for most counts,
         except for large element group outliers.
@@ -147,10 +308,51 @@ class ConnectionGenerator:
             element_2_count: Total number of elements of type 2.
             element_1_count_map: Dictionary int:int that maps element 1 count in element 2 group to number of elements 2.
             element_2_count_map: Dictionary int:int that maps element 2 count in element 1 group to number of elements 1.
+            engine: String, one of ENGINES.
+            rng: numpy.random.Generator for the vectorized engine, random.Random for the reference engine.
+                 New unseeded generator or global random module if None.
+
+        Returns:
+            Dictionary that maps group 1 id to a set of group 2 ids.
+
+        Raises:
+            ValueError: Unknown connection engine.
+        """
+        if engine == "reference":
+            return ConnectionGenerator._get_many_to_many_connections_reference(element_1_count, element_2_count,
+                                                                              element_1_count_map, element_2_count_map,
+                                                                              rng=rng)
+        elif engine != "vectorized":
+            raise ValueError(f"Unknown connection engine {engine}. Use one of {ENGINES}.")
+
+        element_1_degrees = ConnectionGenerator._get_group_sizes(element_1_count_map)
+        element_2_degrees = ConnectionGenerator._get_group_sizes(element_2_count_map)
+        element_1_ids, element_2_ids = ConnectionGenerator.match_stubs(element_1_degrees, element_2_degrees, rng=rng)
+
+        # Create connection dictionary.
+        element_1_conn_element_2 = {i: set() for i in range(1, len(element_1_degrees) + 1)}
+        for element_1, element_2 in zip(element_1_ids.tolist(), element_2_ids.tolist()):
+            element_1_conn_element_2[element_1].add(element_2)
+        return element_1_conn_element_2
+
+    @staticmethod
+    def _get_many_to_many_connections_reference(element_1_count, element_2_count, element_1_count_map, element_2_count_map,
+                                                rng=None):
+        """Reference engine for get_many_to_many_connections. Picks random pairs and rejects existing ones.
+        The output distribution is expected to be exact for most counts, except for large element group outliers.
+
+        Args:
+            element_1_count: Total number of elements of type 1.
+            element_2_count: Total number of elements of type 2.
+            element_1_count_map: Dictionary int:int that maps element 1 count in element 2 group to number of elements 2.
+            element_2_count_map: Dictionary int:int that maps element 2 count in element 1 group to number of elements 1.
+            rng: random.Random used for sampling. Global random module if None.
 
         Returns:
             Dictionary that maps group 1 id to a list of group 2 ids.
         """
+        rng = rng if rng is not None else random
+
         # Count zeros for each group.
         element_1_zeros = element_1_count_map[0] if 0 in element_1_count_map else 0
         element_2_zeros = element_2_count_map[0] if 0 in element_2_count_map else 0
@@ -171,8 +373,8 @@ class ConnectionGenerator:
         # Loop until any group runs out of elements.
         while element_1_values and element_2_values:
             # Generate a random connection
-            element_1_gen = random.choice(element_1_values)
-            element_2_gen = random.choice(element_2_values)
+            element_1_gen = rng.choice(element_1_values)
+            element_2_gen = rng.choice(element_2_values)
 
             # Check if connection doesn't already exist.
             if not element_2_gen in element_1_conn_element_2[element_1_gen]:
@@ -193,43 +395,108 @@ class ConnectionGenerator:
 
         return element_1_conn_element_2
 
-    def _system_collection_to_collection(self):
-        """Generates collection - system collection one to many connections."""
-        self.system_collections_conn_collection = self.get_one_to_many_connections(self.system_collection_count,
-                                                                                   self.system_collection_count_map)
-
-    def _dataset_collection_to_collection(self):
+    def _get_rng(self, seed_sequence):
+        """Creates random generator of the engine from a seed sequence."""
+        if self.engine == "reference":
+            return python_random(seed_sequence)
+        return np.random.default_rng(seed_sequence)
+
+    def _get_one_to_many(self, element_count, element_count_map, seed_sequence):
+        """Generates one to many connections with the generator engine as a Relation."""
+        rng = self._get_rng(seed_sequence)
+        if self.engine == "reference":
+            return Relation.from_dict(self.get_one_to_many_connections(element_count, element_count_map, rng=rng),
+                                      target_count=element_count)
+        offsets, members = self.get_one_to_many_offsets(element_count, element_count_map, rng=rng)
+        return Relation(offsets, members, target_count=element_count)
+
+    def _get_many_to_many(self, element_1_count, element_2_count, element_1_count_map, element_2_count_map,
+                          seed_sequence):
+        """Generates many to many connections with the generator engine as a Relation."""
+        rng = self._get_rng(seed_sequence)
+        if self.engine == "reference":
+            connections = self.get_many_to_many_connections(element_1_count, element_2_count, element_1_count_map,
+                                                            element_2_count_map, engine="reference", rng=rng)
+            return Relation.from_dict(connections)
+        element_1_degrees = self._get_group_sizes(element_1_count_map)
+        element_2_degrees = self._get_group_sizes(element_2_count_map)
+        element_1_ids, element_2_ids = self.match_stubs(element_1_degrees, element_2_degrees, rng=rng)
+        return Relation.from_pairs(element_1_ids, element_2_ids, len(element_1_degrees), len(element_2_degrees))
+
+    def _dataset_collection_to_collection(self, seed_sequence):
         """Generates collection - dataset collection one to many connections."""
-        self.dataset_collections_conn_collection = self.get_one_to_many_connections(self.dataset_collection_count,
-                                                                                    self.dataset_collection_count_map)
+        return self._get_one_to_many(self.dataset_collection_count, self.dataset_collection_count_map, seed_sequence)
 
-    def _dataset_to_dataset_collection(self):
+    def _system_collection_to_collection(self, seed_sequence):
+        """Generates collection - system collection one to many connections."""
+        return self._get_one_to_many(self.system_collection_count, self.system_collection_count_map, seed_sequence)
+
+    def _dataset_to_dataset_collection(self, seed_sequence):
         """Generates dataset collection - dataset one to many connections."""
-        self.datasets_conn_collection = self.get_one_to_many_connections(self.dataset_count, self.dataset_count_map)
+        return self._get_one_to_many(self.dataset_count, self.dataset_count_map, seed_sequence)
 
-    def _system_to_system_collection(self):
+    def _system_to_system_collection(self, seed_sequence):
         """Generates system collection - system one to many connections."""
-        self.systems_conn_collection = self.get_one_to_many_connections(self.system_count, self.system_count_map)
+        return self._get_one_to_many(self.system_count, self.system_count_map, seed_sequence)
 
-    def _dataset_read_to_system_input(self):
+    def _dataset_read_to_system_input(self, seed_sequence):
         """Generates dataset reads and system inputs many to many connections."""
-        self.dataset_read_conn_systems = self.get_many_to_many_connections(self.dataset_read_count,
-                                                                           self.system_input_count,
-                                                                           self.dataset_read_count_map,
-                                                                           self.system_input_count_map)
+        return self._get_many_to_many(self.dataset_read_count, self.system_input_count,
+                                      self.dataset_read_count_map, self.system_input_count_map, seed_sequence)
 
-    def _dataset_write_to_system_output(self):
+    def _dataset_write_to_system_output(self, seed_sequence):
         """Generates dataset write and system outputs many to many connections."""
-        self.dataset_write_conn_systems = self.get_many_to_many_connections(self.dataset_write_count,
-                                                                            self.system_output_count,
-                                                                            self.dataset_write_count_map,
-                                                                            self.system_output_count_map)
+        return self._get_many_to_many(self.dataset_write_count, self.system_output_count,
+                                      self.dataset_write_count_map, self.system_output_count_map, seed_sequence)
+
+    def _get_builders(self):
+        """Returns relation builders and random streams by relation name. Every relation has its own stream."""
+        builders = {
+            "dataset_collections_conn_collection": self._dataset_collection_to_collection,
+            "system_collections_conn_collection": self._system_collection_to_collection,
+            "datasets_conn_collection": self._dataset_to_dataset_collection,
+            "systems_conn_collection": self._system_to_system_collection,
+            "dataset_read_conn_systems": self._dataset_read_to_system_input,
+            "dataset_write_conn_systems": self._dataset_write_to_system_output
+        }
+        # One random stream per relation, in RELATIONS order.
+        seed_sequences = {name: child_sequence(self.seed_sequence, i) for i, name in enumerate(RELATIONS)}
+        return builders, seed_sequences
 
     def generate(self):
-        """Generate all connections for a graph."""
-        self._dataset_collection_to_collection()
-        self._system_collection_to_collection()
-        self._dataset_to_dataset_collection()
-        self._system_to_system_collection()
-        self._dataset_read_to_system_input()
-        self._dataset_write_to_system_output()
+        """Generate all connections for a graph. Independent relations run in a process pool if workers > 1."""
+        builders, seed_sequences = self._get_builders()
+        if self.workers == 1:
+            for name in RELATIONS:
+                with self.report.stage(f"connections.{name}"):
+                    self.connections.add(name, builders[name](seed_sequences[name]))
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(RELATIONS))) as executor:
+            # Submit the slowest many-to-many relations first. Workers measure their relations in their own reports.
+            futures = {name: executor.submit(call_measured, f"connections.{name}", builders[name],
+                                             seed_sequences[name], trace_memory=self.report.trace_memory)
+                       for name in reversed(RELATIONS)}
+            for name in RELATIONS:
+                relation, report = futures[name].result()
+                self.connections.add(name, relation)
+                self.report.merge(report)
+
+    def iter_chunks(self, chunk_size=None):
+        """
+        Yields (relation name, source ids, target ids) chunks of at most chunk_size connections.
+        Relations are the same as the ones made by generate(). If they weren't generated yet and workers == 1,
+        relations are generated one by one and released after they are consumed.
+        """
+        if len(self.connections.relations) == len(RELATIONS) or self.workers > 1:
+            if len(self.connections.relations) < len(RELATIONS):
+                self.generate()
+            yield from self.connections.iter_chunks(chunk_size)
+            return
+
+        builders, seed_sequences = self._get_builders()
+        for name in RELATIONS:
+            with self.report.stage(f"connections.{name}"):
+                relation = builders[name](seed_sequences[name])
+            for source_ids, target_ids in relation.iter_chunks(chunk_size):
+                yield name, source_ids, target_ids
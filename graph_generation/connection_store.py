@@ -0,0 +1,226 @@
+"""
+This module implements compact storage for connections between nodes in a graph.
+
+Each relation is stored in CSR (compressed sparse row) format as two integer arrays:
+    offsets - for source with id i + 1, offsets[i]:offsets[i + 1] is its slice in indices.
+    indices - target ids of all connections, grouped by source id.
+
+Arrays are int32, which takes 4 bytes per connection instead of ~100 bytes for Python dictionaries of sets.
+Relations with more than 2^31 - 1 connections or ids fall back to int64.
+
+Relations and stores can be read in chunks of connections, so graph writers never need Python objects for
+the whole relation at once.
+"""
+
+import numpy as np
+
+# Number of connections converted to Python integers at once while iterating.
+ITER_CHUNK_SIZE = 65536
+
+
+def _index_dtype(max_value):
+    """Returns int32 if it can hold max_value, int64 otherwise."""
+    return np.int32 if max_value <= np.iinfo(np.int32).max else np.int64
+
+
+def iter_ranges(count, chunk_size=None):
+    """Yields (start, stop) ranges that split range(count) into chunks of chunk_size. One range if chunk_size is None.
+
+    Raises:
+        ValueError: Chunk size is not positive.
+    """
+    if chunk_size is None:
+        yield 0, count
+        return
+    if chunk_size < 1:
+        raise ValueError("Chunk size should be a positive integer.")
+    for start in range(0, count, chunk_size):
+        yield start, min(start + chunk_size, count)
+
+
+class Relation:
+    """
+    A class to represent one relation between source and target node ids in CSR format.
+
+    ...
+
+    Attributes:
+        offsets: Integer array of length source_count + 1 with slice boundaries of each source in indices.
+        indices: Integer array of target ids, grouped by source id.
+        target_count: Integer, maximal target id.
+
+    Methods:
+        from_pairs(source_ids, target_ids, source_count=None, target_count=None)
+            Creates relation from two arrays of connection pairs.
+
+        from_dict(connections, source_count=None, target_count=None)
+            Creates relation from dictionary that maps source id to target ids.
+
+        degree(source_id)
+            Returns number of connections of a source.
+
+        degrees()
+            Returns array of number of connections of every source.
+
+        neighbors(source_id)
+            Returns array of target ids of a source.
+
+        source_ids(start=0, stop=None)
+            Returns array of source id of every connection, aligned with indices.
+
+        iter_chunks(chunk_size=None)
+            Yields (source ids, target ids) arrays of consecutive chunks of connections.
+
+        reverse()
+            Returns relation with sources and targets swapped.
+    """
+    def __init__(self, offsets, indices, target_count=None):
+        """
+        Args:
+            offsets: Integer array of length source_count + 1, starting with 0.
+            indices: Integer array of target ids, grouped by source id.
+            target_count: Integer, maximal target id. Maximal id in indices if None.
+        """
+        indices = np.asarray(indices)
+        if target_count is None:
+            target_count = int(indices.max()) if len(indices) else 0
+        self.target_count = target_count
+        self.offsets = np.asarray(offsets, dtype=_index_dtype(len(indices)))
+        self.indices = np.asarray(indices, dtype=_index_dtype(target_count))
+
+    @classmethod
+    def from_pairs(cls, source_ids, target_ids, source_count=None, target_count=None):
+        """Creates relation from connection pairs. Order of connections of the same source is preserved."""
+        source_ids = np.asarray(source_ids, dtype=np.int64)
+        if source_count is None:
+            source_count = int(source_ids.max()) if len(source_ids) else 0
+        order = np.argsort(source_ids, kind="stable")
+        offsets = np.zeros(source_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source_ids, minlength=source_count + 1)[1:], out=offsets[1:])
+        return cls(offsets, np.asarray(target_ids)[order], target_count)
+
+    @classmethod
+    def from_dict(cls, connections, source_count=None, target_count=None):
+        """Creates relation from dictionary that maps source id to a collection of target ids."""
+        if source_count is None:
+            source_count = max(connections, default=0)
+        degrees = np.zeros(source_count + 1, dtype=np.int64)
+        for source_id in connections:
+            degrees[source_id] = len(connections[source_id])
+        indices = np.fromiter((target_id for source_id in sorted(connections) for target_id in connections[source_id]),
+                              dtype=np.int64, count=int(degrees.sum()))
+        return cls(np.cumsum(degrees), indices, target_count)
+
+    @property
+    def source_count(self):
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self):
+        return int(self.offsets[-1])
+
+    @property
+    def nbytes(self):
+        return self.offsets.nbytes + self.indices.nbytes
+
+    def __len__(self):
+        return self.edge_count
+
+    def __iter__(self):
+        """Iterates (source id, target id) pairs, converting arrays to Python integers chunk by chunk."""
+        for source_ids, target_ids in self.iter_chunks(ITER_CHUNK_SIZE):
+            yield from zip(source_ids.tolist(), target_ids.tolist())
+
+    def iter_chunks(self, chunk_size=None):
+        """Yields (source ids, target ids) arrays of at most chunk_size connections, all connections if None."""
+        for start, stop in iter_ranges(self.edge_count, chunk_size):
+            yield self.source_ids(start, stop), self.indices[start:stop]
+
+    def degree(self, source_id):
+        return int(self.offsets[source_id] - self.offsets[source_id - 1])
+
+    def degrees(self):
+        return np.diff(self.offsets)
+
+    def neighbors(self, source_id):
+        return self.indices[self.offsets[source_id - 1]:self.offsets[source_id]]
+
+    def source_ids(self, start=0, stop=None):
+        """Returns source id of every connection in indices[start:stop]."""
+        stop = self.edge_count if stop is None else stop
+        return np.searchsorted(self.offsets, np.arange(start, stop), side="right").astype(self.indices.dtype)
+
+    def reverse(self):
+        """Returns relation with sources and targets swapped."""
+        return Relation.from_pairs(self.indices, self.source_ids(), self.target_count, self.source_count)
+
+
+class ConnectionStore:
+    """
+    A class to hold all relations of a graph by name, with forward and reverse views.
+
+    ...
+
+    Attributes:
+        relations: Dictionary that maps relation name to forward Relation.
+
+    Methods:
+        add(name, relation)
+            Adds a relation to the store.
+
+        forward(name)
+            Returns relation that maps source ids to target ids.
+
+        reverse(name)
+            Returns relation that maps target ids to source ids. It is computed once and cached.
+
+        degrees(name, reverse=False)
+            Returns array of number of connections for every source (or target) id.
+
+        edge_count(name)
+            Returns number of connections in a relation.
+
+        iter_chunks(chunk_size=None)
+            Yields (name, source ids, target ids) chunks of all relations in the order they were added.
+    """
+    def __init__(self):
+        self.relations = {}
+        self._reverse_relations = {}
+
+    def add(self, name, relation):
+        """Adds relation, replacing an existing one with the same name."""
+        self.relations[name] = relation
+        self._reverse_relations.pop(name, None)
+
+    def forward(self, name):
+        return self.relations[name]
+
+    def reverse(self, name):
+        if name not in self._reverse_relations:
+            self._reverse_relations[name] = self.relations[name].reverse()
+        return self._reverse_relations[name]
+
+    def degrees(self, name, reverse=False):
+        relation = self.reverse(name) if reverse else self.forward(name)
+        return relation.degrees()
+
+    def edge_count(self, name):
+        return self.relations[name].edge_count
+
+    @property
+    def nbytes(self):
+        return sum(relation.nbytes for relation in self.relations.values())
+
+    def iter_chunks(self, chunk_size=None):
+        for name, relation in self.relations.items():
+            for source_ids, target_ids in relation.iter_chunks(chunk_size):
+                yield name, source_ids, target_ids
+
+    def __getitem__(self, name):
+        return self.forward(name)
+
+    def __contains__(self, name):
+        return name in self.relations
+
+    def __iter__(self):
+        return iter(self.relations)
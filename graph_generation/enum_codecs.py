@@ -0,0 +1,119 @@
+"""
+This module implements codecs between names and numbers of proto enums, with tables built once from config_pb2.
+
+Every enum of the proto graph has one module-level EnumCodec:
+    ENV - environment of datasets and systems.
+    SYSTEM_CRITICALITY - criticality of systems.
+    PROCESSING_IMPACT - impact of processings.
+    PROCESSING_FRESHNESS - freshness of processings.
+
+A codec converts single values, or whole columns at once: encode_many() converts names to an int64 array of enum
+numbers, decode_many() wraps enum numbers as a CategoricalColumn (see attribute_columns.py) of names without copying
+strings. Unknown names are logged once per column and replaced by the default value of the enum.
+
+Usage:
+    ENV.encode("PRODUCTION_ENV")                  # 2
+    ENV.decode(2)                                 # PRODUCTION_ENV
+    ENV.encode_many(["PRODUCTION_ENV", "TESTING_ENV"])   # array([2, 4])
+    ENV.decode_many(np.array([2, 4])).tolist()    # ["PRODUCTION_ENV", "TESTING_ENV"]
+"""
+
+import logging
+
+import numpy as np
+
+from attribute_columns import CategoricalColumn
+from proto import config_pb2
+
+
+def _is_number_array(values):
+    """Returns True if values are a NumPy array of integers, ex. enum numbers read from proto messages."""
+    return isinstance(values, np.ndarray) and values.dtype.kind in "iu"
+
+
+class EnumCodec:
+    """
+    A class to convert names and numbers of a proto enum.
+
+    ...
+
+    Attributes:
+        label: String, name of the enum used in log messages, ex. environment.
+        default: String, name used for unknown names.
+        names: Tuple of names, indexed by enum number.
+        numbers: Dictionary that maps name to enum number.
+
+    Methods:
+        encode(name)
+            Returns enum number of a name, or of the default for unknown names.
+
+        decode(number)
+            Returns name of an enum number.
+
+        encode_many(values)
+            Returns int64 array of enum numbers of a column of names.
+
+        decode_many(numbers)
+            Returns CategoricalColumn of names of an array of enum numbers.
+
+        to_names(values)
+            Returns values as names, decoding them only if they are an array of enum numbers.
+    """
+    def __init__(self, label, enum_type, default):
+        items = sorted(enum_type.items(), key=lambda item: item[1])
+        if [number for _, number in items] != list(range(len(items))):
+            raise ValueError(f"Numbers of {label} enum should go from 0 without gaps.")
+        self.label = label
+        self.default = default
+        self.names = tuple(name for name, _ in items)
+        self.numbers = dict(items)
+        self._default_number = self.numbers[default]
+
+    def encode(self, name):
+        """Returns enum number of a name, or of the default for unknown names."""
+        number = self.numbers.get(name)
+        if number is None:
+            logging.error(f"Incorrect {self.label} value. Setting {self.default} as a default.")
+            return self._default_number
+        return number
+
+    def decode(self, number):
+        """Returns name of an enum number."""
+        return self.names[number]
+
+    def encode_many(self, values):
+        """
+        Converts a column of names to enum numbers, every distinct name is looked up once.
+        Values can be a CategoricalColumn, an array of enum numbers or any iterable of names.
+
+        Returns:
+            int64 array of enum numbers.
+        """
+        if _is_number_array(values):
+            return values.astype(np.int64, copy=False)
+        if isinstance(values, CategoricalColumn):
+            table = np.array([self.encode(category) for category in values.categories], dtype=np.int64)
+            return table[values.codes]
+        values = values if isinstance(values, list) else list(values)
+        table = {name: self.encode(name) for name in set(values)}
+        return np.fromiter((table[name] for name in values), dtype=np.int64, count=len(values))
+
+    def decode_many(self, numbers):
+        """
+        Converts enum numbers to names, the numbers are used as codes of the column of all names.
+
+        Returns:
+            CategoricalColumn of names.
+        """
+        return CategoricalColumn(np.asarray(numbers), self.names)
+
+    def to_names(self, values):
+        """Returns a column of names as it is, and decodes an array of enum numbers with decode_many()."""
+        return self.decode_many(values) if _is_number_array(values) else values
+
+
+ENV = EnumCodec("environment", config_pb2.ProtoGraph.Env, "UNKNOWN_ENV")
+SYSTEM_CRITICALITY = EnumCodec("system criticality", config_pb2.ProtoGraph.System.SystemCriticality,
+                               "CRITICAL_OTHER")
+PROCESSING_IMPACT = EnumCodec("processing impact", config_pb2.ProtoGraph.Processing.Impact, "NONE")
+PROCESSING_FRESHNESS = EnumCodec("processing freshness", config_pb2.ProtoGraph.Processing.Freshness, "NEVER")
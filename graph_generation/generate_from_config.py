@@ -7,23 +7,91 @@ Usage:
          --output_file "output.graphml" \
          --config_file "graph_generation/configs/config_15_09_20.yaml" \
          --graph_type "networkx" \
+         --workers 6 \
+         --seed 42 \
          --overwrite
 
+    Sharded generation (every shard can be generated on a different machine with the same config and seed):
+    python3 graph_generation/generate_from_config.py \
+         --output_file "output.bin" \
+         --config_file "graph_generation/configs/config_15_09_20.yaml" \
+         --graph_type "proto" \
+         --seed 42 \
+         --shard_count 16 \
+         --shard_index 3
+
+    Batch generation (the config is parsed once, graphs are generated by a pool of workers processes):
+    python3 graph_generation/generate_from_config.py \
+         --output_dir "graphs" \
+         --config_file "graph_generation/configs/config_15_09_20.yaml" \
+         --graph_type "proto" \
+         --count 200 \
+         --workers 8 \
+         --seed 42
+
+    Graphs are saved to graphs/graph-00000.bin ... graphs/graph-00199.bin, every graph has its own seed derived
+    from the batch seed. Seeds, files and generation times are saved to graphs/batch_summary.json, so any graph of
+    the batch can be generated again with its seed.
+
     Parameters info:
-        output file for proto has .bin extension and output file for networkx graph has .graphml extension
+        output file for proto has .bin extension and output file for networkx graph has .graphml extension,
+        output files ending with .gz or .zst (ex. output.graphml.zst) are compressed while they are written.
         graph_type could be one of "proto" / "networkx"
+        workers is a number of processes used to generate connections and serialize proto graphs, 1 if not specified.
+        seed makes generation reproducible. The same seed gives the same graph for any number of workers.
+        If it is not specified, a random seed is used and logged.
+        shard_count splits the graph into shards saved to files output-00003-of-00016.bin, described by
+        output.manifest.json. shard_index generates a single shard (the manifest is written with shard 0),
+        otherwise all shards are generated, using workers processes. seed is required with shard_index.
+        chunk_size streams the graph to the output file: connections, attributes and nodes are generated in chunks
+        of chunk_size connections. Only the integer arrays of the relation being written and one chunk of nodes
+        are kept in memory. The whole graph is generated in memory and saved at the end if it is not specified.
+        The same seed gives the same graph in both modes.
+        index saves an offset index of a proto output file to <output file>.idx, for reading single records of the
+        graph without parsing it (see proto_index.py).
+        scale multiplies node counts and count maps of the config (ex. 0.01 or 10), keeping their distributions.
+        count generates a batch of graphs from one config to output_dir (see Batch generation above).
         overwrite if not specified equals to False. If it is used (ex. above) - it will overwrite the existing graph.
+        log_level is DEBUG / INFO / WARNING / ERROR / CRITICAL, INFO if not specified. Nodes are not logged one by one:
+        progress lines with node counts, throughput and ETA are logged every few seconds, and log_sample_every logs
+        every N-th node of a type at DEBUG level.
+        report_file saves wall time, CPU time and peak RSS of every generation stage (config, connections.<relation>,
+        attributes.<node type>, nodes.<node type>, serialization) as JSON, prometheus_file saves them as a Prometheus
+        textfile for the node exporter (see stage_report.py). trace_memory adds tracemalloc peaks, and slows
+        generation down.
+        profile is cprofile or tracemalloc, it profiles every stage of the report separately and saves pstats /
+        tracemalloc text files and collapsed stacks for flame graphs to <profile_out>.<stage>.* (see profiling.py).
+        profile_out is <output file without extension>.profile if not specified. Stages run in worker processes are
+        not profiled, profile with workers 1.
+
+    Durations (dataset SLOs and data integrity times) are integer seconds in the graph. Optional config keys set
+    their ranges in seconds, both ends included (ex. dataset_slo_range_seconds: [5, 10000] under dataset and
+    restoration_range_seconds / regeneration_range_seconds / reconstruction_range_seconds under data_integrity).
+    Without them, durations are whole numbers of days, hours, minutes or seconds (see attribute_columns.py).
 """
 
+import os
+import copy
+import json
 import yaml
 import time
 import logging
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 from connection_generator import ConnectionGenerator
 from attribute_generator import AttributeGenerator
 from proto_graph import ProtoGraph
+from proto_index import build_index
+from compression import get_compression
 from nx_graph import NxGraph
+from progress import LOG_LEVELS, configure_logging
+from stage_report import StageReport
+from profiling import PROFILE_KINDS, StageProfiler
+from random_streams import RandomStreams
+from sharding import ShardPlan, get_config_hash, get_manifest_file, get_shard_file, write_manifest
+from connection_store import iter_ranges
+from scaling import scale_count, scale_many_to_many, scale_one_to_many
 
 from config_params.collection_params import CollectionParams
 from config_params.data_integrity_params import DataIntegrityParams
@@ -33,6 +101,10 @@ from config_params.processing_params import ProcessingParams
 from config_params.system_params import SystemParams
 from config_params.connection_params import ConnectionParams
 
+# Extensions of output files of every graph type.
+GRAPH_EXTENSIONS = {"proto": ".bin", "networkx": ".graphml"}
+BATCH_SUMMARY_FILE = "batch_summary.json"
+
 
 def process_map(config_map, proba=False, enum=False):
     """Converts string map in format [key1:value1 key2:value2] into a dictionary.
@@ -52,15 +124,128 @@ def process_map(config_map, proba=False, enum=False):
     return {keys[i]: values[i] for i in range(len(keys))}
 
 
+def process_range(config_range):
+    """Converts an optional config range [low, high] of seconds into a pair of integers, or None if it's missing.
+
+    Raises:
+        ValueError: Range is not a pair of non negative integers low <= high.
+    """
+    if config_range is None:
+        return None
+    if len(config_range) != 2 or not 0 <= int(config_range[0]) <= int(config_range[1]):
+        raise ValueError(f"Range {config_range} should be [low, high] with 0 <= low <= high.")
+    return int(config_range[0]), int(config_range[1])
+
+
+def format_map(count_map):
+    """Converts dictionary into a string map in format [key1:value1 key2:value2], the inverse of process_map()."""
+    return "[" + " ".join(f"{key}:{value}" for key, value in count_map.items()) + "]"
+
+
+def scale_config(config, scale, rng):
+    """
+    Returns a copy of config with node counts and count maps scaled by scale (see scaling.py).
+    Both count maps of dataset reads / system inputs and dataset writes / system outputs keep the same number of
+    connections. Probability maps are not changed.
+
+    Args:
+        config: Dictionary of a yaml config.
+        scale: Float, scale factor.
+        rng: numpy.random.Generator used for sampling.
+    """
+    config = copy.deepcopy(config)
+    dataset, system = config["dataset"], config["system"]
+    dataset_collection, system_collection = config["dataset_collection"], config["system_collection"]
+    collection = config["collection"]
+
+    dataset_count = dataset["dataset_count"] = scale_count(dataset["dataset_count"], scale)
+    system_count = system["system_count"] = scale_count(system["system_count"], scale)
+    dataset_collection_count = dataset_collection["dataset_collection_count"] = \
+        scale_count(dataset_collection["dataset_collection_count"], scale)
+    system_collection_count = system_collection["system_collection_count"] = \
+        scale_count(system_collection["system_collection_count"], scale)
+    collection_count = collection["collection_count"] = scale_count(collection["collection_count"], scale)
+
+    # Many-to-many relations.
+    for dataset_key, system_key in [("dataset_read_count_map", "system_inputs_count_map"),
+                                    ("dataset_write_count_map", "system_outputs_count_map")]:
+        dataset_map, system_map = scale_many_to_many(process_map(dataset[dataset_key]), process_map(system[system_key]),
+                                                     scale, dataset_count, system_count, rng)
+        dataset[dataset_key], system[system_key] = format_map(dataset_map), format_map(system_map)
+
+    # One-to-many relations.
+    for section, key, group_count, element_count in [
+            (dataset_collection, "dataset_count_map", dataset_collection_count, dataset_count),
+            (system_collection, "system_count_map", system_collection_count, system_count),
+            (collection, "dataset_collection_count_map", collection_count, dataset_collection_count),
+            (collection, "system_collection_count_map", collection_count, system_collection_count)]:
+        section[key] = format_map(scale_one_to_many(process_map(section[key]), scale, group_count, element_count, rng))
+
+    logging.info(f"Scaled config by {scale}: {dataset_count} datasets, {system_count} systems, "
+                 f"{dataset_collection_count} dataset collections, {system_collection_count} system collections, "
+                 f"{collection_count} collections.")
+    return config
+
+
 def parse_args():
     """Parses input arguments."""
     parser = argparse.ArgumentParser(description='Generate graph based on config.')
-    parser.add_argument('-f', '--output_file', help='Path to output graphml or proto binary.', required=True)
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('-f', '--output_file', help='Path to output graphml or proto binary.')
+    output.add_argument('-d', '--output_dir', help='Path to output directory of a batch of graphs.')
     parser.add_argument('-c', '--config_file', help='Path to yaml config file with graph parameters.', required=True)
     parser.add_argument('-t', '--graph_type', help='Type of the graph to generate. Can be proto or networkx.',
                         default="networkx", choices=["proto", "networkx"])
     parser.add_argument('-o', '--overwrite', help='If output file exists, overwrite it.', type=bool, default=False)
+    parser.add_argument('-w', '--workers', help='Number of processes used to generate connections and serialize proto '
+                        'graphs.', type=int, default=1)
+    parser.add_argument('-s', '--seed', help='Random seed of the generated graph.', type=int, default=None)
+    parser.add_argument('--shard_count', help='Number of shards to split the graph into.', type=int, default=1)
+    parser.add_argument('--shard_index', help='Index of a single shard to generate.', type=int, default=None)
+    parser.add_argument('--scale', help='Scale factor of node counts and count maps of the config.', type=float,
+                        default=1.0)
+    parser.add_argument('--chunk_size', help='Number of connections generated and written to the output at once.',
+                        type=int, default=None)
+    parser.add_argument('-n', '--count', help='Number of graphs generated to --output_dir.', type=int, default=None)
+    parser.add_argument('--index', help='Save offset index of the proto output file.', type=bool, default=False)
+    parser.add_argument('--log_level', '--log-level', help='Logging level.', default="INFO",
+                        choices=LOG_LEVELS, type=str.upper)
+    parser.add_argument('--log_sample_every', help='Log every N-th added node of a type at DEBUG level.', type=int,
+                        default=None)
+    parser.add_argument('--report_file', help='Path to JSON report of time and memory of generation stages.',
+                        default=None)
+    parser.add_argument('--prometheus_file', help='Path to Prometheus textfile with the metrics of the report.',
+                        default=None)
+    parser.add_argument('--trace_memory', help='Measure tracemalloc peaks of stages in the report (slower).',
+                        type=bool, default=False)
+    parser.add_argument('--profile', help='Profile every generation stage with cprofile or tracemalloc.',
+                        default=None, choices=PROFILE_KINDS)
+    parser.add_argument('--profile_out', '--profile-out', help='Prefix of profile files of stages.', default=None)
     args = parser.parse_args()
+    if args.output_dir is not None and (args.count is None or args.count < 1):
+        parser.error("--count should be a positive integer with --output_dir.")
+    if args.count is not None and args.output_dir is None:
+        parser.error("--output_dir is required with --count.")
+    if args.output_dir is not None and (args.shard_count > 1 or args.shard_index is not None):
+        parser.error("Batch generation can't be used with sharded generation.")
+    if args.scale <= 0:
+        parser.error("--scale should be a positive number.")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk_size should be a positive integer.")
+    if args.shard_index is not None and args.seed is None:
+        parser.error("--seed is required with --shard_index, all shards of a graph need the same seed.")
+    if args.shard_index is not None and not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard_index should be between 0 and --shard_count - 1.")
+    if args.output_dir is not None and (args.report_file is not None or args.prometheus_file is not None):
+        parser.error("Batch generation saves its own summary, --report_file and --prometheus_file can't be used.")
+    if args.output_dir is not None and args.profile is not None:
+        parser.error("Batch generation can't be profiled, generate a single graph of the batch with its seed.")
+    if args.profile_out is not None and args.profile is None:
+        parser.error("--profile is required with --profile_out.")
+    if args.index and (args.graph_type != "proto" or args.output_file is None or args.shard_count > 1):
+        parser.error("--index can only be used with a single proto --output_file.")
+    if args.index and get_compression(args.output_file) is not None:
+        parser.error("--index can't be used with a compressed --output_file.")
     return args
 
 
@@ -71,7 +256,8 @@ def get_connection_params(config):
     """
     dataset_params = DatasetParams(
         dataset_count=config["dataset"]["dataset_count"],
-        dataset_env_count_map=process_map(config["dataset"]["dataset_env_count_map"], enum=True)
+        dataset_env_count_map=process_map(config["dataset"]["dataset_env_count_map"], enum=True),
+        dataset_slo_range=process_range(config["dataset"].get("dataset_slo_range_seconds"))
     )
 
     system_params = SystemParams(
@@ -100,9 +286,10 @@ def get_connection_params(config):
     return dataset_params, system_params, dataset_to_system_params, collection_params
 
 
-def get_attribute_params(config, graph_connections):
+def get_attribute_params(config, connections=None):
     """
     Creates instances of ProcessingParams, DataIntegrityParams, ConnectionParams for attribute generation from config.
+    ConnectionParams is None if connections are not generated yet, when attributes are generated in chunks.
     """
     processing_params = ProcessingParams(
         dataset_criticality_proba_map=process_map(config["data_processing"]["dataset_criticality_proba_map"],
@@ -112,161 +299,441 @@ def get_attribute_params(config, graph_connections):
     )
 
     data_integrity_params = DataIntegrityParams(
-        data_volatility_proba_map=process_map(config["data_integrity"]["volatality_proba_map"], proba=True)
+        data_volatility_proba_map=process_map(config["data_integrity"]["volatality_proba_map"], proba=True),
+        data_restoration_range_seconds=process_range(config["data_integrity"].get("restoration_range_seconds")),
+        data_regeneration_range_seconds=process_range(config["data_integrity"].get("regeneration_range_seconds")),
+        data_reconstruction_range_seconds=process_range(config["data_integrity"].get("reconstruction_range_seconds"))
     )
 
+    if connections is None:
+        return processing_params, data_integrity_params, None
+
     # Number of connections can not be predicted, so we need to get them for attribute generation.
-    system_write_conn_count = sum([len(i) for i in graph_connections.dataset_write_conn_systems.values()])
-    system_read_conn_count = sum([len(i) for i in graph_connections.dataset_read_conn_systems.values()])
+    system_write_conn_count = connections.edge_count("dataset_write_conn_systems")
+    system_read_conn_count = connections.edge_count("dataset_read_conn_systems")
     connection_params = ConnectionParams(system_write_conn_count, system_read_conn_count)
     return processing_params, data_integrity_params, connection_params
 
 
-def generate_nodes_and_edges(graph, collection_params, graph_connections, graph_attributes):
+def get_graph_params(config):
     """
-    Generates nodes and edges of a graph based on generated connections, attributes, and graph dimensions in config.
+    Creates all parameters of graph generation from config, so a config can be parsed once for many graphs.
+
+    Returns:
+        Tuple of DatasetParams, SystemParams, DatasetToSystemParams, CollectionParams, ProcessingParams and
+        DataIntegrityParams.
+    """
+    processing_params, data_integrity_params, _ = get_attribute_params(config)
+    return get_connection_params(config) + (processing_params, data_integrity_params)
+
+
+def set_progress_totals(progress, collection_params, graph_attributes):
+    """Sets expected numbers of nodes of every type to a ProgressCounter. Processings are counted only if the number
+    of connections is known, when connections are generated before nodes."""
+    progress.set_total("collection", collection_params.collection_count)
+    progress.set_total("data_integrity", collection_params.dataset_collection_count)
+    progress.set_total("dataset_collection", collection_params.dataset_collection_count)
+    progress.set_total("system_collection", collection_params.system_collection_count)
+    progress.set_total("dataset", graph_attributes.dataset_params.dataset_count)
+    progress.set_total("system", graph_attributes.system_params.system_count)
+    if graph_attributes.connection_params is not None:
+        progress.set_total("processing", graph_attributes.connection_params.dataset_system_connection_count)
+
+
+def generate_nodes_and_edges(graph, collection_params, connection_chunks, graph_attributes, chunk_size=None,
+                             report=None):
+    """
+    Generates nodes and edges of a graph from chunks of connections and attributes of nodes in every chunk.
+    connection_chunks yields (relation name, source ids, target ids) like ConnectionGenerator.iter_chunks().
+    Generated nodes are flushed after every chunk, so only one chunk is kept in memory if the graph stream is opened.
+    Processing ids start after graph_attributes.id_offsets["processing"], when a graph shard is generated.
+    Nodes of a chunk are added at once with the bulk add_<node type>s() methods of the graph.
+    Expected node counts are set to graph.progress, so progress lines have ETA when all of them are known.
+    Attribute generation, node building and writing of chunks are measured as stages attributes.<node type>,
+    nodes.<node type> and serialization of the report.
     """
+    report = report if report is not None else StageReport()
+    set_progress_totals(graph.progress, collection_params, graph_attributes)
+
     # Generate collections.
     start = time.time()
-    for collection_id in range(1, collection_params.collection_count + 1):
-        name = graph_attributes.collection_attributes["names"][collection_id - 1]
-        graph.generate_collection(collection_id, name)
+    for start_index, stop_index in iter_ranges(collection_params.collection_count, chunk_size):
+        collection_ids = range(start_index + 1, stop_index + 1)
+        with report.stage("attributes.collection"):
+            names = graph_attributes.get_collection_attributes(collection_ids)["names"]
+        with report.stage("nodes.collection"):
+            graph.add_collections(collection_ids, names)
+        with report.stage("serialization"):
+            graph.flush()
     logging.info(f"Generated collections in {round(time.time() - start, 1)} seconds.")
 
-    # Generate dataset collections.
+    # Generate data integrity, one for each dataset collection.
     start = time.time()
-    for collection_id in graph_connections.dataset_collections_conn_collection:
-        for dataset_collection_id in graph_connections.dataset_collections_conn_collection[collection_id]:
-            name = graph_attributes.dataset_collection_attributes["names"][dataset_collection_id - 1]
-            graph.generate_dataset_collection(dataset_collection_id, collection_id, name)
-    logging.info(f"Generated dataset collections in {round(time.time() - start, 1)} seconds.")
+    for start_index, stop_index in iter_ranges(collection_params.dataset_collection_count, chunk_size):
+        data_integrity_ids = range(start_index + 1, stop_index + 1)
+        with report.stage("attributes.data_integrity"):
+            attributes = graph_attributes.get_data_integrity_attributes(len(data_integrity_ids))
+        with report.stage("nodes.data_integrity"):
+            graph.add_data_integrities(data_integrity_ids=data_integrity_ids,
+                                       dataset_collection_ids=data_integrity_ids,
+                                       data_integrity_rec_times=attributes["data_reconstruction_time"],
+                                       data_integrity_volats=attributes["data_volatility"],
+                                       data_integrity_reg_times=attributes["data_regeneration_time"],
+                                       data_integrity_rest_times=attributes["data_restoration_time"])
+        with report.stage("serialization"):
+            graph.flush()
+    logging.info(f"Generated data integrity in {round(time.time() - start, 1)} seconds.")
 
-    # Generate system collections.
-    start = time.time()
-    for collection_id in graph_connections.system_collections_conn_collection:
-        for system_collection_id in graph_connections.system_collections_conn_collection[collection_id]:
-            name = graph_attributes.system_collection_attributes["names"][system_collection_id - 1]
-            graph.generate_system_collection(system_collection_id, collection_id, name)
-    logging.info(f"Generated system collections in {round(time.time() - start, 1)} seconds.")
+    # Generate nodes of every relation chunk.
+    elapsed = {}
+    processing_id = graph_attributes.id_offsets.get("processing", 0) + 1
+    for relation, source_ids, target_ids in connection_chunks:
+        start = time.time()
+
+        if relation == "dataset_collections_conn_collection":
+            with report.stage("attributes.dataset_collection"):
+                names = graph_attributes.get_dataset_collection_attributes(target_ids)["names"]
+            with report.stage("nodes.dataset_collection"):
+                graph.add_dataset_collections(target_ids, source_ids, names)
+
+        elif relation == "system_collections_conn_collection":
+            with report.stage("attributes.system_collection"):
+                names = graph_attributes.get_system_collection_attributes(target_ids)["names"]
+            with report.stage("nodes.system_collection"):
+                graph.add_system_collections(target_ids, source_ids, names)
+
+        elif relation == "datasets_conn_collection":
+            with report.stage("attributes.dataset"):
+                attributes = graph_attributes.get_dataset_attributes(target_ids)
+            with report.stage("nodes.dataset"):
+                graph.add_datasets(dataset_ids=target_ids,
+                                   dataset_collection_ids=source_ids,
+                                   regex_groupings=attributes["regex_groupings"],
+                                   names=attributes["names"],
+                                   slos=attributes["dataset_slos"],
+                                   envs=attributes["dataset_environments"],
+                                   descriptions=attributes["descriptions"])
+
+        elif relation == "systems_conn_collection":
+            with report.stage("attributes.system"):
+                attributes = graph_attributes.get_system_attributes(target_ids)
+            with report.stage("nodes.system"):
+                graph.add_systems(system_ids=target_ids,
+                                  system_critics=attributes["system_criticalities"],
+                                  system_collection_ids=source_ids,
+                                  regex_groupings=attributes["regex_groupings"],
+                                  names=attributes["names"],
+                                  envs=attributes["system_environments"],
+                                  descriptions=attributes["descriptions"])
+
+        else:
+            # Connections between dataset read and system input, or between system output and dataset write.
+            with report.stage("attributes.processing"):
+                attributes = graph_attributes.get_processing_attributes(len(source_ids))
+            with report.stage("nodes.processing"):
+                graph.add_processings(system_ids=target_ids,
+                                      dataset_ids=source_ids,
+                                      processing_ids=range(processing_id, processing_id + len(source_ids)),
+                                      impacts=attributes["dataset_impacts"],
+                                      freshness=attributes["dataset_freshness"],
+                                      inputs=relation == "dataset_read_conn_systems")
+            processing_id += len(source_ids)
+
+        with report.stage("serialization"):
+            graph.flush()
+        elapsed[relation] = elapsed.get(relation, 0) + time.time() - start
+
+    for relation in elapsed:
+        logging.info(f"Generated nodes of {relation} in {round(elapsed[relation], 1)} seconds.")
+    graph.progress.log_summary()
+
+
+def create_graph(graph_type):
+    """Creates an empty graph of type proto or networkx."""
+    if graph_type == "proto":
+        graph = ProtoGraph()
+    else:
+        graph = NxGraph()
+    logging.info(f"Created empty {graph_type} graph.")
+    return graph
 
-    # Generate datasets.
-    start = time.time()
-    for dataset_collection_id in graph_connections.datasets_conn_collection:
-        for dataset_id in graph_connections.datasets_conn_collection[dataset_collection_id]:
-            graph.generate_dataset(dataset_id=dataset_id,
-                                   dataset_collection_id=dataset_collection_id,
-                                   slo=graph_attributes.dataset_attributes["dataset_slos"][dataset_id - 1],
-                                   env=graph_attributes.dataset_attributes["dataset_environments"][dataset_id - 1],
-                                   description=graph_attributes.dataset_attributes["descriptions"][dataset_id - 1],
-                                   regex_grouping=graph_attributes.dataset_attributes["regex_groupings"][dataset_id - 1],
-                                   name=graph_attributes.dataset_attributes["names"][dataset_id - 1])
-    logging.info(f"Generated datasets in {round(time.time() - start, 1)} seconds.")
-
-    # Generate systems.
-    start = time.time()
-    for system_collection_id in graph_connections.systems_conn_collection:
-        for system_id in graph_connections.systems_conn_collection[system_collection_id]:
-            graph.generate_system(system_id=system_id,
-                                  system_collection_id=system_collection_id,
-                                  system_critic=graph_attributes.system_attributes["system_criticalities"][system_id - 1],
-                                  env=graph_attributes.system_attributes["system_environments"][system_id - 1],
-                                  description=graph_attributes.system_attributes["descriptions"][system_id - 1],
-                                  regex_grouping=graph_attributes.system_attributes["regex_groupings"][system_id - 1],
-                                  name=graph_attributes.system_attributes["names"][system_id - 1])
-    logging.info(f"Generated systems in {round(time.time() - start, 1)} seconds.")
-
-    # Generate data integrity.
-    start = time.time()
-    for i in range(1, collection_params.dataset_collection_count + 1):
-        restoration_time = graph_attributes.data_integrity_attributes["data_restoration_time"][i - 1]
-        regeneration_time = graph_attributes.data_integrity_attributes["data_regeneration_time"][i - 1]
-        reconstruction_time = graph_attributes.data_integrity_attributes["data_reconstruction_time"][i - 1]
-        volatility = graph_attributes.data_integrity_attributes["data_volatility"][i - 1]
-        graph.generate_data_integrity(dataset_collection_id=i,
-                                      data_integrity_id=i,
-                                      data_integrity_rec_time=restoration_time,
-                                      data_integrity_reg_time=regeneration_time,
-                                      data_integrity_rest_time=reconstruction_time,
-                                      data_integrity_volat=volatility)
-    logging.info(f"Generated data integrity in {round(time.time() - start, 1)} seconds.")
 
-    # Generate connections between dataset read and system input
-    start = time.time()
-    processing_id = 1
-    for dataset_read in graph_connections.dataset_read_conn_systems:
-        for system_input in graph_connections.dataset_read_conn_systems[dataset_read]:
-            graph.generate_processing(system_id=system_input,
-                                      dataset_id=dataset_read,
-                                      processing_id=processing_id,
-                                      impact=graph_attributes.dataset_processing_attributes["dataset_impacts"][processing_id - 1],
-                                      freshness=graph_attributes.dataset_processing_attributes["dataset_freshness"][processing_id - 1],
-                                      inputs=True)
-            processing_id += 1
-    logging.info(f"Generated dataset read connections in {round(time.time() - start, 1)} seconds.")
-
-    # Generate connections between system output and dataset write.
+def build_and_save_graph(graph_type, output_file, collection_params, connection_chunks, graph_attributes,
+                         chunk_size=None, overwrite=False, workers=1, index=False, report=None):
+    """
+    Creates a graph, adds nodes and edges from connection chunks and saves it to the output_file.
+    If chunk_size is given, every chunk is written to the output_file as soon as it is generated.
+    Otherwise proto graphs are serialized by workers processes. If index, offset index of a proto graph is saved too.
+    """
+    report = report if report is not None else StageReport()
+    graph = create_graph(graph_type)
+    if chunk_size is not None:
+        graph.open_stream(output_file, overwrite=overwrite)
+
+    # Add nodes and edges from generated attributes and connections
+    generate_nodes_and_edges(graph, collection_params, connection_chunks, graph_attributes, chunk_size=chunk_size,
+                             report=report)
+
+    # Save graph to file.
     start = time.time()
-    for dataset_write in graph_connections.dataset_write_conn_systems:
-        for system_output in graph_connections.dataset_write_conn_systems[dataset_write]:
-            graph.generate_processing(system_id=system_output,
-                                      dataset_id=dataset_write,
-                                      processing_id=processing_id,
-                                      impact=graph_attributes.dataset_processing_attributes["dataset_impacts"][processing_id - 1],
-                                      freshness=graph_attributes.dataset_processing_attributes["dataset_freshness"][processing_id - 1],
-                                      inputs=False)
-            processing_id += 1
-    logging.info(f"Generated dataset write connections in {round(time.time() - start, 1)} seconds.")
-
-
-def generate_and_save_graph(config, graph_type, output_file):
-    """Generates graph of type proto or networkx from config and saves the file to the output_file."""
-    # Get connection params.
-    dataset_params, system_params, dataset_to_system_params, collection_params = get_connection_params(config)
+    with report.stage("serialization"):
+        if chunk_size is not None:
+            graph.close_stream()
+            if index:
+                build_index(output_file)
+        elif graph_type == "proto":
+            graph.save_to_file(output_file, overwrite=overwrite, workers=workers, index=index)
+        else:
+            graph.save_to_file(output_file, overwrite=overwrite)
+    logging.info(f"Finished generation and saved graph to {output_file} in {round(time.time() - start, 1)} seconds.")
+
+
+def generate_and_save_graph(config, graph_type, output_file, workers=1, seed=None, overwrite=False, chunk_size=None,
+                            graph_params=None, index=False, report=None):
+    """
+    Generates graph of type proto or networkx from config and saves the file to the output_file.
+    With chunk_size, connections, attributes and nodes are generated and written in chunks of chunk_size connections.
+    If graph_params from get_graph_params() are given, they are used instead of parsing the config, which can be None.
+    Stages of generation are measured in the StageReport report, if it is given. If index, offset index of a proto
+    graph is saved to <output_file>.idx.
+    """
+    report = report if report is not None else StageReport()
+
+    # Every generation stage gets an independent random stream derived from the seed.
+    streams = RandomStreams(seed)
+    report.info["seed"] = streams.seed
+    logging.info(f"Generating graph with seed {streams.seed}.")
+
+    # Get connection and attribute params.
+    if graph_params is None:
+        with report.stage("config"):
+            graph_params = get_graph_params(config)
+    dataset_params, system_params, dataset_to_system_params, collection_params, processing_params, \
+        data_integrity_params = graph_params
 
     # Generate random connections between nodes.
     graph_connections = ConnectionGenerator(
         dataset_params=dataset_params,
         system_params=system_params,
         dataset_to_system_params=dataset_to_system_params,
-        collection_params=collection_params
+        collection_params=collection_params,
+        workers=workers,
+        seed=streams.seed_sequence("connections"),
+        report=report
     )
-    graph_connections.generate()
-    logging.info(f"Successfully generated connections.")
+    if chunk_size is None:
+        graph_connections.generate()
+        logging.info(f"Successfully generated connections.")
+        connection_chunks = graph_connections.connections.iter_chunks()
+    else:
+        # Relations are generated while chunks are consumed.
+        connection_chunks = graph_connections.iter_chunks(chunk_size)
 
-    # Get attribute params.
-    processing_params, data_integrity_params, connection_params = get_attribute_params(config, graph_connections)
+    # Attributes are generated for the nodes of every chunk.
     graph_attributes = AttributeGenerator(collection_params, dataset_params, system_params, data_integrity_params,
-                                          processing_params, connection_params)
-    graph_attributes.generate()
-    logging.info(f"Successfully generated attributes.")
+                                          processing_params, None, seed=streams.seed_sequence("attributes"))
 
-    # Create a graph.
-    if graph_type == "proto":
-        graph = ProtoGraph()
-    else:
-        graph = NxGraph()
-    logging.info(f"Created empty {graph_type} graph.")
+    build_and_save_graph(graph_type, output_file, collection_params, connection_chunks, graph_attributes,
+                         chunk_size=chunk_size, overwrite=overwrite, workers=workers, index=index, report=report)
 
-    # Add nodes and edges from generated attributes and connections
-    generate_nodes_and_edges(graph, collection_params, graph_connections, graph_attributes)
 
-    # Save graph to file.
-    start = time.time()
-    graph.save_to_file(output_file, overwrite=overwrite)
-    logging.info(f"Finished generation and saved graph to file in {round(time.time() - start, 1)} seconds.")
+def generate_and_save_shard(config, graph_type, output_file, shard_plan, shard_index, overwrite=False,
+                            chunk_size=None, report=None):
+    """
+    Generates one shard of a graph from the shard plan and saves it next to the output_file.
+
+    Returns:
+        StageReport with stages of the shard, added to report if it is given.
+    """
+    report = report if report is not None else StageReport()
+
+    # Generate connections of the shard.
+    with report.stage("connections"):
+        connections = shard_plan.generate_connections(shard_index)
+    logging.info(f"Successfully generated connections of shard {shard_index}.")
+
+    # Attributes of shard nodes are generated from the shard random stream.
+    dataset_params, system_params, collection_params = shard_plan.get_shard_params(shard_index)
+    with report.stage("config"):
+        processing_params, data_integrity_params, connection_params = get_attribute_params(config, connections)
+    graph_attributes = AttributeGenerator(collection_params, dataset_params, system_params, data_integrity_params,
+                                          processing_params, connection_params,
+                                          seed=shard_plan.streams.seed_sequence("attributes", shard_index),
+                                          id_offsets=shard_plan.get_id_offsets(shard_index))
+
+    shard_file = get_shard_file(output_file, shard_index, shard_plan.shard_count)
+    build_and_save_graph(graph_type, shard_file, collection_params, connections.iter_chunks(chunk_size),
+                         graph_attributes, chunk_size=chunk_size, overwrite=overwrite, report=report)
+    return report
+
+
+def generate_and_save_shards(config, graph_type, output_file, shard_count, shard_index=None, workers=1, seed=None,
+                             overwrite=False, chunk_size=None, report=None):
+    """
+    Generates one or all shards of a graph. The shard manifest is saved with shard 0.
+    Stages of all shards are merged in the StageReport report, if it is given.
+    """
+    report = report if report is not None else StageReport()
+    with report.stage("config"):
+        dataset_params, system_params, dataset_to_system_params, collection_params = get_connection_params(config)
+    shard_plan = ShardPlan(dataset_params, system_params, dataset_to_system_params, collection_params, shard_count,
+                           seed=seed)
+    report.info["seed"] = shard_plan.seed
+    logging.info(f"Generating {shard_count} graph shards with seed {shard_plan.seed}.")
+
+    shard_indexes = range(shard_count) if shard_index is None else [shard_index]
+    if 0 in shard_indexes:
+        write_manifest(shard_plan.to_manifest(output_file, graph_type, config), get_manifest_file(output_file),
+                       overwrite=overwrite)
+
+    if workers == 1 or len(shard_indexes) == 1:
+        for i in shard_indexes:
+            generate_and_save_shard(config, graph_type, output_file, shard_plan, i, overwrite=overwrite,
+                                    chunk_size=chunk_size, report=report)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Every worker measures its shard in its own report, merged into report when the shard is done.
+        futures = [executor.submit(generate_and_save_shard, config, graph_type, output_file, shard_plan, i, overwrite,
+                                   chunk_size, StageReport(trace_memory=report.trace_memory))
+                   for i in shard_indexes]
+        for future in futures:
+            report.merge(future.result())
+
+
+def get_batch_file(output_dir, graph_type, index):
+    """Returns file name of a graph of a batch (ex. graphs/graph-00003.bin)."""
+    return os.path.join(output_dir, f"graph-{index:05d}{GRAPH_EXTENSIONS[graph_type]}")
+
+
+def get_batch_seeds(seed, count):
+    """Returns integer seeds of count graphs derived from the batch seed, one independent stream per graph."""
+    streams = RandomStreams(seed)
+    return streams.seed, [int(streams.seed_sequence("batch", i).generate_state(1, "uint64")[0]) for i in range(count)]
+
+
+def _generate_batch_graph(graph_params, graph_type, output_file, seed, overwrite, chunk_size):
+    """Generates one graph of a batch and returns its wall and CPU generation time in seconds."""
+    start, cpu_start = time.perf_counter(), time.process_time()
+    generate_and_save_graph(None, graph_type, output_file, seed=seed, overwrite=overwrite, chunk_size=chunk_size,
+                            graph_params=graph_params)
+    return time.perf_counter() - start, time.process_time() - cpu_start
+
+
+def generate_and_save_batch(config, graph_type, output_dir, count, workers=1, seed=None, overwrite=False,
+                            chunk_size=None):
+    """
+    Generates count graphs from one config to output_dir, in a pool of workers processes. The config is parsed once,
+    every graph gets its own seed derived from seed. Seeds, files and times of all graphs are saved to the batch
+    summary file in output_dir.
+
+    Returns:
+        Dictionary of the batch summary.
+
+    Raises:
+        ValueError: Batch summary already exists in output_dir.
+    """
+    summary_file = os.path.join(output_dir, BATCH_SUMMARY_FILE)
+    if os.path.isfile(summary_file) and not overwrite:
+        raise ValueError("Batch summary already exists in the output directory.")
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    graph_params = get_graph_params(config)
+    batch_seed, seeds = get_batch_seeds(seed, count)
+    logging.info(f"Generating batch of {count} graphs with seed {batch_seed}.")
+
+    graphs = [{"index": i, "seed": seeds[i], "output_file": get_batch_file(output_dir, graph_type, i)}
+              for i in range(count)]
+    arguments = [(graph_params, graph_type, graph["output_file"], graph["seed"], overwrite, chunk_size)
+                 for graph in graphs]
+    if workers == 1:
+        results = {i: _generate_batch_graph(*arguments[i]) for i in range(count)}
+    else:
+        # Worker processes are reused for many graphs, so modules are imported once per worker.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_generate_batch_graph, *arguments[i]): i for i in range(count)}
+            results = {}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                logging.info(f"Generated {len(results)} of {count} graphs.")
+
+    for graph in graphs:
+        graph["seconds"], graph["cpu_seconds"] = (round(value, 3) for value in results[graph["index"]])
+    seconds = [graph["seconds"] for graph in graphs]
+    summary = {
+        "graph_type": graph_type,
+        "count": count,
+        "seed": batch_seed,
+        "workers": workers,
+        "config_hash": get_config_hash(config),
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "mean_seconds": round(sum(seconds) / count, 3),
+        "min_seconds": min(seconds),
+        "max_seconds": max(seconds),
+        "graphs": graphs
+    }
+    with open(summary_file, "w") as f:
+        json.dump(summary, f, indent=2)
+    logging.info(f"Generated {count} graphs in {summary['total_seconds']} seconds, "
+                 f"{summary['mean_seconds']} seconds per graph. Batch summary saved to {summary_file}.")
+    return summary
 
 
 if __name__ == '__main__':
     # Parse command line arguments.
     args = parse_args()
+    configure_logging(args.log_level, sample_every=args.log_sample_every)
     output_file = args.output_file
     config_path = args.config_file
     graph_type = args.graph_type
     overwrite = args.overwrite
+    workers = args.workers
+    seed = args.seed
+    shard_count = args.shard_count
+    shard_index = args.shard_index
+    chunk_size = args.chunk_size
+    scale = args.scale
+    profiler = None
+    if args.profile is not None:
+        profiler = StageProfiler(args.profile, args.profile_out or f"{os.path.splitext(output_file)[0]}.profile")
+        if workers > 1:
+            logging.warning("Stages run in worker processes are not profiled, use --workers 1 to profile them.")
+    report = StageReport(trace_memory=args.trace_memory, labels={"graph_type": graph_type},
+                         info={"config_file": config_path, "output_file": output_file, "workers": workers,
+                               "chunk_size": chunk_size, "scale": scale, "shard_count": shard_count,
+                               "shard_index": shard_index},
+                         profiler=profiler)
 
     # Load config file.
-    with open(config_path, 'r') as f:
-        config = yaml.load(f, Loader=yaml.FullLoader)
+    with report.stage("config"):
+        with open(config_path, 'r') as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+
+        # Scale graph dimensions with a stream of the graph seed, so every shard gets the same scaled config.
+        if scale != 1:
+            streams = RandomStreams(seed)
+            seed = streams.seed
+            config = scale_config(config, scale, streams.generator("scale"))
 
     # Generate graph and save to output file.
-    generate_and_save_graph(config, graph_type, output_file)
+    if args.output_dir is not None:
+        generate_and_save_batch(config, graph_type, args.output_dir, args.count, workers=workers, seed=seed,
+                                overwrite=overwrite, chunk_size=chunk_size)
+    elif shard_count > 1 or shard_index is not None:
+        generate_and_save_shards(config, graph_type, output_file, shard_count, shard_index=shard_index,
+                                 workers=workers, seed=seed, overwrite=overwrite, chunk_size=chunk_size, report=report)
+    else:
+        generate_and_save_graph(config, graph_type, output_file, workers=workers, seed=seed, overwrite=overwrite,
+                                chunk_size=chunk_size, index=args.index, report=report)
+
+    # Save time and memory of generation stages.
+    if args.report_file is not None:
+        report.save_json(args.report_file)
+        logging.info(f"Stage report saved to {args.report_file}.")
+    if args.prometheus_file is not None:
+        report.save_prometheus(args.prometheus_file)
+        logging.info(f"Stage metrics saved to {args.prometheus_file}.")
+    if profiler is not None:
+        profile_files = profiler.save()
+        logging.info(f"Saved {len(profile_files)} {args.profile} profile files of stages to {profiler.output_prefix}.*")
@@ -0,0 +1,328 @@
+"""
+This module implements graph backends compared by compare_backends.py: proto, networkx GraphML, igraph and Neo4j CSV.
+
+A backend builds its graph from a proto graph, saves it to a file, loads it, and answers traversal queries on the
+loaded graph through a view with three methods:
+    get_node(key) - attributes of a node, in the native form of the backend.
+    get_successors(key), get_predecessors(key) - keys of the nodes connected to a node.
+Nodes are keyed like in NxGraph (ex. dataset_5), and edges go in the direction of containment and data flow:
+collection -> dataset collection -> dataset, dataset -> processing -> system for inputs and system -> processing ->
+dataset for outputs.
+
+Backends:
+    proto - ProtoGraph. Proto messages have no adjacency, so it is indexed in dictionaries when the graph is loaded,
+            record by record with proto_container.py.
+    networkx - NxGraph saved as GraphML, loaded as networkx DiGraph.
+    igraph - igraph Graph built from the nodes and edges collected by NxGraph, as deprecated/i_graph.py did, saved in
+             the igraph pickle format. Needs the optional igraph package.
+    neo4j_csv - CSV files of neo4j-admin database import: a directory with a node file per node type and a
+                relationship file per edge label. Loading parses the files to dictionaries, it doesn't measure a
+                Neo4j server.
+
+New backends subclass GraphBackend and are added with register_backend().
+
+Usage:
+    backend = BACKENDS["networkx"]()
+    backend.save(backend.build(proto_graph), "graph.graphml")
+    view = backend.load("graph.graphml")
+    view.get_successors("dataset_1")
+"""
+
+import csv
+import os
+from collections import defaultdict
+
+import networkx as nx
+
+from nx_graph import NxGraph
+from proto_container import ProtoContainerReader
+from proto_graph import ProtoGraph
+from proto_to_nx import add_proto_nodes
+
+try:
+    import igraph
+except ImportError:
+    igraph = None
+
+
+def get_node_type(key):
+    """Returns type of a node key, ex. dataset_collection_5 -> dataset_collection."""
+    return key.rsplit("_", 1)[0]
+
+
+class AdjacencyView:
+    """
+    A view of a graph loaded to dictionaries.
+
+    ...
+
+    Attributes:
+        nodes: Dictionary that maps node key to its attributes.
+        successors, predecessors: Dictionaries that map node key to the list of connected node keys.
+    """
+    def __init__(self, nodes, successors, predecessors):
+        self.nodes = nodes
+        self.successors = successors
+        self.predecessors = predecessors
+
+    def get_node(self, key):
+        return self.nodes[key]
+
+    def get_successors(self, key):
+        return self.successors.get(key, [])
+
+    def get_predecessors(self, key):
+        return self.predecessors.get(key, [])
+
+
+class NetworkxView:
+    """A view of a networkx DiGraph."""
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get_node(self, key):
+        return self.graph.nodes[key]
+
+    def get_successors(self, key):
+        return list(self.graph.succ[key])
+
+    def get_predecessors(self, key):
+        return list(self.graph.pred[key])
+
+
+class IgraphView:
+    """A view of an igraph Graph with vertex names."""
+    def __init__(self, graph):
+        self.graph = graph
+        self.names = graph.vs["name"]
+        self.indices = {name: index for index, name in enumerate(self.names)}
+
+    def get_node(self, key):
+        return self.graph.vs[self.indices[key]].attributes()
+
+    def get_successors(self, key):
+        names = self.names
+        return [names[index] for index in self.graph.successors(self.indices[key])]
+
+    def get_predecessors(self, key):
+        names = self.names
+        return [names[index] for index in self.graph.predecessors(self.indices[key])]
+
+
+class GraphBackend:
+    """
+    A base class of graph backends.
+
+    ...
+
+    Attributes:
+        name: String, name of the backend.
+        extension: String, extension of saved graphs.
+
+    Methods:
+        is_available()
+            Returns False if the backend needs a package that is not installed.
+        build(proto_graph)
+            Builds the graph of the backend from a ProtoGraph and returns it.
+        save(graph, filename)
+            Saves a built graph.
+        load(filename)
+            Loads a saved graph and returns a view to query it.
+        get_size(filename)
+            Returns size of a saved graph in bytes.
+    """
+    name = None
+    extension = None
+
+    @staticmethod
+    def is_available():
+        return True
+
+    def build(self, proto_graph):
+        raise NotImplementedError
+
+    def save(self, graph, filename):
+        raise NotImplementedError
+
+    def load(self, filename):
+        raise NotImplementedError
+
+    @staticmethod
+    def get_size(filename):
+        if os.path.isdir(filename):
+            return sum(os.path.getsize(os.path.join(filename, name)) for name in os.listdir(filename))
+        return os.path.getsize(filename)
+
+
+class ProtoBackend(GraphBackend):
+    name = "proto"
+    extension = ".bin"
+
+    def build(self, proto_graph):
+        graph = ProtoGraph()
+        add_proto_nodes(proto_graph, graph)
+        return graph
+
+    def save(self, graph, filename):
+        graph.save_to_file(filename, overwrite=True)
+
+    def load(self, filename):
+        # Records are read one by one from the file as a container, the whole graph message is never parsed.
+        nodes = {}
+        successors, predecessors = defaultdict(list), defaultdict(list)
+
+        def add_edge(source, target):
+            successors[source].append(target)
+            predecessors[target].append(source)
+
+        with ProtoContainerReader(filename) as reader:
+            for field, message in reader.iter_records():
+                if field == "collections":
+                    nodes[f"collection_{message.collection_id}"] = message
+                elif field == "dataset_collections":
+                    key = f"dataset_collection_{message.dataset_collection_id}"
+                    nodes[key] = message
+                    add_edge(f"collection_{message.collection_id}", key)
+                elif field == "system_collections":
+                    key = f"system_collection_{message.system_collection_id}"
+                    nodes[key] = message
+                    add_edge(f"collection_{message.collection_id}", key)
+                elif field == "datasets":
+                    key = f"dataset_{message.dataset_id}"
+                    nodes[key] = message
+                    add_edge(f"dataset_collection_{message.dataset_collection_id}", key)
+                elif field == "systems":
+                    key = f"system_{message.system_id}"
+                    nodes[key] = message
+                    add_edge(f"system_collection_{message.system_collection_id}", key)
+                elif field == "processings":
+                    key = f"processing_{message.processing_id}"
+                    nodes[key] = message
+                    dataset, system = f"dataset_{message.dataset_id}", f"system_{message.system_id}"
+                    if message.inputs:
+                        add_edge(dataset, key)
+                        add_edge(key, system)
+                    else:
+                        add_edge(key, dataset)
+                        add_edge(system, key)
+                elif field == "data_integrities":
+                    key = f"data_integrity_{message.data_integrity_id}"
+                    nodes[key] = message
+                    add_edge(f"dataset_collection_{message.dataset_collection_id}", key)
+        return AdjacencyView(nodes, dict(successors), dict(predecessors))
+
+
+class NetworkxBackend(GraphBackend):
+    name = "networkx"
+    extension = ".graphml"
+
+    def build(self, proto_graph):
+        graph = NxGraph()
+        add_proto_nodes(proto_graph, graph)
+        return graph.build_graph()
+
+    def save(self, graph, filename):
+        nx.write_graphml(graph, filename)
+
+    def load(self, filename):
+        return NetworkxView(nx.read_graphml(filename))
+
+
+class IgraphBackend(GraphBackend):
+    name = "igraph"
+    extension = ".igraph.pickle"
+
+    @staticmethod
+    def is_available():
+        return igraph is not None
+
+    def build(self, proto_graph):
+        # Nodes and edges are collected first and added to igraph at once, adding them one by one is slow.
+        collected = NxGraph()
+        add_proto_nodes(proto_graph, collected)
+        attribute_names = list(dict.fromkeys(name for _, attributes in collected.nodes for name in attributes))
+        graph = igraph.Graph(directed=True)
+        graph.add_vertices([node for node, _ in collected.nodes],
+                           attributes={name: [attributes.get(name) for _, attributes in collected.nodes]
+                                       for name in attribute_names})
+        edges = [edge for edge_type in collected.edges for edge in collected.edges[edge_type]]
+        labels = [collected.edge_types[edge_type] for edge_type in collected.edges
+                  for _ in collected.edges[edge_type]]
+        graph.add_edges(edges, attributes={"label": labels})
+        return graph
+
+    def save(self, graph, filename):
+        graph.write_pickle(filename)
+
+    def load(self, filename):
+        return IgraphView(igraph.Graph.Read_Pickle(filename))
+
+
+class Neo4jCsvBackend(GraphBackend):
+    name = "neo4j_csv"
+    extension = ".neo4j"
+
+    def build(self, proto_graph):
+        """Returns dictionary of CSV file name -> (header, rows) in the format of neo4j-admin database import."""
+        collected = NxGraph()
+        add_proto_nodes(proto_graph, collected)
+        nodes_by_type = defaultdict(list)
+        for node, attributes in collected.nodes:
+            nodes_by_type[attributes["type"]].append((node, attributes))
+
+        files = {}
+        for node_type, nodes in nodes_by_type.items():
+            names = [name for name in nodes[0][1] if name != "type"]
+            # Integer properties are typed, the others are strings.
+            header = [":ID"] + [f"{name}:long" if isinstance(nodes[0][1][name], int) else name for name in names] + \
+                [":LABEL"]
+            files[f"nodes_{node_type}.csv"] = (header, [[node] + [attributes[name] for name in names] + [node_type]
+                                                        for node, attributes in nodes])
+        for edge_type, edges in collected.edges.items():
+            label = collected.edge_types[edge_type]
+            header, rows = files.setdefault(f"relationships_{label}.csv", ([":START_ID", ":END_ID", ":TYPE"], []))
+            rows.extend([source, target, label] for source, target in edges)
+        return files
+
+    def save(self, graph, filename):
+        os.makedirs(filename, exist_ok=True)
+        for name, (header, rows) in graph.items():
+            with open(os.path.join(filename, name), "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+
+    def load(self, filename):
+        nodes = {}
+        successors, predecessors = defaultdict(list), defaultdict(list)
+        for name in sorted(os.listdir(filename)):
+            with open(os.path.join(filename, name), newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader)
+                if name.startswith("nodes_"):
+                    columns = [(index, column.split(":")[0], column.endswith(":long"))
+                               for index, column in enumerate(header) if not column.startswith(":")]
+                    for row in reader:
+                        nodes[row[0]] = {column: int(row[index]) if is_long else row[index]
+                                         for index, column, is_long in columns}
+                else:
+                    for source, target, _ in reader:
+                        successors[source].append(target)
+                        predecessors[target].append(source)
+        return AdjacencyView(nodes, dict(successors), dict(predecessors))
+
+
+BACKENDS = {backend.name: backend for backend in (ProtoBackend, NetworkxBackend, IgraphBackend, Neo4jCsvBackend)}
+
+
+def register_backend(backend):
+    """
+    Adds a GraphBackend subclass to BACKENDS, so it is compared with the other backends.
+
+    Raises:
+        ValueError: A backend with this name already exists.
+    """
+    if backend.name in BACKENDS:
+        raise ValueError(f"Backend {backend.name} already exists.")
+    BACKENDS[backend.name] = backend
+    return backend
@@ -0,0 +1,482 @@
+"""
+This module evolves an existing proto graph step by step and saves every step as a GraphDelta message.
+
+A step makes three kinds of changes, given as fractions of the current graph:
+    churn - random datasets and systems are removed with all their processings.
+    rewire - pairs of processings of the same kind exchange their systems (double edge swap), so the number of
+             reads, writes, inputs and outputs of every node stays the same.
+    growth - new datasets and systems are added. Their numbers of reads / writes / inputs / outputs are sampled from
+             the count maps of the config. The other end of every new processing is the end of a random existing
+             processing of the same kind, so existing nodes are picked in proportion to their degree and degree
+             distributions keep their shape.
+
+The graph is loaded once into NumPy arrays indexed by id. A step only samples and touches changed nodes and
+processings: random nodes and processings are drawn by rejection from these arrays, and processings of a node are
+found with CSR offsets of the loaded graph, plus the processings added or rewired later. So the runtime of a step
+depends on the size of the change, not on the size of the graph. Ids are never reused.
+
+Usage:
+    python3 graph_generation/graph_evolution.py \
+         --graph_file "output.bin" \
+         --config_file "graph_generation/configs/config_15_09_20.yaml" \
+         --delta_file "delta.bin" \
+         --growth 0.01 \
+         --churn 0.005 \
+         --rewire 0.01 \
+         --steps 7 \
+         --seed 42 \
+         --evolved_graph_file "evolved.bin" \
+         --log_level INFO \
+         --overwrite
+
+    Parameters info:
+        every step is saved to its own file: delta-00001.bin, delta-00002.bin, ...
+        delta and graph files with .gz or .zst extensions are compressed (see compression.py).
+        growth and churn are fractions of datasets and systems, rewire is a fraction of processings changed in a step.
+        evolved_graph_file is optional, the input graph with all deltas applied is saved to it.
+        log_level is DEBUG / INFO / WARNING / ERROR / CRITICAL, INFO if not specified.
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import numpy as np
+import yaml
+
+from attribute_generator import AttributeGenerator, compile_samplers
+from compression import open_file, split_compression
+from connection_store import Relation
+from generate_from_config import get_graph_params
+from progress import LOG_LEVELS, configure_logging
+from proto import config_pb2
+from proto_graph import ProtoGraph
+from random_streams import RandomStreams
+
+
+def get_step_file(delta_file, step):
+    """Returns file name of an evolution step, ex. delta-00003.bin or delta-00003.bin.gz."""
+    name, compression_extension = split_compression(delta_file)
+    root, extension = os.path.splitext(name)
+    return f"{root}-{step:05d}{extension}{compression_extension}"
+
+
+def _resize(array, size):
+    """Returns array with at least size elements, new elements are zeros. Capacity at least doubles."""
+    if len(array) >= size:
+        return array
+    resized = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    resized[:len(array)] = array
+    return resized
+
+
+def apply_delta(graph, delta):
+    """Returns a new ProtoGraph message, that is the graph with the GraphDelta applied."""
+    removed_datasets = set(delta.removed_dataset_ids)
+    removed_systems = set(delta.removed_system_ids)
+    removed_processings = set(delta.removed_processing_ids)
+    rewired_processings = {processing.processing_id: processing for processing in delta.rewired_processings}
+
+    evolved_graph = config_pb2.ProtoGraph()
+    evolved_graph.collections.extend(graph.collections)
+    evolved_graph.dataset_collections.extend(graph.dataset_collections)
+    evolved_graph.system_collections.extend(graph.system_collections)
+    evolved_graph.data_integrities.extend(graph.data_integrities)
+    evolved_graph.datasets.extend(dataset for dataset in graph.datasets if dataset.dataset_id not in removed_datasets)
+    evolved_graph.systems.extend(system for system in graph.systems if system.system_id not in removed_systems)
+    evolved_graph.processings.extend(rewired_processings.get(processing.processing_id, processing)
+                                     for processing in graph.processings
+                                     if processing.processing_id not in removed_processings)
+    evolved_graph.MergeFrom(delta.added)
+    return evolved_graph
+
+
+class GraphEvolution:
+    """
+    A class to generate a sequence of deltas of a proto graph.
+
+    ...
+
+    Attributes:
+        config: Dictionary of a yaml config. Count maps and attribute maps of new nodes are taken from it.
+        streams: RandomStreams of the evolution, every step uses its own streams.
+        step: Integer, number of generated steps.
+        dataset_collections: Array of dataset collection id of every dataset id, 0 for missing datasets.
+        system_collections: Array of system collection id of every system id, 0 for missing systems.
+        processing_datasets: Array of dataset id of every processing id, 0 for missing processings.
+        processing_systems: Array of system id of every processing id.
+        processing_inputs: Boolean array, true if the processing is a dataset read (system input).
+        processing_impacts: Array of processing impact enums.
+        processing_freshness: Array of processing freshness enums.
+        next_ids: Dictionary that maps node type to the id of the next added node.
+        dataset_count, system_count: Integers, number of datasets and systems in the current graph.
+        processing_counts: Dictionary that maps inputs flag to the number of processings of that kind.
+
+    Methods:
+        evolve(growth=0.0, churn=0.0, rewire=0.0)
+            Makes one step of changes and returns it as a GraphDelta message.
+    """
+    def __init__(self, graph, config, seed=None):
+        """
+        Args:
+            graph: ProtoGraph message.
+            config: Dictionary of a yaml config.
+            seed: Integer seed of the evolution.
+        """
+        self.config = config
+        self.streams = RandomStreams(seed)
+        self.step = 0
+        self.dataset_params, self.system_params, self.dataset_to_system_params, self.collection_params, \
+            self.processing_params, self.data_integrity_params = get_graph_params(config)
+        self.samplers = compile_samplers(dataset_params=self.dataset_params, system_params=self.system_params,
+                                         processing_params=self.processing_params,
+                                         data_integrity_params=self.data_integrity_params)
+
+        dataset_ids = np.fromiter((dataset.dataset_id for dataset in graph.datasets), dtype=np.int64,
+                                  count=len(graph.datasets))
+        system_ids = np.fromiter((system.system_id for system in graph.systems), dtype=np.int64,
+                                 count=len(graph.systems))
+        processing_ids = np.fromiter((processing.processing_id for processing in graph.processings), dtype=np.int64,
+                                     count=len(graph.processings))
+
+        self.dataset_collections = np.zeros(dataset_ids.max(initial=0) + 1, dtype=np.int64)
+        self.dataset_collections[dataset_ids] = [dataset.dataset_collection_id for dataset in graph.datasets]
+        self.system_collections = np.zeros(system_ids.max(initial=0) + 1, dtype=np.int64)
+        self.system_collections[system_ids] = [system.system_collection_id for system in graph.systems]
+
+        size = processing_ids.max(initial=0) + 1
+        self.processing_datasets = np.zeros(size, dtype=np.int64)
+        self.processing_datasets[processing_ids] = [processing.dataset_id for processing in graph.processings]
+        self.processing_systems = np.zeros(size, dtype=np.int64)
+        self.processing_systems[processing_ids] = [processing.system_id for processing in graph.processings]
+        self.processing_inputs = np.zeros(size, dtype=bool)
+        self.processing_inputs[processing_ids] = [processing.inputs for processing in graph.processings]
+        self.processing_impacts = np.zeros(size, dtype=np.int64)
+        self.processing_impacts[processing_ids] = [processing.impact for processing in graph.processings]
+        self.processing_freshness = np.zeros(size, dtype=np.int64)
+        self.processing_freshness[processing_ids] = [processing.freshness for processing in graph.processings]
+
+        self.next_ids = {"dataset": len(self.dataset_collections), "system": len(self.system_collections),
+                         "processing": size}
+        self.dataset_count, self.system_count = len(dataset_ids), len(system_ids)
+        input_count = int(np.count_nonzero(self.processing_inputs))
+        self.processing_counts = {True: input_count, False: len(processing_ids) - input_count}
+
+        # Processings of every node in the loaded graph, and processings added or rewired to a node later.
+        self._dataset_processings = Relation.from_pairs(self.processing_datasets[processing_ids], processing_ids,
+                                                        source_count=len(self.dataset_collections) - 1)
+        self._system_processings = Relation.from_pairs(self.processing_systems[processing_ids], processing_ids,
+                                                       source_count=len(self.system_collections) - 1)
+        self._new_dataset_processings = {}
+        self._new_system_processings = {}
+        logging.info(f"Loaded graph with {self.dataset_count} datasets, {self.system_count} systems and "
+                     f"{len(processing_ids)} processings for evolution.")
+
+    @staticmethod
+    def _sample_ids(is_alive, stop, count, rng, replace=True):
+        """
+        Returns count random ids from 1 to stop - 1, for which is_alive(ids) is true. Ids are drawn uniformly and
+        rejected until there are enough of them. Ids are distinct if replace is false.
+        """
+        sampled = np.zeros(0, dtype=np.int64)
+        while len(sampled) < count:
+            candidates = rng.integers(1, stop, size=2 * (count - len(sampled)) + 16)
+            candidates = candidates[is_alive(candidates)]
+            if replace:
+                sampled = np.concatenate([sampled, candidates[:count - len(sampled)]])
+            else:
+                sampled = np.concatenate([sampled, np.setdiff1d(np.unique(candidates), sampled)])
+        return rng.permutation(sampled)[:count]
+
+    def _sample_datasets(self, count, rng, replace=True):
+        return self._sample_ids(lambda ids: self.dataset_collections[ids] != 0, self.next_ids["dataset"], count, rng,
+                                replace)
+
+    def _sample_systems(self, count, rng, replace=True):
+        return self._sample_ids(lambda ids: self.system_collections[ids] != 0, self.next_ids["system"], count, rng,
+                                replace)
+
+    def _sample_processings(self, count, rng, inputs=None, replace=True):
+        """Returns ids of random processings, of one kind if inputs is not None."""
+        def is_alive(ids):
+            alive = self.processing_datasets[ids] != 0
+            return alive if inputs is None else alive & (self.processing_inputs[ids] == inputs)
+        return self._sample_ids(is_alive, self.next_ids["processing"], count, rng, replace)
+
+    def _get_processings(self, node_id, relation, new_processings, processing_nodes):
+        """Returns ids of processings currently connected to a dataset or a system."""
+        loaded = relation.neighbors(node_id) if node_id <= relation.source_count else []
+        candidates = np.unique(np.concatenate([loaded, new_processings.get(node_id, [])]).astype(np.int64))
+        return candidates[(self.processing_datasets[candidates] != 0) & (processing_nodes[candidates] == node_id)]
+
+    def _get_dataset_processings(self, dataset_id):
+        return self._get_processings(dataset_id, self._dataset_processings, self._new_dataset_processings,
+                                     self.processing_datasets)
+
+    def _get_system_processings(self, system_id):
+        return self._get_processings(system_id, self._system_processings, self._new_system_processings,
+                                     self.processing_systems)
+
+    def _has_processing(self, dataset_id, system_id, inputs):
+        """Returns true if the dataset already has a processing of a kind with the system."""
+        processing_ids = self._get_dataset_processings(dataset_id)
+        return bool(np.any((self.processing_systems[processing_ids] == system_id)
+                           & (self.processing_inputs[processing_ids] == inputs)))
+
+    def _reserve_ids(self, node_type, count):
+        """Returns the next count ids of a node type."""
+        start = self.next_ids[node_type]
+        self.next_ids[node_type] += count
+        return np.arange(start, start + count, dtype=np.int64)
+
+    @staticmethod
+    def _sample_degrees(count_map, count, rng):
+        """Samples count degrees using count map as a distribution."""
+        if count == 0 or not count_map:
+            return np.zeros(count, dtype=np.int64)
+        degrees = np.fromiter(count_map.keys(), dtype=np.int64)
+        counts = np.fromiter(count_map.values(), dtype=np.float64)
+        return rng.choice(degrees, size=count, p=counts / counts.sum())
+
+    def _churn(self, churn, delta, rng):
+        """Removes random datasets and systems with all their processings."""
+        removed_datasets = self._sample_datasets(int(round(churn * self.dataset_count)), rng, replace=False)
+        removed_systems = self._sample_systems(int(round(churn * self.system_count)), rng, replace=False)
+        processing_ids = [self._get_dataset_processings(i) for i in removed_datasets.tolist()]
+        processing_ids += [self._get_system_processings(i) for i in removed_systems.tolist()]
+        processing_ids = np.unique(np.concatenate(processing_ids)) if processing_ids else np.zeros(0, dtype=np.int64)
+
+        input_count = int(np.count_nonzero(self.processing_inputs[processing_ids]))
+        self.processing_counts[True] -= input_count
+        self.processing_counts[False] -= len(processing_ids) - input_count
+        self.processing_datasets[processing_ids] = 0
+        self.dataset_collections[removed_datasets] = 0
+        self.system_collections[removed_systems] = 0
+        self.dataset_count -= len(removed_datasets)
+        self.system_count -= len(removed_systems)
+
+        delta.removed_dataset_ids.extend(np.sort(removed_datasets).tolist())
+        delta.removed_system_ids.extend(np.sort(removed_systems).tolist())
+        delta.removed_processing_ids.extend(processing_ids.tolist())
+
+    def _rewire(self, rewire, delta, rng):
+        """Exchanges systems of random pairs of processings of the same kind, unless it creates a duplicate."""
+        processing_count = self.processing_counts[True] + self.processing_counts[False]
+        rewired = set()
+        for processing_1 in self._sample_processings(int(round(rewire * processing_count)), rng,
+                                                     replace=False).tolist():
+            inputs = bool(self.processing_inputs[processing_1])
+            if self.processing_counts[inputs] < 2:
+                continue
+            processing_2 = int(self._sample_processings(1, rng, inputs=inputs)[0])
+            dataset_1 = int(self.processing_datasets[processing_1])
+            system_1 = int(self.processing_systems[processing_1])
+            dataset_2 = int(self.processing_datasets[processing_2])
+            system_2 = int(self.processing_systems[processing_2])
+            if dataset_1 == dataset_2 or system_1 == system_2 or self._has_processing(dataset_1, system_2, inputs) \
+                    or self._has_processing(dataset_2, system_1, inputs):
+                continue
+            self.processing_systems[processing_1], self.processing_systems[processing_2] = system_2, system_1
+            self._new_system_processings.setdefault(system_2, []).append(processing_1)
+            self._new_system_processings.setdefault(system_1, []).append(processing_2)
+            rewired.update((processing_1, processing_2))
+
+        for processing_id in sorted(rewired):
+            processing = delta.rewired_processings.add()
+            processing.processing_id = processing_id
+            processing.dataset_id = int(self.processing_datasets[processing_id])
+            processing.system_id = int(self.processing_systems[processing_id])
+            processing.impact = int(self.processing_impacts[processing_id])
+            processing.freshness = int(self.processing_freshness[processing_id])
+            processing.inputs = bool(self.processing_inputs[processing_id])
+
+    def _grow(self, growth, delta, rng, graph_attributes):
+        """Adds new datasets and systems, and connects them to existing nodes in proportion to their degree."""
+        # New nodes join collections of random existing nodes, so collections grow in proportion to their size.
+        dataset_collections = self.dataset_collections[
+            self._sample_datasets(int(round(growth * self.dataset_count)), rng)]
+        system_collections = self.system_collections[self._sample_systems(int(round(growth * self.system_count)), rng)]
+        dataset_ids = self._reserve_ids("dataset", len(dataset_collections))
+        system_ids = self._reserve_ids("system", len(system_collections))
+
+        # The other end of a new processing is the end of a random existing processing of the same kind.
+        processings = []
+        for inputs, dataset_map, system_map in [
+                (True, self.dataset_to_system_params.dataset_read_count_map,
+                 self.dataset_to_system_params.system_input_count_map),
+                (False, self.dataset_to_system_params.dataset_write_count_map,
+                 self.dataset_to_system_params.system_output_count_map)]:
+            if self.processing_counts[inputs] == 0:
+                continue
+            new_datasets = np.repeat(dataset_ids, self._sample_degrees(dataset_map, len(dataset_ids), rng))
+            new_systems = np.repeat(system_ids, self._sample_degrees(system_map, len(system_ids), rng))
+            partner_systems = self.processing_systems[self._sample_processings(len(new_datasets), rng, inputs)]
+            partner_datasets = self.processing_datasets[self._sample_processings(len(new_systems), rng, inputs)]
+            pairs = np.unique(np.stack([np.concatenate([new_datasets, partner_datasets]),
+                                        np.concatenate([partner_systems, new_systems])]), axis=1)
+            processings.append((pairs[0], pairs[1], inputs))
+
+        self.dataset_collections = _resize(self.dataset_collections, self.next_ids["dataset"])
+        self.dataset_collections[dataset_ids] = dataset_collections
+        self.system_collections = _resize(self.system_collections, self.next_ids["system"])
+        self.system_collections[system_ids] = system_collections
+        self.dataset_count += len(dataset_ids)
+        self.system_count += len(system_ids)
+
+        added = ProtoGraph()
+        added.graph = delta.added
+        attributes = graph_attributes.get_dataset_attributes(dataset_ids)
+        added.add_datasets(dataset_ids=dataset_ids,
+                           dataset_collection_ids=dataset_collections,
+                           regex_groupings=attributes["regex_groupings"],
+                           names=attributes["names"],
+                           slos=attributes["dataset_slos"],
+                           envs=attributes["dataset_environments"],
+                           descriptions=attributes["descriptions"])
+        attributes = graph_attributes.get_system_attributes(system_ids)
+        added.add_systems(system_ids=system_ids,
+                          system_critics=attributes["system_criticalities"],
+                          system_collection_ids=system_collections,
+                          regex_groupings=attributes["regex_groupings"],
+                          names=attributes["names"],
+                          envs=attributes["system_environments"],
+                          descriptions=attributes["descriptions"])
+        for processing_datasets, processing_systems, inputs in processings:
+            self._add_processings(processing_datasets, processing_systems, inputs, added, graph_attributes)
+
+    def _add_processings(self, dataset_ids, system_ids, inputs, added, graph_attributes):
+        """Adds processings of a kind between datasets and systems to the graph and to the added graph."""
+        processing_ids = self._reserve_ids("processing", len(dataset_ids))
+        size = self.next_ids["processing"]
+        self.processing_datasets = _resize(self.processing_datasets, size)
+        self.processing_systems = _resize(self.processing_systems, size)
+        self.processing_inputs = _resize(self.processing_inputs, size)
+        self.processing_impacts = _resize(self.processing_impacts, size)
+        self.processing_freshness = _resize(self.processing_freshness, size)
+        self.processing_datasets[processing_ids] = dataset_ids
+        self.processing_systems[processing_ids] = system_ids
+        self.processing_inputs[processing_ids] = inputs
+        self.processing_counts[inputs] += len(processing_ids)
+
+        attributes = graph_attributes.get_processing_attributes(len(processing_ids))
+        added.add_processings(system_ids=system_ids,
+                              dataset_ids=dataset_ids,
+                              processing_ids=processing_ids,
+                              impacts=attributes["dataset_impacts"],
+                              freshness=attributes["dataset_freshness"],
+                              inputs=inputs)
+        processings = added.graph.processings[len(added.graph.processings) - len(processing_ids):]
+        self.processing_impacts[processing_ids] = [processing.impact for processing in processings]
+        self.processing_freshness[processing_ids] = [processing.freshness for processing in processings]
+        for processing_id, dataset_id, system_id in zip(processing_ids.tolist(), dataset_ids.tolist(),
+                                                        system_ids.tolist()):
+            self._new_dataset_processings.setdefault(dataset_id, []).append(processing_id)
+            self._new_system_processings.setdefault(system_id, []).append(processing_id)
+
+    def evolve(self, growth=0.0, churn=0.0, rewire=0.0):
+        """
+        Makes one step of changes: churn, then rewiring, then growth.
+
+        Args:
+            growth: Float, number of added datasets and systems as a fraction of the current ones.
+            churn: Float, number of removed datasets and systems as a fraction of the current ones.
+            rewire: Float, number of rewired processings as a fraction of the current ones.
+
+        Returns:
+            GraphDelta message of the step.
+
+        Raises:
+            ValueError: A fraction is negative, or churn or rewire is larger than 1.
+        """
+        if min(growth, churn, rewire) < 0 or max(churn, rewire) > 1:
+            raise ValueError("Growth, churn and rewire should be non negative, churn and rewire should be at most 1.")
+        self.step += 1
+        rng = self.streams.generator("evolution", self.step)
+        graph_attributes = AttributeGenerator(self.collection_params, self.dataset_params, self.system_params,
+                                              self.data_integrity_params, self.processing_params, None,
+                                              seed=self.streams.seed_sequence("evolution_attributes", self.step),
+                                              samplers=self.samplers)
+
+        delta = config_pb2.GraphDelta()
+        self._churn(churn, delta, rng)
+        self._rewire(rewire, delta, rng)
+        self._grow(growth, delta, rng, graph_attributes)
+        logging.info(f"Evolution step {self.step}: added {len(delta.added.datasets)} datasets, "
+                     f"{len(delta.added.systems)} systems, {len(delta.added.processings)} processings; removed "
+                     f"{len(delta.removed_dataset_ids)} datasets, {len(delta.removed_system_ids)} systems, "
+                     f"{len(delta.removed_processing_ids)} processings; rewired {len(delta.rewired_processings)} "
+                     f"processings.")
+        return delta
+
+
+def save_delta(delta, filename, overwrite=False):
+    """
+    Saves GraphDelta message to binary. If overwrite - existing file will be overwritten.
+
+    Raises:
+        ValueError: Delta with this file already exists.
+    """
+    if os.path.isfile(filename) and not overwrite:
+        raise ValueError("Delta with this file already exists.")
+    with open_file(filename, "wb") as f:
+        f.write(delta.SerializeToString())
+    logging.info(f"Graph delta saved to {filename}.")
+
+
+def read_delta(filename):
+    """Reads GraphDelta message from binary."""
+    delta = config_pb2.GraphDelta()
+    with open_file(filename, "rb") as f:
+        delta.ParseFromString(f.read())
+    return delta
+
+
+def parse_args():
+    """Parses input arguments."""
+    parser = argparse.ArgumentParser(description='Generate deltas of an evolving proto graph.')
+    parser.add_argument('-g', '--graph_file', help='Path to an input proto binary.', required=True)
+    parser.add_argument('-c', '--config_file', help='Path to yaml config file with graph parameters.', required=True)
+    parser.add_argument('-d', '--delta_file', help='Path to output delta binaries, step number is appended.',
+                        required=True)
+    parser.add_argument('--growth', help='Fraction of added datasets and systems in a step.', type=float, default=0.0)
+    parser.add_argument('--churn', help='Fraction of removed datasets and systems in a step.', type=float, default=0.0)
+    parser.add_argument('--rewire', help='Fraction of rewired processings in a step.', type=float, default=0.0)
+    parser.add_argument('--steps', help='Number of evolution steps.', type=int, default=1)
+    parser.add_argument('-s', '--seed', help='Random seed of the evolution.', type=int, default=None)
+    parser.add_argument('-e', '--evolved_graph_file', help='Path to the graph with all deltas applied.', default=None)
+    parser.add_argument('-o', '--overwrite', help='If output file exists, overwrite it.', type=bool, default=False)
+    parser.add_argument('--log_level', '--log-level', help='Logging level.', default="INFO",
+                        choices=LOG_LEVELS, type=str.upper)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_logging(args.log_level)
+    if args.steps < 1:
+        raise ValueError("Number of steps should be positive.")
+
+    with open(args.config_file, 'r') as f:
+        config = yaml.load(f, Loader=yaml.FullLoader)
+    proto_graph = ProtoGraph()
+    proto_graph.read_from_file(args.graph_file)
+
+    start = time.time()
+    evolution = GraphEvolution(proto_graph.graph, config, seed=args.seed)
+    logging.info(f"Loaded graph for evolution in {round(time.time() - start, 2)} seconds, "
+                 f"seed {evolution.streams.seed}.")
+
+    graph = proto_graph.graph
+    for step in range(1, args.steps + 1):
+        start = time.time()
+        delta = evolution.evolve(growth=args.growth, churn=args.churn, rewire=args.rewire)
+        logging.info(f"Generated evolution step {step} in {round(time.time() - start, 2)} seconds.")
+        save_delta(delta, get_step_file(args.delta_file, step), overwrite=args.overwrite)
+        if args.evolved_graph_file is not None:
+            graph = apply_delta(graph, delta)
+
+    if args.evolved_graph_file is not None:
+        evolved_graph = ProtoGraph()
+        evolved_graph.graph = graph
+        evolved_graph.save_to_file(args.evolved_graph_file, overwrite=args.overwrite)
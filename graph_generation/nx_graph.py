@@ -22,11 +22,55 @@ While creating the nodes, the following two way connections will be created:
 
 To optimize generation, vertices and edges are not added iteratively, but all at the same time.
 The networkx itself will be generated in the method save_to_file.
+
+Every node type also has a bulk method add_<node type>s(), that takes whole columns of ids and attributes (lists,
+ranges or columns of attribute_columns.py) and builds all nodes and edges in one pass. Enum attributes are stored
+as names, and can also be given as arrays of proto enum numbers, which are decoded by enum_codecs.py.
+Added nodes are counted by a ProgressCounter (see progress.py) instead of being logged one by one.
+
+A graph can also be written in chunks without building networkx graph: open_stream() writes GraphML header with
+declarations of all node attributes, flush() appends nodes and edges generated so far and clears them,
+close_stream() writes the rest. Nodes and edges can go in any order in GraphML, so nx.read_graphml() reads the file.
+
+GraphML files with .gz or .zst extensions are compressed and decompressed on the fly (see compression.py).
 """
 
 import networkx as nx
 import os
 import logging
+from xml.sax.saxutils import escape, quoteattr
+
+from attribute_columns import to_list
+from compression import open_file
+from enum_codecs import ENV, PROCESSING_FRESHNESS, PROCESSING_IMPACT, SYSTEM_CRITICALITY
+from progress import ProgressCounter
+
+# GraphML types of attributes of generated nodes, "long" is the type networkx writes for integers.
+GRAPHML_NODE_ATTRIBUTES = {
+    "id": "long",
+    "collection_id": "long",
+    "dataset_collection_id": "long",
+    "system_collection_id": "long",
+    "regex_grouping": "string",
+    "node_name": "string",
+    "description": "string",
+    "slo": "long",
+    "env": "string",
+    "system_critic": "string",
+    "impact": "string",
+    "freshness": "string",
+    "data_integrity_rec_time": "long",
+    "data_integrity_rest_time": "long",
+    "data_integrity_reg_time": "long",
+    "data_integrity_volat": "long",
+    "type": "string"
+}
+
+GRAPHML_HEADER = ('<?xml version=\'1.0\' encoding=\'utf-8\'?>\n'
+                  '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+                  'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                  'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+                  'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n')
 
 
 class NxGraph:
@@ -35,6 +79,12 @@ class NxGraph:
 
     ...
 
+    Attributes:
+        graph: networkx DiGraph, built by save_to_file().
+        nodes: List of generated (node, attributes) pairs.
+        edges: Dictionary that maps edge type to the list of generated edges.
+        progress: ProgressCounter of added nodes of every type.
+
     Methods:
         generate_collection(collection_id, name)
             Generates a collection with the given id.
@@ -59,11 +109,26 @@ class NxGraph:
                                 data_integrity_reg_time, data_integrity_rest_time)
             Generates a data integrity node, that corresponds to a specific dataset, having the attributes.
 
+        add_collections(collection_ids, names), add_datasets(dataset_ids, dataset_collection_ids, ...), ...
+            Generate many nodes of a type from columns, with the arguments of generate_<node type>() as columns.
+
+        build_graph()
+            Adds generated nodes and edges to the networkx directed graph (DiGraph) and returns it.
+
         save_to_file(filename, overwrite=False)
             Loads graph to networkx directed graph (DiGraph) object and saves generated graph message to .net binary.
 
         read_from_file(filename, overwrite=False)
             Reads graph message from .net binary.
+
+        open_stream(filename, overwrite=False)
+            Opens GraphML file to write the graph in chunks.
+
+        flush()
+            Appends generated nodes and edges to the opened GraphML file and clears them.
+
+        close_stream()
+            Flushes the rest of generated nodes and edges and closes the GraphML file.
     """
     def __init__(self):
         self.graph = nx.DiGraph()
@@ -76,6 +141,10 @@ class NxGraph:
                            "dataset_to_system_output": "OUTPUTS",
                            "data_integrity_to_dataset_collection": "HAS"}
         self.edges = {edge: [] for edge in self.edge_types}
+        self.progress = ProgressCounter("NxGraph")
+        self._stream = None
+        self._stream_filename = None
+        self._keys = {}
 
     def generate_collection(self, collection_id, name):
         """Generates collection node."""
@@ -84,7 +153,7 @@ class NxGraph:
                            "type": "collection"}
         node = (f"collection_{collection_id}", node_attributes)
         self.nodes.append(node)
-        logging.info(f"NxGraph. Added collection {collection_id}.")
+        self.progress.add("collection", item_id=collection_id)
 
     def generate_dataset_collection(self, dataset_collection_id, collection_id, name):
         """Generates dataset collection node and dataset collection - collection edge."""
@@ -96,7 +165,7 @@ class NxGraph:
         self.nodes.append(node)
         self.edges["dataset_collection_to_collection"].append((f"collection_{collection_id}",
                                                                f"dataset_collection_{dataset_collection_id}"))
-        logging.info(f"NxGraph. Added dataset collection {dataset_collection_id}.")
+        self.progress.add("dataset_collection", item_id=dataset_collection_id)
 
     def generate_system_collection(self, system_collection_id, collection_id, name):
         """Generates system collection node and system collection - collection edge."""
@@ -108,7 +177,7 @@ class NxGraph:
         self.nodes.append(node)
         self.edges["system_collection_to_collection"].append((f"collection_{collection_id}",
                                                               f"system_collection_{system_collection_id}"))
-        logging.info(f"NxGraph. Added system collection {system_collection_id}.")
+        self.progress.add("system_collection", item_id=system_collection_id)
 
     def generate_dataset(self, dataset_id, dataset_collection_id, regex_grouping, name, slo, env, description):
         """Generates dataset node and dataset - dataset collection edge."""
@@ -124,7 +193,7 @@ class NxGraph:
         self.nodes.append(node)
         self.edges["dataset_to_dataset_collection"].append((f"dataset_collection_{dataset_collection_id}",
                                                             f"dataset_{dataset_id}"))
-        logging.info(f"NxGraph. Added dataset {dataset_id}.")
+        self.progress.add("dataset", item_id=dataset_id)
 
     def generate_system(self, system_id, system_critic, system_collection_id, regex_grouping, name, env, description):
         """Generates system node and system - system collection edge."""
@@ -141,7 +210,7 @@ class NxGraph:
         self.nodes.append(node)
         self.edges["system_to_system_collection"].append((f"system_collection_{system_collection_id}",
                                                           f"system_{system_id}"))
-        logging.info(f"NxGraph. Added system {system_id}.")
+        self.progress.add("system", item_id=system_id)
 
     def generate_processing(self, system_id, dataset_id, processing_id, impact, freshness, inputs=True):
         """Generates processing node and processing - dataset, processing - system edges."""
@@ -159,7 +228,7 @@ class NxGraph:
         else:
             self.edges["dataset_to_system_output"].append((f"processing_{processing_id}", f"dataset_{dataset_id}"))
             self.edges["dataset_to_system_output"].append((f"system_{system_id}", f"processing_{processing_id}"))
-        logging.info(f"NxGraph. Added processing {processing_id}.")
+        self.progress.add("processing", item_id=processing_id)
 
     def generate_data_integrity(self, data_integrity_id, dataset_collection_id, data_integrity_rec_time,
                                 data_integrity_volat, data_integrity_reg_time, data_integrity_rest_time):
@@ -174,7 +243,131 @@ class NxGraph:
         self.nodes.append(node)
         self.edges["data_integrity_to_dataset_collection"].append((f"dataset_collection_{dataset_collection_id}",
                                                                    f"data_integrity_{data_integrity_id}"))
-        logging.info(f"NxGraph. Added data integrity {data_integrity_id}.")
+        self.progress.add("data_integrity", item_id=data_integrity_id)
+
+    def add_collections(self, collection_ids, names):
+        """Generates collection nodes from columns."""
+        self.nodes.extend((f"collection_{collection_id}", {"id": collection_id, "node_name": name, "type": "collection"})
+                          for collection_id, name in zip(to_list(collection_ids), to_list(names)))
+        self.progress.add("collection", len(collection_ids))
+
+    def add_dataset_collections(self, dataset_collection_ids, collection_ids, names):
+        """Generates dataset collection nodes and dataset collection - collection edges from columns."""
+        pairs = list(zip(to_list(dataset_collection_ids), to_list(collection_ids)))
+        self.nodes.extend((f"dataset_collection_{dataset_collection_id}",
+                           {"id": dataset_collection_id,
+                            "collection_id": collection_id,
+                            "node_name": name,
+                            "type": "dataset_collection"})
+                          for (dataset_collection_id, collection_id), name in zip(pairs, to_list(names)))
+        self.edges["dataset_collection_to_collection"].extend(
+            (f"collection_{collection_id}", f"dataset_collection_{dataset_collection_id}")
+            for dataset_collection_id, collection_id in pairs)
+        self.progress.add("dataset_collection", len(pairs))
+
+    def add_system_collections(self, system_collection_ids, collection_ids, names):
+        """Generates system collection nodes and system collection - collection edges from columns."""
+        pairs = list(zip(to_list(system_collection_ids), to_list(collection_ids)))
+        self.nodes.extend((f"system_collection_{system_collection_id}",
+                           {"id": system_collection_id,
+                            "collection_id": collection_id,
+                            "node_name": name,
+                            "type": "system_collection"})
+                          for (system_collection_id, collection_id), name in zip(pairs, to_list(names)))
+        self.edges["system_collection_to_collection"].extend(
+            (f"collection_{collection_id}", f"system_collection_{system_collection_id}")
+            for system_collection_id, collection_id in pairs)
+        self.progress.add("system_collection", len(pairs))
+
+    def add_datasets(self, dataset_ids, dataset_collection_ids, regex_groupings, names, slos, envs, descriptions):
+        """Generates dataset nodes and dataset - dataset collection edges from columns."""
+        pairs = list(zip(to_list(dataset_ids), to_list(dataset_collection_ids)))
+        self.nodes.extend((f"dataset_{dataset_id}",
+                           {"id": dataset_id,
+                            "dataset_collection_id": dataset_collection_id,
+                            "regex_grouping": regex_grouping,
+                            "node_name": name,
+                            "description": description,
+                            "slo": slo,
+                            "env": env,
+                            "type": "dataset"})
+                          for (dataset_id, dataset_collection_id), regex_grouping, name, slo, env, description in zip(
+                              pairs, to_list(regex_groupings), to_list(names), to_list(slos), to_list(ENV.to_names(envs)),
+                              to_list(descriptions)))
+        self.edges["dataset_to_dataset_collection"].extend(
+            (f"dataset_collection_{dataset_collection_id}", f"dataset_{dataset_id}")
+            for dataset_id, dataset_collection_id in pairs)
+        self.progress.add("dataset", len(pairs))
+
+    def add_systems(self, system_ids, system_critics, system_collection_ids, regex_groupings, names, envs,
+                    descriptions):
+        """Generates system nodes and system - system collection edges from columns."""
+        pairs = list(zip(to_list(system_ids), to_list(system_collection_ids)))
+        self.nodes.extend((f"system_{system_id}",
+                           {"id": system_id,
+                            "system_collection_id": system_collection_id,
+                            "regex_grouping": regex_grouping,
+                            "node_name": name,
+                            "description": description,
+                            "system_critic": system_critic,
+                            "env": env,
+                            "type": "system"})
+                          for (system_id, system_collection_id), system_critic, regex_grouping, name, env, description
+                          in zip(pairs, to_list(SYSTEM_CRITICALITY.to_names(system_critics)), to_list(regex_groupings),
+                                 to_list(names), to_list(ENV.to_names(envs)), to_list(descriptions)))
+        self.edges["system_to_system_collection"].extend(
+            (f"system_collection_{system_collection_id}", f"system_{system_id}")
+            for system_id, system_collection_id in pairs)
+        self.progress.add("system", len(pairs))
+
+    def add_processings(self, system_ids, dataset_ids, processing_ids, impacts, freshness, inputs=True):
+        """Generates processing nodes and their edges from columns, all of them are inputs or all are outputs."""
+        processings = list(zip(to_list(system_ids), to_list(dataset_ids), to_list(processing_ids)))
+        self.nodes.extend((f"processing_{processing_id}",
+                           {"id": processing_id,
+                            "impact": impact,
+                            "freshness": processing_freshness,
+                            "type": "processing"})
+                          for (_, _, processing_id), impact, processing_freshness in zip(
+                              processings, to_list(PROCESSING_IMPACT.to_names(impacts)),
+                              to_list(PROCESSING_FRESHNESS.to_names(freshness))))
+        if inputs:
+            self.edges["dataset_to_system_input"].extend(
+                edge for system_id, dataset_id, processing_id in processings
+                for edge in ((f"dataset_{dataset_id}", f"processing_{processing_id}"),
+                             (f"processing_{processing_id}", f"system_{system_id}")))
+        else:
+            self.edges["dataset_to_system_output"].extend(
+                edge for system_id, dataset_id, processing_id in processings
+                for edge in ((f"processing_{processing_id}", f"dataset_{dataset_id}"),
+                             (f"system_{system_id}", f"processing_{processing_id}")))
+        self.progress.add("processing", len(processings))
+
+    def add_data_integrities(self, data_integrity_ids, dataset_collection_ids, data_integrity_rec_times,
+                             data_integrity_volats, data_integrity_reg_times, data_integrity_rest_times):
+        """Generates data integrity nodes and dataset collection - data integrity edges from columns."""
+        pairs = list(zip(to_list(data_integrity_ids), to_list(dataset_collection_ids)))
+        self.nodes.extend((f"data_integrity_{data_integrity_id}",
+                           {"id": data_integrity_id,
+                            "data_integrity_rec_time": rec_time,
+                            "data_integrity_rest_time": rest_time,
+                            "data_integrity_reg_time": reg_time,
+                            "data_integrity_volat": int(volat),
+                            "type": "data_integrity"})
+                          for (data_integrity_id, _), rec_time, volat, reg_time, rest_time in zip(
+                              pairs, to_list(data_integrity_rec_times), to_list(data_integrity_volats),
+                              to_list(data_integrity_reg_times), to_list(data_integrity_rest_times)))
+        self.edges["data_integrity_to_dataset_collection"].extend(
+            (f"dataset_collection_{dataset_collection_id}", f"data_integrity_{data_integrity_id}")
+            for data_integrity_id, dataset_collection_id in pairs)
+        self.progress.add("data_integrity", len(pairs))
+
+    def build_graph(self):
+        """Adds generated nodes and edges to the networkx graph and returns it."""
+        self.graph.add_nodes_from(self.nodes)
+        for edge_type in self.edges:
+            self.graph.add_edges_from(self.edges[edge_type], label=self.edge_types[edge_type])
+        return self.graph
 
     def save_to_file(self, filename, overwrite=False):
         """Saves generated graph to .net file.
@@ -182,15 +375,14 @@ class NxGraph:
         Raises:
             ValueError: Graph database with this file already exists.
         """
-        self.graph.add_nodes_from(self.nodes)
-        for edge_type in self.edges:
-            self.graph.add_edges_from(self.edges[edge_type], label=self.edge_types[edge_type])
+        self.build_graph()
 
         if os.path.isfile(filename) and overwrite:
             os.remove(filename)
         elif os.path.isfile(filename):
             raise ValueError("Graph database with this file already exists.")
-        nx.write_graphml(self.graph, filename)
+        with open_file(filename, "wb") as f:
+            nx.write_graphml(self.graph, f)
         logging.info(f"NxGraph saved to {filename}.")
 
     def read_from_file(self, filename, overwrite=False):
@@ -200,7 +392,57 @@ class NxGraph:
             ValueError: Graph attribute is not empty.
         """
         if len(self.graph) == 0 or overwrite:
-            self.graph = nx.read_graphml(filename)
+            with open_file(filename, "rb") as f:
+                self.graph = nx.read_graphml(f)
         else:
             raise ValueError("Graph is not empty. Use overwrite arg if this is intended.")
         logging.info(f"NxGraph loaded from {filename}.")
+
+    def open_stream(self, filename, overwrite=False):
+        """Opens GraphML file and writes its header to write the graph in chunks.
+
+        Raises:
+            ValueError: Graph database with this file already exists.
+        """
+        if os.path.isfile(filename) and not overwrite:
+            raise ValueError("Graph database with this file already exists.")
+        self._stream = open_file(filename, "w")
+        self._stream_filename = filename
+        self._keys = {attribute: f"d{i}" for i, attribute in enumerate(GRAPHML_NODE_ATTRIBUTES)}
+        self._keys["label"] = f"d{len(GRAPHML_NODE_ATTRIBUTES)}"
+
+        header = [GRAPHML_HEADER]
+        for attribute, attribute_type in GRAPHML_NODE_ATTRIBUTES.items():
+            header.append(f'  <key id="{self._keys[attribute]}" for="node" attr.name="{attribute}" '
+                          f'attr.type="{attribute_type}" />\n')
+        header.append(f'  <key id="{self._keys["label"]}" for="edge" attr.name="label" attr.type="string" />\n')
+        header.append('  <graph edgedefault="directed">\n')
+        self._stream.write("".join(header))
+        logging.info(f"NxGraph stream opened to {filename}.")
+
+    def flush(self):
+        """Appends generated nodes and edges to the opened GraphML file and clears them.
+        Does nothing if no stream is opened.
+        """
+        if self._stream is None:
+            return
+        lines = []
+        for node, node_attributes in self.nodes:
+            data = "".join(f'<data key="{self._keys[attribute]}">{escape(str(value))}</data>'
+                           for attribute, value in node_attributes.items())
+            lines.append(f"    <node id={quoteattr(node)}>{data}</node>\n")
+        for edge_type in self.edges:
+            label = f'<data key="{self._keys["label"]}">{escape(self.edge_types[edge_type])}</data>'
+            for source, target in self.edges[edge_type]:
+                lines.append(f"    <edge source={quoteattr(source)} target={quoteattr(target)}>{label}</edge>\n")
+            self.edges[edge_type] = []
+        self.nodes = []
+        self._stream.write("".join(lines))
+
+    def close_stream(self):
+        """Flushes generated nodes and edges, closes GraphML elements and the file."""
+        self.flush()
+        self._stream.write("  </graph>\n</graphml>\n")
+        self._stream.close()
+        self._stream = None
+        logging.info(f"NxGraph saved to {self._stream_filename}.")
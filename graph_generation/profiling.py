@@ -0,0 +1,231 @@
+"""
+This module implements profiling of graph generation stages with cProfile or tracemalloc.
+
+A StageProfiler is given to a StageReport, and every stage measured by the report is profiled separately, so hot
+spots (ex. get_many_to_many_connections in connections.<relation> or nx.write_graphml in serialization) can be found
+on production-sized configs without changing the code. Runs of a stage with the same name (ex. one per chunk) are
+profiled together.
+
+Profile kinds:
+    cprofile - function call times. Every stage is saved as <prefix>.<stage>.pstats, readable with pstats or
+               snakeviz, and as <prefix>.<stage>.collapsed, collapsed stacks in microseconds for flamegraph.pl or
+               speedscope. Time of a nested stage is profiled only in the nested stage.
+    tracemalloc - memory allocated in a stage and still held when it ends, by allocation traceback. Every stage is
+                  saved as <prefix>.<stage>.tracemalloc.txt with the top allocating lines, and as
+                  <prefix>.<stage>.collapsed, collapsed stacks in bytes. Memory of a nested stage also counts in the
+                  outer stage.
+
+cProfile collects call edges, not whole stacks, so collapsed stacks of cprofile are built from the call graph:
+time of a function is split between its callers by the time of their calls. Stacks shorter than
+MIN_STACK_FRACTION of the stage time are left out.
+
+Usage:
+    profiler = StageProfiler("cprofile", "graph.profile")
+    report = StageReport(profiler=profiler)
+    with report.stage("serialization"):
+        ...
+    profiler.save()
+
+    Collapsed stack line:
+    generate (connection_generator.py:460);get_many_to_many_connections (connection_generator.py:250) 125000
+"""
+
+import cProfile
+import os
+import pstats
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+PROFILE_KINDS = ("cprofile", "tracemalloc")
+
+# Number of frames of tracemalloc tracebacks.
+TRACEMALLOC_FRAMES = 32
+
+# Number of allocating lines saved to tracemalloc text files.
+TOP_ALLOCATIONS = 50
+
+# Minimal time of a collapsed stack built from cProfile stats, as a fraction of the stage time.
+MIN_STACK_FRACTION = 1e-4
+
+
+def get_function_label(function):
+    """Returns flamegraph frame of a pstats function key, ex. generate (connection_generator.py:460)."""
+    filename, lineno, name = function
+    if filename == "~":
+        # Built-in functions have no file.
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{lineno})"
+    return label.replace(";", ":")
+
+
+def get_collapsed_stacks(stats, min_fraction=MIN_STACK_FRACTION):
+    """
+    Builds collapsed stacks from the call graph of pstats stats.
+
+    Args:
+        stats: Dictionary of pstats.Stats.stats, function -> (primitive calls, calls, own time, cumulative time,
+               callers).
+        min_fraction: Float, stacks with less time than this fraction of the total time are left out.
+
+    Returns:
+        Dictionary that maps tuple of frames, from the outermost, to own time in seconds.
+    """
+    callees = defaultdict(list)
+    for function, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((function, edge[3]))
+
+    roots = [(function, cumulative_time) for function, (_, _, _, cumulative_time, callers) in stats.items()
+             if not callers]
+    min_time = sum(cumulative_time for _, cumulative_time in roots) * min_fraction
+    stacks = defaultdict(float)
+    pending = [(function, (function,), time) for function, time in roots if time > min_time]
+    while pending:
+        function, path, time = pending.pop()
+        _, _, own_time, cumulative_time, _ = stats[function]
+        # Part of the calls of the function made on this path.
+        fraction = time / cumulative_time if cumulative_time > 0 else 0.0
+        if own_time * fraction > 0:
+            stacks[path] += own_time * fraction
+        for callee, edge_time in callees[function]:
+            if callee not in path and edge_time * fraction > min_time:
+                pending.append((callee, path + (callee,), edge_time * fraction))
+    return {tuple(get_function_label(function) for function in path): time for path, time in stacks.items()}
+
+
+def save_collapsed_stacks(stacks, filename, scale=1):
+    """Saves collapsed stacks, one line of frames separated by ; and a weight multiplied by scale per stack."""
+    with open(filename, "w") as f:
+        for path, weight in sorted(stacks.items()):
+            weight = round(weight * scale)
+            if weight > 0:
+                f.write(f"{';'.join(path)} {weight}\n")
+
+
+class StageProfiler:
+    """
+    A class to profile stages of a StageReport with cProfile or tracemalloc.
+
+    ...
+
+    Attributes:
+        kind: String, one of PROFILE_KINDS.
+        output_prefix: String, prefix of saved profile files.
+        profiles: Dictionary that maps stage name to cProfile.Profile, for cprofile.
+        allocations: Dictionary that maps stage name to a dictionary of allocation traceback -> [size, count], for
+                     tracemalloc.
+
+    Methods:
+        stage(name)
+            Context manager that profiles a stage.
+        save()
+            Saves profiles of all stages and returns the list of saved files.
+    """
+    def __init__(self, kind, output_prefix):
+        if kind not in PROFILE_KINDS:
+            raise ValueError(f"Unknown profile kind {kind}, should be one of {', '.join(PROFILE_KINDS)}.")
+        self.kind = kind
+        self.output_prefix = output_prefix
+        self.profiles = {}
+        self.allocations = {}
+        self._active = []
+
+    @contextmanager
+    def stage(self, name):
+        """Profiles the code of a with block as a stage."""
+        if name in self._active:
+            # A stage nested in a stage with the same name is already profiled.
+            yield
+            return
+        profile = self._profile_stage if self.kind == "cprofile" else self._trace_stage
+        self._active.append(name)
+        try:
+            with profile(name):
+                yield
+        finally:
+            self._active.pop()
+
+    @contextmanager
+    def _profile_stage(self, name):
+        # Only one profiler can be enabled at once, the profiler of an outer stage is paused.
+        outer = self.profiles[self._active[-2]] if len(self._active) > 1 else None
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        if outer is not None:
+            outer.disable()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if outer is not None:
+                outer.enable()
+
+    @contextmanager
+    def _trace_stage(self, name):
+        # Memory is traced only during a stage, so a snapshot at its end holds only memory allocated in the stage.
+        # Snapshots of a nested stage, or of a stage run while memory is traced anyway (ex. by a StageReport that
+        # traces memory), are compared with a snapshot from the start of the stage, which is slower.
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        start = None if started else tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            end = tracemalloc.take_snapshot()
+            if started:
+                tracemalloc.stop()
+            self._add_allocations(name, end, start)
+
+    def _add_allocations(self, name, end, start=None):
+        """Adds memory of the end snapshot, or the difference between the end and start snapshots, to a stage."""
+        ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        if start is None:
+            statistics = ((statistic.traceback, statistic.size, statistic.count)
+                          for statistic in end.filter_traces(ignored).statistics("traceback"))
+        else:
+            statistics = ((difference.traceback, difference.size_diff, difference.count_diff)
+                          for difference in end.filter_traces(ignored).compare_to(start.filter_traces(ignored),
+                                                                                  "traceback"))
+        allocations = self.allocations.setdefault(name, defaultdict(lambda: [0, 0]))
+        for traceback, size, count in statistics:
+            allocation = allocations[traceback]
+            allocation[0] += size
+            allocation[1] += count
+
+    def get_file(self, name, extension):
+        """Returns the file of a stage profile, ex. graph.profile.nodes.dataset.pstats."""
+        return f"{self.output_prefix}.{name.replace(os.sep, '_')}.{extension}"
+
+    def save(self):
+        """Saves profiles of all stages, returns the list of saved files."""
+        saved_files = []
+        for name, profile in self.profiles.items():
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            profile.dump_stats(self.get_file(name, "pstats"))
+            # Seconds are saved as microseconds, flamegraph weights are integers.
+            save_collapsed_stacks(get_collapsed_stacks(pstats.Stats(profile).stats), self.get_file(name, "collapsed"),
+                                  scale=10 ** 6)
+            saved_files += [self.get_file(name, "pstats"), self.get_file(name, "collapsed")]
+
+        for name, allocations in self.allocations.items():
+            held = {traceback: allocation for traceback, allocation in allocations.items() if allocation[0] > 0}
+            by_line = defaultdict(lambda: [0, 0])
+            for traceback, (size, count) in held.items():
+                line = by_line[traceback[-1]]
+                line[0] += size
+                line[1] += count
+            with open(self.get_file(name, "tracemalloc.txt"), "w") as f:
+                f.write(f"Stage {name}: {sum(size for size, _ in held.values()) / 1024:.1f} KiB allocated and held "
+                        f"at the end of the stage.\n")
+                for frame, (size, count) in sorted(by_line.items(), key=lambda item: -item[1][0])[:TOP_ALLOCATIONS]:
+                    f.write(f"{size / 1024:.1f} KiB, {count} blocks: {frame.filename}:{frame.lineno}\n")
+            stacks = {tuple(f"{os.path.basename(frame.filename)}:{frame.lineno}".replace(";", ":")
+                            for frame in traceback): size for traceback, (size, _) in held.items()}
+            save_collapsed_stacks(stacks, self.get_file(name, "collapsed"))
+            saved_files += [self.get_file(name, "tracemalloc.txt"), self.get_file(name, "collapsed")]
+        return saved_files
@@ -2,9 +2,9 @@
 # Generated by the protocol buffer compiler.  DO NOT EDIT!
 # source: graph_generation/proto/config.proto
 """Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
 from google.protobuf import descriptor as _descriptor
-from google.protobuf import message as _message
-from google.protobuf import reflection as _reflection
+from google.protobuf import descriptor_pool as _descriptor_pool
 from google.protobuf import symbol_database as _symbol_database
 # @@protoc_insertion_point(imports)
 
@@ -13,749 +13,37 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor.FileDescriptor(
-  name='graph_generation/proto/config.proto',
-  package='',
-  syntax='proto3',
-  serialized_options=None,
-  create_key=_descriptor._internal_create_key,
-  serialized_pb=b'\n#graph_generation/proto/config.proto\"\xde\r\n\nProtoGraph\x12+\n\x0b\x63ollections\x18\x01 \x03(\x0b\x32\x16.ProtoGraph.Collection\x12:\n\x13\x64\x61taset_collections\x18\x02 \x03(\x0b\x32\x1d.ProtoGraph.DatasetCollection\x12\x38\n\x12system_collections\x18\x03 \x03(\x0b\x32\x1c.ProtoGraph.SystemCollection\x12%\n\x08\x64\x61tasets\x18\x04 \x03(\x0b\x32\x13.ProtoGraph.Dataset\x12#\n\x07systems\x18\x05 \x03(\x0b\x32\x12.ProtoGraph.System\x12\x33\n\x10\x64\x61ta_integrities\x18\x06 \x03(\x0b\x32\x19.ProtoGraph.DataIntegrity\x12+\n\x0bprocessings\x18\x07 \x03(\x0b\x32\x16.ProtoGraph.Processing\x1a\x31\n\nCollection\x12\x15\n\rcollection_id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x1aW\n\x11\x44\x61tasetCollection\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x01 \x01(\x03\x12\x15\n\rcollection_id\x18\x02 \x01(\x03\x12\x0c\n\x04name\x18\x03 \x01(\t\x1aU\n\x10SystemCollection\x12\x1c\n\x14system_collection_id\x18\x01 \x01(\x03\x12\x15\n\rcollection_id\x18\x02 \x01(\x03\x12\x0c\n\x04name\x18\x03 \x01(\t\x1a\xa2\x01\n\x07\x44\x61taset\x12\x12\n\ndataset_id\x18\x01 \x01(\x03\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x02 \x01(\x03\x12\x0b\n\x03slo\x18\x03 \x01(\t\x12\x1c\n\x03\x65nv\x18\x04 \x01(\x0e\x32\x0f.ProtoGraph.Env\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x16\n\x0eregex_grouping\x18\x06 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\t\x1a\xcf\x02\n\x06System\x12\x11\n\tsystem_id\x18\x01 \x01(\x03\x12\x1c\n\x14system_collection_id\x18\x02 \x01(\x03\x12;\n\rsystem_critic\x18\x03 \x01(\x0e\x32$.ProtoGraph.System.SystemCriticality\x12\x1c\n\x03\x65nv\x18\x04 \x01(\x0e\x32\x0f.ProtoGraph.Env\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x16\n\x0eregex_grouping\x18\x06 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\t\"~\n\x11SystemCriticality\x12\x10\n\x0cNOT_CRITICAL\x10\x00\x12 \n\x1c\x43RITICAL_CAN_CAUSE_S0_OUTAGE\x10\x01\x12!\n\x1d\x43RITICAL_SIGNIFICANT_RUN_RATE\x10\x02\x12\x12\n\x0e\x43RITICAL_OTHER\x10\x03\x1a\xe1\x02\n\nProcessing\x12\x11\n\tsystem_id\x18\x01 \x01(\x03\x12\x12\n\ndataset_id\x18\x02 \x01(\x03\x12\x15\n\rprocessing_id\x18\x03 \x01(\x03\x12-\n\x06impact\x18\x04 \x01(\x0e\x32\x1d.ProtoGraph.Processing.Impact\x12\x33\n\tfreshness\x18\x05 \x01(\x0e\x32 .ProtoGraph.Processing.Freshness\x12\x0e\n\x06inputs\x18\x06 \x01(\x08\"W\n\x06Impact\x12\x08\n\x04\x44OWN\x10\x00\x12\x15\n\x11SEVERELY_DEGRADED\x10\x01\x12\x0c\n\x08\x44\x45GRADED\x10\x02\x12\x14\n\x10OPPORTUNITY_LOSS\x10\x03\x12\x08\n\x04NONE\x10\x04\"H\n\tFreshness\x12\r\n\tIMMEDIATE\x10\x00\x12\x07\n\x03\x44\x41Y\x10\x01\x12\x08\n\x04WEEK\x10\x02\x12\x0e\n\nEVENTUALLY\x10\x03\x12\t\n\x05NEVER\x10\x04\x1a\xcb\x01\n\rDataIntegrity\x12\x19\n\x11\x64\x61ta_integrity_id\x18\x01 \x01(\x03\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x02 \x01(\x03\x12\x1f\n\x17\x64\x61ta_integrity_rec_time\x18\x03 \x01(\t\x12\x1c\n\x14\x64\x61ta_integrity_volat\x18\x04 \x01(\x08\x12\x1f\n\x17\x64\x61ta_integrity_reg_time\x18\x05 \x01(\t\x12 \n\x18\x64\x61ta_integrity_rest_time\x18\x06 \x01(\t\"s\n\x03\x45nv\x12\x13\n\x0f\x44\x45VELOPMENT_ENV\x10\x00\x12\x10\n\x0cPERSONAL_ENV\x10\x01\x12\x12\n\x0ePRODUCTION_ENV\x10\x02\x12\x0f\n\x0bSTAGING_ENV\x10\x03\x12\x0f\n\x0bTESTING_ENV\x10\x04\x12\x0f\n\x0bUNKNOWN_ENV\x10\x05\x62\x06proto3'
-)
-
-
-
-_PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY = _descriptor.EnumDescriptor(
-  name='SystemCriticality',
-  full_name='ProtoGraph.System.SystemCriticality',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='NOT_CRITICAL', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='CRITICAL_CAN_CAUSE_S0_OUTAGE', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='CRITICAL_SIGNIFICANT_RUN_RATE', index=2, number=2,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='CRITICAL_OTHER', index=3, number=3,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=993,
-  serialized_end=1119,
-)
-_sym_db.RegisterEnumDescriptor(_PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY)
-
-_PROTOGRAPH_PROCESSING_IMPACT = _descriptor.EnumDescriptor(
-  name='Impact',
-  full_name='ProtoGraph.Processing.Impact',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='DOWN', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='SEVERELY_DEGRADED', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='DEGRADED', index=2, number=2,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='OPPORTUNITY_LOSS', index=3, number=3,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='NONE', index=4, number=4,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=1314,
-  serialized_end=1401,
-)
-_sym_db.RegisterEnumDescriptor(_PROTOGRAPH_PROCESSING_IMPACT)
-
-_PROTOGRAPH_PROCESSING_FRESHNESS = _descriptor.EnumDescriptor(
-  name='Freshness',
-  full_name='ProtoGraph.Processing.Freshness',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='IMMEDIATE', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='DAY', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='WEEK', index=2, number=2,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='EVENTUALLY', index=3, number=3,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='NEVER', index=4, number=4,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=1403,
-  serialized_end=1475,
-)
-_sym_db.RegisterEnumDescriptor(_PROTOGRAPH_PROCESSING_FRESHNESS)
-
-_PROTOGRAPH_ENV = _descriptor.EnumDescriptor(
-  name='Env',
-  full_name='ProtoGraph.Env',
-  filename=None,
-  file=DESCRIPTOR,
-  create_key=_descriptor._internal_create_key,
-  values=[
-    _descriptor.EnumValueDescriptor(
-      name='DEVELOPMENT_ENV', index=0, number=0,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='PERSONAL_ENV', index=1, number=1,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='PRODUCTION_ENV', index=2, number=2,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='STAGING_ENV', index=3, number=3,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='TESTING_ENV', index=4, number=4,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-    _descriptor.EnumValueDescriptor(
-      name='UNKNOWN_ENV', index=5, number=5,
-      serialized_options=None,
-      type=None,
-      create_key=_descriptor._internal_create_key),
-  ],
-  containing_type=None,
-  serialized_options=None,
-  serialized_start=1683,
-  serialized_end=1798,
-)
-_sym_db.RegisterEnumDescriptor(_PROTOGRAPH_ENV)
-
-
-_PROTOGRAPH_COLLECTION = _descriptor.Descriptor(
-  name='Collection',
-  full_name='ProtoGraph.Collection',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='collection_id', full_name='ProtoGraph.Collection.collection_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='ProtoGraph.Collection.name', index=1,
-      number=2, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=391,
-  serialized_end=440,
-)
-
-_PROTOGRAPH_DATASETCOLLECTION = _descriptor.Descriptor(
-  name='DatasetCollection',
-  full_name='ProtoGraph.DatasetCollection',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='dataset_collection_id', full_name='ProtoGraph.DatasetCollection.dataset_collection_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='collection_id', full_name='ProtoGraph.DatasetCollection.collection_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='ProtoGraph.DatasetCollection.name', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=442,
-  serialized_end=529,
-)
-
-_PROTOGRAPH_SYSTEMCOLLECTION = _descriptor.Descriptor(
-  name='SystemCollection',
-  full_name='ProtoGraph.SystemCollection',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='system_collection_id', full_name='ProtoGraph.SystemCollection.system_collection_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='collection_id', full_name='ProtoGraph.SystemCollection.collection_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='ProtoGraph.SystemCollection.name', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=531,
-  serialized_end=616,
-)
-
-_PROTOGRAPH_DATASET = _descriptor.Descriptor(
-  name='Dataset',
-  full_name='ProtoGraph.Dataset',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='dataset_id', full_name='ProtoGraph.Dataset.dataset_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='dataset_collection_id', full_name='ProtoGraph.Dataset.dataset_collection_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='slo', full_name='ProtoGraph.Dataset.slo', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='env', full_name='ProtoGraph.Dataset.env', index=3,
-      number=4, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='description', full_name='ProtoGraph.Dataset.description', index=4,
-      number=5, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='regex_grouping', full_name='ProtoGraph.Dataset.regex_grouping', index=5,
-      number=6, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='ProtoGraph.Dataset.name', index=6,
-      number=7, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=619,
-  serialized_end=781,
-)
-
-_PROTOGRAPH_SYSTEM = _descriptor.Descriptor(
-  name='System',
-  full_name='ProtoGraph.System',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='system_id', full_name='ProtoGraph.System.system_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='system_collection_id', full_name='ProtoGraph.System.system_collection_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='system_critic', full_name='ProtoGraph.System.system_critic', index=2,
-      number=3, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='env', full_name='ProtoGraph.System.env', index=3,
-      number=4, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='description', full_name='ProtoGraph.System.description', index=4,
-      number=5, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='regex_grouping', full_name='ProtoGraph.System.regex_grouping', index=5,
-      number=6, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='name', full_name='ProtoGraph.System.name', index=6,
-      number=7, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-    _PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY,
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=784,
-  serialized_end=1119,
-)
-
-_PROTOGRAPH_PROCESSING = _descriptor.Descriptor(
-  name='Processing',
-  full_name='ProtoGraph.Processing',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='system_id', full_name='ProtoGraph.Processing.system_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='dataset_id', full_name='ProtoGraph.Processing.dataset_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='processing_id', full_name='ProtoGraph.Processing.processing_id', index=2,
-      number=3, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='impact', full_name='ProtoGraph.Processing.impact', index=3,
-      number=4, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='freshness', full_name='ProtoGraph.Processing.freshness', index=4,
-      number=5, type=14, cpp_type=8, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='inputs', full_name='ProtoGraph.Processing.inputs', index=5,
-      number=6, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-    _PROTOGRAPH_PROCESSING_IMPACT,
-    _PROTOGRAPH_PROCESSING_FRESHNESS,
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1122,
-  serialized_end=1475,
-)
-
-_PROTOGRAPH_DATAINTEGRITY = _descriptor.Descriptor(
-  name='DataIntegrity',
-  full_name='ProtoGraph.DataIntegrity',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='data_integrity_id', full_name='ProtoGraph.DataIntegrity.data_integrity_id', index=0,
-      number=1, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='dataset_collection_id', full_name='ProtoGraph.DataIntegrity.dataset_collection_id', index=1,
-      number=2, type=3, cpp_type=2, label=1,
-      has_default_value=False, default_value=0,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data_integrity_rec_time', full_name='ProtoGraph.DataIntegrity.data_integrity_rec_time', index=2,
-      number=3, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data_integrity_volat', full_name='ProtoGraph.DataIntegrity.data_integrity_volat', index=3,
-      number=4, type=8, cpp_type=7, label=1,
-      has_default_value=False, default_value=False,
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data_integrity_reg_time', full_name='ProtoGraph.DataIntegrity.data_integrity_reg_time', index=4,
-      number=5, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data_integrity_rest_time', full_name='ProtoGraph.DataIntegrity.data_integrity_rest_time', index=5,
-      number=6, type=9, cpp_type=9, label=1,
-      has_default_value=False, default_value=b"".decode('utf-8'),
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[],
-  enum_types=[
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=1478,
-  serialized_end=1681,
-)
-
-_PROTOGRAPH = _descriptor.Descriptor(
-  name='ProtoGraph',
-  full_name='ProtoGraph',
-  filename=None,
-  file=DESCRIPTOR,
-  containing_type=None,
-  create_key=_descriptor._internal_create_key,
-  fields=[
-    _descriptor.FieldDescriptor(
-      name='collections', full_name='ProtoGraph.collections', index=0,
-      number=1, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='dataset_collections', full_name='ProtoGraph.dataset_collections', index=1,
-      number=2, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='system_collections', full_name='ProtoGraph.system_collections', index=2,
-      number=3, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='datasets', full_name='ProtoGraph.datasets', index=3,
-      number=4, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='systems', full_name='ProtoGraph.systems', index=4,
-      number=5, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='data_integrities', full_name='ProtoGraph.data_integrities', index=5,
-      number=6, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-    _descriptor.FieldDescriptor(
-      name='processings', full_name='ProtoGraph.processings', index=6,
-      number=7, type=11, cpp_type=10, label=3,
-      has_default_value=False, default_value=[],
-      message_type=None, enum_type=None, containing_type=None,
-      is_extension=False, extension_scope=None,
-      serialized_options=None, file=DESCRIPTOR,  create_key=_descriptor._internal_create_key),
-  ],
-  extensions=[
-  ],
-  nested_types=[_PROTOGRAPH_COLLECTION, _PROTOGRAPH_DATASETCOLLECTION, _PROTOGRAPH_SYSTEMCOLLECTION, _PROTOGRAPH_DATASET, _PROTOGRAPH_SYSTEM, _PROTOGRAPH_PROCESSING, _PROTOGRAPH_DATAINTEGRITY, ],
-  enum_types=[
-    _PROTOGRAPH_ENV,
-  ],
-  serialized_options=None,
-  is_extendable=False,
-  syntax='proto3',
-  extension_ranges=[],
-  oneofs=[
-  ],
-  serialized_start=40,
-  serialized_end=1798,
-)
-
-_PROTOGRAPH_COLLECTION.containing_type = _PROTOGRAPH
-_PROTOGRAPH_DATASETCOLLECTION.containing_type = _PROTOGRAPH
-_PROTOGRAPH_SYSTEMCOLLECTION.containing_type = _PROTOGRAPH
-_PROTOGRAPH_DATASET.fields_by_name['env'].enum_type = _PROTOGRAPH_ENV
-_PROTOGRAPH_DATASET.containing_type = _PROTOGRAPH
-_PROTOGRAPH_SYSTEM.fields_by_name['system_critic'].enum_type = _PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY
-_PROTOGRAPH_SYSTEM.fields_by_name['env'].enum_type = _PROTOGRAPH_ENV
-_PROTOGRAPH_SYSTEM.containing_type = _PROTOGRAPH
-_PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY.containing_type = _PROTOGRAPH_SYSTEM
-_PROTOGRAPH_PROCESSING.fields_by_name['impact'].enum_type = _PROTOGRAPH_PROCESSING_IMPACT
-_PROTOGRAPH_PROCESSING.fields_by_name['freshness'].enum_type = _PROTOGRAPH_PROCESSING_FRESHNESS
-_PROTOGRAPH_PROCESSING.containing_type = _PROTOGRAPH
-_PROTOGRAPH_PROCESSING_IMPACT.containing_type = _PROTOGRAPH_PROCESSING
-_PROTOGRAPH_PROCESSING_FRESHNESS.containing_type = _PROTOGRAPH_PROCESSING
-_PROTOGRAPH_DATAINTEGRITY.containing_type = _PROTOGRAPH
-_PROTOGRAPH.fields_by_name['collections'].message_type = _PROTOGRAPH_COLLECTION
-_PROTOGRAPH.fields_by_name['dataset_collections'].message_type = _PROTOGRAPH_DATASETCOLLECTION
-_PROTOGRAPH.fields_by_name['system_collections'].message_type = _PROTOGRAPH_SYSTEMCOLLECTION
-_PROTOGRAPH.fields_by_name['datasets'].message_type = _PROTOGRAPH_DATASET
-_PROTOGRAPH.fields_by_name['systems'].message_type = _PROTOGRAPH_SYSTEM
-_PROTOGRAPH.fields_by_name['data_integrities'].message_type = _PROTOGRAPH_DATAINTEGRITY
-_PROTOGRAPH.fields_by_name['processings'].message_type = _PROTOGRAPH_PROCESSING
-_PROTOGRAPH_ENV.containing_type = _PROTOGRAPH
-DESCRIPTOR.message_types_by_name['ProtoGraph'] = _PROTOGRAPH
-_sym_db.RegisterFileDescriptor(DESCRIPTOR)
-
-ProtoGraph = _reflection.GeneratedProtocolMessageType('ProtoGraph', (_message.Message,), {
-
-  'Collection' : _reflection.GeneratedProtocolMessageType('Collection', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_COLLECTION,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.Collection)
-    })
-  ,
-
-  'DatasetCollection' : _reflection.GeneratedProtocolMessageType('DatasetCollection', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_DATASETCOLLECTION,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.DatasetCollection)
-    })
-  ,
-
-  'SystemCollection' : _reflection.GeneratedProtocolMessageType('SystemCollection', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_SYSTEMCOLLECTION,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.SystemCollection)
-    })
-  ,
-
-  'Dataset' : _reflection.GeneratedProtocolMessageType('Dataset', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_DATASET,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.Dataset)
-    })
-  ,
-
-  'System' : _reflection.GeneratedProtocolMessageType('System', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_SYSTEM,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.System)
-    })
-  ,
-
-  'Processing' : _reflection.GeneratedProtocolMessageType('Processing', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_PROCESSING,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.Processing)
-    })
-  ,
-
-  'DataIntegrity' : _reflection.GeneratedProtocolMessageType('DataIntegrity', (_message.Message,), {
-    'DESCRIPTOR' : _PROTOGRAPH_DATAINTEGRITY,
-    '__module__' : 'graph_generation.proto.config_pb2'
-    # @@protoc_insertion_point(class_scope:ProtoGraph.DataIntegrity)
-    })
-  ,
-  'DESCRIPTOR' : _PROTOGRAPH,
-  '__module__' : 'graph_generation.proto.config_pb2'
-  # @@protoc_insertion_point(class_scope:ProtoGraph)
-  })
-_sym_db.RegisterMessage(ProtoGraph)
-_sym_db.RegisterMessage(ProtoGraph.Collection)
-_sym_db.RegisterMessage(ProtoGraph.DatasetCollection)
-_sym_db.RegisterMessage(ProtoGraph.SystemCollection)
-_sym_db.RegisterMessage(ProtoGraph.Dataset)
-_sym_db.RegisterMessage(ProtoGraph.System)
-_sym_db.RegisterMessage(ProtoGraph.Processing)
-_sym_db.RegisterMessage(ProtoGraph.DataIntegrity)
-
-
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n#graph_generation/proto/config.proto\"\xf6\r\n\nProtoGraph\x12+\n\x0b\x63ollections\x18\x01 \x03(\x0b\x32\x16.ProtoGraph.Collection\x12:\n\x13\x64\x61taset_collections\x18\x02 \x03(\x0b\x32\x1d.ProtoGraph.DatasetCollection\x12\x38\n\x12system_collections\x18\x03 \x03(\x0b\x32\x1c.ProtoGraph.SystemCollection\x12%\n\x08\x64\x61tasets\x18\x04 \x03(\x0b\x32\x13.ProtoGraph.Dataset\x12#\n\x07systems\x18\x05 \x03(\x0b\x32\x12.ProtoGraph.System\x12\x33\n\x10\x64\x61ta_integrities\x18\x06 \x03(\x0b\x32\x19.ProtoGraph.DataIntegrity\x12+\n\x0bprocessings\x18\x07 \x03(\x0b\x32\x16.ProtoGraph.Processing\x1a\x31\n\nCollection\x12\x15\n\rcollection_id\x18\x01 \x01(\x03\x12\x0c\n\x04name\x18\x02 \x01(\t\x1aW\n\x11\x44\x61tasetCollection\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x01 \x01(\x03\x12\x15\n\rcollection_id\x18\x02 \x01(\x03\x12\x0c\n\x04name\x18\x03 \x01(\t\x1aU\n\x10SystemCollection\x12\x1c\n\x14system_collection_id\x18\x01 \x01(\x03\x12\x15\n\rcollection_id\x18\x02 \x01(\x03\x12\x0c\n\x04name\x18\x03 \x01(\t\x1a\xa8\x01\n\x07\x44\x61taset\x12\x12\n\ndataset_id\x18\x01 \x01(\x03\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x02 \x01(\x03\x12\x0b\n\x03slo\x18\x08 \x01(\x03\x12\x1c\n\x03\x65nv\x18\x04 \x01(\x0e\x32\x0f.ProtoGraph.Env\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x16\n\x0eregex_grouping\x18\x06 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\tJ\x04\x08\x03\x10\x04\x1a\xcf\x02\n\x06System\x12\x11\n\tsystem_id\x18\x01 \x01(\x03\x12\x1c\n\x14system_collection_id\x18\x02 \x01(\x03\x12;\n\rsystem_critic\x18\x03 \x01(\x0e\x32$.ProtoGraph.System.SystemCriticality\x12\x1c\n\x03\x65nv\x18\x04 \x01(\x0e\x32\x0f.ProtoGraph.Env\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\x16\n\x0eregex_grouping\x18\x06 \x01(\t\x12\x0c\n\x04name\x18\x07 \x01(\t\"~\n\x11SystemCriticality\x12\x10\n\x0cNOT_CRITICAL\x10\x00\x12 \n\x1c\x43RITICAL_CAN_CAUSE_S0_OUTAGE\x10\x01\x12!\n\x1d\x43RITICAL_SIGNIFICANT_RUN_RATE\x10\x02\x12\x12\n\x0e\x43RITICAL_OTHER\x10\x03\x1a\xe1\x02\n\nProcessing\x12\x11\n\tsystem_id\x18\x01 \x01(\x03\x12\x12\n\ndataset_id\x18\x02 \x01(\x03\x12\x15\n\rprocessing_id\x18\x03 \x01(\x03\x12-\n\x06impact\x18\x04 \x01(\x0e\x32\x1d.ProtoGraph.Processing.Impact\x12\x33\n\tfreshness\x18\x05 \x01(\x0e\x32 .ProtoGraph.Processing.Freshness\x12\x0e\n\x06inputs\x18\x06 \x01(\x08\"W\n\x06Impact\x12\x08\n\x04\x44OWN\x10\x00\x12\x15\n\x11SEVERELY_DEGRADED\x10\x01\x12\x0c\n\x08\x44\x45GRADED\x10\x02\x12\x14\n\x10OPPORTUNITY_LOSS\x10\x03\x12\x08\n\x04NONE\x10\x04\"H\n\tFreshness\x12\r\n\tIMMEDIATE\x10\x00\x12\x07\n\x03\x44\x41Y\x10\x01\x12\x08\n\x04WEEK\x10\x02\x12\x0e\n\nEVENTUALLY\x10\x03\x12\t\n\x05NEVER\x10\x04\x1a\xdd\x01\n\rDataIntegrity\x12\x19\n\x11\x64\x61ta_integrity_id\x18\x01 \x01(\x03\x12\x1d\n\x15\x64\x61taset_collection_id\x18\x02 \x01(\x03\x12\x1f\n\x17\x64\x61ta_integrity_rec_time\x18\x07 \x01(\x03\x12\x1c\n\x14\x64\x61ta_integrity_volat\x18\x04 \x01(\x08\x12\x1f\n\x17\x64\x61ta_integrity_reg_time\x18\x08 \x01(\x03\x12 \n\x18\x64\x61ta_integrity_rest_time\x18\t \x01(\x03J\x04\x08\x03\x10\x04J\x04\x08\x05\x10\x06J\x04\x08\x06\x10\x07\"s\n\x03\x45nv\x12\x13\n\x0f\x44\x45VELOPMENT_ENV\x10\x00\x12\x10\n\x0cPERSONAL_ENV\x10\x01\x12\x12\n\x0ePRODUCTION_ENV\x10\x02\x12\x0f\n\x0bSTAGING_ENV\x10\x03\x12\x0f\n\x0bTESTING_ENV\x10\x04\x12\x0f\n\x0bUNKNOWN_ENV\x10\x05\"\xb6\x01\n\nGraphDelta\x12\x1a\n\x05\x61\x64\x64\x65\x64\x18\x01 \x01(\x0b\x32\x0b.ProtoGraph\x12\x1b\n\x13removed_dataset_ids\x18\x02 \x03(\x03\x12\x1a\n\x12removed_system_ids\x18\x03 \x03(\x03\x12\x1e\n\x16removed_processing_ids\x18\x04 \x03(\x03\x12\x33\n\x13rewired_processings\x18\x05 \x03(\x0b\x32\x16.ProtoGraph.Processingb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'graph_generation.proto.config_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _PROTOGRAPH._serialized_start=40
+  _PROTOGRAPH._serialized_end=1822
+  _PROTOGRAPH_COLLECTION._serialized_start=391
+  _PROTOGRAPH_COLLECTION._serialized_end=440
+  _PROTOGRAPH_DATASETCOLLECTION._serialized_start=442
+  _PROTOGRAPH_DATASETCOLLECTION._serialized_end=529
+  _PROTOGRAPH_SYSTEMCOLLECTION._serialized_start=531
+  _PROTOGRAPH_SYSTEMCOLLECTION._serialized_end=616
+  _PROTOGRAPH_DATASET._serialized_start=619
+  _PROTOGRAPH_DATASET._serialized_end=787
+  _PROTOGRAPH_SYSTEM._serialized_start=790
+  _PROTOGRAPH_SYSTEM._serialized_end=1125
+  _PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY._serialized_start=999
+  _PROTOGRAPH_SYSTEM_SYSTEMCRITICALITY._serialized_end=1125
+  _PROTOGRAPH_PROCESSING._serialized_start=1128
+  _PROTOGRAPH_PROCESSING._serialized_end=1481
+  _PROTOGRAPH_PROCESSING_IMPACT._serialized_start=1320
+  _PROTOGRAPH_PROCESSING_IMPACT._serialized_end=1407
+  _PROTOGRAPH_PROCESSING_FRESHNESS._serialized_start=1409
+  _PROTOGRAPH_PROCESSING_FRESHNESS._serialized_end=1481
+  _PROTOGRAPH_DATAINTEGRITY._serialized_start=1484
+  _PROTOGRAPH_DATAINTEGRITY._serialized_end=1705
+  _PROTOGRAPH_ENV._serialized_start=1707
+  _PROTOGRAPH_ENV._serialized_end=1822
+  _GRAPHDELTA._serialized_start=1825
+  _GRAPHDELTA._serialized_end=2007
 # @@protoc_insertion_point(module_scope)
@@ -0,0 +1,310 @@
+"""
+This module implements a streaming container of proto graph messages: a file of length-delimited records.
+
+Every record is one message of a repeated field of ProtoGraph (collections, datasets, systems, processings, ...):
+    varint tag - (field number << 3) | 2, the tag of the field in the ProtoGraph message.
+    varint length - length of the serialized message.
+    message - serialized Collection, Dataset, System, Processing, ... message.
+This is how protobuf encodes repeated message fields, so a container is a valid ProtoGraph binary, and a binary
+written by ProtoGraph.save_to_file() is a valid container. Records of the same type are grouped: write() appends all
+messages it gets together, and write_graph() writes the fields of a graph one after another in field number order.
+
+A container has no size limit. Only a parsed ProtoGraph message is limited to 2 GB, while ProtoContainerReader decodes
+records one at a time from a memory-mapped or buffered file, so graphs of any size are read with flat memory.
+Containers with .gz or .zst extensions are compressed (see compression.py), they are read in order without mmap.
+
+Usage:
+    with ProtoContainerWriter("graph.bin") as writer:
+        writer.write("datasets", datasets)
+        writer.write_graph(proto_graph.graph)
+
+    with ProtoContainerReader("graph.bin") as reader:
+        for field, dataset in reader.iter_records(fields=["datasets"]):
+            ...
+        for field, messages in reader.iter_batches(10000):
+            ...
+"""
+
+import mmap
+import os
+
+from compression import get_compression, open_file
+from proto import config_pb2
+
+# Wire type of length-delimited fields.
+LENGTH_DELIMITED = 2
+
+# Repeated fields of ProtoGraph with their field numbers and message classes.
+RECORD_TYPES = {field.name: (field.number, getattr(config_pb2.ProtoGraph, field.message_type.name))
+                for field in sorted(config_pb2.ProtoGraph.DESCRIPTOR.fields, key=lambda field: field.number)}
+
+# Field names of record tags.
+RECORD_FIELDS = {(number << 3) | LENGTH_DELIMITED: field for field, (number, _) in RECORD_TYPES.items()}
+
+
+def encode_varint(value):
+    """Returns protobuf varint encoding of a non-negative integer."""
+    encoded = bytearray()
+    while value > 0x7f:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varint(buffer, offset):
+    """
+    Decodes protobuf varint from a buffer at offset.
+
+    Returns:
+        Pair of the value and the offset after the varint.
+
+    Raises:
+        ValueError: Buffer ends inside the varint.
+    """
+    value, shift = 0, 0
+    while True:
+        if offset >= len(buffer):
+            raise ValueError("Proto container ends inside a record header.")
+        byte = buffer[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _read_varint(f):
+    """Reads protobuf varint from a file. Returns None at the end of the file."""
+    value, shift = 0, 0
+    while True:
+        byte = f.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("Proto container ends inside a record header.")
+            return None
+        value |= (byte[0] & 0x7f) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def _get_field(tag):
+    """Returns field name of a record tag.
+
+    Raises:
+        ValueError: Tag is not a repeated message field of ProtoGraph.
+    """
+    if tag not in RECORD_FIELDS:
+        raise ValueError(f"Unknown record with field number {tag >> 3} and wire type {tag & 7} in proto container.")
+    return RECORD_FIELDS[tag]
+
+
+class ProtoContainerWriter:
+    """
+    A class to write proto graph messages to a container.
+
+    ...
+
+    Attributes:
+        filename: Path to the container.
+        record_counts: Dictionary that maps field to the number of written records.
+
+    Methods:
+        write(field, messages)
+            Appends messages of a repeated field of ProtoGraph, ex. write("datasets", datasets).
+
+        write_graph(graph)
+            Appends messages of all repeated fields of a ProtoGraph message, grouped by field.
+
+        close()
+            Closes the container.
+    """
+    def __init__(self, filename, overwrite=False):
+        """
+        Raises:
+            ValueError: Graph database with this file already exists.
+        """
+        if os.path.isfile(filename) and not overwrite:
+            raise ValueError("Graph database with this file already exists.")
+        self.filename = filename
+        self.record_counts = {field: 0 for field in RECORD_TYPES}
+        self._file = open_file(filename, "wb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, field, messages):
+        """
+        Appends messages of a repeated field as records.
+
+        Raises:
+            ValueError: Field is not a repeated message field of ProtoGraph.
+        """
+        if field not in RECORD_TYPES:
+            raise ValueError(f"Unknown record type {field}, should be one of {', '.join(RECORD_TYPES)}.")
+        # A graph message with only this field serializes to the records of its messages.
+        shard = config_pb2.ProtoGraph()
+        getattr(shard, field).extend(messages)
+        self._file.write(shard.SerializeToString())
+        self.record_counts[field] += len(getattr(shard, field))
+
+    def write_graph(self, graph):
+        """Appends messages of all repeated fields of a ProtoGraph message, in field number order."""
+        for field in RECORD_TYPES:
+            if len(getattr(graph, field)) > 0:
+                self.write(field, getattr(graph, field))
+
+    def close(self):
+        self._file.close()
+
+
+class ProtoContainerReader:
+    """
+    A class to read records of a container lazily, one at a time.
+
+    ...
+
+    Attributes:
+        filename: Path to the container.
+        compressed: Boolean, if the file is compressed.
+        use_mmap: Boolean, if the file is memory-mapped. Otherwise it is read with a buffered file.
+
+    Methods:
+        iter_frames(fields=None)
+            Yields (field, offset, length) of serialized messages.
+
+        iter_records(fields=None)
+            Yields (field, message) of records.
+
+        iter_batches(batch_size, fields=None)
+            Yields (field, messages) lists of at most batch_size consecutive records of the same field.
+
+        read(offset, length)
+            Returns serialized message of a frame.
+
+        close()
+            Closes the container.
+    """
+    def __init__(self, filename, use_mmap=True):
+        self.filename = filename
+        self.compressed = get_compression(filename) is not None
+        # Compressed files are decompressed as they are read, and the others are read directly.
+        self._file = None if self.compressed else open(filename, "rb")
+        # Empty and compressed files can't be memory-mapped.
+        self.use_mmap = use_mmap and not self.compressed and os.path.getsize(filename) > 0
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.use_mmap else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _iter_messages(self, fields, read_messages):
+        """
+        Yields (field, offset, length, data) of records of the given fields, or of all records if fields is None.
+        Data is the serialized message if read_messages or if the file is read sequentially, None otherwise.
+        Offsets are positions in the uncompressed container.
+
+        Raises:
+            ValueError: Container ends inside a record or has an unknown record.
+        """
+        if self.use_mmap:
+            buffer, offset = self._buffer, 0
+            while offset < len(buffer):
+                tag, offset = decode_varint(buffer, offset)
+                length, offset = decode_varint(buffer, offset)
+                if offset + length > len(buffer):
+                    raise ValueError("Proto container ends inside a record.")
+                field = _get_field(tag)
+                if fields is None or field in fields:
+                    yield field, offset, length, buffer[offset:offset + length] if read_messages else None
+                offset += length
+            return
+
+        if self.compressed:
+            # Compressed files can't be rewound, every iteration decompresses the file from the start.
+            with open_file(self.filename, "rb") as f:
+                offset = 0
+                while True:
+                    tag = _read_varint(f)
+                    if tag is None:
+                        return
+                    length = _read_varint(f)
+                    if length is None:
+                        raise ValueError("Proto container ends inside a record header.")
+                    offset += len(encode_varint(tag)) + len(encode_varint(length))
+                    data = f.read(length)
+                    if len(data) < length:
+                        raise ValueError("Proto container ends inside a record.")
+                    field = _get_field(tag)
+                    if fields is None or field in fields:
+                        yield field, offset, length, data
+                    offset += length
+
+        f, size = self._file, os.path.getsize(self.filename)
+        f.seek(0)
+        while True:
+            tag = _read_varint(f)
+            if tag is None:
+                return
+            length = _read_varint(f)
+            if length is None:
+                raise ValueError("Proto container ends inside a record header.")
+            offset = f.tell()
+            if offset + length > size:
+                raise ValueError("Proto container ends inside a record.")
+            field = _get_field(tag)
+            if fields is None or field in fields:
+                # Bodies of skipped records and of frames are not read, the file seeks past them.
+                yield field, offset, length, f.read(length) if read_messages else None
+            f.seek(offset + length)
+
+    def read(self, offset, length):
+        """
+        Returns serialized message at offset, ex. of a frame of iter_frames().
+
+        Raises:
+            ValueError: Container is compressed, its records can only be read in order.
+        """
+        if self.compressed:
+            raise ValueError("Records of a compressed proto container can only be read in order.")
+        if self.use_mmap:
+            return self._buffer[offset:offset + length]
+        self._file.seek(offset)
+        return self._file.read(length)
+
+    def iter_frames(self, fields=None):
+        """Yields (field, offset, length) of serialized messages of all records, or of records of the given fields."""
+        fields = set(fields) if fields is not None else None
+        for field, offset, length, _ in self._iter_messages(fields, read_messages=False):
+            yield field, offset, length
+
+    def iter_records(self, fields=None):
+        """Yields (field, message) of all records, or of records of the given fields."""
+        fields = set(fields) if fields is not None else None
+        for field, _, _, data in self._iter_messages(fields, read_messages=True):
+            yield field, RECORD_TYPES[field][1].FromString(data)
+
+    def iter_batches(self, batch_size, fields=None):
+        """Yields (field, messages) lists of at most batch_size consecutive records of the same field."""
+        batch_field, batch = None, []
+        for field, message in self.iter_records(fields):
+            if batch and (field != batch_field or len(batch) == batch_size):
+                yield batch_field, batch
+                batch = []
+            batch_field = field
+            batch.append(message)
+        if batch:
+            yield batch_field, batch
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
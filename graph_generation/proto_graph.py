@@ -10,11 +10,55 @@ It allows to create the following messages:
     environment
     dataset processing
     data integrity
+
+Every node type also has a bulk method add_<node type>s(), that takes whole columns of ids and attributes (lists,
+ranges or columns of attribute_columns.py) and fills repeated fields in one pass. Enums are converted with the
+codecs of enum_codecs.py, once per category.
+
+Added nodes are not logged one by one, they are counted by a ProgressCounter (see progress.py) that logs progress
+lines with throughput and ETA at most every few seconds.
+
+A graph can also be written in chunks: open_stream() opens the file, flush() appends messages generated so far and
+clears them, close_stream() writes the rest. Serialized proto messages concatenated together parse as one message
+with merged repeated fields, so the file is read by read_from_file() as usual.
+
+The same property lets save_to_file() serialize a large graph in parallel: with workers > 1, repeated fields are
+split into slices of chunk_size messages, forked worker processes serialize the slices of the graph they inherited,
+and the byte strings are written to the file in order as they arrive. Slices follow the field numbers, so the file
+is byte for byte the one written by a single SerializeToString().
+
+Files with .gz or .zst extensions are compressed and decompressed on the fly (see compression.py), by save_to_file(),
+read_from_file() and open_stream().
+
+save_to_file(index=True) also writes an offset index next to the binary (see proto_index.py). open_index() maps it,
+and get_record() / get_records() then parse single records or id ranges of the binary instead of the whole graph.
 """
 
 from proto import config_pb2
 import logging
+import multiprocessing
 import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from attribute_columns import to_list
+from compression import get_compression, open_file
+from enum_codecs import ENV, PROCESSING_FRESHNESS, PROCESSING_IMPACT, SYSTEM_CRITICALITY
+from progress import ProgressCounter
+from proto_index import RECORD_ID_FIELDS, ProtoIndex, build_index
+
+# Default number of messages of a repeated field serialized together by save_to_file() in chunks.
+SERIALIZATION_CHUNK_SIZE = 100000
+
+# Graph message serialized by worker processes of save_to_file(), inherited by forked workers without pickling.
+_serialized_graph = None
+
+
+def _serialize_slice(field, start, stop):
+    """Serializes messages [start, stop) of a repeated field of _serialized_graph as a graph message."""
+    shard = config_pb2.ProtoGraph()
+    getattr(shard, field).extend(getattr(_serialized_graph, field)[start:stop])
+    return shard.SerializeToString()
 
 
 class ProtoGraph:
@@ -23,6 +67,10 @@ class ProtoGraph:
 
     ...
 
+    Attributes:
+        graph: ProtoGraph message.
+        progress: ProgressCounter of added nodes of every type.
+
     Methods:
         generate_collection(collection_id, name)
             Generates a collection with the given id.
@@ -47,95 +95,80 @@ class ProtoGraph:
                                 data_integrity_reg_time, data_integrity_rest_time)
             Generates a data integrity node, that corresponds to a specific dataset, having the attributes.
 
-        save_to_file(filename, overwrite=False)
-            Saves generated graph message to proto binary.
+        add_collections(collection_ids, names), add_datasets(dataset_ids, dataset_collection_ids, ...), ...
+            Generate many nodes of a type from columns, with the arguments of generate_<node type>() as columns.
+
+        save_to_file(filename, overwrite=False, workers=1, chunk_size=None, index=False)
+            Saves generated graph message to proto binary, in chunks serialized by worker processes if workers > 1.
+            With index, also saves the offset index of the binary.
 
         read_from_file(filename, overwrite=False)
             Reads graph message from proto binary.
+
+        open_stream(filename, overwrite=False)
+            Opens proto binary to write the graph in chunks.
+
+        flush()
+            Appends generated messages to the opened proto binary and clears them from the graph.
+
+        close_stream()
+            Flushes the rest of generated messages and closes the proto binary.
+
+        open_index(filename)
+            Opens offset index of a proto binary for get_record() and get_records().
+
+        get_record(field, record_id)
+            Returns a message of a repeated field with an id from the indexed binary, ex. get_record("datasets", 5).
+
+        get_records(field, start_id, stop_id)
+            Returns messages of a repeated field with start_id <= id < stop_id from the indexed binary.
+
+        close_index()
+            Closes the offset index.
     """
     def __init__(self):
         self.graph = config_pb2.ProtoGraph()
         self.is_empty = True
+        self.progress = ProgressCounter("Proto graph")
+        self._stream = None
+        self._stream_filename = None
+        self.index = None
 
     @staticmethod
     def _get_env_enum(env):
         """Returns environment enum from proto config."""
-        env_dict = {
-            "DEVELOPMENT_ENV": config_pb2.ProtoGraph.Env.DEVELOPMENT_ENV,
-            "PERSONAL_ENV": config_pb2.ProtoGraph.Env.PERSONAL_ENV,
-            "PRODUCTION_ENV": config_pb2.ProtoGraph.Env.PRODUCTION_ENV,
-            "STAGING_ENV": config_pb2.ProtoGraph.Env.STAGING_ENV,
-            "TESTING_ENV": config_pb2.ProtoGraph.Env.TESTING_ENV,
-            "UNKNOWN_ENV": config_pb2.ProtoGraph.Env.UNKNOWN_ENV
-        }
-        if env in env_dict:
-            return env_dict[env]
-        else:
-            logging.error("Incorrect environment value. Setting UNKNOWN_ENV as a default.")
-            return env_dict["UNKNOWN_ENV"]
+        return ENV.encode(env)
 
     @staticmethod
     def env_enum_to_string(env):
-        return config_pb2.ProtoGraph.Env.Name(env)
+        return ENV.decode(env)
 
     @staticmethod
     def _get_system_criticality_enum(system_criticality):
         """Returns system criticality enum from proto config."""
-        system_criticality_dict = {
-            "NOT_CRITICAL": config_pb2.ProtoGraph.System.SystemCriticality.NOT_CRITICAL,
-            "CRITICAL_CAN_CAUSE_S0_OUTAGE": config_pb2.ProtoGraph.System.SystemCriticality.CRITICAL_CAN_CAUSE_S0_OUTAGE,
-            "CRITICAL_SIGNIFICANT_RUN_RATE": config_pb2.ProtoGraph.System.SystemCriticality.CRITICAL_SIGNIFICANT_RUN_RATE,
-            "CRITICAL_OTHER": config_pb2.ProtoGraph.System.SystemCriticality.CRITICAL_OTHER
-        }
-        if system_criticality in system_criticality_dict:
-            return system_criticality_dict[system_criticality]
-        else:
-            logging.error("Incorrect system criticality value. Setting NEVER as a default.")
-            return system_criticality_dict["CRITICAL_OTHER"]
+        return SYSTEM_CRITICALITY.encode(system_criticality)
 
     @staticmethod
     def criticality_enum_to_string(system_criticality):
-        return config_pb2.ProtoGraph.System.SystemCriticality.Name(system_criticality)
+        return SYSTEM_CRITICALITY.decode(system_criticality)
 
     @staticmethod
     def _get_processing_impact_enum(impact):
         """Returns processing impact enum from proto config."""
-        impact_dict = {
-            "DOWN": config_pb2.ProtoGraph.Processing.Impact.DOWN,
-            "SEVERELY_DEGRADED": config_pb2.ProtoGraph.Processing.Impact.SEVERELY_DEGRADED,
-            "DEGRADED": config_pb2.ProtoGraph.Processing.Impact.DEGRADED,
-            "OPPORTUNITY_LOSS": config_pb2.ProtoGraph.Processing.Impact.OPPORTUNITY_LOSS,
-            "NONE": config_pb2.ProtoGraph.Processing.Impact.NONE
-        }
-        if impact in impact_dict:
-            return impact_dict[impact]
-        else:
-            logging.error("Incorrect processing impact value. Setting NONE as a default.")
-            return impact_dict["NONE"]
+        return PROCESSING_IMPACT.encode(impact)
 
     @staticmethod
     def processing_impact_enum_to_string(impact):
-        return config_pb2.ProtoGraph.Processing.Impact.Name(impact)
+        return PROCESSING_IMPACT.decode(impact)
 
     @staticmethod
     def _get_processing_freshness_enum(freshness):
         """Returns processing freshness enum from proto config"""
-        freshness_dict = {
-            "IMMEDIATE": config_pb2.ProtoGraph.Processing.Freshness.IMMEDIATE,
-            "DAY": config_pb2.ProtoGraph.Processing.Freshness.DAY,
-            "WEEK": config_pb2.ProtoGraph.Processing.Freshness.WEEK,
-            "EVENTUALLY": config_pb2.ProtoGraph.Processing.Freshness.EVENTUALLY,
-            "NEVER": config_pb2.ProtoGraph.Processing.Freshness.NEVER
-        }
-        if freshness in freshness_dict:
-            return freshness_dict[freshness]
-        else:
-            logging.error("Incorrect processing freshness value. Setting NEVER as a default.")
-            return freshness_dict["NEVER"]
+        return PROCESSING_FRESHNESS.encode(freshness)
 
     @staticmethod
     def processing_freshness_enum_to_string(freshness):
-        return config_pb2.ProtoGraph.Processing.Freshness.Name(freshness)
+        return PROCESSING_FRESHNESS.decode(freshness)
 
     def generate_collection(self, collection_id, name):
         """Generates collection message."""
@@ -143,7 +176,7 @@ class ProtoGraph:
         collection = self.graph.collections.add()
         collection.collection_id = collection_id
         collection.name = name
-        logging.info(f"Proto graph. Added collection {collection_id}.")
+        self.progress.add("collection", item_id=collection_id)
 
     def generate_dataset_collection(self, dataset_collection_id, collection_id, name):
         """Generates dataset collection message."""
@@ -151,7 +184,7 @@ class ProtoGraph:
         dataset_collection.dataset_collection_id = dataset_collection_id
         dataset_collection.collection_id = collection_id
         dataset_collection.name = name
-        logging.info(f"Proto graph. Added dataset collection {dataset_collection_id}.")
+        self.progress.add("dataset_collection", item_id=dataset_collection_id)
 
     def generate_system_collection(self, system_collection_id, collection_id, name):
         """Generates system collection message."""
@@ -159,7 +192,7 @@ class ProtoGraph:
         system_collection.system_collection_id = system_collection_id
         system_collection.collection_id = collection_id
         system_collection.name = name
-        logging.info(f"Proto graph. Added system collection {system_collection_id}.")
+        self.progress.add("system_collection", item_id=system_collection_id)
 
     def generate_dataset(self, dataset_id, dataset_collection_id, regex_grouping, name, slo, env, description):
         """Generates dataset message."""
@@ -171,7 +204,7 @@ class ProtoGraph:
         dataset.regex_grouping = regex_grouping
         dataset.name = name
         dataset.description = description
-        logging.info(f"Proto graph. Added dataset {dataset_id}.")
+        self.progress.add("dataset", item_id=dataset_id)
 
     def generate_system(self, system_id, system_critic, system_collection_id, regex_grouping, name, env, description):
         """Generate system message."""
@@ -183,7 +216,7 @@ class ProtoGraph:
         system.regex_grouping = regex_grouping
         system.name = name
         system.description = description
-        logging.info(f"Proto graph. Added system {system_id}.")
+        self.progress.add("system", item_id=system_id)
 
     def generate_processing(self, system_id, dataset_id, processing_id, impact, freshness, inputs=True):
         """Generate processing message."""
@@ -194,7 +227,7 @@ class ProtoGraph:
         processing.impact = self._get_processing_impact_enum(impact)
         processing.freshness = self._get_processing_freshness_enum(freshness)
         processing.inputs = inputs
-        logging.info(f"Proto graph. Added processing {processing_id}.")
+        self.progress.add("processing", item_id=processing_id)
 
     def generate_data_integrity(self, data_integrity_id, dataset_collection_id, data_integrity_rec_time,
                                 data_integrity_volat, data_integrity_reg_time, data_integrity_rest_time):
@@ -206,22 +239,177 @@ class ProtoGraph:
         data_integrity.data_integrity_volat = data_integrity_volat
         data_integrity.data_integrity_reg_time = data_integrity_reg_time
         data_integrity.data_integrity_rest_time = data_integrity_rest_time
-        logging.info(f"Proto graph. Added data integrity {data_integrity_id}.")
+        self.progress.add("data_integrity", item_id=data_integrity_id)
 
-    def save_to_file(self, filename, overwrite=False):
+    def add_collections(self, collection_ids, names):
+        """Generates collection messages from columns."""
+        self.is_empty = False
+        add = self.graph.collections.add
+        for collection_id, name in zip(to_list(collection_ids), to_list(names)):
+            collection = add()
+            collection.collection_id = collection_id
+            collection.name = name
+        self.progress.add("collection", len(collection_ids))
+
+    def add_dataset_collections(self, dataset_collection_ids, collection_ids, names):
+        """Generates dataset collection messages from columns."""
+        add = self.graph.dataset_collections.add
+        for dataset_collection_id, collection_id, name in zip(to_list(dataset_collection_ids), to_list(collection_ids),
+                                                              to_list(names)):
+            dataset_collection = add()
+            dataset_collection.dataset_collection_id = dataset_collection_id
+            dataset_collection.collection_id = collection_id
+            dataset_collection.name = name
+        self.progress.add("dataset_collection", len(dataset_collection_ids))
+
+    def add_system_collections(self, system_collection_ids, collection_ids, names):
+        """Generates system collection messages from columns."""
+        add = self.graph.system_collections.add
+        for system_collection_id, collection_id, name in zip(to_list(system_collection_ids), to_list(collection_ids),
+                                                             to_list(names)):
+            system_collection = add()
+            system_collection.system_collection_id = system_collection_id
+            system_collection.collection_id = collection_id
+            system_collection.name = name
+        self.progress.add("system_collection", len(system_collection_ids))
+
+    def add_datasets(self, dataset_ids, dataset_collection_ids, regex_groupings, names, slos, envs, descriptions):
+        """Generates dataset messages from columns."""
+        add = self.graph.datasets.add
+        for dataset_id, dataset_collection_id, regex_grouping, name, slo, env, description in zip(
+                to_list(dataset_ids), to_list(dataset_collection_ids), to_list(regex_groupings), to_list(names),
+                to_list(slos), ENV.encode_many(envs).tolist(), to_list(descriptions)):
+            dataset = add()
+            dataset.dataset_id = dataset_id
+            dataset.dataset_collection_id = dataset_collection_id
+            dataset.slo = slo
+            dataset.env = env
+            dataset.regex_grouping = regex_grouping
+            dataset.name = name
+            dataset.description = description
+        self.progress.add("dataset", len(dataset_ids))
+
+    def add_systems(self, system_ids, system_critics, system_collection_ids, regex_groupings, names, envs,
+                    descriptions):
+        """Generates system messages from columns."""
+        add = self.graph.systems.add
+        for system_id, system_critic, system_collection_id, regex_grouping, name, env, description in zip(
+                to_list(system_ids), SYSTEM_CRITICALITY.encode_many(system_critics).tolist(),
+                to_list(system_collection_ids), to_list(regex_groupings), to_list(names),
+                ENV.encode_many(envs).tolist(), to_list(descriptions)):
+            system = add()
+            system.system_id = system_id
+            system.system_collection_id = system_collection_id
+            system.system_critic = system_critic
+            system.env = env
+            system.regex_grouping = regex_grouping
+            system.name = name
+            system.description = description
+        self.progress.add("system", len(system_ids))
+
+    def add_processings(self, system_ids, dataset_ids, processing_ids, impacts, freshness, inputs=True):
+        """Generates processing messages from columns, all of them are inputs or all are outputs."""
+        add = self.graph.processings.add
+        for system_id, dataset_id, processing_id, impact, processing_freshness in zip(
+                to_list(system_ids), to_list(dataset_ids), to_list(processing_ids),
+                PROCESSING_IMPACT.encode_many(impacts).tolist(),
+                PROCESSING_FRESHNESS.encode_many(freshness).tolist()):
+            processing = add()
+            processing.system_id = system_id
+            processing.dataset_id = dataset_id
+            processing.processing_id = processing_id
+            processing.impact = impact
+            processing.freshness = processing_freshness
+            processing.inputs = inputs
+        self.progress.add("processing", len(processing_ids))
+
+    def add_data_integrities(self, data_integrity_ids, dataset_collection_ids, data_integrity_rec_times,
+                             data_integrity_volats, data_integrity_reg_times, data_integrity_rest_times):
+        """Generates data integrity messages from columns."""
+        add = self.graph.data_integrities.add
+        for data_integrity_id, dataset_collection_id, rec_time, volat, reg_time, rest_time in zip(
+                to_list(data_integrity_ids), to_list(dataset_collection_ids), to_list(data_integrity_rec_times),
+                to_list(data_integrity_volats), to_list(data_integrity_reg_times), to_list(data_integrity_rest_times)):
+            data_integrity = add()
+            data_integrity.data_integrity_id = data_integrity_id
+            data_integrity.dataset_collection_id = dataset_collection_id
+            data_integrity.data_integrity_rec_time = rec_time
+            data_integrity.data_integrity_volat = volat
+            data_integrity.data_integrity_reg_time = reg_time
+            data_integrity.data_integrity_rest_time = rest_time
+        self.progress.add("data_integrity", len(data_integrity_ids))
+
+    def save_to_file(self, filename, overwrite=False, workers=1, chunk_size=None, index=False):
         """
         Saves generated graph message to binary. If overwrite - existing file will be overwritten.
+        With workers > 1 or chunk_size, the graph is serialized by workers processes in slices of chunk_size messages
+        (SERIALIZATION_CHUNK_SIZE if not given), that are appended to the file in order.
+        If index, offset index of the binary is saved to <filename>.idx (see proto_index.py).
+        The binary is compressed if filename ends with .gz or .zst.
 
         Raises:
-            ValueError: Graph database with this file already exists.
+            ValueError: Graph database with this file already exists, incorrect number of workers or index of a
+                compressed binary.
         """
+        if workers < 1:
+            raise ValueError("Number of workers should be at least 1.")
+        if index and get_compression(filename) is not None:
+            raise ValueError("Compressed proto binary can't be indexed, save it uncompressed.")
         if os.path.isfile(filename) and overwrite:
             os.remove(filename)
         elif os.path.isfile(filename):
             raise ValueError("Graph database with this file already exists.")
-        with open(filename, "wb") as f:
-            f.write(self.graph.SerializeToString())
+        with open_file(filename, "wb") as f:
+            if workers == 1 and chunk_size is None:
+                f.write(self.graph.SerializeToString())
+            else:
+                for chunk in self._serialize_chunks(workers, chunk_size or SERIALIZATION_CHUNK_SIZE):
+                    f.write(chunk)
         logging.info(f"Proto graph saved to {filename}.")
+        if index:
+            # Ids are taken from the graph, so records of the binary are not parsed again.
+            record_ids = {field: [getattr(message, id_field) for message in getattr(self.graph, field)]
+                          for field, id_field in RECORD_ID_FIELDS.items()}
+            index_file = build_index(filename, record_ids=record_ids)
+            logging.info(f"Proto graph index saved to {index_file}.")
+
+    def _get_slices(self, chunk_size):
+        """Returns (field, start, stop) slices of repeated fields of the graph, in the order of field numbers."""
+        slices = []
+        for field in sorted(self.graph.DESCRIPTOR.fields, key=lambda field: field.number):
+            size = len(getattr(self.graph, field.name))
+            slices.extend((field.name, start, min(start + chunk_size, size)) for start in range(0, size, chunk_size))
+        return slices
+
+    def _serialize_chunks(self, workers, chunk_size):
+        """
+        Yields serialized slices of the graph in order. Workers are forked, so they read the graph without pickling it,
+        and at most 2 * workers slices are serialized ahead of the one being written.
+        """
+        global _serialized_graph
+        slices = self._get_slices(chunk_size)
+        _serialized_graph = self.graph
+        parallel = workers > 1 and len(slices) > 1
+        if parallel and "fork" not in multiprocessing.get_all_start_methods():
+            logging.warning("Worker processes can't be forked on this platform, serializing in one process.")
+            parallel = False
+        try:
+            if not parallel:
+                for field, start, stop in slices:
+                    yield _serialize_slice(field, start, stop)
+                return
+
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(max_workers=min(workers, len(slices)), mp_context=context) as executor:
+                pending = deque()
+                for field, start, stop in slices:
+                    pending.append(executor.submit(_serialize_slice, field, start, stop))
+                    if len(pending) > 2 * workers:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+        finally:
+            _serialized_graph = None
 
     def read_from_file(self, filename, overwrite=False):
         """
@@ -231,8 +419,71 @@ class ProtoGraph:
             ValueError: Graph attribute is not empty.
         """
         if self.is_empty or overwrite:
-            with open(filename, "rb") as f:
+            with open_file(filename, "rb") as f:
                 self.graph.ParseFromString(f.read())
             logging.info(f"Proto graph loaded from {filename}.")
         else:
             raise ValueError("Graph is not empty. Use overwrite arg if this is intended.")
+
+    def open_stream(self, filename, overwrite=False):
+        """
+        Opens binary to write the graph in chunks. If overwrite - existing file will be overwritten.
+
+        Raises:
+            ValueError: Graph database with this file already exists.
+        """
+        if os.path.isfile(filename) and not overwrite:
+            raise ValueError("Graph database with this file already exists.")
+        self._stream = open_file(filename, "wb")
+        self._stream_filename = filename
+        logging.info(f"Proto graph stream opened to {filename}.")
+
+    def flush(self):
+        """Appends generated messages to the opened binary and clears them. Does nothing if no stream is opened."""
+        if self._stream is None:
+            return
+        self._stream.write(self.graph.SerializeToString())
+        self.graph.Clear()
+
+    def close_stream(self):
+        """Flushes generated messages and closes the binary."""
+        self.flush()
+        self._stream.close()
+        self._stream = None
+        logging.info(f"Proto graph saved to {self._stream_filename}.")
+
+    def open_index(self, filename):
+        """
+        Opens offset index of a proto binary, saved by save_to_file(index=True) or proto_index.build_index().
+
+        Raises:
+            ValueError: Index doesn't match the binary.
+        """
+        self.close_index()
+        self.index = ProtoIndex(filename)
+        logging.info(f"Proto graph index of {filename} opened.")
+
+    def _get_index(self):
+        """
+        Returns opened offset index.
+
+        Raises:
+            ValueError: No index is opened.
+        """
+        if self.index is None:
+            raise ValueError("No index is opened. Use open_index() first.")
+        return self.index
+
+    def get_record(self, field, record_id):
+        """Returns message of a repeated field with an id from the indexed binary, or None if there is no record."""
+        return self._get_index().get(field, record_id)
+
+    def get_records(self, field, start_id, stop_id):
+        """Returns messages of a repeated field with start_id <= id < stop_id from the indexed binary, ordered by id."""
+        return self._get_index().get_range(field, start_id, stop_id)
+
+    def close_index(self):
+        """Closes opened offset index. Does nothing if no index is opened."""
+        if self.index is not None:
+            self.index.close()
+            self.index = None
@@ -0,0 +1,258 @@
+"""
+This module implements an offset index of a proto graph binary, saved as a sidecar file <proto file>.idx.
+
+For every record type of the binary (see proto_container.py), the index has a table of (id, offset, length) rows,
+sorted by id: offset and length of the serialized message of the record with this id in the binary. Every table also
+has the range of ids and the range of bytes of its records in the binary.
+
+Index file layout, all integers are little-endian:
+    header - magic b"DDGIDX01", uint64 size of the indexed binary, uint32 number of tables, uint32 padding.
+    table headers - one INDEX_HEADER_DTYPE row per table.
+    tables - INDEX_TABLE_DTYPE rows of every table, at the offset given in its header.
+
+ProtoIndex memory-maps the index and the binary, and tables are NumPy views of the mapped index, so opening an index
+doesn't read it. A record is found with one subtraction if the ids of its type are consecutive (which they are in
+generated graphs), with a binary search otherwise, and only its message is parsed.
+
+Usage:
+    proto_graph.save_to_file("graph.bin", index=True)    # or build_index("graph.bin") for an existing binary
+    with ProtoIndex("graph.bin") as index:
+        index.get("datasets", 5)                         # Dataset message with dataset_id 5, or None
+        index.get_range("systems", 10, 20)               # System messages with ids 10 <= system_id < 20
+"""
+
+import mmap
+import os
+
+import numpy as np
+
+from compression import get_compression
+from proto_container import LENGTH_DELIMITED, RECORD_TYPES, ProtoContainerReader, encode_varint
+
+# Suffix of index files added to the name of the indexed binary.
+INDEX_SUFFIX = ".idx"
+
+INDEX_MAGIC = b"DDGIDX01"
+
+# Id fields of messages of every record type.
+RECORD_ID_FIELDS = {
+    "collections": "collection_id",
+    "dataset_collections": "dataset_collection_id",
+    "system_collections": "system_collection_id",
+    "datasets": "dataset_id",
+    "systems": "system_id",
+    "data_integrities": "data_integrity_id",
+    "processings": "processing_id"
+}
+
+INDEX_PREFIX_DTYPE = np.dtype([("magic", "S8"), ("proto_size", "<u8"), ("table_count", "<u4"), ("padding", "<u4")])
+
+# Header of a table: record type, if its ids are consecutive, and ranges of its ids and bytes in the binary.
+INDEX_HEADER_DTYPE = np.dtype([("field_number", "<u4"), ("dense", "<u4"), ("count", "<u8"), ("table_offset", "<u8"),
+                               ("min_id", "<i8"), ("max_id", "<i8"), ("byte_start", "<u8"), ("byte_stop", "<u8")])
+
+INDEX_TABLE_DTYPE = np.dtype([("id", "<i8"), ("offset", "<u8"), ("length", "<u8")])
+
+# Record types of field numbers.
+FIELD_NUMBER_TYPES = {number: field for field, (number, _) in RECORD_TYPES.items()}
+
+
+def get_index_filename(proto_file):
+    """Returns name of the index file of a proto binary."""
+    return f"{proto_file}{INDEX_SUFFIX}"
+
+
+def _check_uncompressed(proto_file):
+    """
+    Raises:
+        ValueError: Binary is compressed, its records can't be read at offsets.
+    """
+    if get_compression(proto_file) is not None:
+        raise ValueError(f"Compressed proto binary {proto_file} can't be indexed, save it uncompressed.")
+
+
+def build_index(proto_file, record_ids=None):
+    """
+    Scans record headers of a proto binary and saves its index next to it.
+    Record ids are read from the records, unless record_ids maps every record type to the ids of its records in the
+    order of the binary (ex. the messages of the graph that was saved), then messages are not parsed.
+
+    Returns:
+        Name of the index file.
+
+    Raises:
+        ValueError: Binary is compressed.
+    """
+    _check_uncompressed(proto_file)
+    frames = {field: ([], [], []) for field in RECORD_TYPES}
+    with ProtoContainerReader(proto_file) as reader:
+        if record_ids is None:
+            for field, offset, length in reader.iter_frames():
+                message = RECORD_TYPES[field][1].FromString(reader.read(offset, length))
+                for values, value in zip(frames[field], (getattr(message, RECORD_ID_FIELDS[field]), offset, length)):
+                    values.append(value)
+        else:
+            for field, offset, length in reader.iter_frames():
+                frames[field][1].append(offset)
+                frames[field][2].append(length)
+            for field, ids in record_ids.items():
+                frames[field][0].extend(ids)
+                if len(frames[field][0]) != len(frames[field][1]):
+                    raise ValueError(f"Number of ids of {field} doesn't match the number of its records.")
+
+    tables = {}
+    for field, (ids, offsets, lengths) in frames.items():
+        if not ids:
+            continue
+        table = np.empty(len(ids), dtype=INDEX_TABLE_DTYPE)
+        table["id"], table["offset"], table["length"] = ids, offsets, lengths
+        tables[field] = table[np.argsort(table["id"], kind="stable")]
+    index_file = get_index_filename(proto_file)
+    save_index(index_file, tables, os.path.getsize(proto_file))
+    return index_file
+
+
+def save_index(index_file, tables, proto_size):
+    """Saves tables of (id, offset, length) rows sorted by id, a table per record type, to an index file."""
+    prefix = np.zeros(1, dtype=INDEX_PREFIX_DTYPE)
+    prefix["magic"], prefix["proto_size"], prefix["table_count"] = INDEX_MAGIC, proto_size, len(tables)
+    headers = np.zeros(len(tables), dtype=INDEX_HEADER_DTYPE)
+    table_offset = INDEX_PREFIX_DTYPE.itemsize + headers.nbytes
+    for i, (field, table) in enumerate(tables.items()):
+        ids, first = table["id"], table[np.argmin(table["offset"])]
+        field_number = RECORD_TYPES[field][0]
+        # The first record starts with its tag and length before the message.
+        tag = (field_number << 3) | LENGTH_DELIMITED
+        header_size = len(encode_varint(tag)) + len(encode_varint(int(first["length"])))
+        headers[i] = (field_number, np.all(np.diff(ids) == 1), len(table), table_offset, ids[0], ids[-1],
+                      int(first["offset"]) - header_size, int((table["offset"] + table["length"]).max()))
+        table_offset += table.nbytes
+
+    with open(index_file, "wb") as f:
+        f.write(prefix.tobytes())
+        f.write(headers.tobytes())
+        for table in tables.values():
+            f.write(table.tobytes())
+
+
+class ProtoIndex:
+    """
+    A class to read single records of a proto binary with its index, without parsing the binary.
+
+    ...
+
+    Attributes:
+        proto_file: Path to the proto binary.
+        index_file: Path to its index.
+        tables: Dictionary that maps record type to the read-only array of its (id, offset, length) rows.
+        headers: Dictionary that maps record type to its table header.
+
+    Methods:
+        get(field, record_id)
+            Returns the message of a record type with an id, or None.
+
+        get_range(field, start_id, stop_id)
+            Returns messages of a record type with start_id <= id < stop_id, ordered by id.
+
+        get_id_range(field)
+            Returns the smallest and the largest id of a record type.
+
+        get_byte_range(field)
+            Returns the range of bytes of the binary with all records of a type.
+
+        close()
+            Closes the mapped files.
+    """
+    def __init__(self, proto_file, index_file=None):
+        """
+        Raises:
+            ValueError: Binary is compressed, index file is not an index or the binary changed since it was indexed.
+        """
+        _check_uncompressed(proto_file)
+        self.proto_file = proto_file
+        self.index_file = index_file or get_index_filename(proto_file)
+        self._files = [open(self.proto_file, "rb"), open(self.index_file, "rb")]
+        proto_size = os.path.getsize(self.proto_file)
+        self._proto = mmap.mmap(self._files[0].fileno(), 0, access=mmap.ACCESS_READ) if proto_size > 0 else b""
+        self._index = mmap.mmap(self._files[1].fileno(), 0, access=mmap.ACCESS_READ)
+
+        # Prefix and headers are copied, so that the mapped index can be closed while they are used.
+        prefix = np.frombuffer(self._index[:INDEX_PREFIX_DTYPE.itemsize], dtype=INDEX_PREFIX_DTYPE)[0]
+        if prefix["magic"] != INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"{self.index_file} is not an index of a proto graph.")
+        if prefix["proto_size"] != proto_size:
+            self.close()
+            raise ValueError(f"{self.proto_file} changed since it was indexed, rebuild {self.index_file}.")
+        headers = np.frombuffer(self._index, dtype=INDEX_HEADER_DTYPE, count=int(prefix["table_count"]),
+                                offset=INDEX_PREFIX_DTYPE.itemsize).copy()
+        self.headers = {FIELD_NUMBER_TYPES[int(header["field_number"])]: header for header in headers}
+        self.tables = {field: np.frombuffer(self._index, dtype=INDEX_TABLE_DTYPE, count=int(header["count"]),
+                                            offset=int(header["table_offset"]))
+                       for field, header in self.headers.items()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _parse(self, field, row):
+        offset = int(row["offset"])
+        return RECORD_TYPES[field][1].FromString(self._proto[offset:offset + int(row["length"])])
+
+    def _find(self, field, record_id):
+        """Returns position of the first row with an id >= record_id in the table of a record type."""
+        header, table = self.headers[field], self.tables[field]
+        if header["dense"]:
+            return int(min(max(record_id - int(header["min_id"]), 0), len(table)))
+        return int(np.searchsorted(table["id"], record_id))
+
+    def get(self, field, record_id):
+        """
+        Returns the message of a record type with an id, or None if there is no such record.
+
+        Raises:
+            ValueError: Unknown record type.
+        """
+        if field not in RECORD_TYPES:
+            raise ValueError(f"Unknown record type {field}, should be one of {', '.join(RECORD_TYPES)}.")
+        if field not in self.tables:
+            return None
+        position = self._find(field, record_id)
+        table = self.tables[field]
+        if position == len(table) or table[position]["id"] != record_id:
+            return None
+        return self._parse(field, table[position])
+
+    def get_range(self, field, start_id, stop_id):
+        """Returns messages of a record type with start_id <= id < stop_id, ordered by id."""
+        if field not in RECORD_TYPES:
+            raise ValueError(f"Unknown record type {field}, should be one of {', '.join(RECORD_TYPES)}.")
+        if field not in self.tables or stop_id <= start_id:
+            return []
+        rows = self.tables[field][self._find(field, start_id):self._find(field, stop_id)]
+        return [self._parse(field, row) for row in rows]
+
+    def get_id_range(self, field):
+        """Returns the smallest and the largest id of a record type, or None if it has no records."""
+        if field not in self.headers:
+            return None
+        return int(self.headers[field]["min_id"]), int(self.headers[field]["max_id"])
+
+    def get_byte_range(self, field):
+        """
+        Returns (start, stop) range of bytes of the binary that contains all records of a type, or None if it has no
+        records. Records of other types can be inside it, if they were written in between.
+        """
+        if field not in self.headers:
+            return None
+        return int(self.headers[field]["byte_start"]), int(self.headers[field]["byte_stop"])
+
+    def close(self):
+        self.tables, self.headers = {}, {}
+        for buffer in (self._proto, self._index):
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+        for f in self._files:
+            f.close()
@@ -5,19 +5,50 @@ Usage:
     python3 graph_generation/proto_to_nx.py \
          --proto_file "proto.bin" \
          --nx_file "nx.graphml" \
+         --log_level INFO \
+         --profile cprofile \
+         --chunk_size 100000 \
          --overwrite
 
     Parameters info:
-        Input proto file has .bin extension and output nx file has .graphml extension
+        Input proto file has .bin extension and output nx file has .graphml extension, files ending with .gz or .zst
+        (ex. nx.graphml.gz) are compressed.
         overwrite if not specified equals to False. If it is used (ex. above) - it will overwrite the existing graph.
+        log_level is DEBUG / INFO / WARNING / ERROR / CRITICAL, INFO if not specified. Progress of converted nodes
+        is logged every few seconds, log_sample_every logs every N-th node of a type at DEBUG level.
+        profile is cprofile or tracemalloc, it profiles stages read, nodes.<node type> and serialization separately
+        and saves them to <profile_out>.<stage>.* (see profiling.py). profile_out is <nx file without
+        extension>.profile if not specified.
+        chunk_size streams the conversion: records of the proto file are read lazily (see proto_container.py) and
+        every chunk of chunk_size nodes is appended to the GraphML file, so graphs of any size are converted with
+        flat memory. Without it the proto graph is parsed at once, which protobuf limits to 2 GB.
 """
 
 import argparse
 import logging
+import os
 import time
+from itertools import groupby
 
+import numpy as np
+
+from proto_container import ProtoContainerReader
 from proto_graph import ProtoGraph
 from nx_graph import NxGraph
+from progress import LOG_LEVELS, configure_logging
+from profiling import PROFILE_KINDS, StageProfiler
+from stage_report import StageReport
+
+# Repeated fields of proto graph with node types they are counted as.
+PROTO_NODE_FIELDS = {
+    "collection": "collections",
+    "dataset_collection": "dataset_collections",
+    "system_collection": "system_collections",
+    "dataset": "datasets",
+    "system": "systems",
+    "processing": "processings",
+    "data_integrity": "data_integrities"
+}
 
 
 def parse_args():
@@ -26,72 +57,155 @@ def parse_args():
     parser.add_argument('-p', '--proto_file', help='Path to an input proto binary.', required=True)
     parser.add_argument('-n', '--nx_file', help='Path to an output for networkx graph.', required=True)
     parser.add_argument('-o', '--overwrite', help='If output file exists, overwrite it.', type=bool, default=False)
-    return parser.parse_args()
-
-
-def convert_proto_to_nx_graph(proto_graph, nx_graph, nx_file, overwrite):
-    """Parses all nodes in proto graph, converts enums to strings, creates networkx graph and saves it."""
-    for collection in proto_graph.graph.collections:
-        nx_graph.generate_collection(collection.collection_id, collection.name)
-    logging.info(f"Added all collection nodes from proto to nx.")
-
-    for dataset_collection in proto_graph.graph.dataset_collections:
-        nx_graph.generate_dataset_collection(dataset_collection.dataset_collection_id,
-                                             dataset_collection.collection_id,
-                                             dataset_collection.name)
-    logging.info(f"Added all dataset collection nodes from proto to nx.")
-
-    for system_collection in proto_graph.graph.system_collections:
-        nx_graph.generate_system_collection(system_collection.system_collection_id,
-                                            system_collection.collection_id,
-                                            system_collection.name)
-    logging.info(f"Added all system collection nodes from proto to nx.")
-
-    for dataset in proto_graph.graph.datasets:
-        dataset_env = proto_graph.env_enum_to_string(dataset.env)
-        nx_graph.generate_dataset(dataset.dataset_id, dataset.dataset_collection_id, dataset.regex_grouping,
-                                  dataset.name, dataset.slo, dataset_env, dataset.description)
-    logging.info(f"Added all dataset nodes from proto to nx.")
-
-    for system in proto_graph.graph.systems:
-        system_env = proto_graph.env_enum_to_string(system.env)
-        criticality = proto_graph.criticality_enum_to_string(system.system_critic)
-        nx_graph.generate_system(system.system_id, criticality, system.system_collection_id, system.regex_grouping,
-                                 system.name, system_env, system.description)
-    logging.info(f"Added all system nodes from proto to nx.")
-
-    for processing in proto_graph.graph.processings:
-        impact = proto_graph.processing_impact_enum_to_string(processing.impact)
-        freshness = proto_graph.processing_freshness_enum_to_string(processing.freshness)
-        nx_graph.generate_processing(processing.system_id, processing.dataset_id, processing.processing_id,
-                                     impact, freshness, inputs=processing.inputs)
-    logging.info(f"Added all processing nodes from proto to nx.")
-
-    for data_integrity in proto_graph.graph.data_integrities:
-        nx_graph.generate_data_integrity(data_integrity.data_integrity_id, data_integrity.dataset_collection_id,
-                                         data_integrity.data_integrity_rec_time, data_integrity.data_integrity_volat,
-                                         data_integrity.data_integrity_reg_time, data_integrity.data_integrity_rest_time)
-    logging.info(f"Added all data integrity nodes from proto to nx.")
+    parser.add_argument('--log_level', '--log-level', help='Logging level.', default="INFO",
+                        choices=LOG_LEVELS, type=str.upper)
+    parser.add_argument('--log_sample_every', help='Log every N-th converted node of a type at DEBUG level.',
+                        type=int, default=None)
+    parser.add_argument('--profile', help='Profile every conversion stage with cprofile or tracemalloc.',
+                        default=None, choices=PROFILE_KINDS)
+    parser.add_argument('--profile_out', '--profile-out', help='Prefix of profile files of stages.', default=None)
+    parser.add_argument('--chunk_size', help='Stream the proto file and convert it in chunks of this many nodes.',
+                        type=int, default=None)
+    args = parser.parse_args()
+    if args.chunk_size is not None and args.chunk_size < 1:
+        parser.error("--chunk_size should be a positive integer.")
+    if args.profile_out is not None and args.profile is None:
+        parser.error("--profile is required with --profile_out.")
+    return args
+
+
+def _get_column(messages, field, dtype=np.int64):
+    """Returns a field of all proto messages as a NumPy array."""
+    return np.fromiter((getattr(message, field) for message in messages), dtype=dtype, count=len(messages))
+
+
+def _get_strings(messages, field):
+    """Returns a string field of all proto messages as a list."""
+    return [getattr(message, field) for message in messages]
+
+
+def add_proto_messages(graph, node_type, messages):
+    """
+    Adds proto messages of a node type to a graph with add_<node type>s() methods (ex. NxGraph or ProtoGraph), one
+    column per field. Enums are passed as arrays of enum numbers, and decoded by the graph with enum_codecs.py.
+    """
+    if node_type == "collection":
+        graph.add_collections(_get_column(messages, "collection_id"), _get_strings(messages, "name"))
+    elif node_type == "dataset_collection":
+        graph.add_dataset_collections(_get_column(messages, "dataset_collection_id"),
+                                      _get_column(messages, "collection_id"), _get_strings(messages, "name"))
+    elif node_type == "system_collection":
+        graph.add_system_collections(_get_column(messages, "system_collection_id"),
+                                     _get_column(messages, "collection_id"), _get_strings(messages, "name"))
+    elif node_type == "dataset":
+        graph.add_datasets(_get_column(messages, "dataset_id"), _get_column(messages, "dataset_collection_id"),
+                           _get_strings(messages, "regex_grouping"), _get_strings(messages, "name"),
+                           _get_column(messages, "slo"), _get_column(messages, "env"),
+                           _get_strings(messages, "description"))
+    elif node_type == "system":
+        graph.add_systems(_get_column(messages, "system_id"), _get_column(messages, "system_critic"),
+                          _get_column(messages, "system_collection_id"), _get_strings(messages, "regex_grouping"),
+                          _get_strings(messages, "name"), _get_column(messages, "env"),
+                          _get_strings(messages, "description"))
+    elif node_type == "processing":
+        # Consecutive inputs and outputs are added in runs, so nodes keep the order of the proto graph.
+        for inputs, run in groupby(messages, key=lambda processing: processing.inputs):
+            processings = list(run)
+            graph.add_processings(_get_column(processings, "system_id"), _get_column(processings, "dataset_id"),
+                                  _get_column(processings, "processing_id"), _get_column(processings, "impact"),
+                                  _get_column(processings, "freshness"), inputs=inputs)
+    elif node_type == "data_integrity":
+        graph.add_data_integrities(_get_column(messages, "data_integrity_id"),
+                                   _get_column(messages, "dataset_collection_id"),
+                                   _get_column(messages, "data_integrity_rec_time"),
+                                   _get_column(messages, "data_integrity_volat", dtype=bool),
+                                   _get_column(messages, "data_integrity_reg_time"),
+                                   _get_column(messages, "data_integrity_rest_time"))
+    else:
+        raise ValueError(f"Unknown node type {node_type}, should be one of {', '.join(PROTO_NODE_FIELDS)}.")
+
+
+def add_proto_nodes(proto_graph, graph, report=None):
+    """
+    Adds all nodes of proto graph to a graph with add_<node type>s() methods (ex. NxGraph or ProtoGraph), see
+    add_proto_messages(). Every node type is measured as stage nodes.<node type> of the StageReport report.
+    """
+    report = report if report is not None else StageReport()
+    for node_type, field in PROTO_NODE_FIELDS.items():
+        graph.progress.set_total(node_type, len(getattr(proto_graph.graph, field)))
+
+    for node_type, field in PROTO_NODE_FIELDS.items():
+        with report.stage(f"nodes.{node_type}"):
+            add_proto_messages(graph, node_type, getattr(proto_graph.graph, field))
+        logging.info(f"Added all {node_type.replace('_', ' ')} nodes from proto to nx.")
+    graph.progress.log_summary()
+
+
+def convert_proto_file_to_nx_stream(proto_file, nx_graph, nx_file, overwrite, chunk_size, report=None):
+    """
+    Reads records of proto_file lazily as a container (see proto_container.py), converts them in chunks of chunk_size
+    nodes and appends every chunk to the GraphML nx_file, so memory doesn't grow with the graph.
+    Conversion of every node type is measured as stage nodes.<node type> of the StageReport report, writing of chunks
+    as stage serialization.
+    """
+    report = report if report is not None else StageReport()
+    node_types = {field: node_type for node_type, field in PROTO_NODE_FIELDS.items()}
+    start = time.time()
+    nx_graph.open_stream(nx_file, overwrite=overwrite)
+    with ProtoContainerReader(proto_file) as reader:
+        for field, messages in reader.iter_batches(chunk_size):
+            with report.stage(f"nodes.{node_types[field]}"):
+                add_proto_messages(nx_graph, node_types[field], messages)
+            with report.stage("serialization"):
+                nx_graph.flush()
+    with report.stage("serialization"):
+        nx_graph.close_stream()
+    nx_graph.progress.log_summary()
+    logging.info(f"Finished streaming conversion to {nx_file} in {round(time.time() - start, 1)} seconds.")
+
+
+def convert_proto_to_nx_graph(proto_graph, nx_graph, nx_file, overwrite, report=None):
+    """
+    Parses all nodes in proto graph, converts enums to strings with enum_codecs.py, creates networkx graph and saves it.
+    Conversion of every node type is measured as stage nodes.<node type> of the StageReport report, saving as stage
+    serialization.
+    """
+    report = report if report is not None else StageReport()
+    add_proto_nodes(proto_graph, nx_graph, report=report)
 
     # Save graph to file.
     start = time.time()
-    nx_graph.save_to_file(nx_file, overwrite=overwrite)
+    with report.stage("serialization"):
+        nx_graph.save_to_file(nx_file, overwrite=overwrite)
     logging.info(f"Finished generation and saved nx graph to file in {round(time.time() - start, 1)} seconds.")
 
 
 if __name__ == "__main__":
     # Parse arguments.
     args = parse_args()
+    configure_logging(args.log_level, sample_every=args.log_sample_every)
     proto_file = args.proto_file
     nx_file = args.nx_file
     overwrite = args.overwrite
-
-    # Read proto graph from file.
-    proto_graph = ProtoGraph()
-    proto_graph.read_from_file(proto_file)
+    profiler = None
+    if args.profile is not None:
+        profiler = StageProfiler(args.profile, args.profile_out or f"{os.path.splitext(nx_file)[0]}.profile")
+    report = StageReport(labels={"graph_type": "networkx"}, profiler=profiler)
 
     # Create an empty networkx graph.
     nx_graph = NxGraph()
 
-    # Convert proto to nx and save it to output file.
-    convert_proto_to_nx_graph(proto_graph, nx_graph, nx_file, overwrite)
+    if args.chunk_size is not None:
+        # Stream records of proto file to nx output file.
+        convert_proto_file_to_nx_stream(proto_file, nx_graph, nx_file, overwrite, args.chunk_size, report=report)
+    else:
+        # Read proto graph from file.
+        proto_graph = ProtoGraph()
+        with report.stage("read"):
+            proto_graph.read_from_file(proto_file)
+
+        # Convert proto to nx and save it to output file.
+        convert_proto_to_nx_graph(proto_graph, nx_graph, nx_file, overwrite, report=report)
+    if profiler is not None:
+        profile_files = profiler.save()
+        logging.info(f"Saved {len(profile_files)} {args.profile} profile files of stages to {profiler.output_prefix}.*")
@@ -0,0 +1,64 @@
+"""
+This module implements independent, reproducible random streams for graph generation.
+
+All streams are derived from one root seed with numpy SeedSequence. A stream is addressed by a stage name
+(ex. "connections", "attributes") and a shard index, and is the same as the SeedSequence.spawn child with
+spawn key (crc32(stage), shard). Streams don't depend on the order they are requested in, so the same seed
+gives the same graph whatever number of workers or shards is used.
+"""
+
+import random
+import zlib
+
+import numpy as np
+
+
+def child_sequence(seed_sequence, key):
+    """Returns child of a seed sequence with an integer key, without changing the parent spawn counter."""
+    return np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (key,),
+                                  pool_size=seed_sequence.pool_size)
+
+
+def python_random(seed_sequence):
+    """Creates random.Random seeded from a seed sequence."""
+    return random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), "little"))
+
+
+def as_seed_sequence(seed):
+    """Converts integer seed, None or SeedSequence into a SeedSequence."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+class RandomStreams:
+    """
+    A class to derive per-stage and per-shard random streams from one root seed.
+
+    ...
+
+    Attributes:
+        seed: Integer root seed. If it wasn't given, fresh entropy is used and stored here to reproduce the run.
+
+    Methods:
+        seed_sequence(stage, shard=0)
+            Returns SeedSequence of a stage and shard.
+
+        generator(stage, shard=0)
+            Returns numpy.random.Generator of a stage and shard.
+
+        python_random(stage, shard=0)
+            Returns random.Random of a stage and shard.
+    """
+    def __init__(self, seed=None):
+        self.root = np.random.SeedSequence(seed)
+        self.seed = self.root.entropy
+
+    def seed_sequence(self, stage, shard=0):
+        return child_sequence(child_sequence(self.root, zlib.crc32(stage.encode())), shard)
+
+    def generator(self, stage, shard=0):
+        return np.random.default_rng(self.seed_sequence(stage, shard))
+
+    def python_random(self, stage, shard=0):
+        return python_random(self.seed_sequence(stage, shard))
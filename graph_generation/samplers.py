@@ -0,0 +1,104 @@
+"""
+This module implements samplers of values from probability maps, compiled once per map.
+
+AliasSampler builds Walker's alias table of a map {value: probability or count} (with Vose's method), so that every
+draw takes O(1) time whatever the number of values: a uniform number picks a column of the table, and its fraction
+decides between the value of the column and its alias. One uniform number is used per draw, so values drawn in
+chunks are the same as values drawn at once.
+
+Samplers only keep small NumPy arrays and tuples, so they are pickled cheaply and can be shared with worker
+processes.
+
+Usage:
+    sampler = AliasSampler({"PRODUCTION_ENV": 90, "TESTING_ENV": 10})
+    sampler.draw(rng)                     # one value, rng is numpy.random.Generator or random.Random
+    sampler.sample(100000, rng)           # CategoricalColumn of 100000 values, rng is numpy.random.Generator
+"""
+
+from itertools import accumulate
+
+import numpy as np
+
+from attribute_columns import CategoricalColumn
+
+
+class AliasSampler:
+    """
+    A class to draw values from a probability map with Walker's alias method.
+
+    ...
+
+    Attributes:
+        values: Tuple of values of the map.
+        probabilities: float64 array of normalised probabilities of values.
+        cum_weights: List of cumulative normalised probabilities, for random.choices().
+        accept: float64 array, probability to keep the value of a column of the alias table.
+        alias: Array of the value code used otherwise.
+
+    Methods:
+        draw(rng)
+            Draws one value.
+        sample_codes(n, rng)
+            Draws n value codes (indexes of values) as an array.
+        sample(n, rng)
+            Draws n values as a CategoricalColumn.
+    """
+    def __init__(self, proba_map):
+        """
+        Args:
+            proba_map: Dictionary that maps values to probabilities or counts.
+
+        Raises:
+            ValueError: Probabilities are negative, or all of them are zero.
+        """
+        self.values = tuple(proba_map)
+        weights = np.fromiter(proba_map.values(), dtype=np.float64, count=len(proba_map))
+        if np.any(weights < 0) or (len(weights) and weights.sum() == 0):
+            raise ValueError("Probabilities should be non negative, and at least one should be positive.")
+        self.probabilities = weights / weights.sum() if len(weights) else weights
+        self.cum_weights = list(accumulate(self.probabilities.tolist()))
+        self.accept, self.alias = self._build_table(self.probabilities)
+
+    @staticmethod
+    def _build_table(probabilities):
+        """Builds alias table with Vose's method, columns with too much probability fill the others."""
+        count = len(probabilities)
+        scaled = probabilities * count
+        accept = np.ones(count, dtype=np.float64)
+        alias = np.arange(count, dtype=np.int64)
+        small = [i for i in range(count) if scaled[i] < 1]
+        large = [i for i in range(count) if scaled[i] >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            accept[less], alias[less] = scaled[less], more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Columns left in one list have probability 1 up to rounding errors.
+        return accept, alias
+
+    def __len__(self):
+        return len(self.values)
+
+    def _check_not_empty(self):
+        if not self.values:
+            raise ValueError("Can't draw values from an empty map.")
+
+    def draw(self, rng):
+        """Draws one value with numpy.random.Generator or random.Random."""
+        self._check_not_empty()
+        uniform = rng.random() * len(self.values)
+        column = min(int(uniform), len(self.values) - 1)
+        return self.values[column if uniform - column < self.accept[column] else self.alias[column]]
+
+    def sample_codes(self, n, rng):
+        """Draws codes of n values with numpy.random.Generator, a code is the index of a value in values."""
+        if n == 0:
+            return np.zeros(0, dtype=np.int64)
+        self._check_not_empty()
+        uniform = rng.random(n) * len(self.values)
+        columns = np.minimum(uniform.astype(np.int64), len(self.values) - 1)
+        return np.where(uniform - columns < self.accept[columns], columns, self.alias[columns])
+
+    def sample(self, n, rng):
+        """Draws n values with numpy.random.Generator as a CategoricalColumn."""
+        return CategoricalColumn(self.sample_codes(n, rng), self.values)
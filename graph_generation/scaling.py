@@ -0,0 +1,177 @@
+"""
+This module implements scaling of graph dimensions, to generate graphs of a different size with the same distributions.
+
+Node counts are multiplied by the scale factor. Count maps {degree: node count} are scaled in three steps:
+    1. Node counts of every degree are multiplied by the scale factor and rounded with systematic rounding. Every
+       count becomes floor or ceil of its scaled value, and the total is exact. Heavy tails (many degrees with one
+       node each) keep their share of nodes, spread evenly over the tail.
+    2. Degrees are capped with the number of connected nodes on the other side, ex. a system can't read more
+       datasets than there are datasets read by any system in the scaled graph.
+    3. Total number of connections is set to the scaled total. Both sides of a many-to-many relation get the same
+       total, so every stub is matched. Connections are added to or removed from nodes in proportion to their
+       degree, so the shape of the distribution is kept, and a capped hub loses most of the extra connections.
+
+All sampling is done with NumPy on arrays of degree classes, or of connected nodes when the totals are fixed.
+"""
+
+import numpy as np
+
+
+def scale_count(count, scale):
+    """Scales a number of nodes. There is at least one node after scaling if there were any."""
+    if count <= 0:
+        return 0
+    return max(1, int(round(count * scale)))
+
+
+def round_counts(expected, total, rng):
+    """
+    Rounds expected counts to integers that sum to total with systematic rounding. Expected counts are rescaled to
+    the total first, then every count is floor or ceil of its value, using one random offset for all counts.
+    """
+    expected = np.asarray(expected, dtype=np.float64)
+    if total == 0 or expected.sum() == 0:
+        return np.zeros(len(expected), dtype=np.int64)
+    bounds = np.floor(np.cumsum(expected) * (total / expected.sum()) + rng.random())
+    bounds[-1] = total
+    return np.diff(bounds, prepend=0).astype(np.int64)
+
+
+def _to_arrays(count_map):
+    """Returns sorted keys and their counts of a count map as int64 arrays."""
+    keys = np.array(sorted(count_map), dtype=np.int64)
+    counts = np.array([count_map[key] for key in keys.tolist()], dtype=np.int64)
+    return keys, counts
+
+
+def _to_map(keys, counts):
+    """Creates count map from keys and counts, merging equal keys and skipping keys without nodes."""
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    unique_counts = np.bincount(inverse, weights=counts, minlength=len(unique_keys)).astype(np.int64)
+    return {key: count for key, count in zip(unique_keys.tolist(), unique_counts.tolist()) if count > 0}
+
+
+def scale_count_map(count_map, node_count, rng, max_key=None):
+    """
+    Scales count map to node_count nodes with the same distribution of keys.
+
+    Args:
+        count_map: Dictionary int:int that maps degree to count of nodes with that degree.
+        node_count: Integer, total count of nodes in the scaled map.
+        rng: numpy.random.Generator used for rounding.
+        max_key: Integer, maximal degree. Larger degrees are capped. No cap if None.
+
+    Returns:
+        Scaled count map.
+    """
+    if not count_map:
+        return {}
+    keys, counts = _to_arrays(count_map)
+    scaled_counts = round_counts(counts, node_count, rng)
+    if max_key is not None:
+        keys = np.minimum(keys, max_key)
+    return _to_map(keys, scaled_counts)
+
+
+def match_stub_total(count_map, stub_total, rng, max_key=None):
+    """
+    Changes degrees of nodes in count map, so that the total number of connections sum(degree * count) is stub_total.
+    Degrees are capped with max_key first. Then connections are removed from (or added to) connected nodes at random
+    in proportion to their degree. Nodes without connections get them only if connected nodes are full.
+
+    Args:
+        count_map: Dictionary int:int that maps degree to count of nodes with that degree.
+        stub_total: Integer, total number of connections in the returned map.
+        rng: numpy.random.Generator used for sampling.
+        max_key: Integer, maximal degree. No cap if None.
+
+    Returns:
+        Count map with the same number of nodes and stub_total connections.
+
+    Raises:
+        ValueError: Nodes can't have stub_total connections with max_key connections at most.
+    """
+    keys, counts = _to_arrays(count_map)
+    max_key = max_key if max_key is not None else stub_total
+    if stub_total > max_key * int(counts.sum()):
+        raise ValueError(f"{int(counts.sum())} nodes can't have {stub_total} connections, "
+                         f"with at most {max_key} connections each.")
+
+    # Degrees of connected nodes, nodes without connections are only counted.
+    unconnected_count = int(counts[keys == 0].sum())
+    degrees = np.minimum(np.repeat(keys[keys > 0], counts[keys > 0]), max_key)
+    difference = stub_total - int(degrees.sum())
+
+    if difference < 0:
+        degrees -= rng.multivariate_hypergeometric(degrees, -difference, method="marginals")
+
+    while difference > 0:
+        # Nodes that reached max_key don't get new connections.
+        weights = np.where(degrees < max_key, degrees, 0).astype(np.float64)
+        if weights.sum() == 0:
+            # All connected nodes are full, the rest of connections fills unconnected nodes up to max_key at once.
+            full_count, rest = divmod(difference, max_key)
+            moved = np.full(full_count + (rest > 0), max_key, dtype=degrees.dtype)
+            if rest > 0:
+                moved[-1] = rest
+            degrees = np.concatenate([degrees, moved])
+            unconnected_count -= len(moved)
+            difference = 0
+            continue
+        added = np.minimum(rng.multinomial(difference, weights / weights.sum()), max_key - degrees)
+        degrees += added
+        difference -= int(added.sum())
+
+    scaled_map = _to_map(degrees, np.ones(len(degrees), dtype=np.int64))
+    if unconnected_count > 0:
+        scaled_map[0] = scaled_map.get(0, 0) + unconnected_count
+    return dict(sorted(scaled_map.items()))
+
+
+def scale_one_to_many(count_map, scale, group_count, element_count, rng):
+    """
+    Scales count map of one-to-many connections, that maps number of elements in a group to count of groups.
+
+    Args:
+        count_map: Dictionary int:int, count map of the config.
+        scale: Float, scale factor.
+        group_count: Integer, scaled number of groups.
+        element_count: Integer, scaled number of elements.
+        rng: numpy.random.Generator used for sampling.
+
+    Returns:
+        Scaled count map of group_count groups.
+    """
+    if not count_map:
+        return {}
+    scaled_map = scale_count_map(count_map, group_count, rng, max_key=element_count)
+    stub_total = min(scale_count(sum(key * count for key, count in count_map.items()), scale), element_count)
+    return match_stub_total(scaled_map, stub_total, rng, max_key=element_count)
+
+
+def scale_many_to_many(count_map_1, count_map_2, scale, count_1, count_2, rng):
+    """
+    Scales both count maps of a many-to-many relation, so that they have the same number of connections.
+
+    Args:
+        count_map_1: Dictionary int:int that maps number of connections of element 1 to count of elements 1.
+        count_map_2: Dictionary int:int that maps number of connections of element 2 to count of elements 2.
+        scale: Float, scale factor.
+        count_1: Integer, scaled number of elements 1.
+        count_2: Integer, scaled number of elements 2.
+        rng: numpy.random.Generator used for sampling.
+
+    Returns:
+        Tuple of scaled count maps.
+    """
+    stub_totals = [sum(key * count for key, count in count_map.items()) for count_map in (count_map_1, count_map_2)]
+    stub_total = min(scale_count(min(stub_totals), scale), count_1 * count_2)
+
+    scaled_map_1 = scale_count_map(count_map_1, scale_count(sum(count_map_1.values()), scale), rng, max_key=count_2)
+    scaled_map_2 = scale_count_map(count_map_2, scale_count(sum(count_map_2.values()), scale), rng, max_key=count_1)
+
+    # An element can't have more distinct connections than there are connected elements on the other side.
+    connected_count_1 = sum(count for key, count in scaled_map_1.items() if key > 0)
+    connected_count_2 = sum(count for key, count in scaled_map_2.items() if key > 0)
+    return (match_stub_total(scaled_map_1, stub_total, rng, max_key=max(connected_count_2, 1)),
+            match_stub_total(scaled_map_2, stub_total, rng, max_key=max(connected_count_1, 1)))
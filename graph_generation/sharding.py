@@ -0,0 +1,337 @@
+"""
+This module implements sharded generation of graphs that are too large to be generated in one process.
+
+Dataset and system id spaces are split into contiguous ranges, one range per shard. Every shard builds the same
+global ShardPlan from the config and seed, so shards can be generated independently, on different machines:
+    one-to-many relations are generated globally, and every shard keeps only its own datasets and systems;
+    many-to-many degrees are assigned to dataset and system ids globally. Dataset stubs stay in the shard of the
+    dataset, and stubs of every system are split between shards with multivariate hypergeometric draws, so every
+    shard gets exactly as many system stubs as it has dataset stubs. Shards pair their stubs locally.
+Degrees of datasets and systems are therefore preserved globally, not only inside each shard.
+
+Collections, dataset collections, system collections and data integrities belong to shard 0.
+Processing ids of a shard start after the stub counts of the previous shards, so they are unique across shards.
+
+Shards are saved to separate files. A JSON manifest describes the shards, so readers can treat them as one graph:
+    graph.bin -> graph-00000-of-00004.bin ... graph-00003-of-00004.bin + graph.manifest.json
+Compressed graphs (see compression.py) get compressed shards, and their manifest keeps the compression extension:
+    graph.bin.gz -> graph-00000-of-00004.bin.gz ... graph-00003-of-00004.bin.gz + graph.gz.manifest.json
+"""
+
+import hashlib
+import json
+import logging
+import os
+
+import networkx as nx
+import numpy as np
+
+from compression import open_file, split_compression
+from config_params.collection_params import CollectionParams
+from config_params.dataset_params import DatasetParams
+from config_params.system_params import SystemParams
+from connection_generator import ConnectionGenerator
+from connection_store import ConnectionStore, Relation
+from nx_graph import NxGraph
+from proto_graph import ProtoGraph
+from random_streams import RandomStreams, child_sequence
+
+MANIFEST_VERSION = 1
+
+
+def get_id_ranges(count, shard_count):
+    """Splits ids 1..count into shard_count contiguous ranges of almost equal size.
+
+    Returns:
+        List of (start, stop) tuples, shard ids are start <= id < stop.
+    """
+    return [(1 + count * i // shard_count, 1 + count * (i + 1) // shard_count) for i in range(shard_count)]
+
+
+def get_shard_file(output_file, shard_index, shard_count):
+    """Returns file name of a shard (ex. graph.bin -> graph-00001-of-00004.bin, graph.bin.gz -> ...bin.gz)."""
+    name, compression_extension = split_compression(output_file)
+    root, extension = os.path.splitext(name)
+    return f"{root}-{shard_index:05d}-of-{shard_count:05d}{extension}{compression_extension}"
+
+
+def get_manifest_file(output_file):
+    """
+    Returns file name of a shard manifest (ex. graph.bin -> graph.manifest.json). The compression extension is kept
+    (ex. graph.bin.gz -> graph.gz.manifest.json), so compressed and uncompressed graphs in a directory don't share it.
+    """
+    name, compression_extension = split_compression(output_file)
+    return f"{os.path.splitext(name)[0]}{compression_extension}.manifest.json"
+
+
+def get_config_hash(config):
+    """Returns hash of a config, so shards generated from different configs can be detected."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+def _get_degrees(element_count, element_count_map, rng):
+    """Assigns connection counts from count map to element ids 1..element_count in random order."""
+    degrees = np.repeat(np.maximum(np.fromiter(element_count_map.keys(), dtype=np.int64), 0),
+                        np.fromiter(element_count_map.values(), dtype=np.int64))[:element_count]
+    degrees = np.pad(degrees, (0, element_count - len(degrees)))
+    return rng.permutation(degrees)
+
+
+def _trim_stubs(degrees, stub_count, rng):
+    """Keeps random stub_count stubs of a degree sequence."""
+    if degrees.sum() <= stub_count:
+        return degrees
+    return rng.multivariate_hypergeometric(degrees, stub_count)
+
+
+class ManyToManyPlan:
+    """
+    A class to plan a sharded many-to-many relation. Element 1 ids are partitioned between shards, and stubs of
+    element 2 are split between shards in proportion to element 1 stubs of every shard.
+
+    ...
+
+    Attributes:
+        element_1_degrees: Array of connection counts of element 1 ids 1..element_1_count.
+        element_2_degrees: Array of connection counts of element 2 ids 1..element_2_count.
+        shard_stub_counts: Array of number of stubs in every shard.
+
+    Methods:
+        element_2_stubs(shard_index)
+            Returns array of element 2 stub counts allocated to a shard.
+    """
+    def __init__(self, element_1_count, element_2_count, element_1_count_map, element_2_count_map, element_1_ranges,
+                 seed_sequence):
+        rng = np.random.default_rng(child_sequence(seed_sequence, 0))
+        element_1_degrees = _get_degrees(element_1_count, element_1_count_map, rng)
+        element_2_degrees = _get_degrees(element_2_count, element_2_count_map, rng)
+
+        # Both sides need the same number of stubs.
+        stub_count = min(element_1_degrees.sum(), element_2_degrees.sum())
+        self.element_1_degrees = _trim_stubs(element_1_degrees, stub_count, rng)
+        self.element_2_degrees = _trim_stubs(element_2_degrees, stub_count, rng)
+        self.shard_stub_counts = np.array([self.element_1_degrees[start - 1:stop - 1].sum()
+                                           for start, stop in element_1_ranges], dtype=np.int64)
+        self._allocation_seed_sequence = child_sequence(seed_sequence, 1)
+        self._element_2_allocations = None
+
+    def element_2_stubs(self, shard_index):
+        """
+        Returns element 2 stub counts of a shard. Shards are allocated in order, each from the remaining stubs, so
+        allocations of all shards are drawn once, on the first call.
+        """
+        if self._element_2_allocations is None:
+            rng = np.random.default_rng(self._allocation_seed_sequence)
+            remaining = self.element_2_degrees.copy()
+            self._element_2_allocations = []
+            for stub_count in self.shard_stub_counts.tolist():
+                allocated = rng.multivariate_hypergeometric(remaining, stub_count)
+                remaining -= allocated
+                self._element_2_allocations.append(allocated)
+        return self._element_2_allocations[shard_index]
+
+
+class ShardPlan:
+    """
+    A class to partition a graph into shards. The plan is the same in every process with the same config and seed.
+
+    ...
+
+    Attributes:
+        seed: Integer root seed of the graph.
+        shard_count: Integer, number of shards.
+        dataset_ranges: List of (start, stop) dataset id ranges of shards.
+        system_ranges: List of (start, stop) system id ranges of shards.
+        processing_ranges: List of (start, stop) processing id ranges of shards.
+        dataset_reads: ManyToManyPlan of dataset reads and system inputs.
+        dataset_writes: ManyToManyPlan of dataset writes and system outputs.
+
+    Methods:
+        generate_connections(shard_index)
+            Generates ConnectionStore with connections of a shard.
+
+        get_shard_params(shard_index)
+            Returns DatasetParams, SystemParams and CollectionParams with counts of a shard for attribute generation.
+
+        get_id_offsets(shard_index)
+            Returns dictionary that maps node type to its first id - 1 in a shard.
+
+        to_manifest(output_file, graph_type, config)
+            Returns manifest dictionary that describes shard files.
+    """
+    def __init__(self, dataset_params, system_params, dataset_to_system_params, collection_params, shard_count,
+                 seed=None):
+        """
+        Raises:
+            ValueError: Incorrect number of shards.
+        """
+        if shard_count < 1:
+            raise ValueError("Number of shards should be at least 1.")
+        self.streams = RandomStreams(seed)
+        self.seed = self.streams.seed
+        self.shard_count = shard_count
+        self.dataset_params = dataset_params
+        self.system_params = system_params
+        self.collection_params = collection_params
+
+        self.dataset_ranges = get_id_ranges(dataset_params.dataset_count, shard_count)
+        self.system_ranges = get_id_ranges(system_params.system_count, shard_count)
+
+        self.dataset_reads = ManyToManyPlan(dataset_params.dataset_count, system_params.system_count,
+                                            dataset_to_system_params.dataset_read_count_map,
+                                            dataset_to_system_params.system_input_count_map, self.dataset_ranges,
+                                            self.streams.seed_sequence("shard_plan.dataset_read_conn_systems"))
+        self.dataset_writes = ManyToManyPlan(dataset_params.dataset_count, system_params.system_count,
+                                             dataset_to_system_params.dataset_write_count_map,
+                                             dataset_to_system_params.system_output_count_map, self.dataset_ranges,
+                                             self.streams.seed_sequence("shard_plan.dataset_write_conn_systems"))
+
+        # Every shard has at most as many processings as stubs, so ids are reserved by stub counts.
+        processing_offsets = np.zeros(shard_count + 1, dtype=np.int64)
+        np.cumsum(self.dataset_reads.shard_stub_counts + self.dataset_writes.shard_stub_counts,
+                  out=processing_offsets[1:])
+        self.processing_ranges = [(int(processing_offsets[i]) + 1, int(processing_offsets[i + 1]) + 1)
+                                  for i in range(shard_count)]
+
+    def _get_one_to_many(self, name, element_count, element_count_map, element_range):
+        """Generates global one to many connections and keeps the ones with elements in element_range."""
+        offsets, members = ConnectionGenerator.get_one_to_many_offsets(
+            element_count, element_count_map, rng=self.streams.generator(f"shard_plan.{name}"))
+        group_ids = np.repeat(np.arange(1, len(offsets), dtype=np.int64), np.diff(offsets))
+        in_range = (members >= element_range[0]) & (members < element_range[1])
+        return Relation.from_pairs(group_ids[in_range], members[in_range], len(offsets) - 1, element_count)
+
+    def _get_many_to_many(self, name, relation_plan, shard_index):
+        """Pairs dataset stubs of a shard with system stubs allocated to it."""
+        start, stop = self.dataset_ranges[shard_index]
+        dataset_ids, system_ids = ConnectionGenerator.match_stubs(
+            relation_plan.element_1_degrees[start - 1:stop - 1], relation_plan.element_2_stubs(shard_index),
+            rng=self.streams.generator(f"connections.{name}", shard_index))
+        return Relation.from_pairs(dataset_ids + start - 1, system_ids, stop - 1, self.system_params.system_count)
+
+    def generate_connections(self, shard_index):
+        """Generates connections of a shard in a ConnectionStore with the same relations as ConnectionGenerator."""
+        connections = ConnectionStore()
+        empty_relation = Relation(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64), target_count=0)
+        if shard_index == 0:
+            connections.add("dataset_collections_conn_collection",
+                            self._get_one_to_many("dataset_collections_conn_collection",
+                                                  self.collection_params.dataset_collection_count,
+                                                  self.collection_params.dataset_collection_count_map,
+                                                  (1, self.collection_params.dataset_collection_count + 1)))
+            connections.add("system_collections_conn_collection",
+                            self._get_one_to_many("system_collections_conn_collection",
+                                                  self.collection_params.system_collection_count,
+                                                  self.collection_params.system_collection_count_map,
+                                                  (1, self.collection_params.system_collection_count + 1)))
+        else:
+            connections.add("dataset_collections_conn_collection", empty_relation)
+            connections.add("system_collections_conn_collection", empty_relation)
+
+        connections.add("datasets_conn_collection",
+                        self._get_one_to_many("datasets_conn_collection", self.dataset_params.dataset_count,
+                                              self.collection_params.dataset_count_map,
+                                              self.dataset_ranges[shard_index]))
+        connections.add("systems_conn_collection",
+                        self._get_one_to_many("systems_conn_collection", self.system_params.system_count,
+                                              self.collection_params.system_count_map,
+                                              self.system_ranges[shard_index]))
+        connections.add("dataset_read_conn_systems",
+                        self._get_many_to_many("dataset_read_conn_systems", self.dataset_reads, shard_index))
+        connections.add("dataset_write_conn_systems",
+                        self._get_many_to_many("dataset_write_conn_systems", self.dataset_writes, shard_index))
+        return connections
+
+    def get_shard_params(self, shard_index):
+        """Returns DatasetParams, SystemParams and CollectionParams with node counts of a shard."""
+        dataset_start, dataset_stop = self.dataset_ranges[shard_index]
+        system_start, system_stop = self.system_ranges[shard_index]
+        dataset_params = DatasetParams(dataset_stop - dataset_start, self.dataset_params.dataset_env_count_map,
+                                       self.dataset_params.dataset_slo_range)
+        system_params = SystemParams(system_stop - system_start, self.system_params.system_criticality_proba_map,
+                                     self.system_params.system_env_count_map)
+        if shard_index == 0:
+            return dataset_params, system_params, self.collection_params
+        collection_params = CollectionParams(self.collection_params.dataset_count_map,
+                                             self.collection_params.system_count_map, 0, {}, 0, {}, 0)
+        return dataset_params, system_params, collection_params
+
+    def get_id_offsets(self, shard_index):
+        """Returns dictionary that maps node type to the first id - 1 of a shard."""
+        return {"dataset": self.dataset_ranges[shard_index][0] - 1,
+                "system": self.system_ranges[shard_index][0] - 1,
+                "processing": self.processing_ranges[shard_index][0] - 1}
+
+    def to_manifest(self, output_file, graph_type, config):
+        """Returns manifest dictionary that describes all shard files of output_file."""
+        shards = []
+        for i in range(self.shard_count):
+            shards.append({
+                "index": i,
+                "file": os.path.basename(get_shard_file(output_file, i, self.shard_count)),
+                "dataset_ids": list(self.dataset_ranges[i]),
+                "system_ids": list(self.system_ranges[i]),
+                "processing_ids": list(self.processing_ranges[i]),
+                "has_collections": i == 0
+            })
+        return {
+            "version": MANIFEST_VERSION,
+            "graph_type": graph_type,
+            "seed": self.seed,
+            "config_sha256": get_config_hash(config),
+            "shard_count": self.shard_count,
+            "dataset_count": self.dataset_params.dataset_count,
+            "system_count": self.system_params.system_count,
+            "shards": shards
+        }
+
+
+def write_manifest(manifest, manifest_file, overwrite=False):
+    """Saves manifest to a JSON file.
+
+    Raises:
+        ValueError: Manifest with this file already exists.
+    """
+    if os.path.isfile(manifest_file) and not overwrite:
+        raise ValueError("Manifest with this file already exists.")
+    with open(manifest_file, "w") as f:
+        json.dump(manifest, f, indent=2)
+    logging.info(f"Shard manifest saved to {manifest_file}.")
+
+
+def read_manifest(manifest_file):
+    """Loads manifest from a JSON file.
+
+    Raises:
+        ValueError: Unsupported manifest version.
+    """
+    with open(manifest_file, "r") as f:
+        manifest = json.load(f)
+    if manifest["version"] != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported shard manifest version {manifest['version']}.")
+    return manifest
+
+
+def _read_graphml(filename):
+    with open_file(filename, "rb") as f:
+        return nx.read_graphml(f)
+
+
+def read_sharded_graph(manifest_file):
+    """Reads all shards of a manifest into one ProtoGraph or NxGraph, depending on the manifest graph type."""
+    manifest = read_manifest(manifest_file)
+    directory = os.path.dirname(manifest_file)
+    shard_files = [os.path.join(directory, shard["file"]) for shard in manifest["shards"]]
+
+    if manifest["graph_type"] == "proto":
+        graph = ProtoGraph()
+        for shard_file in shard_files:
+            with open_file(shard_file, "rb") as f:
+                # Parsing into the same message merges repeated fields of shards.
+                graph.graph.MergeFromString(f.read())
+            graph.is_empty = False
+    else:
+        graph = NxGraph()
+        graph.graph = nx.compose_all([_read_graphml(shard_file) for shard_file in shard_files])
+    logging.info(f"Sharded graph loaded from {manifest_file}.")
+    return graph
@@ -0,0 +1,263 @@
+"""
+This module implements a report of wall time, CPU time and peak memory of graph generation stages.
+
+Stages are measured with StageReport.stage(name), stages with the same name (ex. one per chunk) are merged: their times
+are summed and their peaks are the maximum. For every stage the report keeps:
+    wall_seconds - wall clock time.
+    cpu_seconds - user and system CPU time of the process and of its finished child processes.
+    peak_rss_bytes - peak resident set size during the stage. On Linux the peak is reset with /proc/self/clear_refs
+                     when a stage starts, elsewhere it is the peak of the process since it started.
+    tracemalloc_peak_bytes - peak of memory allocated by Python during the stage, if the report traces memory.
+                             Tracing slows generation down a few times, so it is optional.
+
+Stages can be nested, the peaks of an inner stage count in the peaks of the outer one. Stages run in worker processes
+are measured with call_measured() and merged into the report of the parent process. A report with a StageProfiler
+also profiles every stage it measures in the parent process (see profiling.py).
+
+The report is saved as JSON, or as a Prometheus textfile for the node exporter textfile collector, so runs can be
+compared over time.
+
+Usage:
+    report = StageReport(trace_memory=False, labels={"graph_type": "proto"})
+    with report.stage("connections.datasets_conn_collection"):
+        ...
+    report.save_json("run_report.json")
+    report.save_prometheus("/var/lib/node_exporter/graph_generation.prom")
+
+    Prometheus textfile:
+    graph_generation_stage_wall_seconds{graph_type="proto",stage="connections.datasets_conn_collection"} 0.214
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+METRIC_PREFIX = "graph_generation"
+
+# Metrics of every stage, with the key of the stage dictionary and help text.
+STAGE_METRICS = (
+    ("stage_wall_seconds", "wall_seconds", "Wall time of a graph generation stage in seconds."),
+    ("stage_cpu_seconds", "cpu_seconds", "CPU time of a graph generation stage in seconds."),
+    ("stage_peak_rss_bytes", "peak_rss_bytes", "Peak resident set size during a graph generation stage."),
+    ("stage_tracemalloc_peak_bytes", "tracemalloc_peak_bytes",
+     "Peak of memory allocated by Python during a graph generation stage."),
+    ("stage_calls", "calls", "Number of times a graph generation stage was run.")
+)
+
+
+def reset_peak_rss():
+    """Resets peak RSS of the process. Returns False if it can't be reset (only Linux allows it)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def get_peak_rss():
+    """Returns peak RSS of the process in bytes, since the last reset_peak_rss() on Linux, or None if unknown."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_rss():
+    """Returns current RSS of the process in bytes, or None if unknown (only Linux reports it)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def get_cpu_seconds():
+    """Returns user and system CPU time of the process and of its finished child processes."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _max(*values):
+    """Returns the maximum of values that are not None, or None."""
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+class StageReport:
+    """
+    A class to measure stages of graph generation and save them as JSON or Prometheus textfile.
+
+    ...
+
+    Attributes:
+        trace_memory: Boolean, if True, tracemalloc peaks are measured.
+        labels: Dictionary of labels of the run (ex. graph type), added to every Prometheus metric.
+        info: Dictionary of other run information saved to JSON (ex. seed, output file).
+        stages: Dictionary that maps stage name to its measurements, in the order stages first ran.
+        profiler: StageProfiler that profiles every stage, or None.
+
+    Methods:
+        stage(name)
+            Context manager that measures a stage.
+        add(name, ...)
+            Merges measurements of a stage.
+        merge(report)
+            Merges all stages of another report, ex. measured in a worker process.
+        to_dict()
+            Returns the report as a dictionary.
+        save_json(filename), save_prometheus(filename)
+            Save the report.
+    """
+    def __init__(self, trace_memory=False, labels=None, info=None, profiler=None):
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        self.labels = dict(labels) if labels is not None else {}
+        self.info = dict(info) if info is not None else {}
+        self.stages = {}
+        self._open_stages = []
+        self._start = time.perf_counter()
+        self._cpu_start = get_cpu_seconds()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _read_peaks(self):
+        """Returns current peak RSS and tracemalloc peak."""
+        traced_peak = tracemalloc.get_traced_memory()[1] if self.trace_memory else None
+        return get_peak_rss(), traced_peak
+
+    def _reset_peaks(self):
+        """Keeps the peaks reached so far by open stages, and resets the peaks of the process."""
+        if self._open_stages:
+            peak_rss, traced_peak = self._read_peaks()
+            outer = self._open_stages[-1]
+            outer["peak_rss_bytes"] = _max(outer["peak_rss_bytes"], peak_rss)
+            outer["tracemalloc_peak_bytes"] = _max(outer["tracemalloc_peak_bytes"], traced_peak)
+        reset_peak_rss()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        """Measures the code of a with block as a stage."""
+        self._reset_peaks()
+        measured = {"peak_rss_bytes": None, "tracemalloc_peak_bytes": None}
+        self._open_stages.append(measured)
+        start, cpu_start = time.perf_counter(), get_cpu_seconds()
+        try:
+            with self.profiler.stage(name) if self.profiler is not None else nullcontext():
+                yield
+        finally:
+            wall_seconds, cpu_seconds = time.perf_counter() - start, get_cpu_seconds() - cpu_start
+            peak_rss, traced_peak = self._read_peaks()
+            self._open_stages.pop()
+            peak_rss = _max(measured["peak_rss_bytes"], peak_rss)
+            traced_peak = _max(measured["tracemalloc_peak_bytes"], traced_peak)
+            if self._open_stages:
+                outer = self._open_stages[-1]
+                outer["peak_rss_bytes"] = _max(outer["peak_rss_bytes"], peak_rss)
+                outer["tracemalloc_peak_bytes"] = _max(outer["tracemalloc_peak_bytes"], traced_peak)
+            self.add(name, wall_seconds, cpu_seconds, peak_rss, traced_peak)
+
+    def add(self, name, wall_seconds, cpu_seconds, peak_rss_bytes=None, tracemalloc_peak_bytes=None, calls=1):
+        """Adds measurements to a stage: times and calls are summed, peaks are the maximum."""
+        stage = self.stages.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                                              "peak_rss_bytes": None, "tracemalloc_peak_bytes": None})
+        stage["calls"] += calls
+        stage["wall_seconds"] += wall_seconds
+        stage["cpu_seconds"] += cpu_seconds
+        stage["peak_rss_bytes"] = _max(stage["peak_rss_bytes"], peak_rss_bytes)
+        stage["tracemalloc_peak_bytes"] = _max(stage["tracemalloc_peak_bytes"], tracemalloc_peak_bytes)
+
+    def merge(self, report):
+        """Adds all stages of another report, ex. stages measured in a worker process."""
+        for name, stage in report.stages.items():
+            self.add(name, stage["wall_seconds"], stage["cpu_seconds"], stage["peak_rss_bytes"],
+                     stage["tracemalloc_peak_bytes"], calls=stage["calls"])
+
+    def to_dict(self):
+        """Returns run information and rounded measurements of all stages."""
+        stages = [{"name": name,
+                   "calls": stage["calls"],
+                   "wall_seconds": round(stage["wall_seconds"], 6),
+                   "cpu_seconds": round(stage["cpu_seconds"], 6),
+                   "peak_rss_bytes": stage["peak_rss_bytes"],
+                   "tracemalloc_peak_bytes": stage["tracemalloc_peak_bytes"]}
+                  for name, stage in self.stages.items()]
+        return {"labels": self.labels,
+                "info": self.info,
+                "wall_seconds": round(time.perf_counter() - self._start, 6),
+                "cpu_seconds": round(get_cpu_seconds() - self._cpu_start, 6),
+                "peak_rss_bytes": _max(*(stage["peak_rss_bytes"] for stage in self.stages.values())),
+                "trace_memory": self.trace_memory,
+                "stages": stages}
+
+    def save_json(self, filename):
+        """Saves the report to a JSON file."""
+        with open(filename, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_prometheus(self):
+        """Returns the report in Prometheus text exposition format."""
+        report = self.to_dict()
+
+        def format_labels(labels):
+            escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+                       for value in labels.values())
+            return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+        lines = []
+        for metric, key, help_text in STAGE_METRICS:
+            samples = [(format_labels({**self.labels, "stage": stage["name"]}), stage[key])
+                       for stage in report["stages"] if stage[key] is not None]
+            if not samples:
+                continue
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} gauge")
+            lines.extend(f"{METRIC_PREFIX}_{metric}{labels} {value}" for labels, value in samples)
+        for metric, help_text in [("run_wall_seconds", "Wall time of the graph generation run in seconds."),
+                                  ("run_cpu_seconds", "CPU time of the graph generation run in seconds.")]:
+            lines.append(f"# HELP {METRIC_PREFIX}_{metric} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{metric} gauge")
+            lines.append(f"{METRIC_PREFIX}_{metric}{format_labels(self.labels)} {report[metric[4:]]}")
+        return "\n".join(lines) + "\n"
+
+    def save_prometheus(self, filename):
+        """Saves the report as a Prometheus textfile. The file is replaced at once, so it's never scraped half
+        written."""
+        temporary_file = f"{filename}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(temporary_file, filename)
+
+
+def call_measured(name, function, *args, trace_memory=False):
+    """
+    Calls function(*args) as a stage of a new report, ex. in a worker process.
+
+    Returns:
+        Tuple of the function result and the StageReport.
+    """
+    report = StageReport(trace_memory=trace_memory)
+    with report.stage(name):
+        result = function(*args)
+    return result, report
@@ -0,0 +1,77 @@
+"""
+Module to test typed attribute columns.
+
+Usage:
+    python3 graph_generation/test_attribute_columns.py
+"""
+
+import unittest
+
+import numpy as np
+
+from attribute_columns import CategoricalColumn, DurationColumn, IdStringColumn, draw_durations, \
+    format_duration, format_durations, format_id_string, materialize, parse_duration
+
+
+class TestAttributeColumns(unittest.TestCase):
+    def test_format_duration(self):
+        """Tests if durations are formatted with the largest unit that divides them."""
+        self.assertEqual([format_duration(seconds) for seconds in [86400, 90000, 7260, 46]], ["1d", "25h", "121m", "46s"])
+        seconds = np.random.default_rng(1).integers(0, 10 ** 7, 1000)
+        self.assertEqual(format_durations(seconds).tolist(), [format_duration(value) for value in seconds.tolist()])
+        self.assertEqual(format_durations([]).tolist(), [])
+
+    def test_parse_duration(self):
+        """Tests if duration strings are parsed back to seconds."""
+        self.assertEqual([parse_duration(duration) for duration in ["1d", "25h", "121m", "46s"]], [86400, 90000, 7260, 46])
+        with self.assertRaises(ValueError):
+            parse_duration("5w")
+
+    def test_draw_durations(self):
+        """Tests if durations are in the allowed ranges, and chunks continue the same values."""
+        column = draw_durations(10000, np.random.default_rng(2))
+        self.assertEqual(column.seconds.dtype, np.int32)
+        self.assertTrue(np.all((column.seconds >= 1) & (column.seconds <= 30 * 86400)))
+        # Every duration is a whole number of one of the units, and its string is parsed back.
+        self.assertEqual([parse_duration(duration) for duration in column.format()], column.tolist())
+
+        rng = np.random.default_rng(2)
+        chunks = [draw_durations(n, rng) for n in [1, 4999, 5000]]
+        self.assertEqual(np.concatenate([chunk.seconds for chunk in chunks]).tolist(), column.seconds.tolist())
+        self.assertEqual(DurationColumn([60, 3600]).tolist(), [60, 3600])
+        self.assertEqual(DurationColumn([60, 3600]).format(), ["1m", "1h"])
+        self.assertEqual(DurationColumn([60, 3600])[1], 3600)
+
+    def test_draw_durations_from_range(self):
+        """Tests if durations are drawn from a range in seconds, with both ends, and in chunks."""
+        column = draw_durations(10000, np.random.default_rng(3), (60, 65))
+        self.assertEqual(set(column), set(range(60, 66)))
+        rng = np.random.default_rng(3)
+        chunks = [draw_durations(n, rng, (60, 65)) for n in [3, 9997]]
+        self.assertEqual(np.concatenate([chunk.seconds for chunk in chunks]).tolist(), column.tolist())
+        self.assertEqual(draw_durations(5, rng, (7, 7)).tolist(), [7] * 5)
+
+    def test_categorical_column(self):
+        """Tests if categorical column reads values of its codes."""
+        column = CategoricalColumn([1, 0, 1], ("TESTING_ENV", "PRODUCTION_ENV"))
+        self.assertEqual(column.tolist(), ["PRODUCTION_ENV", "TESTING_ENV", "PRODUCTION_ENV"])
+        self.assertEqual(column[1], "TESTING_ENV")
+        self.assertEqual(column[1:], CategoricalColumn([0, 1], ("TESTING_ENV", "PRODUCTION_ENV")))
+        with self.assertRaises(ValueError):
+            CategoricalColumn([], range(300))
+
+    def test_id_string_column(self):
+        """Tests if virtual strings are built from node numbers only when they are read."""
+        column = IdStringColumn("description", "dataset", range(0, 10 ** 9))
+        self.assertEqual(column[5], "Dataset number 5.")
+        self.assertEqual(column[10 ** 9 - 1], format_id_string("description", "dataset", 10 ** 9 - 1))
+        self.assertIsInstance(column[3:6].numbers, range)
+        self.assertEqual(IdStringColumn("regex", "system", [4, 2]).tolist(), ["system.4.*", "system.2.*"])
+        self.assertEqual(materialize({"names": IdStringColumn("name", "collection", range(2)), "ids": [1, 2]}),
+                         {"names": ["collection.0", "collection.1"], "ids": [1, 2]})
+        with self.assertRaises(ValueError):
+            IdStringColumn("title", "dataset", range(3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,9 @@ Usage:
 """
 
 import unittest
+
+import numpy as np
+
 from attribute_generator import AttributeGenerator
 
 from config_params.collection_params import CollectionParams
@@ -15,6 +18,7 @@ from config_params.dataset_to_system_params import DatasetToSystemParams
 from config_params.processing_params import ProcessingParams
 from config_params.system_params import SystemParams
 from config_params.connection_params import ConnectionParams
+from samplers import AliasSampler
 
 
 class TestAttributeGenerator(unittest.TestCase):
@@ -46,7 +50,7 @@ class TestAttributeGenerator(unittest.TestCase):
         p1, p2, p3, p4, p5, p6 = self.get_dummy_params()
         generator = AttributeGenerator(p1, p2, p3, p4, p5, p6)
         element_proba_map = {1: 0.2, 2: 0.2, 3:0.15, 4:0.15, 100: 0.3}
-        random_values_from_map = generator._generate_from_proba(element_proba_map, n=5)
+        random_values_from_map = generator._generate_from_proba(AliasSampler(element_proba_map), n=5)
         self.assertEqual(len(random_values_from_map), 5)
         for n in random_values_from_map:
             self.assertTrue(n in element_proba_map)
@@ -72,5 +76,75 @@ class TestAttributeGenerator(unittest.TestCase):
         name = generator._generate_name("dataset", 5)
         self.assertEqual(name, "dataset.5")
 
+    def test_generate_is_reproducible(self):
+        """Tests if attribute generation with the same seed gives the same attributes."""
+        p1, p2, p3, p4, p5, p6 = self.get_dummy_params()
+        p2 = DatasetParams(100, {"PRODUCTION_ENV": 90, "TESTING_ENV": 10})
+        p3 = SystemParams(10, {"NOT_CRITICAL": 0.5, "CRITICAL_OTHER": 0.5}, {"PRODUCTION_ENV": 1})
+        p4 = DataIntegrityParams({0: 0.4, 1: 0.6})
+        p5 = ProcessingParams({"DOWN": 0.5, "NONE": 0.5}, {"DAY": 0.5, "NEVER": 0.5})
+        p6 = ConnectionParams(20, 30)
+        p1 = CollectionParams({}, {}, 10, {}, 5, {}, 2)
+        generators = [AttributeGenerator(p1, p2, p3, p4, p5, p6, seed=3) for _ in range(2)]
+        for generator in generators:
+            generator.generate()
+        self.assertEqual(generators[0].dataset_attributes, generators[1].dataset_attributes)
+        self.assertEqual(generators[0].system_attributes, generators[1].system_attributes)
+        self.assertEqual(generators[0].dataset_processing_attributes, generators[1].dataset_processing_attributes)
+        self.assertEqual(generators[0].data_integrity_attributes, generators[1].data_integrity_attributes)
+
+    def test_chunks_are_the_same_as_generate(self):
+        """Tests if attributes generated in chunks are the same as attributes generated at once."""
+        p1, p2, p3, p4, p5, p6 = self.get_dummy_params()
+        p2 = DatasetParams(100, {"PRODUCTION_ENV": 90, "TESTING_ENV": 10})
+        p3 = SystemParams(10, {"NOT_CRITICAL": 0.5, "CRITICAL_OTHER": 0.5}, {"PRODUCTION_ENV": 1})
+        p4 = DataIntegrityParams({0: 0.4, 1: 0.6})
+        p5 = ProcessingParams({"DOWN": 0.5, "NONE": 0.5}, {"DAY": 0.5, "NEVER": 0.5})
+        p6 = ConnectionParams(20, 30)
+        for backend in ["numpy", "python"]:
+            generator = AttributeGenerator(p1, p2, p3, p4, p5, p6, seed=3, backend=backend)
+            generator.generate()
+
+            generator.reset_streams()
+            chunks = [generator.get_dataset_attributes(range(start + 1, min(start + 30, 100) + 1))
+                      for start in range(0, 100, 30)]
+            for attribute in generator.dataset_attributes:
+                self.assertEqual([value for chunk in chunks for value in chunk[attribute]],
+                                 list(generator.dataset_attributes[attribute]))
+            processing_chunks = [generator.get_processing_attributes(count) for count in [10, 25, 15]]
+            self.assertEqual([value for chunk in processing_chunks for value in chunk["dataset_impacts"]],
+                             list(generator.dataset_processing_attributes["dataset_impacts"]))
+
+    def test_numpy_backend_returns_typed_columns(self):
+        """Tests if numpy backend returns category codes and durations as typed arrays."""
+        p1, p2, p3, p4, p5, p6 = self.get_dummy_params()
+        p4 = DataIntegrityParams({0: 0.4, 1: 0.6})
+        p5 = ProcessingParams({"DOWN": 0.5, "NONE": 0.5}, {"DAY": 0.5, "NEVER": 0.5})
+        generator = AttributeGenerator(p1, p2, p3, p4, p5, p6, seed=3)
+        attributes = generator.get_processing_attributes(1000)
+        self.assertEqual(attributes["dataset_impacts"].codes.dtype, np.uint8)
+        self.assertEqual(set(attributes["dataset_impacts"]), {"DOWN", "NONE"})
+        self.assertEqual(generator.get_data_integrity_attributes(10)["data_restoration_time"].seconds.dtype,
+                         np.int32)
+        with self.assertRaises(ValueError):
+            AttributeGenerator(p1, p2, p3, p4, p5, p6, backend="java")
+
+    def test_durations_from_config_ranges(self):
+        """Tests if SLOs and data integrity times are integer seconds from the config ranges with both backends."""
+        p1, p2, p3, p4, p5, p6 = self.get_dummy_params()
+        p2 = DatasetParams(0, {"PRODUCTION_ENV": 1}, dataset_slo_range=(5, 10))
+        p4 = DataIntegrityParams({0: 1}, data_restoration_range_seconds=(60, 120),
+                                 data_reconstruction_range_seconds=(180, 180))
+        for backend in ("numpy", "python"):
+            generator = AttributeGenerator(p1, p2, p3, p4, p5, p6, seed=4, backend=backend)
+            slos = list(generator.get_dataset_attributes(range(1, 101))["dataset_slos"])
+            self.assertTrue(all(isinstance(slo, int) and 5 <= slo <= 10 for slo in slos))
+            attributes = generator.get_data_integrity_attributes(100)
+            self.assertTrue(all(60 <= value <= 120 for value in attributes["data_restoration_time"]))
+            self.assertEqual(set(attributes["data_reconstruction_time"]), {180})
+            # Regeneration time has no range, so it's a whole number of one of the time units.
+            self.assertTrue(all(isinstance(value, int) and value > 0 for value in attributes["data_regeneration_time"]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+"""
+Module to test the benchmark suite.
+
+Usage:
+    python3 graph_generation/test_benchmark.py
+"""
+
+import unittest
+
+from benchmark import check_scaling, compare_results, format_results, run_benchmarks
+from test_sharding import SMALL_CONFIG
+
+
+def get_results(seconds_by_scale, peak_rss_bytes=10 ** 8):
+    return {"scales": list(seconds_by_scale),
+            "benchmarks": {"proto/nodes.dataset": {str(scale): {"wall_seconds": seconds, "cpu_seconds": seconds,
+                                                                "peak_rss_bytes": peak_rss_bytes}
+                                                   for scale, seconds in seconds_by_scale.items()}}}
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_compare_results(self):
+        """Tests if only increases above the tolerance and the noise level are regressions."""
+        baseline = get_results({0.1: 1.0, 0.3: 0.01})
+        self.assertEqual(compare_results(get_results({0.1: 1.4, 0.3: 0.04}), baseline), [])
+        regressions = compare_results(get_results({0.1: 2.0, 1: 5.0}, peak_rss_bytes=10 ** 9), baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("proto/nodes.dataset at scale 0.1: wall_seconds 2.0 is 2.00 times"))
+        self.assertIn("peak_rss_bytes", regressions[1])
+
+    def test_check_scaling(self):
+        """Tests if a benchmark with quadratic time is a regression without a baseline."""
+        self.assertEqual(check_scaling(get_results({0.01: 0.001, 0.1: 0.1, 1: 1.2})), [])
+        regressions = check_scaling(get_results({0.01: 0.001, 0.1: 0.1, 1: 10.0}))
+        self.assertEqual(regressions, ["proto/nodes.dataset: time grows as scale^2.00 from scale 0.1 (0.1 s) "
+                                       "to 1.0 (10.0 s)."])
+
+    def test_run_benchmarks(self):
+        """Tests if every stage of the cases is measured at every scale."""
+        results = run_benchmarks(SMALL_CONFIG, scales=[0.5, 1], cases=["proto_read", "proto"], seed=3, repeat=2)
+        benchmarks = results["benchmarks"]
+        self.assertEqual(list(benchmarks)[0], "proto/config")
+        for name in ("proto/connections.dataset_read_conn_systems", "proto/attributes.dataset",
+                     "proto/nodes.processing", "proto/serialization", "proto_read/read"):
+            self.assertEqual(list(benchmarks[name]), ["0.5", "1"])
+        self.assertGreater(benchmarks["proto_read/read"]["1"]["peak_rss_bytes"], 0)
+        self.assertEqual(len(format_results(results).splitlines()), len(benchmarks) + 1)
+        self.assertEqual(compare_results(results, results), [])
+
+        with self.assertRaises(ValueError):
+            run_benchmarks(SMALL_CONFIG, scales=[1], cases=["proto_to_nx"])
+
+
+if __name__ == '__main__':
+    unittest.main()
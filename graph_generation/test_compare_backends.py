@@ -0,0 +1,43 @@
+"""
+Module to test the backend comparison.
+
+Usage:
+    python3 graph_generation/test_compare_backends.py
+"""
+
+import os
+import tempfile
+import unittest
+
+from compare_backends import QUERIES, compare_backends, format_table
+from generate_from_config import generate_and_save_graph
+from test_sharding import SMALL_CONFIG
+
+
+class TestCompareBackends(unittest.TestCase):
+    def test_compare_backends(self):
+        """Tests if backends are measured on the same queries and find the same nodes."""
+        with tempfile.TemporaryDirectory() as directory:
+            proto_file = os.path.join(directory, "source.bin")
+            generate_and_save_graph(SMALL_CONFIG, "proto", proto_file, seed=4)
+            results = compare_backends(proto_file, directory, ["proto", "neo4j_csv"], sample_size=50, seed=1)
+            self.assertTrue(os.path.isdir(os.path.join(directory, "graph.neo4j")))
+
+        self.assertEqual(list(results), ["proto", "neo4j_csv"])
+        for measurements in results.values():
+            self.assertEqual(list(measurements["query_microseconds"]), list(QUERIES))
+            self.assertGreater(measurements["size_bytes"], 0)
+        self.assertEqual(results["proto"]["query_results"], results["neo4j_csv"]["query_results"])
+        self.assertEqual(results["proto"]["query_results"]["node_lookup"], 50)
+        self.assertGreater(results["proto"]["query_results"]["readers"], 0)
+
+        table = format_table(results).splitlines()
+        self.assertEqual(len(table), 3)
+        self.assertTrue(table[1].strip().startswith("proto "))
+
+        with self.assertRaises(ValueError):
+            compare_backends(proto_file, directory, ["sqlite"])
+
+
+if __name__ == '__main__':
+    unittest.main()
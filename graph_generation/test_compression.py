@@ -0,0 +1,65 @@
+"""
+Module to test compression of graph files.
+
+Usage:
+    python3 graph_generation/test_compression.py
+"""
+
+import gzip
+import os
+import tempfile
+import unittest
+
+import compression
+from compression import get_compression, open_file, split_compression
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_compression(self):
+        """Tests if compression is chosen by the file extension."""
+        self.assertEqual(get_compression("graph.bin.gz"), "gzip")
+        self.assertEqual(get_compression("graph.graphml.ZST"), "zstd")
+        self.assertIsNone(get_compression("graph.bin"))
+        self.assertEqual(split_compression("out/graph.bin.gz"), ("out/graph.bin", ".gz"))
+        self.assertEqual(split_compression("out/graph.bin"), ("out/graph.bin", ""))
+
+    def test_round_trip(self):
+        """Tests if binary and text data is read back from uncompressed and compressed files."""
+        names = ["graph.bin", "graph.bin.gz"] + (["graph.bin.zst"] if compression.zstandard is not None else [])
+        for name in names:
+            filename = os.path.join(self.directory.name, name)
+            with open_file(filename, "wb") as f:
+                f.write(b"\x00\x01" * 1000)
+            with open_file(filename, "rb") as f:
+                self.assertEqual(f.read(), b"\x00\x01" * 1000)
+            with open_file(filename, "w") as f:
+                f.write("<graph>é</graph>\n" * 1000)
+            with open_file(filename, "r") as f:
+                self.assertEqual(f.read(), "<graph>é</graph>\n" * 1000)
+
+    def test_gzip_file(self):
+        """Tests if .gz files are gzip files, smaller than the data."""
+        filename = os.path.join(self.directory.name, "graph.graphml.gz")
+        with open_file(filename, "w") as f:
+            f.write("<node />\n" * 10000)
+        with gzip.open(filename, "rt") as f:
+            self.assertEqual(f.read(), "<node />\n" * 10000)
+        self.assertLess(os.path.getsize(filename), 1000)
+
+    def test_errors(self):
+        """Tests if incorrect modes and zstd files without zstandard package raise errors."""
+        with self.assertRaises(ValueError):
+            open_file(os.path.join(self.directory.name, "graph.bin"), "ab")
+        if compression.zstandard is None:
+            with self.assertRaises(ValueError):
+                open_file(os.path.join(self.directory.name, "graph.bin.zst"), "wb")
+
+
+if __name__ == '__main__':
+    unittest.main()
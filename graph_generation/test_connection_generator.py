@@ -8,7 +8,7 @@ Usage:
 """
 
 import unittest
-from connection_generator import ConnectionGenerator
+from connection_generator import ConnectionGenerator, iter_connections
 from scipy.stats import ks_2samp
 from collections import Counter
 
@@ -16,7 +16,9 @@ from config_params.collection_params import CollectionParams
 from config_params.dataset_params import DatasetParams
 from config_params.dataset_to_system_params import DatasetToSystemParams
 from config_params.system_params import SystemParams
+from connection_generator import RELATIONS
 
+import numpy as np
 import random
 random.seed(1)
 
@@ -73,9 +75,51 @@ class TestNxGraph(unittest.TestCase):
         self.assertTrue(ks_test.pvalue > 0.99)
         self.assertEqual(len(generated_connections), len(original_element_count))
 
-    def test_get_many_to_many_connections(self):
+    def test_get_one_to_many_offsets(self):
+        """
+        Tests if method get_one_to_many_offsets generates CSR connections with given distribution.
+        Kolmogorov-Smirnov statistic is used to compare config parameter and generated distributions.
         """
-        Tests if method get_many_to_many_connection generates connections with given distributions.
+        # Arrange: generate a random integer list, get a count map and number of elements.
+        original_element_count = [random.randint(1, 500) for i in range(10000)]
+        count_map = dict(Counter(original_element_count))
+        element_count = sum(original_element_count)
+
+        # Act: Get CSR connections for the generated count map.
+        offsets, members = ConnectionGenerator.get_one_to_many_offsets(element_count, count_map,
+                                                                       rng=np.random.default_rng(1))
+        generated_element_count = np.diff(offsets)
+
+        # Assert: Every element belongs to exactly one group, distributions are the same.
+        self.assertEqual(len(offsets), len(original_element_count) + 1)
+        self.assertEqual(sorted(members.tolist()), list(range(1, element_count + 1)))
+        ks_test = ks_2samp(original_element_count, generated_element_count)
+        self.assertTrue(ks_test.pvalue > 0.99)
+
+    def test_get_one_to_many_offsets_rest_to_last_group(self):
+        """Tests if elements that don't fit into count map are assigned to the last group."""
+        offsets, members = ConnectionGenerator.get_one_to_many_offsets(10, {2: 3})
+        self.assertEqual(offsets.tolist(), [0, 2, 4, 10])
+        self.assertEqual(len(members), 10)
+
+    def test_get_one_to_many_offsets_without_groups(self):
+        """Tests if a count map without groups gives empty CSR connections."""
+        for count_map in [{}, {2: 0}]:
+            offsets, members = ConnectionGenerator.get_one_to_many_offsets(10, count_map)
+            self.assertEqual(offsets.tolist(), [0])
+            self.assertEqual(len(members), 0)
+
+    def test_iter_connections(self):
+        """Tests if dictionary and CSR connections are iterated as the same pairs."""
+        connections = {1: [3, 1], 2: [], 3: [2]}
+        offsets, members = np.array([0, 2, 2, 3]), np.array([3, 1, 2])
+        expected_pairs = [(1, 3), (1, 1), (3, 2)]
+        self.assertEqual(list(iter_connections(connections)), expected_pairs)
+        self.assertEqual(list(iter_connections((offsets, members))), expected_pairs)
+
+    def assert_many_to_many_distribution(self, engine):
+        """
+        Checks if method get_many_to_many_connection generates connections with given distributions.
         Kolmogorov-Smirnov tests are applied on both element_1 and element_2 connection distributions.
         """
         # Arrange: Expected values of system / dataset groups from config (zeros omitted).
@@ -95,7 +139,8 @@ class TestNxGraph(unittest.TestCase):
         generator = ConnectionGenerator(p1, p2, p3, p4)
 
         generated_1_to_2_connections = generator.get_many_to_many_connections(element_1_count, element_2_count,
-                                                                              element_1_count_map, element_2_count_map)
+                                                                              element_1_count_map, element_2_count_map,
+                                                                              engine=engine)
 
         # Calculate connections for the second group (reverse the output dictionary).
         generated_2_to_1_connections = {}
@@ -123,5 +168,93 @@ class TestNxGraph(unittest.TestCase):
         self.assertTrue(ks_test_2.pvalue > 0.99)
 
 
+    def test_get_many_to_many_connections(self):
+        """Tests if vectorized engine generates many-to-many connections with given distributions."""
+        self.assert_many_to_many_distribution("vectorized")
+
+    def test_get_many_to_many_connections_reference(self):
+        """Tests if reference engine generates many-to-many connections with given distributions."""
+        self.assert_many_to_many_distribution("reference")
+
+    def test_get_many_to_many_connections_unknown_engine(self):
+        """Tests if unknown engine is rejected."""
+        with self.assertRaises(ValueError):
+            ConnectionGenerator.get_many_to_many_connections(1, 1, {1: 1}, {1: 1}, engine="unknown")
+
+    def test_match_stubs(self):
+        """Tests if stub matching keeps exact degrees and creates no duplicate connections."""
+        # Arrange: degree sequences with equal number of stubs, element 2 degrees have a heavy tail.
+        rng = np.random.default_rng(1)
+        element_1_degrees = rng.integers(1, 6, size=3000)
+        element_2_proba = 1 / np.arange(1, 301)
+        element_2_degrees = rng.multinomial(element_1_degrees.sum(), element_2_proba / element_2_proba.sum())
+
+        # Act: Match stubs.
+        element_1_ids, element_2_ids = ConnectionGenerator.match_stubs(element_1_degrees, element_2_degrees, rng=rng)
+
+        # Assert: No duplicate pairs and degrees are at most the requested ones.
+        pairs = set(zip(element_1_ids.tolist(), element_2_ids.tolist()))
+        self.assertEqual(len(pairs), len(element_1_ids))
+        generated_1_degrees = np.bincount(element_1_ids, minlength=len(element_1_degrees) + 1)[1:]
+        generated_2_degrees = np.bincount(element_2_ids, minlength=len(element_2_degrees) + 1)[1:]
+        self.assertTrue(np.all(generated_1_degrees <= element_1_degrees))
+        self.assertTrue(np.all(generated_2_degrees <= element_2_degrees))
+        self.assertGreater(len(element_1_ids), 0.99 * element_1_degrees.sum())
+
+    def test_generate(self):
+        """Tests if generate fills connection store with every relation for both engines."""
+        p1 = DatasetParams(100, {})
+        p2 = SystemParams(10, {}, {})
+        p3 = DatasetToSystemParams({0: 5, 2: 5}, {1: 5, 2: 5}, {0: 50, 1: 50}, {0: 90, 1: 10})
+        p4 = CollectionParams({10: 10}, {2: 5}, 10, {5: 2}, 5, {5: 1}, 2)
+        for engine in ["vectorized", "reference"]:
+            generator = ConnectionGenerator(p1, p2, p3, p4, engine=engine)
+            generator.generate()
+            self.assertEqual(sorted(generator.connections), sorted(RELATIONS))
+            self.assertEqual(generator.connections.edge_count("datasets_conn_collection"), 100)
+            self.assertEqual(generator.connections.edge_count("systems_conn_collection"), 10)
+            self.assertEqual(generator.connections.edge_count("dataset_collections_conn_collection"), 10)
+            self.assertEqual(generator.connections.edge_count("system_collections_conn_collection"), 5)
+            self.assertLessEqual(generator.connections.edge_count("dataset_read_conn_systems"), 10)
+            self.assertLessEqual(generator.connections.edge_count("dataset_write_conn_systems"), 10)
+
+    def test_generate_workers(self):
+        """Tests if relations generated in a process pool are the same as sequentially generated ones."""
+        p1 = DatasetParams(1000, {})
+        p2 = SystemParams(100, {}, {})
+        p3 = DatasetToSystemParams({0: 50, 4: 50}, {1: 50, 2: 50}, {0: 800, 1: 200}, {0: 850, 1: 150})
+        p4 = CollectionParams({10: 100}, {2: 50}, 100, {10: 10}, 50, {5: 10}, 10)
+        for engine in ["vectorized", "reference"]:
+            sequential = ConnectionGenerator(p1, p2, p3, p4, engine=engine, workers=1, seed=7)
+            sequential.generate()
+            parallel = ConnectionGenerator(p1, p2, p3, p4, engine=engine, workers=3, seed=7)
+            parallel.generate()
+            for name in RELATIONS:
+                self.assertEqual(list(sequential.connections[name]), list(parallel.connections[name]))
+
+    def test_iter_chunks(self):
+        """Tests if lazily generated chunks have the same connections as generate()."""
+        p1 = DatasetParams(1000, {})
+        p2 = SystemParams(100, {}, {})
+        p3 = DatasetToSystemParams({0: 50, 4: 50}, {1: 50, 2: 50}, {0: 800, 1: 200}, {0: 850, 1: 150})
+        p4 = CollectionParams({10: 100}, {2: 50}, 100, {10: 10}, 50, {5: 10}, 10)
+        generator = ConnectionGenerator(p1, p2, p3, p4, seed=7)
+        generator.generate()
+        lazy_generator = ConnectionGenerator(p1, p2, p3, p4, seed=7)
+        chunks = list(lazy_generator.iter_chunks(64))
+        self.assertEqual(len(lazy_generator.connections.relations), 0)
+        self.assertTrue(all(len(source_ids) <= 64 for _, source_ids, _ in chunks))
+        for name in RELATIONS:
+            pairs = [pair for chunk_name, source_ids, target_ids in chunks if chunk_name == name
+                     for pair in zip(source_ids.tolist(), target_ids.tolist())]
+            self.assertEqual(pairs, list(generator.connections[name]))
+
+    def test_generate_incorrect_workers(self):
+        """Tests if non positive number of workers is rejected."""
+        p1, p2, p3, p4 = self.get_dummy_params()
+        with self.assertRaises(ValueError):
+            ConnectionGenerator(p1, p2, p3, p4, workers=0)
+
+
 if __name__ == '__main__':
     unittest.main()
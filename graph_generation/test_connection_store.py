@@ -0,0 +1,93 @@
+"""
+Module to test compact connection storage.
+
+Usage:
+    python3 graph_generation/test_connection_store.py
+"""
+
+import unittest
+import numpy as np
+
+from connection_store import ConnectionStore, Relation, iter_ranges
+
+
+class TestConnectionStore(unittest.TestCase):
+    @staticmethod
+    def get_relation():
+        """Creates relation 1 -> [3, 1], 2 -> [], 3 -> [2, 3]."""
+        return Relation(np.array([0, 2, 2, 4]), np.array([3, 1, 2, 3]))
+
+    def test_relation_arrays_are_int32(self):
+        """Tests if offsets and indices are stored as int32 arrays."""
+        relation = self.get_relation()
+        self.assertEqual(relation.offsets.dtype, np.int32)
+        self.assertEqual(relation.indices.dtype, np.int32)
+
+    def test_relation_queries(self):
+        """Tests degree, neighbors and counts of a relation."""
+        relation = self.get_relation()
+        self.assertEqual(relation.source_count, 3)
+        self.assertEqual(relation.target_count, 3)
+        self.assertEqual(relation.edge_count, 4)
+        self.assertEqual(relation.degree(1), 2)
+        self.assertEqual(relation.degree(2), 0)
+        self.assertEqual(relation.degrees().tolist(), [2, 0, 2])
+        self.assertEqual(relation.neighbors(3).tolist(), [2, 3])
+
+    def test_relation_iteration(self):
+        """Tests if relation is iterated as (source id, target id) pairs of Python integers."""
+        pairs = list(self.get_relation())
+        self.assertEqual(pairs, [(1, 3), (1, 1), (3, 2), (3, 3)])
+        self.assertTrue(all(type(source_id) is int and type(target_id) is int for source_id, target_id in pairs))
+
+    def test_from_pairs(self):
+        """Tests if relation built from connection pairs groups them by source id."""
+        relation = Relation.from_pairs([3, 1, 3, 1], [2, 3, 3, 1], source_count=3)
+        self.assertEqual(list(relation), [(1, 3), (1, 1), (3, 2), (3, 3)])
+
+    def test_from_dict(self):
+        """Tests if relation built from dictionary has the same connections."""
+        relation = Relation.from_dict({1: [3, 1], 2: [], 3: [2, 3]})
+        self.assertEqual(relation.offsets.tolist(), [0, 2, 2, 4])
+        self.assertEqual(relation.indices.tolist(), [3, 1, 2, 3])
+
+    def test_reverse(self):
+        """Tests if reverse relation maps targets to sources."""
+        relation = self.get_relation().reverse()
+        self.assertEqual(relation.source_count, 3)
+        self.assertEqual(list(relation), [(1, 1), (2, 3), (3, 1), (3, 3)])
+
+    def test_store_views(self):
+        """Tests forward and reverse views, degrees and edge count of a store."""
+        store = ConnectionStore()
+        store.add("relation", self.get_relation())
+        self.assertTrue("relation" in store)
+        self.assertEqual(list(store), ["relation"])
+        self.assertEqual(store.edge_count("relation"), 4)
+        self.assertEqual(store.degrees("relation").tolist(), [2, 0, 2])
+        self.assertEqual(store.degrees("relation", reverse=True).tolist(), [1, 1, 2])
+        self.assertIs(store.reverse("relation"), store.reverse("relation"))
+        self.assertIs(store["relation"], store.forward("relation"))
+
+
+    def test_iter_ranges(self):
+        """Tests if ranges split all indexes into chunks."""
+        self.assertEqual(list(iter_ranges(5, 2)), [(0, 2), (2, 4), (4, 5)])
+        self.assertEqual(list(iter_ranges(5)), [(0, 5)])
+        with self.assertRaises(ValueError):
+            list(iter_ranges(5, 0))
+
+    def test_iter_chunks(self):
+        """Tests if chunks of a relation and a store have all connections in order."""
+        chunks = list(self.get_relation().iter_chunks(3))
+        self.assertEqual([source_ids.tolist() for source_ids, _ in chunks], [[1, 1, 3], [3]])
+        self.assertEqual([target_ids.tolist() for _, target_ids in chunks], [[3, 1, 2], [3]])
+
+        store = ConnectionStore()
+        store.add("first", self.get_relation())
+        store.add("second", self.get_relation().reverse())
+        self.assertEqual([(name, len(source_ids)) for name, source_ids, _ in store.iter_chunks(3)],
+                         [("first", 3), ("first", 1), ("second", 3), ("second", 1)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Module to test codecs of proto enums.
+
+Usage:
+    python3 graph_generation/test_enum_codecs.py
+"""
+
+import unittest
+
+import numpy as np
+
+from attribute_columns import CategoricalColumn
+from enum_codecs import ENV, PROCESSING_FRESHNESS, PROCESSING_IMPACT, SYSTEM_CRITICALITY
+from nx_graph import NxGraph
+from proto import config_pb2
+
+
+class TestEnumCodecs(unittest.TestCase):
+    def test_tables(self):
+        """Tests if tables of every codec match the descriptors of config_pb2."""
+        enum_types = {ENV: config_pb2.ProtoGraph.Env,
+                      SYSTEM_CRITICALITY: config_pb2.ProtoGraph.System.SystemCriticality,
+                      PROCESSING_IMPACT: config_pb2.ProtoGraph.Processing.Impact,
+                      PROCESSING_FRESHNESS: config_pb2.ProtoGraph.Processing.Freshness}
+        for codec, enum_type in enum_types.items():
+            for name, number in enum_type.items():
+                self.assertEqual(codec.encode(name), number)
+                self.assertEqual(codec.decode(number), enum_type.Name(number))
+
+    def test_encode_default(self):
+        """Tests if unknown names are encoded as the default of the enum."""
+        self.assertEqual(ENV.encode("NON_EXIST"), ENV.encode("UNKNOWN_ENV"))
+        self.assertEqual(SYSTEM_CRITICALITY.encode("NON_EXIST"), SYSTEM_CRITICALITY.encode("CRITICAL_OTHER"))
+        self.assertEqual(PROCESSING_FRESHNESS.encode_many(["DAY", "NON_EXIST"]).tolist(), [1, 4])
+
+    def test_encode_many(self):
+        """Tests if lists, categorical columns and arrays of numbers are encoded the same way."""
+        names = ["PRODUCTION_ENV", "TESTING_ENV", "PRODUCTION_ENV"]
+        expected = [ENV.encode(name) for name in names]
+        column = CategoricalColumn([0, 1, 0], ("PRODUCTION_ENV", "TESTING_ENV"))
+        for values in [names, iter(names), column, np.array(expected, dtype=np.uint8)]:
+            encoded = ENV.encode_many(values)
+            self.assertEqual(encoded.dtype, np.int64)
+            self.assertEqual(encoded.tolist(), expected)
+
+    def test_decode_many(self):
+        """Tests if enum numbers are decoded to a categorical column of names, and back."""
+        numbers = np.array([4, 0, 4, 2])
+        column = PROCESSING_IMPACT.decode_many(numbers)
+        self.assertIsInstance(column, CategoricalColumn)
+        self.assertEqual(column.tolist(), ["NONE", "DOWN", "NONE", "DEGRADED"])
+        self.assertEqual(PROCESSING_IMPACT.encode_many(column).tolist(), numbers.tolist())
+        self.assertEqual(PROCESSING_IMPACT.to_names(["DOWN"]), ["DOWN"])
+
+    def test_nx_graph_enum_numbers(self):
+        """Tests if nx graph stores names of enums given as arrays of enum numbers."""
+        graph = NxGraph()
+        graph.add_systems([1, 2], np.array([0, 3]), [5, 5], ["a", "b"], ["a", "b"], np.array([2, 5]), ["a", "b"])
+        self.assertEqual([(attributes["system_critic"], attributes["env"]) for _, attributes in graph.nodes],
+                         [("NOT_CRITICAL", "PRODUCTION_ENV"), ("CRITICAL_OTHER", "UNKNOWN_ENV")])
+
+
+if __name__ == '__main__':
+    unittest.main()
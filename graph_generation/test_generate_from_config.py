@@ -0,0 +1,62 @@
+"""
+Module to test graph generation from config.
+
+Usage:
+    python3 graph_generation/test_generate_from_config.py
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+from generate_from_config import BATCH_SUMMARY_FILE, generate_and_save_batch, generate_and_save_graph, \
+    get_batch_file, get_batch_seeds, process_range
+from test_sharding import SMALL_CONFIG
+
+
+def read_file(filename):
+    with open(filename, "rb") as f:
+        return f.read()
+
+
+class TestGenerateFromConfig(unittest.TestCase):
+    def test_get_batch_seeds(self):
+        """Tests if graphs of a batch get different seeds that depend only on the batch seed."""
+        batch_seed, seeds = get_batch_seeds(7, 5)
+        self.assertEqual(batch_seed, 7)
+        self.assertEqual(len(set(seeds)), 5)
+        self.assertEqual(get_batch_seeds(7, 3)[1], seeds[:3])
+        self.assertNotEqual(get_batch_seeds(8, 5)[1], seeds)
+
+    def test_process_range(self):
+        """Tests if config ranges in seconds are optional pairs of integers."""
+        self.assertEqual(process_range([60, 259200]), (60, 259200))
+        self.assertIsNone(process_range(None))
+        for config_range in ([10, 5], [-1, 5], [5]):
+            with self.assertRaises(ValueError):
+                process_range(config_range)
+
+    def test_generate_and_save_batch(self):
+        """Tests if every graph of a batch is the graph generated alone with its seed from the summary."""
+        with tempfile.TemporaryDirectory() as directory:
+            output_dir = os.path.join(directory, "graphs")
+            summary = generate_and_save_batch(SMALL_CONFIG, "proto", output_dir, 3, workers=2, seed=5)
+            with open(os.path.join(output_dir, BATCH_SUMMARY_FILE)) as f:
+                self.assertEqual(json.load(f), summary)
+            self.assertEqual([graph["output_file"] for graph in summary["graphs"]],
+                             [get_batch_file(output_dir, "proto", i) for i in range(3)])
+            self.assertEqual(summary["seed"], 5)
+
+            graph = summary["graphs"][1]
+            graph_file = os.path.join(directory, "graph.bin")
+            generate_and_save_graph(SMALL_CONFIG, "proto", graph_file, seed=graph["seed"])
+            self.assertEqual(read_file(graph_file), read_file(graph["output_file"]))
+            self.assertNotEqual(read_file(summary["graphs"][0]["output_file"]), read_file(graph["output_file"]))
+
+            with self.assertRaises(ValueError):
+                generate_and_save_batch(SMALL_CONFIG, "proto", output_dir, 3, seed=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
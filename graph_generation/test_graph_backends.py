@@ -0,0 +1,71 @@
+"""
+Module to test graph backends.
+
+Usage:
+    python3 graph_generation/test_graph_backends.py
+"""
+
+import os
+import tempfile
+import unittest
+
+from generate_from_config import generate_and_save_graph
+from graph_backends import BACKENDS, GraphBackend, ProtoBackend, get_node_type, register_backend
+from proto_graph import ProtoGraph
+from test_sharding import SMALL_CONFIG
+
+
+class TestGraphBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        proto_file = os.path.join(cls.directory.name, "source.bin")
+        generate_and_save_graph(SMALL_CONFIG, "proto", proto_file, seed=2)
+        cls.proto_graph = ProtoGraph()
+        cls.proto_graph.read_from_file(proto_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_get_node_type(self):
+        self.assertEqual(get_node_type("dataset_collection_12"), "dataset_collection")
+        self.assertEqual(get_node_type("dataset_3"), "dataset")
+
+    def test_backends_hold_the_same_graph(self):
+        """Tests if every available backend loads the graph it saved, with the same adjacency as proto."""
+        expected = ProtoBackend().load(os.path.join(self.directory.name, "source.bin"))
+        keys = list(expected.nodes)
+        for name, backend_class in BACKENDS.items():
+            if not backend_class.is_available():
+                continue
+            with self.subTest(backend=name):
+                backend = backend_class()
+                filename = os.path.join(self.directory.name, f"graph{backend.extension}")
+                backend.save(backend.build(self.proto_graph), filename)
+                self.assertGreater(backend.get_size(filename), 0)
+                view = backend.load(filename)
+                for key in keys:
+                    self.assertEqual(sorted(view.get_successors(key)), sorted(expected.get_successors(key)))
+                    self.assertEqual(sorted(view.get_predecessors(key)), sorted(expected.get_predecessors(key)))
+                dataset = self.proto_graph.graph.datasets[0]
+                node = view.get_node(f"dataset_{dataset.dataset_id}")
+                self.assertEqual(node["slo"] if isinstance(node, dict) else node.slo, dataset.slo)
+
+    def test_register_backend(self):
+        """Tests if new backends are added to BACKENDS and names can't repeat."""
+        class TestBackend(GraphBackend):
+            name = "test"
+            extension = ".test"
+
+        register_backend(TestBackend)
+        try:
+            self.assertIs(BACKENDS["test"], TestBackend)
+            with self.assertRaises(ValueError):
+                register_backend(TestBackend)
+        finally:
+            del BACKENDS["test"]
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Module to test incremental graph evolution.
+
+Usage:
+    python3 graph_generation/test_graph_evolution.py
+"""
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from generate_from_config import generate_and_save_graph
+from graph_evolution import GraphEvolution, apply_delta, get_step_file, read_delta, save_delta
+from proto_graph import ProtoGraph
+from test_sharding import SMALL_CONFIG
+
+
+def get_degrees(graph):
+    """Returns counters of reads, writes, inputs and outputs of every node."""
+    return {(inputs, node): Counter(getattr(processing, node) for processing in graph.processings
+                                    if processing.inputs == inputs)
+            for inputs in (True, False) for node in ("dataset_id", "system_id")}
+
+
+class TestGraphEvolution(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Generates a small proto graph to evolve."""
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.bin")
+            generate_and_save_graph(SMALL_CONFIG, "proto", filename, seed=11)
+            cls.proto_graph = ProtoGraph()
+            cls.proto_graph.read_from_file(filename)
+        cls.graph = cls.proto_graph.graph
+
+    def test_churn_removes_nodes_with_processings(self):
+        """Tests if removed nodes and all their processings are missing from the evolved graph."""
+        delta = GraphEvolution(self.graph, SMALL_CONFIG, seed=1).evolve(churn=0.1)
+        self.assertEqual(len(delta.removed_dataset_ids), 100)
+        self.assertEqual(len(delta.removed_system_ids), 10)
+        evolved_graph = apply_delta(self.graph, delta)
+        dataset_ids = {dataset.dataset_id for dataset in evolved_graph.datasets}
+        system_ids = {system.system_id for system in evolved_graph.systems}
+        self.assertFalse(dataset_ids & set(delta.removed_dataset_ids))
+        self.assertEqual(len(evolved_graph.processings), len(self.graph.processings) - len(delta.removed_processing_ids))
+        for processing in evolved_graph.processings:
+            self.assertIn(processing.dataset_id, dataset_ids)
+            self.assertIn(processing.system_id, system_ids)
+
+    def test_rewire_keeps_degrees(self):
+        """Tests if rewiring keeps numbers of connections of every node and doesn't create duplicates."""
+        delta = GraphEvolution(self.graph, SMALL_CONFIG, seed=2).evolve(rewire=0.2)
+        self.assertTrue(len(delta.rewired_processings) > 0)
+        evolved_graph = apply_delta(self.graph, delta)
+        self.assertEqual(get_degrees(evolved_graph), get_degrees(self.graph))
+        pairs = Counter((processing.dataset_id, processing.system_id, processing.inputs)
+                        for processing in evolved_graph.processings)
+        self.assertEqual(max(pairs.values()), 1)
+
+    def test_growth_adds_new_ids(self):
+        """Tests if added nodes get new ids after the existing ones, and connect existing nodes."""
+        evolution = GraphEvolution(self.graph, SMALL_CONFIG, seed=3)
+        graph = self.graph
+        for _ in range(3):
+            max_dataset_id = max(dataset.dataset_id for dataset in graph.datasets)
+            max_processing_id = max(processing.processing_id for processing in graph.processings)
+            delta = evolution.evolve(growth=0.1, churn=0.05, rewire=0.05)
+            self.assertTrue(all(dataset.dataset_id > max_dataset_id for dataset in delta.added.datasets))
+            self.assertTrue(all(processing.processing_id > max_processing_id
+                                for processing in delta.added.processings))
+            graph = apply_delta(graph, delta)
+
+        dataset_ids = {dataset.dataset_id for dataset in graph.datasets}
+        system_ids = {system.system_id for system in graph.systems}
+        self.assertEqual(len(dataset_ids), evolution.dataset_count)
+        self.assertEqual(len(system_ids), evolution.system_count)
+        self.assertEqual(len(graph.processings), sum(evolution.processing_counts.values()))
+        for processing in graph.processings:
+            self.assertIn(processing.dataset_id, dataset_ids)
+            self.assertIn(processing.system_id, system_ids)
+
+    def test_evolution_is_reproducible(self):
+        """Tests if the same seed gives the same deltas, and deltas are saved and read back, also compressed."""
+        deltas = [GraphEvolution(self.graph, SMALL_CONFIG, seed=4).evolve(growth=0.1, churn=0.1, rewire=0.1)
+                  for _ in range(2)]
+        self.assertEqual(deltas[0], deltas[1])
+        with tempfile.TemporaryDirectory() as directory:
+            filename = get_step_file(os.path.join(directory, "delta.bin"), 3)
+            self.assertTrue(filename.endswith("delta-00003.bin"))
+            save_delta(deltas[0], filename)
+            self.assertEqual(read_delta(filename), deltas[0])
+            with self.assertRaises(ValueError):
+                save_delta(deltas[0], filename)
+            filename = get_step_file(os.path.join(directory, "delta.bin.gz"), 3)
+            self.assertTrue(filename.endswith("delta-00003.bin.gz"))
+            save_delta(deltas[0], filename)
+            self.assertEqual(read_delta(filename), deltas[0])
+
+    def test_evolve_checks_fractions(self):
+        """Tests if negative fractions are not allowed."""
+        evolution = GraphEvolution(self.graph, SMALL_CONFIG, seed=5)
+        with self.assertRaises(ValueError):
+            evolution.evolve(growth=-0.1)
+        with self.assertRaises(ValueError):
+            evolution.evolve(churn=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
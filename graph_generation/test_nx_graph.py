@@ -5,8 +5,14 @@ Usage:
     python3 graph_generation/test_nx_graph.py
 """
 
+import os
+import tempfile
 import unittest
+
+import networkx as nx
+
 from nx_graph import NxGraph
+from test_proto_graph import add_test_nodes
 
 
 class TestNxGraph(unittest.TestCase):
@@ -83,7 +89,7 @@ class TestNxGraph(unittest.TestCase):
     def test_generate_dataset(self):
         """Tests if dataset node, dataset collection - dataset edge are added."""
         graph = NxGraph()
-        graph.generate_dataset(5, 5, "dataset.*", "dataset 5", "3d", "PRODUCTION_ENV", "Dataset number 5")
+        graph.generate_dataset(5, 5, "dataset.*", "dataset 5", 259200, "PRODUCTION_ENV", "Dataset number 5")
 
         self.assertEqual(len(graph.nodes), 1)
         self.assertEqual(len(graph.nodes[0]), 2)
@@ -105,7 +111,7 @@ class TestNxGraph(unittest.TestCase):
         self.assertEqual(node_attributes["dataset_collection_id"], 5)
         self.assertEqual(node_attributes["regex_grouping"], "dataset.*")
         self.assertEqual(node_attributes["node_name"], "dataset 5")
-        self.assertEqual(node_attributes["slo"], "3d")
+        self.assertEqual(node_attributes["slo"], 259200)
         self.assertEqual(node_attributes["env"], "PRODUCTION_ENV")
         self.assertEqual(node_attributes["description"], "Dataset number 5")
         self.assertEqual(node_attributes["type"], "dataset")
@@ -192,7 +198,7 @@ class TestNxGraph(unittest.TestCase):
     def test_generate_data_integrity(self):
         """Tests if data integrity node and data integrity -> dataset collection edge are added."""
         graph = NxGraph()
-        graph.generate_data_integrity(1, 2, "1d", True, "2m", "3s")
+        graph.generate_data_integrity(1, 2, 86400, True, 120, 3)
 
         self.assertEqual(len(graph.nodes), 1)
         self.assertEqual(len(graph.nodes[0]), 2)
@@ -209,10 +215,10 @@ class TestNxGraph(unittest.TestCase):
         self.assertTrue("type" in node_attributes)
 
         self.assertEqual(node_attributes["id"], 1)
-        self.assertEqual(node_attributes["data_integrity_rec_time"], "1d")
+        self.assertEqual(node_attributes["data_integrity_rec_time"], 86400)
         self.assertEqual(node_attributes["data_integrity_volat"], True)
-        self.assertEqual(node_attributes["data_integrity_rest_time"], "3s")
-        self.assertEqual(node_attributes["data_integrity_reg_time"], "2m")
+        self.assertEqual(node_attributes["data_integrity_rest_time"], 3)
+        self.assertEqual(node_attributes["data_integrity_reg_time"], 120)
         self.assertEqual(node_attributes["type"], "data_integrity")
 
         self.assertEqual(len(graph.edges["data_integrity_to_dataset_collection"]), 1)
@@ -221,5 +227,56 @@ class TestNxGraph(unittest.TestCase):
         self.assertEqual(graph.edges["data_integrity_to_dataset_collection"][0][1], "data_integrity_1")
 
 
+    def test_stream(self):
+        """Tests if graph written in chunks is read by networkx with node attributes and edge labels."""
+        graph = NxGraph()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.graphml")
+            graph.open_stream(filename)
+            graph.generate_collection(1, "collection <0>")
+            graph.flush()
+            self.assertEqual(graph.nodes, [])
+            graph.generate_dataset_collection(2, 1, "dataset collection.1")
+            graph.generate_data_integrity(1, 2, 86400, True, 120, 3)
+            graph.close_stream()
+            read_graph = nx.read_graphml(filename)
+
+        self.assertEqual(read_graph.nodes["collection_1"], {"id": 1, "node_name": "collection <0>", "type": "collection"})
+        self.assertEqual(read_graph.nodes["data_integrity_1"]["data_integrity_volat"], 1)
+        self.assertEqual(read_graph.nodes["data_integrity_1"]["data_integrity_reg_time"], 120)
+        self.assertEqual(read_graph.edges["collection_1", "dataset_collection_2"]["label"], "CONTAINS")
+        self.assertEqual(read_graph.edges["dataset_collection_2", "data_integrity_1"]["label"], "HAS")
+
+    def test_bulk_methods(self):
+        """Tests if nodes and edges added from columns are the same as added one by one."""
+        graphs = [NxGraph(), NxGraph()]
+        add_test_nodes(graphs[0], bulk=False)
+        add_test_nodes(graphs[1], bulk=True)
+        self.assertEqual(graphs[1].nodes, graphs[0].nodes)
+        self.assertEqual(graphs[1].edges, graphs[0].edges)
+        self.assertEqual(len(graphs[1].edges["dataset_to_system_input"]), 6)
+        self.assertEqual(graphs[1].nodes[9], ("dataset_2", graphs[0].nodes[9][1]))
+        self.assertEqual(graphs[1].nodes[9][1]["env"], "NON_EXIST")
+
+    def test_compressed_files(self):
+        """Tests if compressed GraphML files are saved and streamed, and read back as the same graph."""
+        graph = NxGraph()
+        add_test_nodes(graph, bulk=True)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.graphml.gz")
+            graph.save_to_file(filename)
+            read_graph = NxGraph()
+            read_graph.read_from_file(filename)
+
+            stream_file = os.path.join(directory, "stream.graphml.gz")
+            stream_graph = NxGraph()
+            add_test_nodes(stream_graph, bulk=True)
+            stream_graph.open_stream(stream_file)
+            stream_graph.close_stream()
+            streamed_graph = NxGraph()
+            streamed_graph.read_from_file(stream_file)
+        self.assertEqual(dict(read_graph.graph.nodes(data=True)), dict(graph.graph.nodes(data=True)))
+        self.assertEqual(set(streamed_graph.graph.edges), set(graph.graph.edges))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+"""
+Module to test profiling of generation stages.
+
+Usage:
+    python3 graph_generation/test_profiling.py
+"""
+
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+
+from profiling import StageProfiler, get_collapsed_stacks
+from stage_report import StageReport
+
+
+def allocate(size):
+    return [bytearray(size) for _ in range(10)]
+
+
+def count(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiling(unittest.TestCase):
+    def test_collapsed_stacks(self):
+        """Tests if time of a function is split between its callers by the time of their calls."""
+        main, read, write, encode = ("a.py", 1, "main"), ("a.py", 5, "read"), ("a.py", 9, "write"), \
+            ("~", 0, "<built-in method encode>")
+        stats = {
+            main: (1, 1, 1.0, 10.0, {}),
+            read: (1, 1, 1.0, 3.0, {main: (1, 1, 1.0, 3.0)}),
+            write: (1, 1, 2.0, 6.0, {main: (1, 1, 2.0, 6.0)}),
+            encode: (4, 4, 6.0, 6.0, {read: (1, 1, 2.0, 2.0), write: (3, 3, 4.0, 4.0)})
+        }
+        stacks = get_collapsed_stacks(stats)
+        self.assertEqual(stacks, {("main (a.py:1)",): 1.0,
+                                  ("main (a.py:1)", "read (a.py:5)"): 1.0,
+                                  ("main (a.py:1)", "read (a.py:5)", "<built-in method encode>"): 2.0,
+                                  ("main (a.py:1)", "write (a.py:9)"): 2.0,
+                                  ("main (a.py:1)", "write (a.py:9)", "<built-in method encode>"): 4.0})
+
+    def test_cprofile_stages(self):
+        """Tests if every stage is profiled separately and saved as pstats and collapsed stacks."""
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StageProfiler("cprofile", os.path.join(directory, "graph.profile"))
+            report = StageReport(profiler=profiler)
+            for _ in range(2):
+                with report.stage("outer"):
+                    with report.stage("inner"):
+                        count(10000)
+            saved_files = profiler.save()
+            self.assertEqual(sorted(os.path.basename(file) for file in saved_files),
+                             ["graph.profile.inner.collapsed", "graph.profile.inner.pstats",
+                              "graph.profile.outer.collapsed", "graph.profile.outer.pstats"])
+            inner = pstats.Stats(os.path.join(directory, "graph.profile.inner.pstats")).stats
+            outer = pstats.Stats(os.path.join(directory, "graph.profile.outer.pstats")).stats
+            self.assertEqual([stat[1] for function, stat in inner.items() if function[2] == "count"], [2])
+            self.assertNotIn("count", [function[2] for function in outer])
+            with open(os.path.join(directory, "graph.profile.inner.collapsed")) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(any(line.startswith("count (test_profiling.py:") for line in lines))
+            self.assertTrue(all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines))
+
+    def test_tracemalloc_stages(self):
+        """Tests if memory allocated and held by a stage is saved by allocating line."""
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StageProfiler("tracemalloc", os.path.join(directory, "graph.profile"))
+            report = StageReport(profiler=profiler)
+            with report.stage("nodes"):
+                held = allocate(10 ** 5)
+                allocate(10 ** 6)
+            self.assertFalse(tracemalloc.is_tracing())
+            profiler.save()
+            with open(os.path.join(directory, "graph.profile.nodes.tracemalloc.txt")) as f:
+                lines = f.read().splitlines()
+            with open(os.path.join(directory, "graph.profile.nodes.collapsed")) as f:
+                stacks = f.read().splitlines()
+        self.assertEqual(len(held), 10)
+        self.assertTrue(lines[0].startswith("Stage nodes: "))
+        self.assertGreaterEqual(float(lines[1].split(" KiB")[0]), 10 ** 6 / 1024)
+        self.assertTrue(lines[1].endswith(f"test_profiling.py:{allocate.__code__.co_firstlineno + 1}"))
+        size = sum(int(stack.rsplit(" ", 1)[1]) for stack in stacks)
+        self.assertGreaterEqual(size, 10 ** 6)
+        self.assertLess(size, 2 * 10 ** 6)
+
+    def test_unknown_profile_kind(self):
+        with self.assertRaises(ValueError):
+            StageProfiler("perf", "graph.profile")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Module to test progress counters.
+
+Usage:
+    python3 graph_generation/test_progress.py
+"""
+
+import logging
+import unittest
+
+from progress import ProgressCounter, configure_logging
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProgress(unittest.TestCase):
+    def test_progress_lines_are_rate_limited(self):
+        """Tests if progress is logged at most once per interval, with throughput and ETA."""
+        clock = FakeClock()
+        progress = ProgressCounter("Graph", interval=10, clock=clock)
+        progress.set_total("dataset", 1000)
+        with self.assertLogs(level=logging.INFO) as logs:
+            for i in range(500):
+                clock.now = i * 0.05
+                progress.add("dataset", item_id=i + 1)
+            logging.info("end")
+        lines = [line for line in logs.output if "Graph." in line]
+        self.assertEqual(len(lines), 2)
+        self.assertIn("201 items (dataset 201), 20 items/s, 20% done, ETA 40 s.", lines[0])
+        self.assertEqual(progress.counts, {"dataset": 500})
+
+    def test_eta_needs_totals_of_all_types(self):
+        """Tests if ETA is unknown while a counted type has no total."""
+        clock = FakeClock()
+        progress = ProgressCounter("Graph", clock=clock)
+        progress.set_total("dataset", 100)
+        progress.add("dataset", 50)
+        clock.now = 5
+        self.assertEqual(progress.get_eta(), 5)
+        progress.add("processing", 50)
+        self.assertIsNone(progress.get_eta())
+        self.assertEqual(progress.format_progress(), "Graph. 100 items (dataset 50, processing 50), 20 items/s.")
+        self.assertEqual(progress.get_summary(), {"counts": {"dataset": 50, "processing": 50}, "count": 100,
+                                                  "seconds": 5, "items_per_second": 20})
+
+    def test_debug_samples(self):
+        """Tests if every N-th item of a type is logged at DEBUG level."""
+        progress = ProgressCounter("Graph", interval=float("inf"), sample_every=100)
+        with self.assertLogs(level=logging.DEBUG) as logs:
+            for i in range(250):
+                progress.add("system", item_id=i + 1)
+            progress.add("processing", 150)
+        self.assertEqual([line.split(":", 2)[2] for line in logs.output],
+                         ["Graph. Added system 100, 100 system items in total.",
+                          "Graph. Added system 200, 200 system items in total.",
+                          "Graph. Added 150 processing items, 150 processing items in total."])
+
+    def test_configure_logging_checks_level(self):
+        """Tests if unknown log levels are not allowed."""
+        with self.assertRaises(ValueError):
+            configure_logging("VERBOSE")
+
+
+if __name__ == '__main__':
+    unittest.main()
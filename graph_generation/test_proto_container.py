@@ -0,0 +1,113 @@
+"""
+Module to test the streaming container of proto graph messages.
+
+Usage:
+    python3 graph_generation/test_proto_container.py
+"""
+
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from nx_graph import NxGraph
+from proto_container import RECORD_TYPES, ProtoContainerReader, ProtoContainerWriter, decode_varint, encode_varint
+from proto_graph import ProtoGraph
+from proto_to_nx import convert_proto_file_to_nx_stream, convert_proto_to_nx_graph
+from test_proto_graph import add_test_nodes
+
+
+class TestProtoContainer(unittest.TestCase):
+    def setUp(self):
+        self.graph = ProtoGraph()
+        add_test_nodes(self.graph, bulk=True)
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "graph.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_varint(self):
+        """Tests if varints are decoded to the encoded values."""
+        for value in [0, 1, 127, 128, 300, 2 ** 40]:
+            self.assertEqual(decode_varint(b"x" + encode_varint(value), 1), (value, 1 + len(encode_varint(value))))
+        with self.assertRaises(ValueError):
+            decode_varint(encode_varint(300)[:1], 0)
+
+    def test_writer(self):
+        """Tests if container is read as a proto graph binary, and is the same file as save_to_file() writes."""
+        with ProtoContainerWriter(self.filename) as writer:
+            writer.write_graph(self.graph.graph)
+        self.assertEqual(writer.record_counts["processings"], 6)
+        read_graph = ProtoGraph()
+        read_graph.read_from_file(self.filename)
+        self.assertEqual(read_graph.graph, self.graph.graph)
+
+        saved_file = os.path.join(self.directory.name, "saved.bin")
+        self.graph.save_to_file(saved_file)
+        with open(self.filename, "rb") as f, open(saved_file, "rb") as saved:
+            self.assertEqual(f.read(), saved.read())
+        with self.assertRaises(ValueError):
+            ProtoContainerWriter(self.filename)
+
+    def test_reader(self):
+        """Tests if records and frames of a saved graph are read lazily in order, with mmap and with a buffered file."""
+        self.graph.save_to_file(self.filename)
+        expected = [(field.name, message) for field, messages in self.graph.graph.ListFields() for message in messages]
+        for use_mmap in [True, False]:
+            with ProtoContainerReader(self.filename, use_mmap=use_mmap) as reader:
+                self.assertEqual(list(reader.iter_records()), expected)
+                self.assertEqual([message for _, message in reader.iter_records(fields=["systems"])],
+                                 list(self.graph.graph.systems))
+                batches = list(reader.iter_batches(2, fields=["datasets", "processings"]))
+                frames = list(reader.iter_frames())
+                self.assertEqual([RECORD_TYPES[field][1].FromString(reader.read(offset, length))
+                                  for field, offset, length in frames], [message for _, message in expected])
+                self.assertEqual(frames[-1][1] + frames[-1][2], os.path.getsize(self.filename))
+        self.assertEqual([(field, len(messages)) for field, messages in batches],
+                         [("datasets", 2), ("datasets", 1), ("processings", 2), ("processings", 2),
+                          ("processings", 2)])
+
+    def test_compressed_reader(self):
+        """Tests if records of a compressed container are read in order, without mmap."""
+        filename = os.path.join(self.directory.name, "graph.bin.gz")
+        with ProtoContainerWriter(filename) as writer:
+            writer.write_graph(self.graph.graph)
+        self.graph.save_to_file(self.filename)
+        with ProtoContainerReader(self.filename) as reader:
+            expected_frames = list(reader.iter_frames())
+            expected_records = list(reader.iter_records())
+        with ProtoContainerReader(filename) as reader:
+            self.assertFalse(reader.use_mmap)
+            self.assertEqual(list(reader.iter_frames()), expected_frames)
+            self.assertEqual(list(reader.iter_records()), expected_records)
+            with self.assertRaises(ValueError):
+                reader.read(*expected_frames[0][1:])
+
+    def test_reader_errors(self):
+        """Tests if truncated containers and unknown records raise errors."""
+        self.graph.save_to_file(self.filename)
+        with open(self.filename, "rb") as f:
+            data = f.read()
+        for content in [data[:-1], data + encode_varint(4 << 3 | 2), encode_varint(8 << 3 | 2) + encode_varint(0)]:
+            with open(self.filename, "wb") as f:
+                f.write(content)
+            for use_mmap in [True, False]:
+                with ProtoContainerReader(self.filename, use_mmap=use_mmap) as reader:
+                    with self.assertRaises(ValueError):
+                        list(reader.iter_records())
+
+    def test_stream_conversion(self):
+        """Tests if proto file converted in chunks is the same networkx graph as the one converted at once."""
+        self.graph.save_to_file(self.filename)
+        nx_files = [os.path.join(self.directory.name, f"graph_{i}.graphml") for i in range(2)]
+        convert_proto_to_nx_graph(self.graph, NxGraph(), nx_files[0], overwrite=False)
+        convert_proto_file_to_nx_stream(self.filename, NxGraph(), nx_files[1], overwrite=False, chunk_size=2)
+        graphs = [nx.read_graphml(nx_file) for nx_file in nx_files]
+        self.assertEqual(dict(graphs[1].nodes(data=True)), dict(graphs[0].nodes(data=True)))
+        self.assertEqual(sorted(graphs[1].edges(data=True)), sorted(graphs[0].edges(data=True)))
+
+
+if __name__ == '__main__':
+    unittest.main()
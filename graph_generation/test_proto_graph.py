@@ -5,10 +5,52 @@ Usage:
     python3 graph_generation/test_proto_graph.py
 """
 
+import os
+import tempfile
 import unittest
+
+import numpy as np
+
+from attribute_columns import CategoricalColumn, DurationColumn, IdStringColumn
 from proto_graph import ProtoGraph
 
 
+def add_test_nodes(graph, bulk):
+    """Adds a few nodes of every type to a proto or networkx graph with bulk methods, or one by one."""
+    names = IdStringColumn("name", "dataset", range(3))
+    envs = CategoricalColumn([0, 1, 0], ("PRODUCTION_ENV", "NON_EXIST"))
+    critics = CategoricalColumn([1, 1, 0], ("NOT_CRITICAL", "CRITICAL_OTHER"))
+    impacts = CategoricalColumn([1, 0, 1], ("DOWN", "DEGRADED"))
+    freshness = ["DAY", "NEVER", "DAY"]
+    times = DurationColumn([60, 7200, 86400])
+    ids, parent_ids = range(1, 4), np.array([2, 1, 2])
+    if bulk:
+        graph.add_collections(range(1, 3), ["collection.0", "collection.1"])
+        graph.add_dataset_collections(ids, parent_ids, names)
+        graph.add_system_collections(ids, parent_ids, names)
+        graph.add_datasets(ids, parent_ids, names, names, times, envs, names)
+        graph.add_systems(ids, critics, parent_ids, names, names, envs, names)
+        graph.add_processings(ids, parent_ids, range(10, 13), impacts, freshness, inputs=True)
+        graph.add_processings(ids, parent_ids, range(13, 16), impacts, freshness, inputs=False)
+        graph.add_data_integrities(ids, parent_ids, times, [1, 0, 1], times, times)
+        return
+    graph.generate_collection(1, "collection.0")
+    graph.generate_collection(2, "collection.1")
+    for i, node_id in enumerate(ids):
+        graph.generate_dataset_collection(node_id, int(parent_ids[i]), names[i])
+    for i, node_id in enumerate(ids):
+        graph.generate_system_collection(node_id, int(parent_ids[i]), names[i])
+    for i, node_id in enumerate(ids):
+        graph.generate_dataset(node_id, int(parent_ids[i]), names[i], names[i], times[i], envs[i], names[i])
+    for i, node_id in enumerate(ids):
+        graph.generate_system(node_id, critics[i], int(parent_ids[i]), names[i], names[i], envs[i], names[i])
+    for inputs, first_id in [(True, 10), (False, 13)]:
+        for i, node_id in enumerate(ids):
+            graph.generate_processing(node_id, int(parent_ids[i]), first_id + i, impacts[i], freshness[i], inputs)
+    for i, node_id in enumerate(ids):
+        graph.generate_data_integrity(node_id, int(parent_ids[i]), times[i], [1, 0, 1][i], times[i], times[i])
+
+
 class TestProtoGraph(unittest.TestCase):
     def test__get_env_enum(self):
         """Tests if getting correct env enum from string."""
@@ -106,7 +148,7 @@ class TestProtoGraph(unittest.TestCase):
         """Tests if dataset is added."""
         env = "DEVELOPMENT_ENV"
         proto_graph = ProtoGraph()
-        proto_graph.generate_dataset(5, 5, "dataset.dataset5.*", "dataset 5", "5d", env, "dataset number 5")
+        proto_graph.generate_dataset(5, 5, "dataset.dataset5.*", "dataset 5", 432000, env, "dataset number 5")
 
         self.assertTrue(hasattr(proto_graph.graph, "datasets"))
         self.assertTrue(hasattr(proto_graph.graph.datasets[-1], "dataset_id"))
@@ -122,7 +164,7 @@ class TestProtoGraph(unittest.TestCase):
         self.assertEqual(proto_graph.graph.datasets[-1].dataset_collection_id, 5)
         self.assertEqual(proto_graph.graph.datasets[-1].regex_grouping, "dataset.dataset5.*")
         self.assertEqual(proto_graph.graph.datasets[-1].name, "dataset 5")
-        self.assertEqual(proto_graph.graph.datasets[-1].slo, "5d")
+        self.assertEqual(proto_graph.graph.datasets[-1].slo, 432000)
         self.assertEqual(proto_graph.graph.datasets[-1].env, proto_graph._get_env_enum(env))
         self.assertEqual(proto_graph.graph.datasets[-1].description, "dataset number 5")
 
@@ -175,7 +217,7 @@ class TestProtoGraph(unittest.TestCase):
     def test_generate_data_integrity(self):
         """Tests if data integrity is added."""
         proto_graph = ProtoGraph()
-        proto_graph.generate_data_integrity(5, 5, "t", True, "t", "t")
+        proto_graph.generate_data_integrity(5, 5, 60, True, 120, 180)
 
         self.assertTrue(hasattr(proto_graph.graph, "data_integrities"))
         self.assertTrue(hasattr(proto_graph.graph.data_integrities[-1], "data_integrity_id"))
@@ -188,11 +230,81 @@ class TestProtoGraph(unittest.TestCase):
         self.assertEqual(len(proto_graph.graph.data_integrities), 1)
         self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_id, 5)
         self.assertEqual(proto_graph.graph.data_integrities[-1].dataset_collection_id, 5)
-        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_rec_time, "t")
+        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_rec_time, 60)
         self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_volat, True)
-        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_reg_time, "t")
-        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_rest_time, "t")
-
+        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_reg_time, 120)
+        self.assertEqual(proto_graph.graph.data_integrities[-1].data_integrity_rest_time, 180)
+
+
+    def test_stream(self):
+        """Tests if graph written in chunks is read as one graph."""
+        graph = ProtoGraph()
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.bin")
+            graph.open_stream(filename)
+            graph.generate_collection(1, "collection.0")
+            graph.flush()
+            self.assertEqual(len(graph.graph.collections), 0)
+            graph.generate_collection(2, "collection.1")
+            graph.generate_dataset_collection(1, 2, "dataset collection.0")
+            graph.close_stream()
+
+            read_graph = ProtoGraph()
+            read_graph.read_from_file(filename)
+        self.assertEqual([collection.collection_id for collection in read_graph.graph.collections], [1, 2])
+        self.assertEqual(len(read_graph.graph.dataset_collections), 1)
+
+    def test_bulk_methods(self):
+        """Tests if nodes added from columns are the same as nodes added one by one."""
+        graphs = [ProtoGraph(), ProtoGraph()]
+        add_test_nodes(graphs[0], bulk=False)
+        add_test_nodes(graphs[1], bulk=True)
+        self.assertEqual(graphs[1].graph, graphs[0].graph)
+        self.assertFalse(graphs[1].is_empty)
+        self.assertEqual([dataset.env for dataset in graphs[1].graph.datasets],
+                         [ProtoGraph._get_env_enum(env) for env in ["PRODUCTION_ENV", "UNKNOWN_ENV", "PRODUCTION_ENV"]])
+        self.assertEqual(graphs[1].graph.datasets[1].slo, 7200)
+
+    def test_save_in_chunks(self):
+        """Tests if graph serialized in chunks by worker processes is the same file as the one serialized at once."""
+        graph = ProtoGraph()
+        add_test_nodes(graph, bulk=True)
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for i, (workers, chunk_size) in enumerate([(1, None), (1, 2), (3, 2), (2, None)]):
+                filename = os.path.join(directory, f"graph_{i}.bin")
+                graph.save_to_file(filename, workers=workers, chunk_size=chunk_size)
+                with open(filename, "rb") as f:
+                    files.append(f.read())
+
+            read_graph = ProtoGraph()
+            read_graph.read_from_file(os.path.join(directory, "graph_2.bin"))
+            with self.assertRaises(ValueError):
+                graph.save_to_file(os.path.join(directory, "graph_4.bin"), workers=0)
+        self.assertEqual(files, [files[0]] * len(files))
+        self.assertEqual(read_graph.graph, graph.graph)
+
+    def test_compressed_files(self):
+        """Tests if graphs saved and streamed to compressed binaries are read back."""
+        graph = ProtoGraph()
+        add_test_nodes(graph, bulk=True)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "graph.bin.gz")
+            graph.save_to_file(filename, workers=2, chunk_size=2)
+            read_graph = ProtoGraph()
+            read_graph.read_from_file(filename)
+
+            stream_file = os.path.join(directory, "stream.bin.gz")
+            stream_graph = ProtoGraph()
+            stream_graph.open_stream(stream_file)
+            add_test_nodes(stream_graph, bulk=True)
+            stream_graph.close_stream()
+            streamed_graph = ProtoGraph()
+            streamed_graph.read_from_file(stream_file)
+            with self.assertRaises(ValueError):
+                graph.save_to_file(os.path.join(directory, "indexed.bin.gz"), index=True)
+        self.assertEqual(read_graph.graph, graph.graph)
+        self.assertEqual(streamed_graph.graph, graph.graph)
 
 if __name__ == '__main__':
     unittest.main()
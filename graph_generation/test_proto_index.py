@@ -0,0 +1,79 @@
+"""
+Module to test offset index of proto graph binaries.
+
+Usage:
+    python3 graph_generation/test_proto_index.py
+"""
+
+import os
+import tempfile
+import unittest
+
+from proto_graph import ProtoGraph
+from proto_index import ProtoIndex, build_index, get_index_filename
+from test_proto_graph import add_test_nodes
+
+
+class TestProtoIndex(unittest.TestCase):
+    def setUp(self):
+        self.graph = ProtoGraph()
+        add_test_nodes(self.graph, bulk=True)
+        # Sparse ids are found with a binary search.
+        self.graph.generate_system_collection(10, 1, "system collection.10")
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "graph.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_record(self):
+        """Tests if records and id ranges are read from the indexed binary."""
+        self.graph.save_to_file(self.filename, index=True)
+        graph = ProtoGraph()
+        with self.assertRaises(ValueError):
+            graph.get_record("datasets", 1)
+        graph.open_index(self.filename)
+        self.assertEqual(graph.get_record("datasets", 2), self.graph.graph.datasets[1])
+        self.assertEqual(graph.get_record("system_collections", 10), self.graph.graph.system_collections[3])
+        self.assertIsNone(graph.get_record("system_collections", 5))
+        self.assertIsNone(graph.get_record("datasets", 100))
+        self.assertEqual(graph.get_records("processings", 11, 14), list(self.graph.graph.processings[1:4]))
+        self.assertEqual(graph.get_records("system_collections", 2, 11),
+                         list(self.graph.graph.system_collections[1:]))
+        self.assertEqual(graph.index.get_id_range("processings"), (10, 15))
+        self.assertTrue(graph.is_empty)
+        graph.close_index()
+
+    def test_build_index(self):
+        """Tests if index built from records of a binary is the same as the one saved with the graph."""
+        self.graph.save_to_file(self.filename, index=True)
+        with open(get_index_filename(self.filename), "rb") as f:
+            saved_index = f.read()
+        build_index(self.filename)
+        with open(get_index_filename(self.filename), "rb") as f:
+            self.assertEqual(f.read(), saved_index)
+
+    def test_byte_range(self):
+        """Tests if byte range of a record type contains exactly its records."""
+        self.graph.save_to_file(self.filename, index=True)
+        with ProtoIndex(self.filename) as index:
+            start, stop = index.get_byte_range("datasets")
+        with open(self.filename, "rb") as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        graph = ProtoGraph()
+        graph.graph.ParseFromString(data)
+        self.assertEqual(list(graph.graph.datasets), list(self.graph.graph.datasets))
+        self.assertEqual(len(graph.graph.systems), 0)
+
+    def test_changed_binary(self):
+        """Tests if index of a binary that changed since it was indexed is not used."""
+        self.graph.save_to_file(self.filename, index=True)
+        self.graph.generate_collection(3, "collection.2")
+        self.graph.save_to_file(self.filename, overwrite=True)
+        with self.assertRaises(ValueError):
+            ProtoIndex(self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
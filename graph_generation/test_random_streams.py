@@ -0,0 +1,52 @@
+"""
+Module to test reproducible random streams.
+
+Usage:
+    python3 graph_generation/test_random_streams.py
+"""
+
+import unittest
+import numpy as np
+
+from random_streams import RandomStreams, child_sequence
+
+
+class TestRandomStreams(unittest.TestCase):
+    def test_same_seed_same_streams(self):
+        """Tests if streams with the same seed, stage and shard are identical."""
+        streams_1 = RandomStreams(42)
+        streams_2 = RandomStreams(42)
+        self.assertEqual(streams_1.generator("connections", 3).integers(0, 1000, 10).tolist(),
+                         streams_2.generator("connections", 3).integers(0, 1000, 10).tolist())
+        self.assertEqual(streams_1.python_random("attributes").random(), streams_2.python_random("attributes").random())
+
+    def test_streams_are_independent_of_request_order(self):
+        """Tests if a stream doesn't depend on which streams were requested before it."""
+        streams_1 = RandomStreams(42)
+        streams_1.generator("attributes")
+        streams_2 = RandomStreams(42)
+        self.assertEqual(streams_1.generator("connections").random(), streams_2.generator("connections").random())
+
+    def test_different_stages_and_shards(self):
+        """Tests if different stages and shards give different streams."""
+        streams = RandomStreams(42)
+        values = {streams.generator(stage, shard).random() for stage in ["connections", "attributes"]
+                  for shard in range(3)}
+        self.assertEqual(len(values), 6)
+
+    def test_unseeded_streams_store_seed(self):
+        """Tests if streams without a seed store the used entropy, so they can be reproduced."""
+        streams = RandomStreams()
+        reproduced = RandomStreams(streams.seed)
+        self.assertEqual(streams.generator("connections").random(), reproduced.generator("connections").random())
+
+    def test_child_sequence(self):
+        """Tests if child sequence is the same as spawned child and parent is not changed."""
+        parent = np.random.SeedSequence(1)
+        child = child_sequence(parent, 0)
+        self.assertEqual(parent.n_children_spawned, 0)
+        self.assertEqual(child.generate_state(4).tolist(), parent.spawn(1)[0].generate_state(4).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
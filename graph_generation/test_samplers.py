@@ -0,0 +1,56 @@
+"""
+Module to test samplers of probability maps.
+
+Usage:
+    python3 graph_generation/test_samplers.py
+"""
+
+import pickle
+import random
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from samplers import AliasSampler
+
+
+class TestSamplers(unittest.TestCase):
+    def test_sample_frequencies(self):
+        """Tests if values are drawn with the probabilities of the map, and never with zero probability."""
+        proba_map = {"DOWN": 0.5, "DEGRADED": 0.3, "NONE": 0.2, "UNKNOWN": 0.0}
+        column = AliasSampler(proba_map).sample(100000, np.random.default_rng(1))
+        self.assertEqual(column.codes.dtype, np.uint8)
+        counts = Counter(column.tolist())
+        for value, probability in proba_map.items():
+            self.assertAlmostEqual(counts[value] / 100000, probability, delta=0.01)
+        self.assertNotIn("UNKNOWN", counts)
+
+    def test_draw(self):
+        """Tests if single draws work with both random generators and follow counts of the map."""
+        sampler = AliasSampler({0: 40, 1: 60})
+        for rng in [random.Random(2), np.random.default_rng(2)]:
+            values = [sampler.draw(rng) for _ in range(10000)]
+            self.assertAlmostEqual(values.count(1) / 10000, 0.6, delta=0.02)
+
+    def test_chunks_and_pickle(self):
+        """Tests if chunks continue the same values, and a pickled sampler draws the same values."""
+        sampler = AliasSampler({"PRODUCTION_ENV": 90, "TESTING_ENV": 10, "STAGING_ENV": 5})
+        column = sampler.sample(1000, np.random.default_rng(3))
+        rng = np.random.default_rng(3)
+        chunks = [pickle.loads(pickle.dumps(sampler)).sample(n, rng) for n in [10, 0, 990]]
+        self.assertEqual([value for chunk in chunks for value in chunk], column.tolist())
+
+    def test_invalid_maps(self):
+        """Tests if maps without probability can't be sampled."""
+        with self.assertRaises(ValueError):
+            AliasSampler({"DOWN": 0, "NONE": 0})
+        with self.assertRaises(ValueError):
+            AliasSampler({"DOWN": -1, "NONE": 2})
+        with self.assertRaises(ValueError):
+            AliasSampler({}).sample(1, np.random.default_rng(1))
+        self.assertEqual(len(AliasSampler({}).sample(0, np.random.default_rng(1))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""
+Module to test scaling of graph dimensions.
+
+Usage:
+    python3 graph_generation/test_scaling.py
+"""
+
+import os
+import unittest
+
+import numpy as np
+import yaml
+
+from generate_from_config import format_map, process_map, scale_config
+from scaling import match_stub_total, round_counts, scale_count, scale_count_map, scale_many_to_many
+
+
+def get_stub_total(count_map):
+    """Returns total number of connections of a count map."""
+    return sum(key * count for key, count in count_map.items())
+
+
+class TestScaling(unittest.TestCase):
+    def test_scale_count(self):
+        """Tests if scaled counts are rounded and don't drop to zero."""
+        self.assertEqual(scale_count(212368, 0.01), 2124)
+        self.assertEqual(scale_count(10, 0.01), 1)
+        self.assertEqual(scale_count(0, 10), 0)
+
+    def test_round_counts(self):
+        """Tests if every rounded count is floor or ceil of its scaled value and the total is exact."""
+        rng = np.random.default_rng(0)
+        expected = np.array([1000, 10, 3, 1, 1, 1, 1, 1, 1, 1, 1])
+        for total in [5, 102, 10210]:
+            counts = round_counts(expected, total, rng)
+            scaled = expected * total / expected.sum()
+            self.assertEqual(counts.sum(), total)
+            self.assertTrue(np.all(counts >= np.floor(scaled)) and np.all(counts <= np.ceil(scaled)))
+
+    def test_scale_count_map_caps_keys(self):
+        """Tests if scaled count map has the requested number of nodes and no keys above the cap."""
+        scaled_map = scale_count_map({0: 900, 1: 90, 50: 5, 3022: 5}, 2000, np.random.default_rng(0), max_key=100)
+        self.assertEqual(sum(scaled_map.values()), 2000)
+        self.assertEqual(scaled_map[100], 10)
+
+    def test_match_stub_total(self):
+        """Tests if connections are removed and added without changing number of nodes."""
+        count_map = {0: 50, 1: 30, 2: 15, 40: 5}
+        rng = np.random.default_rng(0)
+        for stub_total in [100, 260, 400]:
+            matched_map = match_stub_total(count_map, stub_total, rng, max_key=60)
+            self.assertEqual(get_stub_total(matched_map), stub_total)
+            self.assertEqual(sum(matched_map.values()), 100)
+            self.assertTrue(max(matched_map) <= 60)
+            self.assertTrue(matched_map[0] >= 50)
+
+        with self.assertRaises(ValueError):
+            match_stub_total(count_map, 1000, rng, max_key=5)
+
+    def test_match_stub_total_fills_unconnected_nodes(self):
+        """Tests if connections that don't fit into connected nodes fill unconnected nodes up to max_key."""
+        rng = np.random.default_rng(0)
+        self.assertEqual(match_stub_total({0: 80000, 1: 10}, 25, rng, max_key=2), {0: 79997, 1: 1, 2: 12})
+        self.assertEqual(match_stub_total({0: 100}, 7, rng, max_key=3), {0: 97, 1: 1, 3: 2})
+
+    def test_scale_many_to_many(self):
+        """Tests if both sides of a scaled relation have the same number of connections."""
+        dataset_map = {0: 700, 1: 200, 2: 60, 5: 30, 20: 10}
+        system_map = {0: 10, 5: 60, 10: 25, 24: 5}
+        for scale in [0.05, 0.5, 3, 20]:
+            dataset_count, system_count = scale_count(1000, scale), scale_count(100, scale)
+            scaled_dataset_map, scaled_system_map = scale_many_to_many(dataset_map, system_map, scale, dataset_count,
+                                                                       system_count, np.random.default_rng(1))
+            self.assertEqual(get_stub_total(scaled_dataset_map), get_stub_total(scaled_system_map))
+            self.assertEqual(sum(scaled_dataset_map.values()), dataset_count)
+            self.assertEqual(sum(scaled_system_map.values()), system_count)
+
+    def test_scale_config(self):
+        """Tests if scaled config keeps totals of the bundled config and is reproducible."""
+        with open(os.path.join(os.path.dirname(__file__), "configs", "config_15_09_20.yaml")) as f:
+            config = yaml.load(f, Loader=yaml.FullLoader)
+        scaled_config = scale_config(config, 10, np.random.default_rng(3))
+        self.assertEqual(scaled_config, scale_config(config, 10, np.random.default_rng(3)))
+        self.assertEqual(scaled_config["dataset"]["dataset_count"], 2123680)
+        self.assertEqual(config["dataset"]["dataset_count"], 212368)
+
+        for dataset_key, system_key in [("dataset_read_count_map", "system_inputs_count_map"),
+                                        ("dataset_write_count_map", "system_outputs_count_map")]:
+            dataset_map = process_map(scaled_config["dataset"][dataset_key])
+            system_map = process_map(scaled_config["system"][system_key])
+            self.assertEqual(get_stub_total(dataset_map), get_stub_total(system_map))
+            self.assertEqual(get_stub_total(dataset_map),
+                             10 * get_stub_total(process_map(config["dataset"][dataset_key])))
+
+        # The heavy tail is kept: hubs of the config are repeated in the scaled config.
+        system_input_map = process_map(scaled_config["system"]["system_inputs_count_map"])
+        self.assertEqual(sum(count for key, count in system_input_map.items() if key >= 3000), 10)
+
+    def test_format_map(self):
+        """Tests if formatted map is parsed back to the same dictionary."""
+        count_map = {0: 5, 3: 1, 3022: 1}
+        self.assertEqual(process_map(format_map(count_map)), count_map)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Module to test sharded graph generation.
+
+Usage:
+    python3 graph_generation/test_sharding.py
+"""
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+import numpy as np
+
+from config_params.collection_params import CollectionParams
+from config_params.dataset_params import DatasetParams
+from config_params.dataset_to_system_params import DatasetToSystemParams
+from config_params.system_params import SystemParams
+from generate_from_config import generate_and_save_shards
+from sharding import ShardPlan, get_id_ranges, get_manifest_file, get_shard_file, read_manifest, read_sharded_graph
+
+SMALL_CONFIG = {
+    "dataset": {
+        "dataset_count": 1000,
+        "dataset_read_count_map": "[0:700 1:200 2:60 5:30 20:10]",
+        "dataset_write_count_map": "[0:800 1:150 3:50]",
+        "dataset_env_count_map": "[PRODUCTION_ENV:900 TESTING_ENV:100]"
+    },
+    "system": {
+        "system_count": 100,
+        "system_inputs_count_map": "[0:10 5:60 10:25 24:5]",
+        "system_outputs_count_map": "[0:20 2:40 5:40]",
+        "system_env_count_map": "[PRODUCTION_ENV:90 STAGING_ENV:10]",
+        "system_criticality_proba_map": "[NOT_CRITICAL:0.7 CRITICAL_OTHER:0.3]"
+    },
+    "dataset_collection": {"dataset_collection_count": 100, "dataset_count_map": "[5:50 15:50]"},
+    "system_collection": {"system_collection_count": 20, "system_count_map": "[5:20]"},
+    "collection": {"collection_count": 4, "dataset_collection_count_map": "[25:4]",
+                   "system_collection_count_map": "[5:4]"},
+    "data_processing": {"dataset_impact_proba_map": "[DOWN:0.5 NONE:0.5]",
+                        "dataset_criticality_proba_map": "[DAY:0.5 NEVER:0.5]"},
+    "data_integrity": {"volatality_proba_map": "[0:0.4 1:0.6]"}
+}
+
+
+class TestSharding(unittest.TestCase):
+    @staticmethod
+    def get_plan(shard_count):
+        """Creates shard plan of a small graph."""
+        dataset_params = DatasetParams(1000, {})
+        system_params = SystemParams(100, {}, {})
+        dataset_to_system_params = DatasetToSystemParams({0: 10, 5: 60, 10: 25, 24: 5}, {0: 20, 2: 40, 5: 40},
+                                                         {0: 700, 1: 200, 2: 60, 5: 30, 20: 10}, {0: 800, 1: 150, 3: 50})
+        collection_params = CollectionParams({5: 50, 15: 50}, {5: 20}, 100, {25: 4}, 20, {5: 4}, 4)
+        return ShardPlan(dataset_params, system_params, dataset_to_system_params, collection_params, shard_count,
+                         seed=5)
+
+    def test_get_id_ranges(self):
+        """Tests if id ranges cover all ids without gaps."""
+        ranges = get_id_ranges(10, 3)
+        self.assertEqual(ranges, [(1, 4), (4, 7), (7, 11)])
+
+    def test_shard_files(self):
+        """Tests shard and manifest file names."""
+        self.assertEqual(get_shard_file("out/graph.bin", 1, 4), "out/graph-00001-of-00004.bin")
+        self.assertEqual(get_manifest_file("out/graph.bin"), "out/graph.manifest.json")
+        self.assertEqual(get_shard_file("out/graph.bin.gz", 1, 4), "out/graph-00001-of-00004.bin.gz")
+        self.assertEqual(get_manifest_file("out/graph.graphml.zst"), "out/graph.zst.manifest.json")
+
+    def test_element_2_stubs_are_split_exactly(self):
+        """Tests if system stubs of all shards add up to system degrees and match dataset stubs of every shard."""
+        plan = self.get_plan(4)
+        stubs = np.array([plan.dataset_reads.element_2_stubs(i) for i in range(4)])
+        self.assertEqual(stubs.sum(axis=0).tolist(), plan.dataset_reads.element_2_degrees.tolist())
+        self.assertEqual(stubs.sum(axis=1).tolist(), plan.dataset_reads.shard_stub_counts.tolist())
+
+    def test_generate_connections_keeps_global_degrees(self):
+        """Tests if union of shard connections has the config degree distribution of systems."""
+        plan = self.get_plan(4)
+        stores = [plan.generate_connections(i) for i in range(4)]
+        pairs = [pair for store in stores for pair in store["dataset_read_conn_systems"]]
+        self.assertEqual(len(pairs), len(set(pairs)))
+
+        system_degrees = Counter(system_id for _, system_id in pairs)
+        degree_counts = Counter(system_degrees.get(i, 0) for i in range(1, 101))
+        self.assertEqual(degree_counts, Counter({0: 10, 5: 60, 10: 25, 24: 5}))
+
+        # Every dataset belongs to exactly one dataset collection, collections are only in shard 0.
+        datasets = [dataset_id for store in stores for _, dataset_id in store["datasets_conn_collection"]]
+        self.assertEqual(sorted(datasets), list(range(1, 1001)))
+        self.assertEqual([store.edge_count("dataset_collections_conn_collection") for store in stores], [100, 0, 0, 0])
+
+    def test_shard_params_keep_ranges(self):
+        """Tests if shard dataset params keep the SLO range of the graph."""
+        plan = self.get_plan(3)
+        plan.dataset_params.dataset_slo_range = (5, 10)
+        self.assertEqual([plan.get_shard_params(i)[0].dataset_slo_range for i in range(3)], [(5, 10)] * 3)
+
+    def test_plan_is_reproducible(self):
+        """Tests if every process with the same seed gets the same shard."""
+        self.assertEqual(list(self.get_plan(3).generate_connections(1)["dataset_write_conn_systems"]),
+                         list(self.get_plan(3).generate_connections(1)["dataset_write_conn_systems"]))
+
+    def test_generate_and_read_sharded_graph(self):
+        """Tests if shards described by a manifest are read as one proto graph."""
+        with tempfile.TemporaryDirectory() as directory:
+            output_file = os.path.join(directory, "graph.bin")
+            generate_and_save_shards(SMALL_CONFIG, "proto", output_file, 3, seed=1)
+            manifest = read_manifest(get_manifest_file(output_file))
+            graph = read_sharded_graph(get_manifest_file(output_file)).graph
+
+        self.assertEqual(manifest["shard_count"], 3)
+        self.assertEqual(len(graph.collections), 4)
+        self.assertEqual(len(graph.data_integrities), 100)
+        self.assertEqual(sorted(dataset.dataset_id for dataset in graph.datasets), list(range(1, 1001)))
+        self.assertEqual(sorted(system.system_id for system in graph.systems), list(range(1, 101)))
+        self.assertEqual(len({dataset.name for dataset in graph.datasets}), 1000)
+        processing_ids = [processing.processing_id for processing in graph.processings]
+        self.assertEqual(len(processing_ids), len(set(processing_ids)))
+
+    def test_read_compressed_sharded_graph(self):
+        """Tests if compressed shards are read as the same graph as uncompressed shards."""
+        with tempfile.TemporaryDirectory() as directory:
+            graphs = {}
+            for graph_type, name in [("proto", "graph.bin"), ("proto", "graph.bin.gz"), ("networkx", "graph.graphml"),
+                                     ("networkx", "graph.graphml.gz")]:
+                output_file = os.path.join(directory, graph_type, name)
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+                generate_and_save_shards(SMALL_CONFIG, graph_type, output_file, 2, seed=1)
+                graphs[name] = read_sharded_graph(get_manifest_file(output_file)).graph
+            self.assertTrue(os.path.isfile(os.path.join(directory, "proto", "graph-00001-of-00002.bin.gz")))
+            self.assertTrue(os.path.isfile(os.path.join(directory, "proto", "graph.gz.manifest.json")))
+
+        self.assertEqual(graphs["graph.bin.gz"], graphs["graph.bin"])
+        self.assertEqual(dict(graphs["graph.graphml.gz"].nodes(data=True)),
+                         dict(graphs["graph.graphml"].nodes(data=True)))
+        self.assertEqual(sorted(graphs["graph.graphml.gz"].edges()), sorted(graphs["graph.graphml"].edges()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Module to test stage reports.
+
+Usage:
+    python3 graph_generation/test_stage_report.py
+"""
+
+import json
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+from generate_from_config import generate_and_save_graph
+from stage_report import StageReport, call_measured
+from test_sharding import SMALL_CONFIG
+
+
+class TestStageReport(unittest.TestCase):
+    def test_stages_are_merged(self):
+        """Tests if runs of a stage sum times and calls and keep the maximal peak."""
+        report = StageReport()
+        report.add("serialization", 1.5, 1.0, peak_rss_bytes=100)
+        report.add("serialization", 0.5, 0.25, peak_rss_bytes=300)
+        other = StageReport()
+        other.add("serialization", 1.0, 1.0, peak_rss_bytes=200, calls=2)
+        other.add("nodes.dataset", 2.0, 2.0)
+        report.merge(other)
+        self.assertEqual(report.stages["serialization"], {"calls": 4, "wall_seconds": 3.0, "cpu_seconds": 2.25,
+                                                          "peak_rss_bytes": 300, "tracemalloc_peak_bytes": None})
+        self.assertEqual(list(report.stages), ["serialization", "nodes.dataset"])
+
+    def test_nested_stage_peaks(self):
+        """Tests if memory allocated in an inner stage counts in the peak of the outer stage."""
+        report = StageReport(trace_memory=True)
+        with report.stage("outer"):
+            with report.stage("inner"):
+                data = bytearray(10 ** 7)
+            del data
+            with report.stage("after"):
+                pass
+        tracemalloc.stop()
+        stages = report.stages
+        self.assertEqual([stages[name]["calls"] for name in ("outer", "inner", "after")], [1, 1, 1])
+        self.assertGreaterEqual(stages["inner"]["tracemalloc_peak_bytes"], 10 ** 7)
+        self.assertGreaterEqual(stages["outer"]["tracemalloc_peak_bytes"], 10 ** 7)
+        self.assertLess(stages["after"]["tracemalloc_peak_bytes"], 10 ** 7)
+        self.assertGreaterEqual(stages["outer"]["wall_seconds"], stages["inner"]["wall_seconds"])
+
+    def test_call_measured(self):
+        """Tests if a function called as a stage returns its result with the report."""
+        result, report = call_measured("sum", sum, [1, 2, 3])
+        self.assertEqual(result, 6)
+        self.assertEqual(list(report.stages), ["sum"])
+        self.assertEqual(report.stages["sum"]["calls"], 1)
+
+    def test_save_report(self):
+        """Tests if a generated graph has a report of its stages in JSON and Prometheus textfile format."""
+        with tempfile.TemporaryDirectory() as directory:
+            report = StageReport(labels={"graph_type": "proto"})
+            generate_and_save_graph(SMALL_CONFIG, "proto", os.path.join(directory, "graph.bin"), seed=1,
+                                    report=report)
+            report.save_json(os.path.join(directory, "report.json"))
+            report.save_prometheus(os.path.join(directory, "report.prom"))
+            with open(os.path.join(directory, "report.json")) as f:
+                saved = json.load(f)
+            with open(os.path.join(directory, "report.prom")) as f:
+                metrics = f.read()
+            self.assertEqual(sorted(os.listdir(directory)), ["graph.bin", "report.json", "report.prom"])
+
+        names = [stage["name"] for stage in saved["stages"]]
+        for name in ("config", "connections.datasets_conn_collection", "attributes.dataset", "nodes.dataset",
+                     "nodes.processing", "serialization"):
+            self.assertIn(name, names)
+        self.assertEqual(saved["info"], {"seed": 1})
+        self.assertIn('graph_generation_stage_wall_seconds{graph_type="proto",stage="nodes.dataset"} ', metrics)
+        self.assertIn("# TYPE graph_generation_run_wall_seconds gauge", metrics)
+        self.assertNotIn("tracemalloc", metrics)
+
+
+if __name__ == '__main__':
+    unittest.main()